@@ -1,9 +1,14 @@
 """Internal classes used by the gzip, lzma and bz2 modules"""
 
+import bisect
+import collections
 import io
+import os
+import struct
 
 
 BUFFER_SIZE = io.DEFAULT_BUFFER_SIZE  # Compressed data read chunk size
+INDEX_SPACING = 1024 * 1024  # Distance between the points of a SeekIndex
 
 
 class BaseStream(io.BufferedIOBase):
@@ -30,13 +35,113 @@ class BaseStream(io.BufferedIOBase):
                                           "does not support seeking")
 
 
+class SeekIndex:
+    """Seek points of a compressed file, to seek without decompressing the
+    data from the start.
+
+    A seek point is a tuple (pos, offset, state): the decompression of the
+    data from position pos can resume at the given offset of the compressed
+    file, with the decompressor state saved by the reader in the state
+    bytes object (empty at the start of a compressed stream).  The points
+    are added in order while reading, at least spacing bytes apart.
+    """
+
+    _HEADER = struct.Struct("<8s8sQqQ")
+    _POINT = struct.Struct("<QQI")
+    _MAGIC = b"PySeekIx"
+
+    def __init__(self, format, spacing=INDEX_SPACING):
+        self.format = format
+        self.spacing = spacing
+        self.size = -1  # Size of the decompressed data once it is known
+        self._positions = []
+        self._points = []
+
+    def __len__(self):
+        return len(self._points)
+
+    @property
+    def next_pos(self):
+        """The position from which the next point can be added."""
+        if not self._points:
+            return 0
+        return self._positions[-1] + self.spacing
+
+    def add(self, pos, offset, state=b""):
+        """Add a seek point if pos is at least next_pos."""
+        if pos < self.next_pos:
+            return False
+        self._positions.append(pos)
+        self._points.append((pos, offset, state))
+        return True
+
+    def find(self, pos):
+        """Return the last seek point before pos, or None."""
+        i = bisect.bisect_right(self._positions, pos)
+        if not i:
+            return None
+        return self._points[i - 1]
+
+    def save(self, file):
+        """Write the seek points to file, a file name or a binary file."""
+        if isinstance(file, (str, bytes)):
+            with open(file, "wb") as f:
+                return self.save(f)
+        file.write(self._HEADER.pack(self._MAGIC,
+                                     self.format.encode("ascii"),
+                                     self.spacing, self.size,
+                                     len(self._points)))
+        for pos, offset, state in self._points:
+            file.write(self._POINT.pack(pos, offset, len(state)))
+            file.write(state)
+
+    @classmethod
+    def load(cls, file, format):
+        """Read the seek points saved by save() for the given format."""
+        if isinstance(file, (str, bytes)):
+            with open(file, "rb") as f:
+                return cls.load(f, format)
+        def read(n):
+            data = file.read(n)
+            if len(data) < n:
+                raise ValueError("Truncated seek index")
+            return data
+        (magic, saved_format, spacing, size,
+         count) = cls._HEADER.unpack(read(cls._HEADER.size))
+        if magic != cls._MAGIC:
+            raise ValueError("Not a seek index")
+        if saved_format.rstrip(b"\0") != format.encode("ascii"):
+            raise ValueError("Not a seek index of a %s file" % format)
+        self = cls(format, spacing)
+        self.size = size
+        for i in range(count):
+            pos, offset, length = cls._POINT.unpack(read(cls._POINT.size))
+            self._positions.append(pos)
+            self._points.append((pos, offset, read(length)))
+        return self
+
+
+def open_index(index, format):
+    """Return the SeekIndex asked by the index argument of a reader.
+
+    index can be None or False for no index, True for a new index built
+    while reading, or a file saved by SeekIndex.save() to load.
+    """
+    if index is None or index is False:
+        return None
+    if index is True:
+        return SeekIndex(format, INDEX_SPACING)
+    return SeekIndex.load(index, format)
+
+
 class DecompressReader(io.RawIOBase):
     """Adapts the decompressor API to a RawIOBase reader API"""
 
     def readable(self):
         return True
 
-    def __init__(self, fp, decomp_factory, trailing_error=(), **decomp_args):
+    def __init__(self, fp, decomp_factory, trailing_error=(), index=None,
+                 **decomp_args):
         self._fp = fp
         self._eof = False
         self._pos = 0  # Current offset in decompressed stream
@@ -44,6 +149,11 @@ class DecompressReader(io.RawIOBase):
         # Set to size of decompressed stream once it is known, for SEEK_END
         self._size = -1
 
+        # Optional SeekIndex, completed while reading
+        self._index = index
+        if index is not None:
+            self._size = index.size
+
         # Save the decompressor factory and arguments.
         # If the file contains multiple compressed streams, each
         # stream will need a separate decompressor object. A new decompressor
@@ -84,6 +194,10 @@ class DecompressReader(io.RawIOBase):
                             self._fp.read(BUFFER_SIZE))
                 if not rawblock:
                     break
+                if self._index is not None:
+                    # The next stream starts at the first byte of rawblock
+                    self._index.add(self._pos,
+                                    self._fp.tell() - len(rawblock))
                 # Continue to next stream.
                 self._decompressor = self._decomp_factory(
                     **self._decomp_args)
@@ -105,11 +219,16 @@ class DecompressReader(io.RawIOBase):
                 break
         if not data:
             self._eof = True
-            self._size = self._pos
+            self._set_size()
             return b""
         self._pos += len(data)
         return data
 
+    def _set_size(self):
+        self._size = self._pos
+        if self._index is not None:
+            self._index.size = self._pos
+
     # Rewind the file to the beginning of the data stream.
     def _rewind(self):
         self._fp.seek(0)
@@ -117,6 +236,14 @@ class DecompressReader(io.RawIOBase):
         self._pos = 0
         self._decompressor = self._decomp_factory(**self._decomp_args)
 
+    # Resume the decompression from a seek point of the index.
+    def _restore(self, point):
+        pos, offset, state = point
+        self._fp.seek(offset)
+        self._eof = False
+        self._pos = pos
+        self._decompressor = self._decomp_factory(**self._decomp_args)
+
     def seek(self, offset, whence=io.SEEK_SET):
         # Recalculate offset as an absolute file position.
         if whence == io.SEEK_SET:
@@ -132,11 +259,16 @@ class DecompressReader(io.RawIOBase):
         else:
             raise ValueError("Invalid value for whence: {}".format(whence))
 
-        # Make it so that offset is the number of bytes to skip forward.
-        if offset < self._pos:
+        # Make it so that offset is the number of bytes to skip forward,
+        # from the closest seek point of the index if there is one.
+        point = None
+        if self._index is not None:
+            point = self._index.find(offset)
+        if point is not None and (offset < self._pos or point[0] > self._pos):
+            self._restore(point)
+        elif offset < self._pos:
             self._rewind()
-        else:
-            offset -= self._pos
+        offset -= self._pos
 
         # Read and discard data until we reach the desired position.
         while offset > 0:
@@ -150,3 +282,97 @@ class DecompressReader(io.RawIOBase):
     def tell(self):
         """Return the current file position."""
         return self._pos
+
+
+class ParallelCompressor:
+    """Compresses blocks of data concurrently in a pool of threads.
+
+    Offers the compress() and flush() methods of the compressor objects.
+    The input is split into blocks of block_size bytes, and each block is
+    compressed by compress_block(data, previous, final) in a thread:
+    previous is the preceding block (None for the first block, b"" after a
+    reset) and final is true for the last block.  The outputs of the
+    blocks are returned in order, as they are completed.
+    """
+
+    def __init__(self, compress_block, threads, block_size):
+        from concurrent.futures import ThreadPoolExecutor
+        if threads == 0:
+            threads = os.cpu_count() or 1
+        elif threads < 0:
+            raise ValueError("threads must be non-negative")
+        self._compress_block = compress_block
+        self._block_size = block_size
+        self._executor = ThreadPoolExecutor(threads)
+        # Enough blocks in flight to keep the threads busy, while bounding
+        # the memory used when the input comes faster than it is compressed
+        self._max_pending = 2 * threads
+        self._pending = collections.deque()
+        self._chunks = []
+        self._size = 0
+        self._previous = None
+
+    def compress(self, data):
+        if self._executor is None:
+            raise ValueError("Compressor has been flushed")
+        block_size = self._block_size
+        output = []
+        # The data is copied once, into the blocks or the buffered chunks,
+        # as the caller may change it before the blocks are compressed
+        with memoryview(data) as view, view.cast("B") as view:
+            start = 0
+            if self._size + len(view) >= block_size:
+                start = block_size - self._size
+                self._chunks.append(view[:start])
+                self._submit(b"".join(self._chunks), False, output)
+                self._chunks = []
+                self._size = 0
+                end = len(view) - (len(view) - start) % block_size
+                for start in range(start, end, block_size):
+                    self._submit(bytes(view[start:start + block_size]),
+                                 False, output)
+                start = end
+            if start < len(view):
+                self._chunks.append(bytes(view[start:]))
+                self._size += len(view) - start
+        output.append(self._collect(False))
+        return b"".join(output)
+
+    def flush(self, final=True, reset=False):
+        """Compress the buffered data and wait for all the blocks.
+
+        If final is true, the stream is finished and the compressor cannot
+        be used any more.  If reset is true, the next block is compressed
+        without the history of the preceding one.
+        """
+        if self._executor is None:
+            raise ValueError("Repeated call to flush()")
+        output = []
+        if self._size or final:
+            self._submit(b"".join(self._chunks), final, output)
+            self._chunks = []
+            self._size = 0
+        output.append(self._collect(True))
+        data = b"".join(output)
+        if reset:
+            self._previous = b""
+        if final:
+            self._executor.shutdown()
+            self._executor = None
+        return data
+
+    def _submit(self, block, final, output):
+        # Wait for the oldest block when too many are in flight
+        if len(self._pending) >= self._max_pending:
+            output.append(self._pending.popleft().result())
+        future = self._executor.submit(self._compress_block, block,
+                                       self._previous, final)
+        self._pending.append(future)
+        self._previous = block
+
+    def _collect(self, wait):
+        pending = self._pending
+        output = []
+        while pending and (wait or pending[0].done()):
+            output.append(pending.popleft().result())
+        return b"".join(output)
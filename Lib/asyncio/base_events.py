@@ -33,7 +33,9 @@ from . import compat
 from . import coroutines
 from . import events
 from . import futures
+from . import protocols
 from . import tasks
+from . import transports
 from .coroutines import coroutine
 from .log import logger
 
@@ -57,6 +59,9 @@ _MIN_CANCELLED_TIMER_HANDLES_FRACTION = 0.5
 _FATAL_ERROR_IGNORE = (BrokenPipeError,
                        ConnectionResetError, ConnectionAbortedError)
 
+# Size of the chunks read from the file by the sendfile() fallback.
+_SENDFILE_FALLBACK_READBUFFER_SIZE = 1024 * 256
+
 
 def _format_handle(handle):
     cb = handle._callback
@@ -171,6 +176,83 @@ def _run_until_complete_cb(fut):
     fut._loop.stop()
 
 
+class _SendfileFallbackProtocol(protocols.Protocol):
+    """Protocol used by sendfile() to honour the transport's flow control.
+
+    It temporarily replaces the transport's protocol: pause_writing() and
+    resume_writing() are intercepted, everything else is forwarded to the
+    original protocol.
+    """
+
+    def __init__(self, transp):
+        if not isinstance(transp, transports._FlowControlMixin):
+            raise TypeError("transport should be _FlowControlMixin instance")
+        self._transport = transp
+        self._proto = transp.get_protocol()
+        self._should_resume_writing = transp._protocol_paused
+        transp.set_protocol(self)
+        if self._should_resume_writing:
+            self._write_ready_fut = self._transport._loop.create_future()
+        else:
+            self._write_ready_fut = None
+
+    @coroutine
+    def drain(self):
+        if self._transport.is_closing():
+            raise ConnectionError("Connection closed by peer")
+        fut = self._write_ready_fut
+        if fut is None:
+            return
+        yield from fut
+
+    def connection_made(self, transport):
+        raise RuntimeError("Invalid state: "
+                           "connection should have been established already.")
+
+    def connection_lost(self, exc):
+        if self._write_ready_fut is not None:
+            # Never happens if peer disconnects after sending the whole
+            # content.  Thus disconnection is always an exception from
+            # user perspective.
+            if exc is None:
+                self._write_ready_fut.set_exception(
+                    ConnectionError("Connection is closed by peer"))
+            else:
+                self._write_ready_fut.set_exception(exc)
+        self._proto.connection_lost(exc)
+
+    def pause_writing(self):
+        if self._write_ready_fut is not None:
+            return
+        self._write_ready_fut = self._transport._loop.create_future()
+
+    def resume_writing(self):
+        if self._write_ready_fut is None:
+            return
+        self._write_ready_fut.set_result(False)
+        self._write_ready_fut = None
+
+    def data_received(self, data):
+        self._proto.data_received(data)
+
+    def eof_received(self):
+        return self._proto.eof_received()
+
+    def restore(self):
+        self._transport.set_protocol(self._proto)
+        if self._write_ready_fut is not None:
+            # Cancel the future.  Basically it has no effect because the
+            # protocol is switched back, no code should wait for it anymore.
+            self._write_ready_fut.cancel()
+            if self._transport.is_closing():
+                return
+            if not self._should_resume_writing:
+                # The transport is still above its high-water mark.
+                self._proto.pause_writing()
+        elif self._should_resume_writing:
+            self._proto.resume_writing()
+
+
 class Server(events.AbstractServer):
 
     def __init__(self, loop, sockets):
@@ -741,6 +823,100 @@ class BaseEventLoop(events.AbstractEventLoop):
 
         return transport, protocol
 
+    @coroutine
+    def sendfile(self, transport, file, offset=0, count=None,
+                 *, fallback=True):
+        """Send a file to transport.
+
+        Return the total number of bytes which were sent.
+
+        The method uses high-performance os.sendfile if available.
+
+        file must be a regular file object opened in binary mode.
+
+        offset tells from where to start reading the file. If specified,
+        count is the total number of bytes to transmit as opposed to
+        sending the file until EOF is reached. File position is updated on
+        return or also in case of error in which case file.tell()
+        can be used to figure out the number of bytes
+        which were sent.
+
+        fallback set to True makes asyncio to manually read and send
+        the file when the platform does not support the sendfile syscall
+        (e.g. Windows or SSL socket on Unix).
+
+        Raise SendfileNotAvailableError if the system does not support
+        sendfile syscall and fallback is False.
+        """
+        if transport.is_closing():
+            raise RuntimeError("Transport is closing")
+        self._check_sendfile_params(file, offset, count)
+        try:
+            return (yield from self._sendfile_native(transport, file,
+                                                     offset, count))
+        except events.SendfileNotAvailableError:
+            if not fallback:
+                raise
+        return (yield from self._sendfile_fallback(transport, file,
+                                                   offset, count))
+
+    def _check_sendfile_params(self, file, offset, count):
+        if 'b' not in getattr(file, 'mode', 'b'):
+            raise ValueError("file should be opened in binary mode")
+        if not isinstance(offset, int):
+            raise TypeError(
+                "offset must be a non-negative integer (got {!r})".format(
+                    offset))
+        if offset < 0:
+            raise ValueError(
+                "offset must be a non-negative integer (got {!r})".format(
+                    offset))
+        if count is not None:
+            if not isinstance(count, int):
+                raise TypeError(
+                    "count must be a positive integer (got {!r})".format(
+                        count))
+            if count <= 0:
+                raise ValueError(
+                    "count must be a positive integer (got {!r})".format(
+                        count))
+
+    @coroutine
+    def _sendfile_native(self, transp, file, offset, count):
+        raise events.SendfileNotAvailableError(
+            "sendfile syscall is not supported")
+
+    @coroutine
+    def _sendfile_fallback(self, transp, file, offset, count):
+        if offset:
+            file.seek(offset)
+        blocksize = _SENDFILE_FALLBACK_READBUFFER_SIZE
+        if count:
+            blocksize = min(count, blocksize)
+        buf = bytearray(blocksize)
+        total_sent = 0
+        proto = _SendfileFallbackProtocol(transp)
+        try:
+            while True:
+                if count:
+                    blocksize = min(count - total_sent, blocksize)
+                    if blocksize <= 0:
+                        return total_sent
+                # The previous chunk may still be referenced by the
+                # transport's write buffer, so each chunk gets its own copy.
+                view = memoryview(buf)[:blocksize]
+                read = yield from self.run_in_executor(None, file.readinto,
+                                                       view)
+                if not read:
+                    return total_sent
+                yield from proto.drain()
+                transp.write(bytes(view[:read]))
+                total_sent += read
+        finally:
+            if total_sent > 0 and hasattr(file, 'seek'):
+                file.seek(offset + total_sent)
+            proto.restore()
+
     @coroutine
     def create_datagram_endpoint(self, protocol_factory,
                                  local_addr=None, remote_addr=None, *,
@@ -6,6 +6,7 @@ __all__ = ['AbstractEventLoopPolicy',
            'get_event_loop_policy', 'set_event_loop_policy',
            'get_event_loop', 'set_event_loop', 'new_event_loop',
            'get_child_watcher', 'set_child_watcher',
+           'SendfileNotAvailableError',
            ]
 
 import functools
@@ -193,6 +194,14 @@ class TimerHandle(Handle):
         super().cancel()
 
 
+class SendfileNotAvailableError(RuntimeError):
+    """Sendfile syscall is not available.
+
+    Raised if OS does not support sendfile syscall for given socket or
+    file type.
+    """
+
+
 class AbstractServer:
     """Abstract server returned by create_server()."""
 
@@ -298,6 +307,14 @@ class AbstractEventLoop:
                           local_addr=None, server_hostname=None):
         raise NotImplementedError
 
+    def sendfile(self, transport, file, offset=0, count=None,
+                 *, fallback=True):
+        """Send a file through a transport.
+
+        Return an amount of sent bytes.
+        """
+        raise NotImplementedError
+
     def create_server(self, protocol_factory, host=None, port=None, *,
                       family=socket.AF_UNSPEC, flags=socket.AI_PASSIVE,
                       sock=None, backlog=100, ssl=None, reuse_address=None,
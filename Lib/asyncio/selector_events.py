@@ -495,6 +495,24 @@ class BaseSelectorEventLoop(base_events.BaseEventLoop):
         self.remove_reader(sock.fileno())
         sock.close()
 
+    @coroutine
+    def _sendfile_native(self, transp, file, offset, count):
+        if not isinstance(transp, _SelectorSocketTransport):
+            raise events.SendfileNotAvailableError(
+                "sendfile is not supported by {!r}".format(transp))
+        # Data written before sendfile() must be sent first.
+        yield from transp._make_empty_waiter()
+        try:
+            return (yield from self._sock_sendfile_native(transp._sock, file,
+                                                          offset, count))
+        finally:
+            transp._reset_empty_waiter()
+
+    @coroutine
+    def _sock_sendfile_native(self, sock, file, offset, count):
+        raise events.SendfileNotAvailableError(
+            "sendfile syscall is not supported")
+
 
 class _SelectorTransport(transports._FlowControlMixin,
                          transports.Transport):
@@ -559,6 +577,12 @@ class _SelectorTransport(transports._FlowControlMixin,
     def abort(self):
         self._force_close(None)
 
+    def set_protocol(self, protocol):
+        self._protocol = protocol
+
+    def get_protocol(self):
+        return self._protocol
+
     def is_closing(self):
         return self._closing
 
@@ -633,6 +657,7 @@ class _SelectorSocketTransport(_SelectorTransport):
         super().__init__(loop, sock, protocol, extra, server)
         self._eof = False
         self._paused = False
+        self._empty_waiter = None
 
         self._loop.call_soon(self._protocol.connection_made, self)
         # only start reading when connection_made() has been called
@@ -693,6 +718,8 @@ class _SelectorSocketTransport(_SelectorTransport):
                             'not %r' % type(data).__name__)
         if self._eof:
             raise RuntimeError('Cannot call write() after write_eof()')
+        if self._empty_waiter is not None:
+            raise RuntimeError('unable to write; sendfile is in progress')
         if not data:
             return
 
@@ -735,12 +762,16 @@ class _SelectorSocketTransport(_SelectorTransport):
             self._loop.remove_writer(self._sock_fd)
             self._buffer.clear()
             self._fatal_error(exc, 'Fatal write error on socket transport')
+            if self._empty_waiter is not None:
+                self._empty_waiter.set_exception(exc)
         else:
             if n:
                 del self._buffer[:n]
             self._maybe_resume_protocol()  # May append to buffer.
             if not self._buffer:
                 self._loop.remove_writer(self._sock_fd)
+                if self._empty_waiter is not None:
+                    self._empty_waiter.set_result(None)
                 if self._closing:
                     self._call_connection_lost(None)
                 elif self._eof:
@@ -756,6 +787,23 @@ class _SelectorSocketTransport(_SelectorTransport):
     def can_write_eof(self):
         return True
 
+    def _call_connection_lost(self, exc):
+        super()._call_connection_lost(exc)
+        if self._empty_waiter is not None and not self._empty_waiter.done():
+            self._empty_waiter.set_exception(
+                ConnectionError("Connection is closed by peer"))
+
+    def _make_empty_waiter(self):
+        if self._empty_waiter is not None:
+            raise RuntimeError("Empty waiter is already set")
+        self._empty_waiter = self._loop.create_future()
+        if not self._buffer:
+            self._empty_waiter.set_result(None)
+        return self._empty_waiter
+
+    def _reset_empty_waiter(self):
+        self._empty_waiter = None
+
 
 class _SelectorSslTransport(_SelectorTransport):
 
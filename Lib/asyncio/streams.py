@@ -401,6 +401,22 @@ class StreamReader:
             self._paused = False
             self._transport.resume_reading()
 
+    def _consume(self, n):
+        """Remove the first *n* bytes from the buffer and return them.
+
+        The data is copied only once: a memoryview avoids the intermediate
+        bytearray created by slicing the buffer.
+        """
+        buffer = self._buffer
+        if n >= len(buffer):
+            data = bytes(buffer)
+            buffer.clear()
+        else:
+            with memoryview(buffer) as view:
+                data = bytes(view[:n])
+            del buffer[:n]
+        return data
+
     def feed_eof(self):
         self._eof = True
         self._wakeup_waiter()
@@ -577,10 +593,9 @@ class StreamReader:
             raise LimitOverrunError(
                 'Separator is found, but chunk is longer than limit', isep)
 
-        chunk = self._buffer[:isep + seplen]
-        del self._buffer[:isep + seplen]
+        chunk = self._consume(isep + seplen)
         self._maybe_resume_transport()
-        return bytes(chunk)
+        return chunk
 
     @coroutine
     def read(self, n=-1):
@@ -627,12 +642,46 @@ class StreamReader:
             yield from self._wait_for_data('read')
 
         # This will work right even if buffer is less than n bytes
-        data = bytes(self._buffer[:n])
-        del self._buffer[:n]
+        data = self._consume(n)
 
         self._maybe_resume_transport()
         return data
 
+    @coroutine
+    def readinto(self, buf):
+        """Read up to len(buf) bytes from the stream into `buf`.
+
+        `buf` must be a writable bytes-like object, such as a bytearray,
+        a memoryview or an mmap.  Data is copied directly from the
+        internal buffer into `buf`, so no intermediate bytes objects are
+        created.
+
+        Return the number of bytes read, which may be less than len(buf),
+        but is at least one byte unless len(buf) is zero.  If EOF was
+        received before any byte is read, return 0.
+
+        If stream was paused, this function will automatically resume it if
+        needed.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        with memoryview(buf) as view, view.cast('B') as target:
+            if not target:
+                return 0
+
+            if not self._buffer and not self._eof:
+                yield from self._wait_for_data('readinto')
+
+            n = min(len(target), len(self._buffer))
+            if n:
+                with memoryview(self._buffer) as data:
+                    target[:n] = data[:n]
+                del self._buffer[:n]
+
+        self._maybe_resume_transport()
+        return n
+
     @coroutine
     def readexactly(self, n):
         """Read exactly `n` bytes.
@@ -658,25 +707,22 @@ class StreamReader:
         if n == 0:
             return b''
 
-        # There used to be "optimized" code here.  It created its own
-        # Future and waited until self._buffer had at least the n
-        # bytes, then called read(n).  Unfortunately, this could pause
-        # the transport if the argument was larger than the pause
-        # limit (which is twice self._limit).  So now we just read()
-        # into a local buffer.
-
-        blocks = []
-        while n > 0:
-            block = yield from self.read(n)
-            if not block:
-                partial = b''.join(blocks)
-                raise IncompleteReadError(partial, len(partial) + n)
-            blocks.append(block)
-            n -= len(block)
-
-        assert n == 0
-
-        return b''.join(blocks)
+        # Wait until the internal buffer holds the whole chunk and copy it
+        # out in one go, rather than joining a list of partial reads.
+        # _wait_for_data() resumes a paused transport, so this cannot
+        # deadlock when n is larger than the pause limit (twice
+        # self._limit).
+        while len(self._buffer) < n:
+            if self._eof:
+                incomplete = bytes(self._buffer)
+                self._buffer.clear()
+                raise IncompleteReadError(incomplete, n)
+
+            yield from self._wait_for_data('readexactly')
+
+        data = self._consume(n)
+        self._maybe_resume_transport()
+        return data
 
     if compat.PY35:
         @coroutine
@@ -23,6 +23,14 @@ class BaseTransport:
         """Return True if the transport is closing or closed."""
         raise NotImplementedError
 
+    def set_protocol(self, protocol):
+        """Set a new protocol."""
+        raise NotImplementedError
+
+    def get_protocol(self):
+        """Return the current protocol."""
+        raise NotImplementedError
+
     def close(self):
         """Close the transport.
 
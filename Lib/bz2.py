@@ -10,6 +10,7 @@ __all__ = ["BZ2File", "BZ2Compressor", "BZ2Decompressor",
 __author__ = "Nadeem Vawda <nadeem.vawda@gmail.com>"
 
 from builtins import open as _builtin_open
+import functools
 import io
 import warnings
 import _compression
@@ -28,6 +29,15 @@ _MODE_READ     = 1
 _MODE_WRITE    = 3
 
 
+def _compress_block(compresslevel, data, previous, final):
+    # Each block is compressed into a separate bzip2 stream.  An empty
+    # stream is only needed for an empty file.
+    if not data and previous is not None:
+        return b""
+    comp = BZ2Compressor(compresslevel)
+    return comp.compress(data) + comp.flush()
+
+
 class BZ2File(_compression.BaseStream):
 
     """A file object providing transparent bzip2 (de)compression.
@@ -39,7 +49,8 @@ class BZ2File(_compression.BaseStream):
     returned as bytes, and data to be written should be given as bytes.
     """
 
-    def __init__(self, filename, mode="r", buffering=None, compresslevel=9):
+    def __init__(self, filename, mode="r", buffering=None, compresslevel=9, *,
+                 threads=1, index=None):
         """Open a bzip2-compressed file.
 
         If filename is a str or bytes object, it gives the name
@@ -56,8 +67,19 @@ class BZ2File(_compression.BaseStream):
         and 9 specifying the level of compression: 1 produces the least
         compression, and 9 (default) produces the most compression.
 
+        If mode is 'w', 'x' or 'a', threads gives the number of threads
+        compressing the data; 0 means the number of CPUs.  With more than
+        one thread, the data is split into blocks of compresslevel * 100 kB
+        compressed concurrently, into a concatenation of bzip2 streams.
+        The default is 1, compressing the data in the calling thread.
+
         If mode is 'r', the input file may be the concatenation of
-        multiple compressed streams.
+        multiple compressed streams.  index makes seeking faster in such
+        a file, if it is seekable: the offsets of the streams are saved
+        every 1 MiB of data while reading, so that seek() can resume the
+        decompression from the closest saved stream instead of the start
+        of the file.  It can be True to build a new index, or the name of
+        a file (or a binary file object) written by save_index() to load.
         """
         # This lock must be recursive, so that BufferedIOBase's
         # writelines() does not deadlock.
@@ -65,6 +87,7 @@ class BZ2File(_compression.BaseStream):
         self._fp = None
         self._closefp = False
         self._mode = _MODE_CLOSED
+        self._index = None
 
         if buffering is not None:
             warnings.warn("Use of 'buffering' argument is deprecated",
@@ -74,23 +97,37 @@ class BZ2File(_compression.BaseStream):
             raise ValueError("compresslevel must be between 1 and 9")
 
         if mode in ("", "r", "rb"):
+            if threads != 1:
+                raise ValueError("Cannot specify threads when opening a "
+                                 "file for reading")
             mode = "rb"
             mode_code = _MODE_READ
+            self._index = _compression.open_index(index, "bz2")
         elif mode in ("w", "wb"):
             mode = "wb"
             mode_code = _MODE_WRITE
-            self._compressor = BZ2Compressor(compresslevel)
         elif mode in ("x", "xb"):
             mode = "xb"
             mode_code = _MODE_WRITE
-            self._compressor = BZ2Compressor(compresslevel)
         elif mode in ("a", "ab"):
             mode = "ab"
             mode_code = _MODE_WRITE
-            self._compressor = BZ2Compressor(compresslevel)
         else:
             raise ValueError("Invalid mode: %r" % (mode,))
 
+        if mode_code == _MODE_WRITE and index is not None:
+            raise ValueError("Cannot specify index when opening a "
+                             "file for writing")
+
+        if mode_code == _MODE_WRITE:
+            if threads == 1:
+                self._compressor = BZ2Compressor(compresslevel)
+            else:
+                # One bzip2 block per stream
+                self._compressor = _compression.ParallelCompressor(
+                    functools.partial(_compress_block, compresslevel),
+                    threads, compresslevel * 100000)
+
         if isinstance(filename, (str, bytes)):
             self._fp = _builtin_open(filename, mode)
             self._closefp = True
@@ -102,8 +139,11 @@ class BZ2File(_compression.BaseStream):
             raise TypeError("filename must be a str or bytes object, or a file")
 
         if self._mode == _MODE_READ:
+            if self._index is not None and not self._fp.seekable():
+                raise io.UnsupportedOperation("The underlying file object "
+                                              "does not support seeking")
             raw = _compression.DecompressReader(self._fp,
-                BZ2Decompressor, trailing_error=OSError)
+                BZ2Decompressor, trailing_error=OSError, index=self._index)
             self._buffer = io.BufferedReader(raw)
         else:
             self._pos = 0
@@ -147,6 +187,18 @@ class BZ2File(_compression.BaseStream):
         """Return whether the file supports seeking."""
         return self.readable() and self._buffer.seekable()
 
+    def save_index(self, file):
+        """Write the seek points of the index built so far to file, a file
+        name or a binary file object.
+
+        Seeking to the end of the file first completes the index.
+        """
+        with self._lock:
+            self._check_not_closed()
+            if self._index is None:
+                raise ValueError("File was not opened with an index")
+            self._index.save(file)
+
     def readable(self):
         """Return whether the file was opened for reading."""
         self._check_not_closed()
@@ -286,7 +338,8 @@ class BZ2File(_compression.BaseStream):
 
 
 def open(filename, mode="rb", compresslevel=9,
-         encoding=None, errors=None, newline=None):
+         encoding=None, errors=None, newline=None, *, threads=1,
+         index=None):
     """Open a bzip2-compressed file in binary or text mode.
 
     The filename argument can be an actual filename (a str or bytes
@@ -297,8 +350,9 @@ def open(filename, mode="rb", compresslevel=9,
     The default mode is "rb", and the default compresslevel is 9.
 
     For binary mode, this function is equivalent to the BZ2File
-    constructor: BZ2File(filename, mode, compresslevel). In this case,
-    the encoding, errors and newline arguments must not be provided.
+    constructor: BZ2File(filename, mode, compresslevel, threads=threads,
+    index=index).  In this case, the encoding, errors and newline arguments
+    must not be provided.
 
     For text mode, a BZ2File object is created, and wrapped in an
     io.TextIOWrapper instance with the specified encoding, error
@@ -317,7 +371,8 @@ def open(filename, mode="rb", compresslevel=9,
             raise ValueError("Argument 'newline' not supported in binary mode")
 
     bz_mode = mode.replace("t", "")
-    binary_file = BZ2File(filename, bz_mode, compresslevel=compresslevel)
+    binary_file = BZ2File(filename, bz_mode, compresslevel=compresslevel,
+                          threads=threads, index=index)
 
     if "t" in mode:
         return io.TextIOWrapper(binary_file, encoding, errors, newline)
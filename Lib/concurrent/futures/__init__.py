@@ -15,4 +15,5 @@ from concurrent.futures._base import (FIRST_COMPLETED,
                                       wait,
                                       as_completed)
 from concurrent.futures.process import ProcessPoolExecutor
-from concurrent.futures.thread import ThreadPoolExecutor
+from concurrent.futures.thread import (ThreadPoolExecutor,
+                                       WorkStealingThreadPoolExecutor)
@@ -4,6 +4,7 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import collections
+import itertools
 import logging
 import threading
 import time
@@ -41,6 +42,10 @@ _STATE_TO_DESCRIPTION_MAP = {
 # Logger for internal use by the futures package.
 LOGGER = logging.getLogger("concurrent.futures")
 
+# Number of calls queued at once by the submit_many() methods of the
+# executors
+_SUBMIT_BATCH_SIZE = 1024
+
 class Error(Exception):
     """Base class for all future-related exceptions."""
     pass
@@ -520,7 +525,20 @@ class Executor(object):
         """
         raise NotImplementedError()
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def submit_many(self, fn, iterable):
+        """Submits a callable to be executed with each of the given arguments.
+
+        Schedules the callable to be executed as fn(*args) for each args of
+        iterable, at once, and returns a list of Future instances in the same
+        order.  Executors can make this cheaper than repeated calls to
+        submit().
+
+        Returns:
+            A list of Futures representing the given calls.
+        """
+        return [self.submit(fn, *args) for args in iterable]
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -532,6 +550,10 @@ class Executor(object):
                 before being passed to a child process. This argument is only
                 used by ProcessPoolExecutor; it is ignored by
                 ThreadPoolExecutor.
+            buffersize: The maximum number of calls submitted ahead of the
+                results yielded. If None, all the calls are submitted at
+                once. Otherwise the iterables are consumed lazily and the
+                calls are submitted in batches, as the results are yielded.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -542,20 +564,37 @@ class Executor(object):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if buffersize is not None and buffersize < 1:
+            raise ValueError("buffersize must be >= 1.")
+
         if timeout is not None:
             end_time = timeout + time.time()
 
-        fs = [self.submit(fn, *args) for args in zip(*iterables)]
+        args_iter = zip(*iterables)
+        if buffersize is None:
+            fs = collections.deque(self.submit_many(fn, args_iter))
+        else:
+            fs = collections.deque(
+                self.submit_many(fn, itertools.islice(args_iter, buffersize)))
+            # Refill the buffer once half of it is consumed, so that the
+            # calls are submitted in batches.
+            low_water = buffersize // 2
 
         # Yield must be hidden in closure so that the futures are submitted
         # before the first iterator value is required.
         def result_iterator():
             try:
-                for future in fs:
+                while fs:
+                    future = fs.popleft()
+                    if buffersize is not None and len(fs) <= low_water:
+                        fs.extend(self.submit_many(
+                            fn,
+                            itertools.islice(args_iter, buffersize - len(fs))))
                     if timeout is None:
                         yield future.result()
                     else:
                         yield future.result(end_time - time.time())
+                    del future
             finally:
                 for future in fs:
                     future.cancel()
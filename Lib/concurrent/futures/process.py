@@ -45,15 +45,19 @@ Process #1..n:
 
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
+import array
 import atexit
+import bisect
 import os
 from concurrent.futures import _base
 import queue
 from queue import Full
 import multiprocessing
 from multiprocessing import SimpleQueue
+from multiprocessing import heap
 from multiprocessing.connection import wait
 import threading
+import time
 import weakref
 from functools import partial
 import itertools
@@ -91,6 +95,12 @@ def _python_exit():
 # (Futures in the call queue cannot be cancelled).
 EXTRA_QUEUED_CALLS = 1
 
+# Buffers smaller than this are pickled along with the rest of the calls and
+# results, even if the executor has some shared memory: below a few hundred
+# kilobytes, copying through a pipe is faster than managing arena blocks
+# (see Tools/ccbench/bufferbench.py).
+SHARED_MEMORY_THRESHOLD = 256 * 1024
+
 # Hack to embed stringification of remote traceback in local traceback
 
 class _RemoteTraceback(Exception):
@@ -120,17 +130,266 @@ class _WorkItem(object):
         self.kwargs = kwargs
 
 class _ResultItem(object):
-    def __init__(self, work_id, exception=None, result=None):
+    def __init__(self, work_id, exception=None, result=None, arena_id=None,
+                 exit_pid=None):
         self.work_id = work_id
         self.exception = exception
         self.result = result
+        # The id of the worker arena holding the shared buffers of the
+        # result, if any.
+        self.arena_id = arena_id
+        # The pid of the worker if it exits after this call.
+        self.exit_pid = exit_pid
 
 class _CallItem(object):
-    def __init__(self, work_id, fn, args, kwargs):
+    def __init__(self, work_id, fn, args, kwargs, shared=False):
         self.work_id = work_id
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
+        # Whether some of the arguments are held in shared memory.
+        self.shared = shared
+
+# Out-of-band transport of large buffers through shared memory
+
+class _SharedBuffer(object):
+    """Stands for a buffer held in a shared memory arena while the call or
+    the result it belongs to is pickled."""
+    def __init__(self, start, size, kind, meta):
+        self.start = start
+        self.size = size
+        self.kind = kind
+        self.meta = meta
+
+    def rebuild(self, buffer, copy):
+        view = memoryview(buffer)[self.start:self.start + self.size]
+        if self.kind is memoryview:
+            if copy:
+                view = memoryview(bytes(view))
+            format, shape = self.meta
+            if format != 'B' or len(shape) != 1:
+                view = view.cast(format, shape)
+            return view
+        if self.kind is array.array:
+            obj = array.array(self.meta)
+            obj.frombytes(view)
+            return obj
+        return self.kind(view)
+
+def _buffer_data(obj):
+    """Returns (kind, meta, view) for the buffers that can be shared, where
+    view is a flat memoryview of the bytes of obj, or None."""
+    kind = type(obj)
+    if kind is bytes or kind is bytearray:
+        meta = None
+    elif kind is array.array:
+        meta = obj.typecode
+    elif kind is memoryview and obj.c_contiguous and obj.ndim:
+        meta = (obj.format, obj.shape)
+        try:
+            obj.cast('B').cast(*meta)
+        except (TypeError, ValueError):
+            # Not a native format
+            return None
+    else:
+        return None
+    view = memoryview(obj)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return kind, meta, view
+
+def _map_buffers(obj, func, memo=None):
+    """Applies func to obj or, recursively, to the items of the tuples and
+    lists obj is made of.  Containers are only rebuilt when some of their
+    items changed, and a container met several times is mapped once.
+    Raises ValueError if the containers refer to themselves, as they can't
+    be rebuilt."""
+    kind = type(obj)
+    if kind is tuple or kind is list:
+        if memo is None:
+            memo = {}
+        key = id(obj)
+        if key in memo:
+            new = memo[key]
+            if new is None:
+                raise ValueError('recursive container')
+            return new
+        # None marks the containers being mapped
+        memo[key] = None
+        items = [_map_buffers(item, func, memo) for item in obj]
+        new = obj
+        for item, old in zip(items, obj):
+            if item is not old:
+                new = kind(items)
+                break
+        memo[key] = new
+        return new
+    return func(obj)
+
+def _map_call_buffers(args, kwargs, func):
+    memo = {}
+    args = _map_buffers(args, func, memo)
+    if kwargs:
+        kwargs = {key: _map_buffers(value, func, memo)
+                  for key, value in kwargs.items()}
+    return args, kwargs
+
+class _ArenaHeap(heap.Heap):
+    """A multiprocessing heap confined to a single arena, allocated before
+    the workers are started so that they can inherit it."""
+    def __init__(self, arena):
+        super().__init__(arena.size)
+        self._arenas.append(arena)
+        self._free((arena, 0, arena.size))
+
+    def _malloc(self, size):
+        if bisect.bisect_left(self._lengths, size) == len(self._lengths):
+            raise MemoryError('shared memory arena is full')
+        return super()._malloc(size)
+
+class _WorkerMemory(object):
+    """The shared memory a worker process is given.
+
+    The call arena is written by the executor and holds the large buffers of
+    the arguments.  The result arena belongs to the worker, which locks it
+    while the executor copies the buffers of a result out of it.
+    """
+    def __init__(self, ident, threshold, call_arena, result_arena, lock):
+        self.ident = ident
+        self.threshold = threshold
+        self.call_arena = call_arena
+        self.result_arena = result_arena
+        self.lock = lock
+
+    def import_call(self, args, kwargs):
+        buffer = self.call_arena.buffer
+        def rebuild(obj):
+            if type(obj) is _SharedBuffer:
+                # memoryviews are handed out without a copy: they are only
+                # valid until the call returns.
+                return obj.rebuild(buffer, copy=False)
+            return obj
+        return _map_call_buffers(args, kwargs, rebuild)
+
+    def export_result(self, result):
+        """Returns (result, shared) where shared tells if some buffers of
+        result were moved to the result arena."""
+        view = None
+        offset = 0
+        def export(obj):
+            nonlocal view, offset
+            data = _buffer_data(obj)
+            if data is None:
+                return obj
+            kind, meta, data = data
+            size = data.nbytes
+            if size < self.threshold or offset + size > self.result_arena.size:
+                return obj
+            if view is None:
+                # The previous result may not have been copied out yet,
+                # don't wait for it.
+                if not self.lock.acquire(False):
+                    return obj
+                view = memoryview(self.result_arena.buffer)
+            start = offset
+            view[start:start + size] = data
+            offset = heap.Heap._roundup(start + size, heap.Heap._alignment)
+            return _SharedBuffer(start, size, kind, meta)
+        try:
+            shared = _map_buffers(result, export)
+        except (ValueError, RecursionError):
+            # Recursive or too deeply nested: leave it to pickle
+            if view is not None:
+                self.lock.release()
+            return result, False
+        return shared, view is not None
+
+class _SharedMemory(object):
+    """The shared memory through which a ProcessPoolExecutor passes the
+    large buffers of the calls and of their results.
+
+    The executor copies the arguments into blocks of the call arena, which
+    the workers inherit, and frees them once the result of the call is
+    back.  Each worker copies the buffers of its results into an arena of
+    its own, and the executor copies them out on arrival.
+    """
+    def __init__(self, size, threshold, max_workers):
+        self.threshold = threshold
+        self.call_arena = heap.Arena(size)
+        self._heap = _ArenaHeap(self.call_arena)
+        self._result_size = max(size // max_workers, threshold)
+        self._call_blocks = {}
+        # The worker memories are registered before the workers start, as
+        # their results may come back before their pid is known.
+        self._worker_ids = itertools.count()
+        self._workers = {}
+        self._worker_pids = {}
+
+    def new_worker(self):
+        worker = _WorkerMemory(next(self._worker_ids), self.threshold,
+                               self.call_arena, heap.Arena(self._result_size),
+                               multiprocessing.BoundedSemaphore(1))
+        self._workers[worker.ident] = worker
+        return worker
+
+    def add_worker(self, pid, worker):
+        self._worker_pids[pid] = worker.ident
+
+    def remove_worker(self, pid):
+        del self._workers[self._worker_pids.pop(pid)]
+
+    def export_call(self, work_id, args, kwargs):
+        """Returns (args, kwargs, shared) where shared tells if some buffers
+        of args and kwargs were moved to the call arena."""
+        buffer = self.call_arena.buffer
+        blocks = []
+        def export(obj):
+            data = _buffer_data(obj)
+            if data is None:
+                return obj
+            kind, meta, data = data
+            size = data.nbytes
+            if size < self.threshold:
+                return obj
+            try:
+                block = self._heap.malloc(size)
+            except MemoryError:
+                # Let it go through the pipe
+                return obj
+            blocks.append(block)
+            _, start, _ = block
+            memoryview(buffer)[start:start + size] = data
+            return _SharedBuffer(start, size, kind, meta)
+        try:
+            args, kwargs = _map_call_buffers(args, kwargs, export)
+        except (ValueError, RecursionError):
+            # Recursive or too deeply nested: leave them to pickle
+            for block in blocks:
+                self._heap.free(block)
+            return args, kwargs, False
+        except BaseException:
+            for block in blocks:
+                self._heap.free(block)
+            raise
+        if blocks:
+            self._call_blocks[work_id] = blocks
+        return args, kwargs, bool(blocks)
+
+    def release_call(self, work_id):
+        for block in self._call_blocks.pop(work_id, ()):
+            self._heap.free(block)
+
+    def import_result(self, arena_id, result):
+        worker = self._workers[arena_id]
+        buffer = worker.result_arena.buffer
+        def rebuild(obj):
+            if type(obj) is _SharedBuffer:
+                return obj.rebuild(buffer, copy=True)
+            return obj
+        try:
+            return _map_buffers(result, rebuild)
+        finally:
+            worker.lock.release()
 
 def _get_chunks(*iterables, chunksize):
     """ Iterates over zip()ed iterables in chunks. """
@@ -152,7 +411,8 @@ def _process_chunk(fn, chunk):
     """
     return [fn(*args) for args in chunk]
 
-def _process_worker(call_queue, result_queue):
+def _process_worker(call_queue, result_queue, shared_memory=None,
+                    max_tasks=None):
     """Evaluates calls from call_queue and places the results in result_queue.
 
     This worker is run in a separate process.
@@ -162,27 +422,48 @@ def _process_worker(call_queue, result_queue):
             evaluated by the worker.
         result_queue: A multiprocessing.Queue of _ResultItems that will written
             to by the worker.
-        shutdown: A multiprocessing.Event that will be set as a signal to the
-            worker that it should exit when call_queue is empty.
+        shared_memory: A _WorkerMemory through which large buffers are
+            received and sent, or None.
+        max_tasks: The number of calls after which the worker exits, or
+            None.
     """
+    exit_pid = None
     while True:
         call_item = call_queue.get(block=True)
         if call_item is None:
             # Wake up queue management thread
             result_queue.put(os.getpid())
             return
+        if max_tasks is not None:
+            max_tasks -= 1
+            if not max_tasks:
+                exit_pid = os.getpid()
+        args, kwargs = call_item.args, call_item.kwargs
+        if call_item.shared:
+            args, kwargs = shared_memory.import_call(args, kwargs)
         try:
-            r = call_item.fn(*call_item.args, **call_item.kwargs)
+            r = call_item.fn(*args, **kwargs)
         except BaseException as e:
             exc = _ExceptionWithTraceback(e, e.__traceback__)
-            result_queue.put(_ResultItem(call_item.work_id, exception=exc))
+            result_queue.put(_ResultItem(call_item.work_id, exception=exc,
+                                         exit_pid=exit_pid))
         else:
+            arena_id = None
+            if shared_memory is not None:
+                r, shared = shared_memory.export_result(r)
+                if shared:
+                    arena_id = shared_memory.ident
             result_queue.put(_ResultItem(call_item.work_id,
-                                         result=r))
+                                         result=r,
+                                         arena_id=arena_id,
+                                         exit_pid=exit_pid))
+        if exit_pid is not None:
+            return
 
 def _add_call_item_to_queue(pending_work_items,
                             work_ids,
-                            call_queue):
+                            call_queue,
+                            shared_memory=None):
     """Fills call_queue with _WorkItems from pending_work_items.
 
     This function never blocks.
@@ -196,6 +477,7 @@ def _add_call_item_to_queue(pending_work_items,
             call_queue.
         call_queue: A multiprocessing.Queue that will be filled with _CallItems
             derived from _WorkItems.
+        shared_memory: The _SharedMemory of the executor, or None.
     """
     while True:
         if call_queue.full():
@@ -208,10 +490,20 @@ def _add_call_item_to_queue(pending_work_items,
             work_item = pending_work_items[work_id]
 
             if work_item.future.set_running_or_notify_cancel():
+                args, kwargs, shared = work_item.args, work_item.kwargs, False
+                if shared_memory is not None:
+                    try:
+                        args, kwargs, shared = shared_memory.export_call(
+                            work_id, args, kwargs)
+                    except BaseException as e:
+                        del pending_work_items[work_id]
+                        work_item.future.set_exception(e)
+                        continue
                 call_queue.put(_CallItem(work_id,
                                          work_item.fn,
-                                         work_item.args,
-                                         work_item.kwargs),
+                                         args,
+                                         kwargs,
+                                         shared),
                                block=True)
             else:
                 del pending_work_items[work_id]
@@ -222,7 +514,10 @@ def _queue_management_worker(executor_reference,
                              pending_work_items,
                              work_ids_queue,
                              call_queue,
-                             result_queue):
+                             result_queue,
+                             shared_memory=None,
+                             min_workers=0,
+                             idle_timeout=None):
     """Manages the communication between this process and the worker processes.
 
     This function is run in a local thread.
@@ -240,6 +535,11 @@ def _queue_management_worker(executor_reference,
             derived from _WorkItems for processing by the process workers.
         result_queue: A multiprocessing.Queue of _ResultItems generated by the
             process workers.
+        shared_memory: The _SharedMemory through which large buffers are
+            exchanged with the workers, or None.
+        min_workers: The number of workers never retired for being idle.
+        idle_timeout: The number of seconds after which the workers that
+            were not needed are retired, or None.
     """
     executor = None
 
@@ -258,19 +558,38 @@ def _queue_management_worker(executor_reference,
         for p in processes.values():
             p.join()
 
+    def remove_worker(pid):
+        p = processes.pop(pid)
+        p.join()
+        if shared_memory is not None:
+            shared_memory.remove_worker(pid)
+
     reader = result_queue._reader
+    # Number of workers asked to exit because they were idle
+    retiring = 0
+    if idle_timeout is not None:
+        # Largest number of calls given to the workers since the last check
+        max_in_flight = 0
+        next_idle_check = time.monotonic() + idle_timeout
 
     while True:
         _add_call_item_to_queue(pending_work_items,
                                 work_ids_queue,
-                                call_queue)
-
-        sentinels = [p.sentinel for p in processes.values()]
-        assert sentinels
-        ready = wait([reader] + sentinels)
+                                call_queue,
+                                shared_memory)
+
+        timeout = None
+        if idle_timeout is not None:
+            in_flight = len(pending_work_items) - work_ids_queue.qsize()
+            max_in_flight = max(max_in_flight, in_flight)
+            timeout = max(next_idle_check - time.monotonic(), 0)
+        # Workers may be spawned by submit() while we are waiting: it wakes
+        # us up so that their sentinels are watched from the next round.
+        sentinels = [p.sentinel for p in list(processes.values())]
+        ready = wait([reader] + sentinels, timeout)
         if reader in ready:
             result_item = reader.recv()
-        else:
+        elif ready:
             # Mark the process pool broken so that submits fail right now.
             executor = executor_reference()
             if executor is not None:
@@ -294,16 +613,31 @@ def _queue_management_worker(executor_reference,
                 p.terminate()
             shutdown_worker()
             return
+        else:
+            # Time to look for idle workers
+            result_item = None
+        executor = executor_reference()
+        worker_exited = False
         if isinstance(result_item, int):
             # Clean shutdown of a worker using its PID
             # (avoids marking the executor broken)
-            assert shutting_down()
-            p = processes.pop(result_item)
-            p.join()
-            if not processes:
+            remove_worker(result_item)
+            worker_exited = True
+            if retiring:
+                retiring -= 1
+            if not processes and shutting_down():
                 shutdown_worker()
                 return
         elif result_item is not None:
+            if shared_memory is not None:
+                shared_memory.release_call(result_item.work_id)
+                if result_item.arena_id is not None:
+                    result_item.result = shared_memory.import_result(
+                        result_item.arena_id, result_item.result)
+            if result_item.exit_pid is not None:
+                # The worker completed its max_tasks_per_child calls
+                remove_worker(result_item.exit_pid)
+                worker_exited = True
             work_item = pending_work_items.pop(result_item.work_id, None)
             # work_item can be None if another process terminated (see above)
             if work_item is not None:
@@ -314,7 +648,6 @@ def _queue_management_worker(executor_reference,
                 # Delete references to object. See issue16284
                 del work_item
         # Check whether we should start shutting down.
-        executor = executor_reference()
         # No more work items can be added if:
         #   - The interpreter is shutting down OR
         #   - The executor that owns this worker has been collected OR
@@ -330,6 +663,22 @@ def _queue_management_worker(executor_reference,
                 # This is not a problem: we will eventually be woken up (in
                 # result_queue.get()) and be able to send a sentinel again.
                 pass
+        elif worker_exited:
+            # Replace the worker if some calls are waiting for one.
+            executor._adjust_process_count()
+        if idle_timeout is not None and time.monotonic() >= next_idle_check:
+            if not shutting_down():
+                # Retire the workers which were not needed at all during
+                # the last idle_timeout seconds.
+                needed = max(max_in_flight, min_workers)
+                for _ in range(len(processes) - retiring - needed):
+                    try:
+                        call_queue.put_nowait(None)
+                    except Full:
+                        break
+                    retiring += 1
+            max_in_flight = 0
+            next_idle_check = time.monotonic() + idle_timeout
         executor = None
 
 _system_limits_checked = False
@@ -365,13 +714,32 @@ class BrokenProcessPool(RuntimeError):
 
 
 class ProcessPoolExecutor(_base.Executor):
-    def __init__(self, max_workers=None):
+    def __init__(self, max_workers=None, *, min_workers=0, idle_timeout=None,
+                 max_tasks_per_child=None, shared_memory_size=0,
+                 shared_memory_threshold=SHARED_MEMORY_THRESHOLD):
         """Initializes a new ProcessPoolExecutor instance.
 
         Args:
             max_workers: The maximum number of processes that can be used to
                 execute the given calls. If None or not given then as many
                 worker processes will be created as the machine has processors.
+                The processes are started on demand.
+            min_workers: The number of processes started with the first
+                call and kept alive when idle.
+            idle_timeout: The number of seconds after which the processes
+                beyond min_workers that were not needed exit. If None, they
+                are kept until shutdown.
+            max_tasks_per_child: The number of calls after which a process
+                exits, to be replaced by a fresh one when needed. If None,
+                processes live as long as the executor.
+            shared_memory_size: The size in bytes of the shared memory arena
+                through which the large buffers of the arguments are passed
+                to the workers instead of being pickled. As much memory
+                again is split between the workers for the buffers of the
+                results. If 0, everything is pickled.
+            shared_memory_threshold: The minimum size in bytes of the bytes,
+                bytearray, array.array and memoryview objects passed through
+                shared memory.
         """
         _check_system_limits()
 
@@ -383,6 +751,27 @@ class ProcessPoolExecutor(_base.Executor):
 
             self._max_workers = max_workers
 
+        if not 0 <= min_workers <= self._max_workers:
+            raise ValueError("min_workers must be between 0 and max_workers")
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be greater than 0")
+        if max_tasks_per_child is not None and max_tasks_per_child < 1:
+            raise ValueError("max_tasks_per_child must be >= 1")
+        self._min_workers = min_workers
+        self._idle_timeout = idle_timeout
+        self._max_tasks_per_child = max_tasks_per_child
+
+        if shared_memory_size < 0:
+            raise ValueError("shared_memory_size must be >= 0")
+        if shared_memory_threshold < 1:
+            raise ValueError("shared_memory_threshold must be >= 1")
+        if shared_memory_size:
+            self._shared_memory = _SharedMemory(shared_memory_size,
+                                                shared_memory_threshold,
+                                                self._max_workers)
+        else:
+            self._shared_memory = None
+
         # Make the call queue slightly larger than the number of processes to
         # prevent the worker processes from idling. But don't make it too big
         # because futures in the call queue cannot be cancelled.
@@ -397,6 +786,9 @@ class ProcessPoolExecutor(_base.Executor):
         self._queue_management_thread = None
         # Map of pids to processes
         self._processes = {}
+        # Serializes the spawning of processes by submit() and the queue
+        # management thread.
+        self._processes_lock = threading.Lock()
 
         # Shutdown is a two-step process.
         self._shutdown_thread = False
@@ -411,8 +803,6 @@ class ProcessPoolExecutor(_base.Executor):
         def weakref_cb(_, q=self._result_queue):
             q.put(None)
         if self._queue_management_thread is None:
-            # Start the processes so that their sentinels are known.
-            self._adjust_process_count()
             self._queue_management_thread = threading.Thread(
                     target=_queue_management_worker,
                     args=(weakref.ref(self, weakref_cb),
@@ -420,19 +810,39 @@ class ProcessPoolExecutor(_base.Executor):
                           self._pending_work_items,
                           self._work_ids,
                           self._call_queue,
-                          self._result_queue))
+                          self._result_queue,
+                          self._shared_memory,
+                          self._min_workers,
+                          self._idle_timeout))
             self._queue_management_thread.daemon = True
             self._queue_management_thread.start()
             _threads_queues[self._queue_management_thread] = self._result_queue
 
     def _adjust_process_count(self):
-        for _ in range(len(self._processes), self._max_workers):
-            p = multiprocessing.Process(
-                    target=_process_worker,
-                    args=(self._call_queue,
-                          self._result_queue))
-            p.start()
-            self._processes[p.pid] = p
+        # Processes are started on demand, one for each pending call, and
+        # there are always at least min_workers of them.
+        with self._processes_lock:
+            if self._shutdown_thread:
+                return
+            wanted = min(len(self._pending_work_items), self._max_workers)
+            for _ in range(len(self._processes),
+                           max(wanted, self._min_workers)):
+                self._spawn_process()
+
+    def _spawn_process(self):
+        worker_memory = None
+        if self._shared_memory is not None:
+            worker_memory = self._shared_memory.new_worker()
+        p = multiprocessing.Process(
+                target=_process_worker,
+                args=(self._call_queue,
+                      self._result_queue,
+                      worker_memory,
+                      self._max_tasks_per_child))
+        p.start()
+        self._processes[p.pid] = p
+        if worker_memory is not None:
+            self._shared_memory.add_worker(p.pid, worker_memory)
 
     def submit(self, fn, *args, **kwargs):
         with self._shutdown_lock:
@@ -448,14 +858,51 @@ class ProcessPoolExecutor(_base.Executor):
             self._pending_work_items[self._queue_count] = w
             self._work_ids.put(self._queue_count)
             self._queue_count += 1
+            # Start the processes before waking up the queue management
+            # thread, so that it watches their sentinels.
+            self._adjust_process_count()
+            self._start_queue_management_thread()
             # Wake up queue management thread
             self._result_queue.put(None)
-
-            self._start_queue_management_thread()
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def submit_many(self, fn, iterable):
+        if type(self).submit is not ProcessPoolExecutor.submit:
+            # A subclass overriding submit() expects to see every call
+            return super().submit_many(fn, iterable)
+        fs = []
+        iterator = iter(iterable)
+        while True:
+            # The arguments are taken by batches, out of the lock since
+            # the iterable may run arbitrary code, and without consuming
+            # a lazy iterable up front
+            batch = list(itertools.islice(iterator, _base._SUBMIT_BATCH_SIZE))
+            with self._shutdown_lock:
+                if self._broken:
+                    raise BrokenProcessPool('A child process terminated '
+                        'abruptly, the process pool is not usable anymore')
+                if self._shutdown_thread:
+                    raise RuntimeError(
+                        'cannot schedule new futures after shutdown')
+
+                for args in batch:
+                    f = _base.Future()
+                    self._pending_work_items[self._queue_count] = _WorkItem(
+                        f, fn, args, {})
+                    self._work_ids.put(self._queue_count)
+                    self._queue_count += 1
+                    fs.append(f)
+                if batch:
+                    self._adjust_process_count()
+                    self._start_queue_management_thread()
+                    # Wake up queue management thread, once for the batch
+                    self._result_queue.put(None)
+            if len(batch) < _base._SUBMIT_BATCH_SIZE:
+                return fs
+    submit_many.__doc__ = _base.Executor.submit_many.__doc__
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -466,6 +913,9 @@ class ProcessPoolExecutor(_base.Executor):
             chunksize: If greater than one, the iterables will be chopped into
                 chunks of size chunksize and submitted to the process pool.
                 If set to one, the items in the list will be sent one at a time.
+            buffersize: The maximum number of items submitted ahead of the
+                results yielded, rounded up to a multiple of chunksize. If
+                None, all the items are submitted at once.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -478,10 +928,15 @@ class ProcessPoolExecutor(_base.Executor):
         """
         if chunksize < 1:
             raise ValueError("chunksize must be >= 1.")
+        if buffersize is not None:
+            if buffersize < 1:
+                raise ValueError("buffersize must be >= 1.")
+            # Count chunks rather than items
+            buffersize = -(-buffersize // chunksize)
 
         results = super().map(partial(_process_chunk, fn),
                               _get_chunks(*iterables, chunksize=chunksize),
-                              timeout=timeout)
+                              timeout=timeout, buffersize=buffersize)
         return itertools.chain.from_iterable(results)
 
     def shutdown(self, wait=True):
@@ -494,10 +949,12 @@ class ProcessPoolExecutor(_base.Executor):
                 self._queue_management_thread.join()
         # To reduce the risk of opening too many files, remove references to
         # objects that use file descriptors.
-        self._queue_management_thread = None
-        self._call_queue = None
-        self._result_queue = None
-        self._processes = None
+        with self._processes_lock:
+            self._queue_management_thread = None
+            self._call_queue = None
+            self._result_queue = None
+            self._processes = None
+            self._shared_memory = None
     shutdown.__doc__ = _base.Executor.shutdown.__doc__
 
 atexit.register(_python_exit)
@@ -6,7 +6,9 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import atexit
+import collections
 from concurrent.futures import _base
+import itertools
 import queue
 import threading
 import weakref
@@ -80,6 +82,92 @@ def _worker(executor_reference, work_queue):
     except BaseException:
         _base.LOGGER.critical('Exception in worker', exc_info=True)
 
+class _WorkStealingQueue(object):
+    """A work queue made of a deque per worker thread.
+
+    Workers push the items they submit at the end of their own deque and pop
+    them back from there, so that related work runs on the same thread.  The
+    items submitted by other threads go to a shared deque.  Workers whose
+    deque is empty take the oldest items of the shared deque, then of the
+    other workers' deques.  Deque operations being atomic, the lock is only
+    taken to wake up idle workers.
+
+    put(None) tells the workers to exit: get() returns None once all the
+    deques are empty.
+    """
+
+    def __init__(self):
+        self._shared = collections.deque()
+        self._deques = []
+        self._local = threading.local()
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = 0
+        self._stopped = False
+
+    def is_worker_thread(self):
+        return hasattr(self._local, 'deque')
+
+    def idle_workers(self):
+        return self._idle
+
+    def put(self, item):
+        if item is None:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+            return
+        local = getattr(self._local, 'deque', None)
+        if local is not None:
+            local.append(item)
+        else:
+            self._shared.append(item)
+        if self._idle:
+            with self._cond:
+                self._cond.notify()
+
+    def get(self, block=True):
+        try:
+            local = self._local.deque
+        except AttributeError:
+            local = self._local.deque = collections.deque()
+            with self._cond:
+                self._local.index = len(self._deques)
+                # Copy, so that _steal() can iterate without the lock
+                self._deques = self._deques + [local]
+        try:
+            return local.pop()
+        except IndexError:
+            pass
+        item = self._steal()
+        if item is not None:
+            return item
+        with self._cond:
+            self._idle += 1
+            try:
+                while True:
+                    # The items put before we got idle are visible now
+                    item = self._steal()
+                    if item is not None or self._stopped:
+                        return item
+                    self._cond.wait()
+            finally:
+                self._idle -= 1
+
+    def _steal(self):
+        try:
+            return self._shared.popleft()
+        except IndexError:
+            pass
+        deques = self._deques
+        # Start after our own deque, to spread the thefts
+        start = self._local.index + 1
+        for victim in deques[start:] + deques[:start]:
+            try:
+                return victim.popleft()
+            except IndexError:
+                pass
+        return None
+
 class ThreadPoolExecutor(_base.Executor):
     def __init__(self, max_workers=None):
         """Initializes a new ThreadPoolExecutor instance.
@@ -114,6 +202,32 @@ class ThreadPoolExecutor(_base.Executor):
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
+    def submit_many(self, fn, iterable):
+        if type(self).submit is not ThreadPoolExecutor.submit:
+            # A subclass overriding submit() expects to see every call
+            return super().submit_many(fn, iterable)
+        fs = []
+        iterator = iter(iterable)
+        while True:
+            # The arguments are taken by batches, out of the lock since
+            # the iterable may run arbitrary code, and without consuming
+            # a lazy iterable up front
+            batch = list(itertools.islice(iterator, _base._SUBMIT_BATCH_SIZE))
+            with self._shutdown_lock:
+                if self._shutdown:
+                    raise RuntimeError(
+                        'cannot schedule new futures after shutdown')
+
+                for args in batch:
+                    f = _base.Future()
+                    self._work_queue.put(_WorkItem(f, fn, args, {}))
+                    fs.append(f)
+                for _ in range(min(len(batch), self._max_workers)):
+                    self._adjust_thread_count()
+            if len(batch) < _base._SUBMIT_BATCH_SIZE:
+                return fs
+    submit_many.__doc__ = _base.Executor.submit_many.__doc__
+
     def _adjust_thread_count(self):
         # When the executor gets lost, the weakref callback will wake up
         # the worker threads.
@@ -138,3 +252,36 @@ class ThreadPoolExecutor(_base.Executor):
             for t in self._threads:
                 t.join()
     shutdown.__doc__ = _base.Executor.shutdown.__doc__
+
+
+class WorkStealingThreadPoolExecutor(ThreadPoolExecutor):
+    def __init__(self, max_workers=None):
+        """Initializes a new WorkStealingThreadPoolExecutor instance.
+
+        Args:
+            max_workers: The maximum number of threads that can be used to
+                execute the given calls.
+        """
+        ThreadPoolExecutor.__init__(self, max_workers)
+        self._work_queue = _WorkStealingQueue()
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._work_queue.is_worker_thread():
+            return ThreadPoolExecutor.submit(self, fn, *args, **kwargs)
+
+        # Fast path for the calls submitted by our workers.  They are
+        # accepted even once shutdown() is called, since the workers only
+        # exit when all the deques are empty, and need not take the lock.
+        f = _base.Future()
+        self._work_queue.put(_WorkItem(f, fn, args, kwargs))
+        if len(self._threads) < self._max_workers:
+            with self._shutdown_lock:
+                if not self._shutdown:
+                    self._adjust_thread_count()
+        return f
+    submit.__doc__ = _base.Executor.submit.__doc__
+
+    def _adjust_thread_count(self):
+        # Idle workers will steal the new work item
+        if not self._work_queue.idle_workers():
+            ThreadPoolExecutor._adjust_thread_count(self)
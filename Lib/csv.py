@@ -4,6 +4,10 @@ csv.py - read/write/investigate CSV files
 """
 
 import re
+import codecs
+import itertools
+import operator
+from array import array
 from _csv import Error, __version__, writer, reader, register_dialect, \
                  unregister_dialect, get_dialect, list_dialects, \
                  field_size_limit, \
@@ -18,7 +22,7 @@ __all__ = ["QUOTE_MINIMAL", "QUOTE_ALL", "QUOTE_NONNUMERIC", "QUOTE_NONE",
            "field_size_limit", "reader", "writer",
            "register_dialect", "get_dialect", "list_dialects", "Sniffer",
            "unregister_dialect", "__version__", "DictReader", "DictWriter",
-           "unix_dialect"]
+           "unix_dialect", "binary_reader", "read_columns"]
 
 class Dialect:
     """Describe a CSV dialect.
@@ -77,15 +81,72 @@ class unix_dialect(Dialect):
 register_dialect("unix", unix_dialect)
 
 
+class _Row(tuple):
+    # Base of the row classes of DictReader(shared_keys=True).  A subclass
+    # is created once for each list of fieldnames, and holds the key to
+    # index mapping shared by all its rows.
+    __slots__ = ()
+    _keys = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        try:
+            index = self._index[key]
+        except KeyError:
+            if isinstance(key, int):
+                return tuple.__getitem__(self, key)
+            raise
+        except TypeError:
+            # An unhashable key, such as a slice
+            return tuple.__getitem__(self, key)
+        if index >= len(self):
+            # The restkey of a row which is not too long
+            raise KeyError(key)
+        return tuple.__getitem__(self, index)
+
+    def get(self, key, default=None):
+        index = self._index.get(key, len(self))
+        if index >= len(self):
+            return default
+        return tuple.__getitem__(self, index)
+
+    def keys(self):
+        return list(self._keys[:len(self)])
+
+    def values(self):
+        return list(self)
+
+    def items(self):
+        return list(zip(self._keys, self))
+
+    def __repr__(self):
+        return '%s({%s})' % (type(self).__name__,
+                             ', '.join(['%r: %r' % item
+                                        for item in self.items()]))
+
+def _make_row_class(fieldnames, restkey):
+    keys = tuple(fieldnames)
+    index = {key: i for i, key in enumerate(keys)}
+    if restkey not in index:
+        index[restkey] = len(keys)
+        keys += (restkey,)
+    return type('Row', (_Row,), {'__slots__': (), '_keys': keys,
+                                 '_index': index,
+                                 '_fieldnames': fieldnames,
+                                 '_restkey': restkey})
+
+
 class DictReader:
     def __init__(self, f, fieldnames=None, restkey=None, restval=None,
-                 dialect="excel", *args, **kwds):
+                 dialect="excel", *args, shared_keys=False, **kwds):
         self._fieldnames = fieldnames   # list of keys for the dict
         self.restkey = restkey          # key to catch long rows
         self.restval = restval          # default value for short rows
         self.reader = reader(f, dialect, *args, **kwds)
         self.dialect = dialect
         self.line_num = 0
+        self.shared_keys = shared_keys  # return _Row objects, not dicts
+        self._row_class = None
 
     def __iter__(self):
         return self
@@ -116,13 +177,25 @@ class DictReader:
         # values
         while row == []:
             row = next(self.reader)
-        d = dict(zip(self.fieldnames, row))
-        lf = len(self.fieldnames)
+        fieldnames = self.fieldnames
+        lf = len(fieldnames)
         lr = len(row)
+        if self.shared_keys:
+            row_class = self._row_class
+            if (row_class is None or row_class._fieldnames is not fieldnames
+                or row_class._restkey != self.restkey):
+                row_class = self._row_class = _make_row_class(fieldnames,
+                                                              self.restkey)
+            if lf < lr:
+                row[lf:] = [row[lf:]]
+            elif lf > lr:
+                row += [self.restval] * (lf - lr)
+            return row_class(row)
+        d = dict(zip(fieldnames, row))
         if lf < lr:
             d[self.restkey] = row[lf:]
         elif lf > lr:
-            for key in self.fieldnames[lr:]:
+            for key in fieldnames[lr:]:
                 d[key] = self.restval
         return d
 
@@ -138,16 +211,37 @@ class DictWriter:
         self.extrasaction = extrasaction
         self.writer = writer(f, dialect, *args, **kwds)
 
+    @property
+    def fieldnames(self):
+        return self._fieldnames
+
+    @fieldnames.setter
+    def fieldnames(self, value):
+        # Compile the extraction of the fields of a dict once for all rows
+        self._fieldnames = value
+        self._fieldset = frozenset(value)
+        if len(value) > 1:
+            self._getter = operator.itemgetter(*value)
+        else:
+            self._getter = lambda rowdict: [rowdict[key] for key in value]
+
     def writeheader(self):
         header = dict(zip(self.fieldnames, self.fieldnames))
         self.writerow(header)
 
     def _dict_to_list(self, rowdict):
         if self.extrasaction == "raise":
-            wrong_fields = [k for k in rowdict if k not in self.fieldnames]
-            if wrong_fields:
+            if not self._fieldset.issuperset(rowdict.keys()):
+                wrong_fields = [k for k in rowdict.keys()
+                                if k not in self._fieldset]
                 raise ValueError("dict contains fields not in fieldnames: "
                                  + ", ".join([repr(x) for x in wrong_fields]))
+        if type(rowdict) is dict:
+            # No __missing__() to bypass
+            try:
+                return self._getter(rowdict)
+            except KeyError:
+                pass
         return (rowdict.get(key, self.restval) for key in self.fieldnames)
 
     def writerow(self, rowdict):
@@ -156,6 +250,79 @@ class DictWriter:
     def writerows(self, rowdicts):
         return self.writer.writerows(map(self._dict_to_list, rowdicts))
 
+
+def _decoded_blocks(f, encoding, errors, buffer_size):
+    # Generate the whole lines of the binary file f, decoded buffer_size
+    # bytes at a time, as StringIO objects splitting them like a text file
+    # opened with newline=''.
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    pending = ''
+    while True:
+        data = f.read(buffer_size)
+        text = pending + decoder.decode(data, not data)
+        if not data:
+            break
+        # Keep the last line, which may be incomplete, and a final '\r',
+        # which may be followed by a '\n'
+        cut = text.rfind('\n') + 1
+        if not cut:
+            cut = text.rfind('\r', 0, -1) + 1
+        pending = text[cut:]
+        if cut:
+            yield StringIO(text[:cut], newline='')
+    if text:
+        yield StringIO(text, newline='')
+
+def binary_reader(f, dialect="excel", *, encoding="utf-8", errors="strict",
+                  buffer_size=65536, **kwds):
+    """Return a reader of the CSV binary file f.
+
+    The file is read and decoded buffer_size bytes at a time, instead of
+    line by line.  The other arguments are those of reader().
+
+    """
+    lines = itertools.chain.from_iterable(
+        _decoded_blocks(f, encoding, errors, buffer_size))
+    return reader(lines, dialect, **kwds)
+
+def _typecode_converter(typecode):
+    if typecode is None:
+        return None
+    if typecode in 'bBhHiIlLqQ':
+        return int
+    if typecode in 'fd':
+        return float
+    raise ValueError("unsupported typecode %r" % (typecode,))
+
+def read_columns(f, typecodes, dialect="excel", *, columns=None,
+                 batch_size=1024, **kwds):
+    """Read the CSV binary file f by columns.
+
+    Return an iterator over batches of up to batch_size rows, each batch
+    being a list of the columns, in the order of columns (by default the
+    first len(typecodes) columns).  A column is an array.array of the
+    corresponding item of typecodes, or a list of str if it is None.  Empty
+    lines are skipped.  The other arguments are those of binary_reader().
+
+    """
+    typecodes = list(typecodes)
+    if columns is None:
+        columns = range(len(typecodes))
+    elif len(columns) != len(typecodes):
+        raise ValueError("columns and typecodes must have the same length")
+    converters = [_typecode_converter(typecode) for typecode in typecodes]
+    rows = filter(None, binary_reader(f, dialect, columns=columns,
+                                      converters=converters, **kwds))
+    return _column_batches(rows, typecodes, batch_size)
+
+def _column_batches(rows, typecodes, batch_size):
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        yield [list(column) if typecode is None else array(typecode, column)
+               for typecode, column in zip(typecodes, zip(*batch))]
+
 # Guard Sniffer's type checking against builds that exclude complex()
 try:
     complex
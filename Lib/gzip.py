@@ -6,6 +6,7 @@ but random access is not allowed."""
 # based on Andrew Kuchling's minigzip.py distributed with the zlib module
 
 import struct, sys, time, os
+import functools
 import zlib
 import builtins
 import io
@@ -18,7 +19,8 @@ FTEXT, FHCRC, FEXTRA, FNAME, FCOMMENT = 1, 2, 4, 8, 16
 READ, WRITE = 1, 2
 
 def open(filename, mode="rb", compresslevel=9,
-         encoding=None, errors=None, newline=None):
+         encoding=None, errors=None, newline=None, *, threads=1,
+         index=None):
     """Open a gzip-compressed file in binary or text mode.
 
     The filename argument can be an actual filename (a str or bytes object), or
@@ -29,8 +31,8 @@ def open(filename, mode="rb", compresslevel=9,
     "rb", and the default compresslevel is 9.
 
     For binary mode, this function is equivalent to the GzipFile constructor:
-    GzipFile(filename, mode, compresslevel). In this case, the encoding, errors
-    and newline arguments must not be provided.
+    GzipFile(filename, mode, compresslevel, threads=threads, index=index). In
+    this case, the encoding, errors and newline arguments must not be provided.
 
     For text mode, a GzipFile object is created, and wrapped in an
     io.TextIOWrapper instance with the specified encoding, error handling
@@ -50,9 +52,11 @@ def open(filename, mode="rb", compresslevel=9,
 
     gz_mode = mode.replace("t", "")
     if isinstance(filename, (str, bytes)):
-        binary_file = GzipFile(filename, gz_mode, compresslevel)
+        binary_file = GzipFile(filename, gz_mode, compresslevel,
+                               threads=threads, index=index)
     elif hasattr(filename, "read") or hasattr(filename, "write"):
-        binary_file = GzipFile(None, gz_mode, compresslevel, filename)
+        binary_file = GzipFile(None, gz_mode, compresslevel, filename,
+                               threads=threads, index=index)
     else:
         raise TypeError("filename must be a str or bytes object, or a file")
 
@@ -61,6 +65,35 @@ def open(filename, mode="rb", compresslevel=9,
     else:
         return binary_file
 
+# Size of the window of deflate, and state of the decompressor saved in the
+# seek points of the index, followed by the compressed window
+_WINDOW_SIZE = 32 * 1024
+_SEEK_POINT = struct.Struct("<BIQ")
+
+# Size of the blocks compressed concurrently when writing with threads
+_PARALLEL_BLOCK_SIZE = 128 * 1024
+
+def _deflate_block(compresslevel, data, previous, final):
+    # Each block is compressed with the end of the preceding one as a
+    # preset dictionary and ends at a byte boundary (with a sync flush),
+    # so that the blocks join into a single deflate stream.
+    if previous:
+        compress = zlib.compressobj(compresslevel, zlib.DEFLATED,
+                                    -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, 0,
+                                    previous[-32768:])
+    else:
+        compress = zlib.compressobj(compresslevel, zlib.DEFLATED,
+                                    -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, 0)
+    return compress.compress(data) + compress.flush(
+        zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class _ParallelDeflater(_compression.ParallelCompressor):
+    """Parallel compressor accepting the flush modes of zlib."""
+
+    def flush(self, mode=zlib.Z_FINISH):
+        return super().flush(final=(mode == zlib.Z_FINISH),
+                             reset=(mode == zlib.Z_FULL_FLUSH))
+
 def write32u(output, value):
     # The L format writes the bit pattern correctly whether signed
     # or unsigned.
@@ -104,6 +137,12 @@ class _PaddedFile:
         self._buffer = None
         return self.file.seek(off)
 
+    def tell(self):
+        # The offset in the file of the next byte returned by read()
+        if self._read is None:
+            return self.file.tell()
+        return self.file.tell() - self._length + self._read
+
     def seekable(self):
         return True  # Allows fast-forwarding even in unseekable streams
 
@@ -121,7 +160,8 @@ class GzipFile(_compression.BaseStream):
     myfileobj = None
 
     def __init__(self, filename=None, mode=None,
-                 compresslevel=9, fileobj=None, mtime=None):
+                 compresslevel=9, fileobj=None, mtime=None, *, threads=1,
+                 index=None):
         """Constructor for the GzipFile class.
 
         At least one of fileobj and filename must be given a
@@ -153,6 +193,20 @@ class GzipFile(_compression.BaseStream):
         to the last modification time field in the stream when compressing.
         If omitted or None, the current time is used.
 
+        The threads argument gives the number of threads compressing the
+        data when writing; 0 means the number of CPUs.  With more than one
+        thread, the data is split into blocks of 128 KiB compressed
+        concurrently, into a single gzip member slightly larger than with a
+        single thread.  The default is 1, compressing the data in the
+        calling thread.
+
+        The index argument makes seeking faster when reading a seekable
+        file: the state of the decompressor is saved every 1 MiB of data
+        while reading, so that seek() can resume the decompression from
+        the closest saved point instead of the start of the file.  It can
+        be True to build a new index, or the name of a file (or a binary
+        file object) written by save_index() to load.
+
         """
 
         if mode and ('t' in mode or 'U' in mode):
@@ -169,19 +223,35 @@ class GzipFile(_compression.BaseStream):
             mode = getattr(fileobj, 'mode', 'rb')
 
         if mode.startswith('r'):
+            if threads != 1:
+                raise ValueError("Cannot specify threads when opening a "
+                                 "file for reading")
             self.mode = READ
-            raw = _GzipReader(fileobj)
+            self._index = _compression.open_index(index, 'gzip')
+            if self._index is not None and not fileobj.seekable():
+                raise io.UnsupportedOperation("The underlying file object "
+                                              "does not support seeking")
+            raw = _GzipReader(fileobj, self._index)
             self._buffer = io.BufferedReader(raw)
             self.name = filename
 
         elif mode.startswith(('w', 'a', 'x')):
+            if index is not None:
+                raise ValueError("Cannot specify index when opening a "
+                                 "file for writing")
             self.mode = WRITE
+            self._index = None
             self._init_write(filename)
-            self.compress = zlib.compressobj(compresslevel,
-                                             zlib.DEFLATED,
-                                             -zlib.MAX_WBITS,
-                                             zlib.DEF_MEM_LEVEL,
-                                             0)
+            if threads == 1:
+                self.compress = zlib.compressobj(compresslevel,
+                                                 zlib.DEFLATED,
+                                                 -zlib.MAX_WBITS,
+                                                 zlib.DEF_MEM_LEVEL,
+                                                 0)
+            else:
+                self.compress = _ParallelDeflater(
+                    functools.partial(_deflate_block, compresslevel),
+                    threads, _PARALLEL_BLOCK_SIZE)
             self._write_mtime = mtime
         else:
             raise ValueError("Invalid mode: {!r}".format(mode))
@@ -338,6 +408,15 @@ class GzipFile(_compression.BaseStream):
             raise OSError("Can't rewind in write mode")
         self._buffer.seek(0)
 
+    def save_index(self, file):
+        """Write the seek points of the index built so far to file, a file
+        name or a binary file object.  Seeking to the end of the file
+        first completes the index."""
+        self._check_not_closed()
+        if self._index is None:
+            raise ValueError("File was not opened with an index")
+        self._index.save(file)
+
     def readable(self):
         return self.mode == READ
 
@@ -373,12 +452,15 @@ class GzipFile(_compression.BaseStream):
 
 
 class _GzipReader(_compression.DecompressReader):
-    def __init__(self, fp):
-        super().__init__(_PaddedFile(fp), zlib.decompressobj,
+    def __init__(self, fp, index=None):
+        super().__init__(_PaddedFile(fp), zlib.decompressobj, index=index,
                          wbits=-zlib.MAX_WBITS)
         # Set flag indicating start of a new member
         self._new_member = True
         self._last_mtime = None
+        # The last 32 KiB of decompressed data of the member, needed to
+        # resume the decompression from a seek point
+        self._window = b""
 
     def _init_read(self):
         self._crc = zlib.crc32(b"")
@@ -458,15 +540,21 @@ class _GzipReader(_compression.DecompressReader):
                 # If the _new_member flag is set, we have to
                 # jump to the next member, if there is one.
                 self._init_read()
+                if self._index is not None:
+                    self._index.add(self._pos, self._fp.tell())
+                    self._window = b""
                 if not self._read_gzip_header():
-                    self._size = self._pos
+                    self._set_size()
                     return b""
                 self._new_member = False
 
             # Read a chunk of data from the file
             buf = self._fp.read(io.DEFAULT_BUFFER_SIZE)
 
-            uncompress = self._decompressor.decompress(buf, size)
+            if self._index is None:
+                uncompress = self._decompressor.decompress(buf, size)
+            else:
+                uncompress = self._decompress_indexed(buf, size)
             if self._decompressor.unconsumed_tail != b"":
                 self._fp.prepend(self._decompressor.unconsumed_tail)
             elif self._decompressor.unused_data != b"":
@@ -484,6 +572,51 @@ class _GzipReader(_compression.DecompressReader):
         self._pos += len(uncompress)
         return uncompress
 
+    def _decompress_indexed(self, buf, size):
+        # Decompress like read(), and add a seek point to the index at the
+        # end of a deflate block once the next point is due.  The window
+        # is only kept up to date when nearing the next point.
+        index = self._index
+        next_pos = index.next_pos
+        if self._pos + size < next_pos:
+            data = self._decompressor.decompress(buf, size)
+        else:
+            data = self._decompressor.decompress_block(buf, size)
+        pos = self._pos + len(data)
+        if pos + _WINDOW_SIZE > next_pos:
+            self._window = (self._window + data)[-_WINDOW_SIZE:]
+        bits = self._decompressor.block_bits
+        if bits is not None and pos >= next_pos:
+            offset = (self._fp.tell() -
+                      len(self._decompressor.unconsumed_tail))
+            state = _SEEK_POINT.pack(bits, zlib.crc32(data, self._crc),
+                                     self._stream_size + len(data))
+            index.add(pos, offset, state + zlib.compress(self._window, 1))
+        return data
+
+    # Resume the decompression from a seek point of the index: either the
+    # start of a member, or the end of a deflate block in a member.
+    def _restore(self, point):
+        pos, offset, state = point
+        if not state:
+            super()._restore(point)
+            self._new_member = True
+            return
+        bits, self._crc, self._stream_size = _SEEK_POINT.unpack_from(state)
+        self._window = zlib.decompress(state[_SEEK_POINT.size:])
+        self._decompressor = self._decomp_factory(zdict=self._window,
+                                                  **self._decomp_args)
+        if bits:
+            # The block starts in the last bits of the previous byte
+            self._fp.seek(offset - 1)
+            byte, = self._read_exact(1)
+            self._decompressor.prime(bits, byte >> (8 - bits))
+        else:
+            self._fp.seek(offset)
+        self._new_member = False
+        self._eof = False
+        self._pos = pos
+
     def _add_read_data(self, data):
         self._crc = zlib.crc32(data, self._crc)
         self._stream_size = self._stream_size + len(data)
@@ -97,12 +97,16 @@ Using json.tool from the shell to validate and pretty-print::
 """
 __version__ = '2.0.9'
 __all__ = [
-    'dump', 'dumps', 'load', 'loads',
+    'dump', 'dumps', 'dumpb', 'load', 'loads', 'iterload', 'dump_lines',
+    'load_lines',
     'JSONDecoder', 'JSONDecodeError', 'JSONEncoder',
 ]
 
 __author__ = 'Bob Ippolito <bob@redivi.com>'
 
+import functools
+import itertools
+
 from .decoder import JSONDecoder, JSONDecodeError
 from .encoder import JSONEncoder
 
@@ -116,6 +120,9 @@ _default_encoder = JSONEncoder(
     default=None,
 )
 
+# The number of chunks joined by dump() for each write
+_WRITE_CHUNKS = 1024
+
 def dump(obj, fp, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         allow_nan=True, cls=None, indent=None, separators=None,
         default=None, sort_keys=False, **kw):
@@ -173,10 +180,14 @@ def dump(obj, fp, *, skipkeys=False, ensure_ascii=True, check_circular=True,
             check_circular=check_circular, allow_nan=allow_nan, indent=indent,
             separators=separators,
             default=default, sort_keys=sort_keys, **kw).iterencode(obj)
-    # could accelerate with writelines in some versions of Python, at
-    # a debuggability cost
-    for chunk in iterable:
-        fp.write(chunk)
+    # Coalesce the many small chunks into fewer writes
+    write = fp.write
+    iterable = iter(iterable)
+    while True:
+        chunks = list(itertools.islice(iterable, _WRITE_CHUNKS))
+        if not chunks:
+            break
+        write(''.join(chunks))
 
 
 def dumps(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
@@ -237,6 +248,30 @@ def dumps(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         **kw).encode(obj)
 
 
+def dumpb(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
+        allow_nan=True, cls=None, indent=None, separators=None,
+        default=None, sort_keys=False, **kw):
+    """Serialize ``obj`` to a JSON formatted ``bytes`` object, encoded
+    in UTF-8.
+
+    The arguments have the same meaning as in ``dumps()``.
+
+    """
+    # cached encoder
+    if (not skipkeys and ensure_ascii and
+        check_circular and allow_nan and
+        cls is None and indent is None and separators is None and
+        default is None and not sort_keys and not kw):
+        return _default_encoder.encodeb(obj)
+    if cls is None:
+        cls = JSONEncoder
+    return cls(
+        skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+        check_circular=check_circular, allow_nan=allow_nan, indent=indent,
+        separators=separators, default=default, sort_keys=sort_keys,
+        **kw).encodeb(obj)
+
+
 _default_decoder = JSONDecoder(object_hook=None, object_pairs_hook=None)
 
 
@@ -330,3 +365,194 @@ def loads(s, *, encoding=None, cls=None, object_hook=None, parse_float=None,
     if parse_constant is not None:
         kw['parse_constant'] = parse_constant
     return cls(**kw).decode(s)
+
+
+def _read_chunks(fp, chunk_size):
+    # Generate the chunks read from fp, as str or bytes
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iterload(fp, *, items=None, chunk_size=65536, cls=None, object_hook=None,
+        parse_float=None, parse_int=None, parse_constant=None,
+        object_pairs_hook=None, **kw):
+    """Deserialize ``fp`` (a ``.read()``-supporting text or binary file
+    containing a JSON document) incrementally, reading ``chunk_size``
+    characters or bytes at a time, and return an iterator over its
+    contents.
+
+    If ``items`` is None, the iterator generates ``(path, event, value)``
+    tuples describing the document; otherwise ``items`` is the path of an
+    array (a tuple of keys and indexes, ``()`` for the top-level value) and
+    the iterator generates its elements as Python objects.  See
+    ``JSONDecoder.iterdecode()`` for the details.
+
+    The other arguments have the same meaning as in ``loads()``.
+
+    """
+    chunks = _read_chunks(fp, chunk_size)
+    if (cls is None and object_hook is None and
+            parse_int is None and parse_float is None and
+            parse_constant is None and object_pairs_hook is None and not kw):
+        return _default_decoder.iterdecode(chunks, items)
+    if cls is None:
+        cls = JSONDecoder
+    if object_hook is not None:
+        kw['object_hook'] = object_hook
+    if object_pairs_hook is not None:
+        kw['object_pairs_hook'] = object_pairs_hook
+    if parse_float is not None:
+        kw['parse_float'] = parse_float
+    if parse_int is not None:
+        kw['parse_int'] = parse_int
+    if parse_constant is not None:
+        kw['parse_constant'] = parse_constant
+    return cls(**kw).iterdecode(chunks, items)
+
+
+def dump_lines(iterable, fp, *, skipkeys=False, ensure_ascii=True,
+        check_circular=True, allow_nan=True, cls=None, separators=None,
+        default=None, sort_keys=False, **kw):
+    """Serialize each object of ``iterable`` as a JSON formatted line to
+    ``fp`` (a ``.write()``-supporting file-like object), in the JSON Lines
+    format.
+
+    The same encoder is used for all the objects and the lines are written
+    in batches, which is much faster than calling ``dumps()`` for each one.
+
+    The arguments have the same meaning as in ``dump()``, except that
+    ``indent`` is not allowed, as each object must fit on a single line.
+
+    """
+    if (not skipkeys and ensure_ascii and
+        check_circular and allow_nan and
+        cls is None and separators is None and
+        default is None and not sort_keys and not kw):
+        encoder = _default_encoder
+    else:
+        if cls is None:
+            cls = JSONEncoder
+        encoder = cls(
+            skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+            check_circular=check_circular, allow_nan=allow_nan,
+            separators=separators, default=default, sort_keys=sort_keys,
+            **kw)
+        if encoder.indent is not None:
+            raise ValueError("indent is not allowed in JSON Lines")
+    encode = encoder._make_encode()
+    write = fp.write
+    iterator = iter(iterable)
+    while True:
+        lines = [encode(obj) for obj in itertools.islice(iterator, 1024)]
+        if not lines:
+            break
+        lines.append('')
+        write('\n'.join(lines))
+
+
+def _line_blocks(fp, block_size):
+    # Generate blocks of whole lines read from fp, as str or bytes
+    pending = []
+    while True:
+        data = fp.read(block_size)
+        if not data:
+            break
+        cut = data.rfind(b'\n' if isinstance(data, bytes) else '\n') + 1
+        if not cut:
+            pending.append(data)
+            continue
+        pending.append(data[:cut])
+        yield data[:0].join(pending)
+        pending = [data[cut:]]
+    if pending:
+        block = pending[0][:0].join(pending)
+        if block:
+            yield block
+
+
+def _decode_block(decoder, block):
+    # Return the values of a block with its length and its number of lines
+    if isinstance(block, (bytes, bytearray)):
+        # Blocks only hold whole lines, thus whole characters
+        block = block.decode('utf-8')
+    return decoder._decode_lines(block), len(block), block.count('\n')
+
+
+def _decode_block_with(cls, kw, block):
+    # Used in the worker processes, the decoders cannot be pickled
+    return _decode_block(cls(**kw), block)
+
+
+def _block_values(results):
+    # Generate the values of the decoded blocks, reporting the decoding
+    # errors at their position in the file rather than in their block
+    offset = lines = 0
+    try:
+        for values, size, count in results:
+            yield from values
+            offset += size
+            lines += count
+    except JSONDecodeError as err:
+        # The blocks start on a line, so the column does not change
+        err.pos += offset
+        err.lineno += lines
+        err.args = ('%s: line %d column %d (char %d)' %
+                    (err.msg, err.lineno, err.colno, err.pos),)
+        raise
+
+
+def _load_lines(decoder, blocks):
+    return _block_values(map(functools.partial(_decode_block, decoder),
+                             blocks))
+
+
+def _load_lines_parallel(cls, kw, blocks, workers):
+    from concurrent.futures import ProcessPoolExecutor
+    decode = functools.partial(_decode_block_with, cls, kw)
+    with ProcessPoolExecutor(workers) as executor:
+        yield from _block_values(executor.map(decode, blocks,
+                                              buffersize=2 * workers))
+
+
+def load_lines(fp, *, block_size=65536, workers=None, cls=None,
+        object_hook=None, parse_float=None, parse_int=None,
+        parse_constant=None, object_pairs_hook=None, **kw):
+    """Deserialize ``fp`` (a ``.read()``-supporting file-like object
+    containing one JSON document per line, in the JSON Lines format) and
+    return an iterator over the Python objects.
+
+    ``fp`` is read ``block_size`` bytes or characters at a time and each
+    block of lines is decoded at once with the same decoder.  Binary files
+    are decoded from UTF-8.  Blank lines are ignored, and a document that
+    does not fit on a single line is an error.
+
+    If ``workers`` is not None, the blocks are decoded by a pool of that
+    many processes, and the hooks and ``cls`` must be picklable.
+
+    The other arguments have the same meaning as in ``loads()``.
+
+    """
+    blocks = _line_blocks(fp, block_size)
+    if (cls is None and object_hook is None and
+            parse_int is None and parse_float is None and
+            parse_constant is None and object_pairs_hook is None and
+            not kw and workers is None):
+        return _load_lines(_default_decoder, blocks)
+    if cls is None:
+        cls = JSONDecoder
+    if object_hook is not None:
+        kw['object_hook'] = object_hook
+    if object_pairs_hook is not None:
+        kw['object_pairs_hook'] = object_pairs_hook
+    if parse_float is not None:
+        kw['parse_float'] = parse_float
+    if parse_int is not None:
+        kw['parse_int'] = parse_int
+    if parse_constant is not None:
+        kw['parse_constant'] = parse_constant
+    if workers is not None:
+        return _load_lines_parallel(cls, kw, blocks, workers)
+    return _load_lines(cls(**kw), blocks)
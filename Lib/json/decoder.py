@@ -1,5 +1,6 @@
 """Implementation of JSONDecoder
 """
+import codecs
 import re
 
 from json import scanner
@@ -130,6 +131,16 @@ scanstring = c_scanstring or py_scanstring
 
 WHITESPACE = re.compile(r'[ \t\n\r]*', FLAGS)
 WHITESPACE_STR = ' \t\n\r'
+LINE_WHITESPACE = re.compile(r'[ \t\r]*', FLAGS)
+
+# A number or a constant is only complete when followed by one of these
+SCALAR_END = re.compile(r'[ \t\n\r,:\]}]', FLAGS)
+# The characters of numbers, which can be arbitrarily long
+NUMBER_CHARS = re.compile(r'[-+.0-9eE]*', FLAGS)
+# The length of the longest constant, '-Infinity': a truncated constant or
+# escape sequence, or a missing delimiter, is reported by the scanner within
+# that many characters from the end of the buffered text
+_MAX_TRUNCATED = 9
 
 
 def JSONObject(s_and_end, strict, scan_once, object_hook, object_pairs_hook,
@@ -250,6 +261,19 @@ def JSONArray(s_and_end, scan_once, _w=WHITESPACE.match, _ws=WHITESPACE_STR):
     return values, end
 
 
+# States of JSONDecoder.iterdecode()
+_VALUE, _FIRST_VALUE, _KEY, _FIRST_KEY, _COLON, _COMMA, _END = range(7)
+_CLOSABLE = (_FIRST_VALUE, _FIRST_KEY, _COMMA)
+_EXPECTING = {
+    _VALUE: "Expecting value",
+    _FIRST_VALUE: "Expecting value",
+    _KEY: "Expecting property name enclosed in double quotes",
+    _FIRST_KEY: "Expecting property name enclosed in double quotes",
+    _COLON: "Expecting ':' delimiter",
+    _COMMA: "Expecting ',' delimiter",
+}
+
+
 class JSONDecoder(object):
     """Simple JSON <http://json.org> decoder
 
@@ -356,3 +380,232 @@ class JSONDecoder(object):
         except StopIteration as err:
             raise JSONDecodeError("Expecting value", s, err.value) from None
         return obj, end
+
+    def _decode_lines(self, s, _w=WHITESPACE.match,
+                      _lw=LINE_WHITESPACE.match):
+        # Return the list of the Python representations of the JSON
+        # documents in s, one per line, reusing the same scanner for all.
+        scan_once = self.scan_once
+        values = []
+        append = values.append
+        end = 0
+        length = len(s)
+        # The newlines between the documents, the others are inside one
+        newlines = 0
+        try:
+            while end != length:
+                try:
+                    obj, end = scan_once(s, end)
+                except StopIteration:
+                    # Skip the blank lines and the leading whitespace, which
+                    # are rare enough not to be looked for before every
+                    # document
+                    idx = _w(s, end).end()
+                    if idx == end:
+                        raise
+                    newlines += s.count('\n', end, idx)
+                    end = idx
+                    continue
+                append(obj)
+                if s[end:end + 1] != '\n':
+                    end = _lw(s, end).end()
+                    if end == length:
+                        break
+                    if s[end] != '\n':
+                        raise StopIteration
+                end += 1
+                newlines += 1
+        except (StopIteration, JSONDecodeError):
+            newlines = -1
+        if newlines != s.count('\n'):
+            # Some document is invalid or spans several lines, decode each
+            # line on its own to report the first error whatever the block
+            return self._decode_each_line(s)
+        return values
+
+    def _decode_each_line(self, s, _lw=LINE_WHITESPACE.match):
+        scan_once = self.scan_once
+        values = []
+        start = 0
+        for line in s.split('\n'):
+            idx = _lw(line).end()
+            if idx != len(line):
+                try:
+                    obj, end = scan_once(line, idx)
+                except StopIteration as err:
+                    raise JSONDecodeError("Expecting value", s,
+                                          start + err.value) from None
+                except JSONDecodeError as err:
+                    raise JSONDecodeError(err.msg, s,
+                                          start + err.pos) from None
+                end = _lw(line, end).end()
+                if end != len(line):
+                    raise JSONDecodeError("Extra data", s, start + end)
+                values.append(obj)
+            start += len(line) + 1
+        return values
+
+    def iterdecode(self, chunks, items=None, _w=WHITESPACE.match):
+        """Decode a JSON document given as an iterable of ``str`` chunks
+        (or ``bytes`` chunks encoded in UTF-8) and
+        generate its contents as soon as they are complete, so that only a
+        small part of the document is held in memory at a time.
+
+        If ``items`` is None, generate ``(path, event, value)`` tuples.
+        ``path`` is a tuple of the keys and indexes leading from the
+        top-level value to the current one and ``event`` is one of
+        ``'start_map'``, ``'map_key'``, ``'end_map'``, ``'start_array'``,
+        ``'end_array'`` and ``'value'``.  ``value`` is the key for
+        ``'map_key'``, the Python representation of a string, number or
+        constant for ``'value'``, and None otherwise.
+
+        Otherwise ``items`` is the path of an array and only its elements
+        are generated, each decoded in full as by ``decode()``.  Other
+        values are validated and skipped.
+
+        """
+        chunks = iter(chunks)
+        scan_once = self.scan_once
+        if items is not None:
+            items = tuple(items)
+        buf = ''
+        pos = 0
+        eof = False
+        # The type of the chunks once known; the bytes chunks are decoded
+        # by an incremental decoder, as a character may span two of them
+        chunk_type = None
+        decode = codecs.getincrementaldecoder('utf-8')().decode
+
+        def fill():
+            # Read at least as much as is already pending, so that a value
+            # spanning many chunks is only scanned a logarithmic number of
+            # times.
+            nonlocal buf, pos, eof, chunk_type
+            pending = [buf[pos:]]
+            wanted = max(len(pending[0]), 1)
+            while wanted > 0:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                    if chunk_type is not str and chunk_type is not None:
+                        pending.append(decode(b'', True))
+                    break
+                if chunk_type is None:
+                    if not isinstance(chunk, (str, bytes, bytearray)):
+                        raise TypeError('the JSON chunks must be str, bytes '
+                                        'or bytearray, not {!r}'
+                                        .format(chunk.__class__.__name__))
+                    chunk_type = str if isinstance(chunk, str) else bytes
+                elif not isinstance(chunk, chunk_type if chunk_type is str
+                                    else (bytes, bytearray)):
+                    raise TypeError('the JSON chunks must all be {}, not {!r}'
+                                    .format(chunk_type.__name__,
+                                            chunk.__class__.__name__))
+                if chunk_type is not str:
+                    chunk = decode(chunk)
+                pending.append(chunk)
+                wanted -= len(chunk)
+            buf = ''.join(pending)
+            pos = 0
+
+        def truncated(idx, msg=''):
+            # Tell if an error of the scanner at idx may only be due to the
+            # end of the buffered text, rather than to invalid data
+            return (not eof and (idx > len(buf) - _MAX_TRUNCATED or
+                                 msg.startswith('Unterminated string')))
+
+        def scan():
+            # Scan the value at pos, reading more chunks until it is
+            # complete.
+            while True:
+                if (buf[pos] not in '"{[' and not eof and
+                        SCALAR_END.search(buf, pos) is None and
+                        (len(buf) - pos < _MAX_TRUNCATED or
+                         NUMBER_CHARS.match(buf, pos).end() == len(buf))):
+                    # The value may be a truncated number or constant
+                    fill()
+                    continue
+                try:
+                    return scan_once(buf, pos)
+                except StopIteration as err:
+                    # A value nested in the one at pos may be truncated
+                    if not truncated(err.value):
+                        raise JSONDecodeError("Expecting value", buf,
+                                              err.value) from None
+                except JSONDecodeError as err:
+                    if not truncated(err.pos, err.msg):
+                        raise
+                fill()
+
+        path = []
+        # True for the objects being decoded, False for the arrays
+        stack = []
+        state = _VALUE
+        while True:
+            pos = _w(buf, pos).end()
+            if pos == len(buf):
+                if eof:
+                    break
+                fill()
+                continue
+            nextchar = buf[pos]
+            if state in _CLOSABLE and nextchar == (']', '}')[stack[-1]]:
+                pos += 1
+                is_object = stack.pop()
+                path.pop()
+                if items is None:
+                    yield (tuple(path), 'end_map' if is_object else
+                           'end_array', None)
+                state = _COMMA if stack else _END
+            elif state == _COMMA:
+                if nextchar != ',':
+                    raise JSONDecodeError("Expecting ',' delimiter", buf, pos)
+                pos += 1
+                if stack[-1]:
+                    state = _KEY
+                else:
+                    path[-1] += 1
+                    state = _VALUE
+            elif state == _COLON:
+                if nextchar != ':':
+                    raise JSONDecodeError("Expecting ':' delimiter", buf, pos)
+                pos += 1
+                state = _VALUE
+            elif state == _KEY or state == _FIRST_KEY:
+                if nextchar != '"':
+                    raise JSONDecodeError(
+                        "Expecting property name enclosed in double quotes",
+                        buf, pos)
+                key, pos = scan()
+                path[-1] = key
+                if items is None:
+                    yield tuple(path[:-1]), 'map_key', key
+                state = _COLON
+            elif state == _END:
+                raise JSONDecodeError("Extra data", buf, pos)
+            elif (items is not None and stack and not stack[-1] and
+                    len(path) == len(items) + 1 and
+                    tuple(path[:-1]) == items):
+                value, pos = scan()
+                yield value
+                state = _COMMA
+            elif nextchar == '{' or nextchar == '[':
+                pos += 1
+                if items is None:
+                    yield (tuple(path), 'start_map' if nextchar == '{' else
+                           'start_array', None)
+                if nextchar == '{':
+                    stack.append(True)
+                    path.append(None)
+                    state = _FIRST_KEY
+                else:
+                    stack.append(False)
+                    path.append(0)
+                    state = _FIRST_VALUE
+            else:
+                value, pos = scan()
+                if items is None:
+                    yield tuple(path), 'value', value
+                state = _COMMA if stack else _END
+        if state != _END:
+            raise JSONDecodeError(_EXPECTING[state], buf, pos)
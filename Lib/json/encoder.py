@@ -1,5 +1,6 @@
 """Implementation of JSONEncoder
 """
+import itertools
 import re
 
 try:
@@ -101,9 +102,10 @@ class JSONEncoder(object):
     """
     item_separator = ', '
     key_separator = ': '
+    key_cache_size = 0
     def __init__(self, *, skipkeys=False, ensure_ascii=True,
             check_circular=True, allow_nan=True, sort_keys=False,
-            indent=None, separators=None, default=None):
+            indent=None, separators=None, default=None, key_cache_size=0):
         """Constructor for JSONEncoder, with sensible defaults.
 
         If skipkeys is false, then it is a TypeError to attempt
@@ -142,6 +144,11 @@ class JSONEncoder(object):
         that can't otherwise be serialized.  It should return a JSON encodable
         version of the object or raise a ``TypeError``.
 
+        If key_cache_size is positive, the encoded dictionary keys, along
+        with the key separator, are cached during each encoding, up to that
+        number of keys, so that lists of dictionaries sharing the same keys
+        are encoded faster.  The cache is cleared when full.
+
         """
 
         self.skipkeys = skipkeys
@@ -156,6 +163,9 @@ class JSONEncoder(object):
             self.item_separator = ','
         if default is not None:
             self.default = default
+        if key_cache_size < 0:
+            raise ValueError("key_cache_size must not be negative")
+        self.key_cache_size = key_cache_size
 
     def default(self, o):
         """Implement this method in a subclass such that it returns
@@ -201,6 +211,61 @@ class JSONEncoder(object):
             chunks = list(chunks)
         return ''.join(chunks)
 
+    def encodeb(self, o):
+        """Return a JSON representation of a Python data structure as
+        UTF-8 encoded ``bytes``.
+
+        >>> from json.encoder import JSONEncoder
+        >>> JSONEncoder(ensure_ascii=False).encodeb({"caf\xe9": [1, 2]})
+        b'{"caf\\xc3\\xa9": [1, 2]}'
+
+        """
+        encoder = self._make_encodeb()
+        if encoder is not None:
+            return encoder(o, 0, True)
+        return b''.join(self._iterencodeb(o))
+
+    def encode_into(self, o, buffer):
+        """Append the UTF-8 encoded JSON representation of a Python data
+        structure to ``buffer``, a ``bytearray``, and return the number of
+        bytes appended.
+
+        This can be used to build a message from several objects or to
+        reuse the same buffer for successive messages.
+
+        """
+        start = len(buffer)
+        encoder = self._make_encodeb()
+        if encoder is not None:
+            buffer += encoder(o, 0, True)
+            return len(buffer) - start
+        try:
+            for data in self._iterencodeb(o):
+                buffer += data
+        except BaseException:
+            # Leave the buffer as it was
+            del buffer[start:]
+            raise
+        return len(buffer) - start
+
+    def _make_encodeb(self):
+        # Return the C encoder if it can write the UTF-8 encoded bytes
+        # directly, else None.
+        if (c_make_encoder is None or self.indent is not None or
+                type(self).iterencode is not JSONEncoder.iterencode):
+            return None
+        return self._make_iterencode(_one_shot=True)
+
+    def _iterencodeb(self, o):
+        # Yield the UTF-8 encoded chunks by batches, so that the whole str
+        # is never built.
+        chunks = iter(self.iterencode(o, _one_shot=True))
+        while True:
+            batch = list(itertools.islice(chunks, 1024))
+            if not batch:
+                break
+            yield ''.join(batch).encode('utf-8')
+
     def iterencode(self, o, _one_shot=False):
         """Encode the given object and yield each string
         representation as available.
@@ -211,6 +276,9 @@ class JSONEncoder(object):
                 mysocket.write(chunk)
 
         """
+        return self._make_iterencode(_one_shot)(o, 0)
+
+    def _make_iterencode(self, _one_shot):
         if self.check_circular:
             markers = {}
         else:
@@ -219,6 +287,10 @@ class JSONEncoder(object):
             _encoder = encode_basestring_ascii
         else:
             _encoder = encode_basestring
+        if self.key_cache_size:
+            key_cache = {}
+        else:
+            key_cache = None
 
         def floatstr(o, allow_nan=self.allow_nan,
                 _repr=float.__repr__, _inf=INFINITY, _neginf=-INFINITY):
@@ -248,16 +320,38 @@ class JSONEncoder(object):
             _iterencode = c_make_encoder(
                 markers, self.default, _encoder, self.indent,
                 self.key_separator, self.item_separator, self.sort_keys,
-                self.skipkeys, self.allow_nan)
+                self.skipkeys, self.allow_nan, key_cache, self.key_cache_size)
         else:
             _iterencode = _make_iterencode(
                 markers, self.default, _encoder, self.indent, floatstr,
                 self.key_separator, self.item_separator, self.sort_keys,
-                self.skipkeys, _one_shot)
-        return _iterencode(o, 0)
+                self.skipkeys, _one_shot, key_cache, self.key_cache_size)
+        return _iterencode
+
+    def _make_encode(self):
+        # Return a function equivalent to encode() which builds the
+        # encoding machinery only once, to encode many objects.
+        if (type(self).encode is not JSONEncoder.encode or
+                type(self).iterencode is not JSONEncoder.iterencode):
+            return self.encode
+        if self.ensure_ascii:
+            _encoder = encode_basestring_ascii
+        else:
+            _encoder = encode_basestring
+        _iterencode = self._make_iterencode(_one_shot=True)
+
+        def encode(o):
+            if isinstance(o, str):
+                return _encoder(o)
+            chunks = _iterencode(o, 0)
+            if not isinstance(chunks, (list, tuple)):
+                chunks = list(chunks)
+            return ''.join(chunks)
+        return encode
 
 def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
         _key_separator, _item_separator, _sort_keys, _skipkeys, _one_shot,
+        _key_cache=None, _key_cache_size=0,
         ## HACK: hand-optimized bytecode; turn globals into locals
         ValueError=ValueError,
         dict=dict,
@@ -378,8 +472,18 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
                 first = False
             else:
                 yield item_separator
-            yield _encoder(key)
-            yield _key_separator
+            if _key_cache is None:
+                yield _encoder(key)
+                yield _key_separator
+            else:
+                # Reuse the escaped key followed by the key separator
+                fragment = _key_cache.get(key)
+                if fragment is None:
+                    fragment = _encoder(key) + _key_separator
+                    if len(_key_cache) >= _key_cache_size:
+                        _key_cache.clear()
+                    _key_cache[key] = fragment
+                yield fragment
             if isinstance(value, str):
                 yield _encoder(value)
             elif value is None:
@@ -170,6 +170,10 @@ else: #pragma: no cover
 
 _srcfile = os.path.normcase(addLevelName.__code__.co_filename)
 
+# Maps the filenames of the code objects met by findCaller() to whether they
+# are _srcfile, to avoid normalizing them for every record.
+_srcfileMatches = {}
+
 # _srcfile is only used in conjunction with sys._getframe().
 # To provide compatibility with older versions of Python, set _srcfile
 # to None if _getframe() is not available; this value will prevent
@@ -242,9 +246,13 @@ class LogRecord(object):
     information to be logged.
     """
     def __init__(self, name, level, pathname, lineno,
-                 msg, args, exc_info, func=None, sinfo=None, **kwargs):
+                 msg, args, exc_info, func=None, sinfo=None, *,
+                 threads=True, processes=True, **kwargs):
         """
         Initialize a logging record with interesting information.
+
+        The thread and process information is only captured if 'threads' and
+        'processes' are true, respectively.
         """
         ct = time.time()
         self.name = name
@@ -288,13 +296,13 @@ class LogRecord(object):
         self.created = ct
         self.msecs = (ct - int(ct)) * 1000
         self.relativeCreated = (self.created - _startTime) * 1000
-        if logThreads and threading:
+        if logThreads and threads and threading:
             self.thread = threading.get_ident()
             self.threadName = threading.current_thread().name
         else: # pragma: no cover
             self.thread = None
             self.threadName = None
-        if not logMultiprocessing: # pragma: no cover
+        if not (logMultiprocessing and processes):
             self.processName = None
         else:
             self.processName = 'MainProcess'
@@ -308,7 +316,7 @@ class LogRecord(object):
                     self.processName = mp.current_process().name
                 except Exception: #pragma: no cover
                     pass
-        if logProcesses and hasattr(os, 'getpid'):
+        if logProcesses and processes and hasattr(os, 'getpid'):
             self.process = os.getpid()
         else:
             self.process = None
@@ -1160,6 +1168,9 @@ class Manager(object):
                 rv.manager = self
                 self.loggerDict[name] = rv
                 self._fixupParents(rv)
+            if rv.level:
+                # The new logger changes the effective level of its children
+                self._clear_cache()
         finally:
             _releaseLock()
         return rv
@@ -1218,6 +1229,20 @@ class Manager(object):
                 alogger.parent = c.parent
                 c.parent = alogger
 
+    def _clear_cache(self):
+        """
+        Clear the cache of the level checks of all the loggers, which gets
+        stale when the level of any of them, or the disable level, changes.
+        """
+        _acquireLock()
+        try:
+            for logger in self.loggerDict.values():
+                if isinstance(logger, Logger):
+                    logger._cache.clear()
+            self.root._cache.clear()
+        finally:
+            _releaseLock()
+
 #---------------------------------------------------------------------------
 #   Logger classes and functions
 #---------------------------------------------------------------------------
@@ -1237,6 +1262,12 @@ class Logger(Filterer):
     level, and "input.csv", "input.xls" and "input.gnu" for the sub-levels.
     There is no arbitrary limit to the depth of nesting.
     """
+    # Set these to False on a logger for its records not to capture the
+    # caller's source location, thread or process information.
+    logCaller = True
+    logThreads = True
+    logProcesses = True
+
     def __init__(self, name, level=NOTSET):
         """
         Initialize the logger with a name and an optional level.
@@ -1248,12 +1279,17 @@ class Logger(Filterer):
         self.propagate = True
         self.handlers = []
         self.disabled = False
+        # Maps levels to the result of isEnabledFor()
+        self._cache = {}
 
     def setLevel(self, level):
         """
         Set the logging level of this logger.  level must be an int or a str.
         """
         self.level = _checkLevel(level)
+        # This logger may not be part of the manager's hierarchy
+        self._cache.clear()
+        self.manager._clear_cache()
 
     def debug(self, msg, *args, **kwargs):
         """
@@ -1358,8 +1394,12 @@ class Logger(Filterer):
         rv = "(unknown file)", 0, "(unknown function)", None
         while hasattr(f, "f_code"):
             co = f.f_code
-            filename = os.path.normcase(co.co_filename)
-            if filename == _srcfile:
+            try:
+                internal = _srcfileMatches[co.co_filename]
+            except KeyError:
+                internal = _srcfileMatches[co.co_filename] = (
+                    os.path.normcase(co.co_filename) == _srcfile)
+            if internal:
                 f = f.f_back
                 continue
             sinfo = None
@@ -1381,8 +1421,13 @@ class Logger(Filterer):
         A factory method which can be overridden in subclasses to create
         specialized LogRecords.
         """
-        rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info, func,
-                             sinfo)
+        if self.logThreads and self.logProcesses:
+            rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info,
+                                   func, sinfo)
+        else:
+            rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info,
+                                   func, sinfo, threads=self.logThreads,
+                                   processes=self.logProcesses)
         if extra is not None:
             for key in extra:
                 if (key in ["message", "asctime"]) or (key in rv.__dict__):
@@ -1396,7 +1441,7 @@ class Logger(Filterer):
         all the handlers of this logger to handle the record.
         """
         sinfo = None
-        if _srcfile:
+        if _srcfile and (self.logCaller or stack_info):
             #IronPython doesn't track Python frames, so findCaller raises an
             #exception on some versions of IronPython. We trap it here so that
             #IronPython can use logging.
@@ -1404,7 +1449,7 @@ class Logger(Filterer):
                 fn, lno, func, sinfo = self.findCaller(stack_info)
             except ValueError: # pragma: no cover
                 fn, lno, func = "(unknown file)", 0, "(unknown function)"
-        else: # pragma: no cover
+        else:
             fn, lno, func = "(unknown file)", 0, "(unknown function)"
         if exc_info:
             if isinstance(exc_info, BaseException):
@@ -1516,10 +1561,23 @@ class Logger(Filterer):
     def isEnabledFor(self, level):
         """
         Is this logger enabled for level 'level'?
+
+        The answer is cached until the level of a logger or the disable level
+        changes through setLevel() or disable().
         """
-        if self.manager.disable >= level:
-            return False
-        return level >= self.getEffectiveLevel()
+        try:
+            return self._cache[level]
+        except KeyError:
+            _acquireLock()
+            try:
+                if self.manager.disable >= level:
+                    is_enabled = self._cache[level] = False
+                else:
+                    is_enabled = self._cache[level] = (
+                        level >= self.getEffectiveLevel())
+            finally:
+                _releaseLock()
+            return is_enabled
 
     def getChild(self, suffix):
         """
@@ -1644,9 +1702,7 @@ class LoggerAdapter(object):
         """
         Is this logger enabled for level 'level'?
         """
-        if self.logger.manager.disable >= level:
-            return False
-        return level >= self.getEffectiveLevel()
+        return self.logger.isEnabledFor(level)
 
     def setLevel(self, level):
         """
@@ -1863,6 +1919,7 @@ def disable(level):
     Disable all logging calls of severity 'level' and below.
     """
     root.manager.disable = level
+    root.manager._clear_cache()
 
 def shutdown(handlerList=_handlerList):
     """
@@ -22,6 +22,7 @@ __all__ = [
 ]
 
 import builtins
+import functools
 import io
 from _lzma import *
 from _lzma import _encode_filter_properties, _decode_filter_properties
@@ -33,6 +34,31 @@ _MODE_READ     = 1
 # Value 2 no longer used
 _MODE_WRITE    = 3
 
+# Dictionary sizes of the preset compression levels 0-9
+_PRESET_DICT_SIZES = [1 << 18, 1 << 20, 1 << 21, 1 << 22, 1 << 22,
+                      1 << 23, 1 << 23, 1 << 24, 1 << 25, 1 << 26]
+
+
+def _compress_block(settings, data, previous, final):
+    # Each block is compressed into a separate .xz stream.  An empty stream
+    # is only needed for an empty file.
+    if not data and previous is not None:
+        return b""
+    comp = LZMACompressor(**settings)
+    return comp.compress(data) + comp.flush()
+
+
+def _parallel_block_size(preset, filters):
+    # Like the xz tool, use blocks of three times the dictionary size
+    dict_size = None
+    if filters is not None:
+        dict_size = filters[-1].get("dict_size")
+    elif preset is not None:
+        dict_size = _PRESET_DICT_SIZES[preset & ~PRESET_EXTREME]
+    if dict_size is None:
+        dict_size = _PRESET_DICT_SIZES[PRESET_DEFAULT]
+    return max(3 * dict_size, 1 << 20)
+
 
 class LZMAFile(_compression.BaseStream):
 
@@ -46,7 +72,7 @@ class LZMAFile(_compression.BaseStream):
     """
 
     def __init__(self, filename=None, mode="r", *,
-                 format=None, check=-1, preset=None, filters=None):
+                 format=None, check=-1, preset=None, filters=None, threads=1):
         """Open an LZMA-compressed file in binary mode.
 
         filename can be either an actual file name (given as a str or
@@ -87,6 +113,13 @@ class LZMAFile(_compression.BaseStream):
         filters (if provided) should be a sequence of dicts. Each dict
         should have an entry for "id" indicating ID of the filter, plus
         additional entries for options to the filter.
+
+        When opening a file for writing with FORMAT_XZ, threads gives the
+        number of threads compressing the data; 0 means the number of
+        CPUs. With more than one thread, the data is split into blocks
+        of three times the dictionary size compressed concurrently, into
+        a concatenation of .xz streams. The default is 1, compressing the
+        data in the calling thread.
         """
         self._fp = None
         self._closefp = False
@@ -99,6 +132,9 @@ class LZMAFile(_compression.BaseStream):
             if preset is not None:
                 raise ValueError("Cannot specify a preset compression "
                                  "level when opening a file for reading")
+            if threads != 1:
+                raise ValueError("Cannot specify threads when opening a "
+                                 "file for reading")
             if format is None:
                 format = FORMAT_AUTO
             mode_code = _MODE_READ
@@ -108,6 +144,16 @@ class LZMAFile(_compression.BaseStream):
             mode_code = _MODE_WRITE
             self._compressor = LZMACompressor(format=format, check=check,
                                               preset=preset, filters=filters)
+            if threads != 1:
+                # The settings have been checked by LZMACompressor() above
+                if format != FORMAT_XZ:
+                    raise ValueError("Parallel compression is only "
+                                     "supported by FORMAT_XZ")
+                settings = dict(format=format, check=check, preset=preset,
+                                filters=filters)
+                self._compressor = _compression.ParallelCompressor(
+                    functools.partial(_compress_block, settings), threads,
+                    _parallel_block_size(preset, filters))
             self._pos = 0
         else:
             raise ValueError("Invalid mode: {!r}".format(mode))
@@ -260,7 +306,7 @@ class LZMAFile(_compression.BaseStream):
 
 def open(filename, mode="rb", *,
          format=None, check=-1, preset=None, filters=None,
-         encoding=None, errors=None, newline=None):
+         encoding=None, errors=None, newline=None, threads=1):
     """Open an LZMA-compressed file in binary or text mode.
 
     filename can be either an actual file name (given as a str or bytes
@@ -271,7 +317,7 @@ def open(filename, mode="rb", *,
     "a", or "ab" for binary mode, or "rt", "wt", "xt", or "at" for text
     mode.
 
-    The format, check, preset and filters arguments specify the
+    The format, check, preset, filters and threads arguments specify the
     compression settings, as for LZMACompressor, LZMADecompressor and
     LZMAFile.
 
@@ -297,7 +343,7 @@ def open(filename, mode="rb", *,
 
     lz_mode = mode.replace("t", "")
     binary_file = LZMAFile(filename, lz_mode, format=format, check=check,
-                           preset=preset, filters=filters)
+                           preset=preset, filters=filters, threads=threads)
 
     if "t" in mode:
         return io.TextIOWrapper(binary_file, encoding, errors, newline)
@@ -46,6 +46,99 @@ def mapstar(args):
 def starmapstar(args):
     return list(itertools.starmap(args[0], args[1]))
 
+def timedstar(mapper, args):
+    start = time.monotonic()
+    result = mapper(args)
+    return time.monotonic() - start, result
+
+#
+# Guided self-scheduling for `chunksize='auto'`
+#
+
+# Chunks are sized after the measured cost of their items: long enough for
+# the cost of passing them to a worker to be negligible, short enough for
+# the other workers to stay busy while the last chunks complete.
+AUTO_CHUNK_MIN_TIME = 0.01
+AUTO_CHUNK_MAX_TIME = 0.2
+
+class AutoChunker(object):
+    '''
+    Splits an iterable in chunks of adaptive sizes.
+
+    Each chunk takes a share of the remaining items, when their number is
+    known, within the bounds given by the cost per item measured on the
+    completed chunks.  To let the sizes adapt, chunks are only produced
+    while less than twice as many as there are workers are in flight.
+    '''
+
+    def __init__(self, func, iterable, processes, length=None):
+        self._func = func
+        self._it = iter(iterable)
+        self._window = 2 * processes
+        self._remaining = length
+        self._cond = threading.Condition(threading.Lock())
+        self._in_flight = 0
+        self._cost = None
+        # Maps the index of each chunk in flight to (start, size)
+        self._chunks = {}
+
+    def __iter__(self):
+        start = 0
+        for i in itertools.count():
+            with self._cond:
+                while self._in_flight >= self._window:
+                    # We run in the task handler, which must notice when
+                    # the pool gets terminated.
+                    if threading.current_thread()._state:
+                        return
+                    self._cond.wait(0.1)
+                size = self._next_size()
+            chunk = tuple(itertools.islice(self._it, size))
+            if not chunk:
+                return
+            size = len(chunk)
+            with self._cond:
+                self._chunks[i] = (start, size)
+                self._in_flight += 1
+            start += size
+            if self._remaining is not None:
+                self._remaining -= size
+            yield (self._func, chunk)
+
+    def _next_size(self):
+        if self._cost is None:
+            # Probe the cost of the items
+            return 1
+        lower = max(1, int(AUTO_CHUNK_MIN_TIME / self._cost))
+        upper = max(1, int(AUTO_CHUNK_MAX_TIME / self._cost))
+        if self._remaining is None:
+            return upper
+        share = -(-self._remaining // self._window)
+        return max(lower, min(share, upper))
+
+    def complete(self, i, obj):
+        '''
+        Account for the completion of chunk `i` with result `obj`, as built
+        by `timedstar()`; return `(start, size, obj)` where `obj` no longer
+        holds the timing.
+        '''
+        success, value = obj
+        with self._cond:
+            if i not in self._chunks:
+                # The task handler reports a failure of the iterable
+                return None, 0, obj
+            start, size = self._chunks.pop(i)
+            self._in_flight -= 1
+            if success:
+                elapsed, value = value
+                cost = elapsed / size
+                if self._cost is None:
+                    self._cost = cost
+                else:
+                    self._cost = (self._cost + cost) / 2
+            self._cond.notify()
+        return start, size, (success, value)
+
 #
 # Hack to embed stringification of remote traceback in local traceback
 #
@@ -281,7 +374,13 @@ class Pool(object):
         '''
         if self._state != RUN:
             raise ValueError("Pool not running")
-        if chunksize == 1:
+        if chunksize == 'auto':
+            chunker = self._auto_chunker(func, iterable)
+            result = AutoIMapIterator(self._cache, chunker)
+            self._taskqueue.put((((result._job, i, timedstar, (mapstar, x), {})
+                     for i, x in enumerate(chunker)), result._set_length))
+            return (item for chunk in result for item in chunk)
+        elif chunksize == 1:
             result = IMapIterator(self._cache)
             self._taskqueue.put((((result._job, i, func, (x,), {})
                          for i, x in enumerate(iterable)), result._set_length))
@@ -300,7 +399,13 @@ class Pool(object):
         '''
         if self._state != RUN:
             raise ValueError("Pool not running")
-        if chunksize == 1:
+        if chunksize == 'auto':
+            chunker = self._auto_chunker(func, iterable)
+            result = AutoIMapUnorderedIterator(self._cache, chunker)
+            self._taskqueue.put((((result._job, i, timedstar, (mapstar, x), {})
+                     for i, x in enumerate(chunker)), result._set_length))
+            return (item for chunk in result for item in chunk)
+        elif chunksize == 1:
             result = IMapUnorderedIterator(self._cache)
             self._taskqueue.put((((result._job, i, func, (x,), {})
                          for i, x in enumerate(iterable)), result._set_length))
@@ -342,6 +447,14 @@ class Pool(object):
         if not hasattr(iterable, '__len__'):
             iterable = list(iterable)
 
+        if chunksize == 'auto':
+            chunker = self._auto_chunker(func, iterable)
+            result = AutoMapResult(self._cache, chunker, len(iterable),
+                                   callback, error_callback=error_callback)
+            self._taskqueue.put((((result._job, i, timedstar, (mapper, x), {})
+                                  for i, x in enumerate(chunker)), None))
+            return result
+
         if chunksize is None:
             chunksize, extra = divmod(len(iterable), len(self._pool) * 4)
             if extra:
@@ -356,6 +469,10 @@ class Pool(object):
                               for i, x in enumerate(task_batches)), None))
         return result
 
+    def _auto_chunker(self, func, iterable):
+        length = len(iterable) if hasattr(iterable, '__len__') else None
+        return AutoChunker(func, iterable, self._processes, length)
+
     @staticmethod
     def _handle_workers(pool):
         thread = threading.current_thread()
@@ -659,6 +776,37 @@ class MapResult(ApplyResult):
                 del self._cache[self._job]
                 self._event.set()
 
+class AutoMapResult(MapResult):
+
+    def __init__(self, cache, chunker, length, callback, error_callback):
+        MapResult.__init__(self, cache, length and 1, length, callback,
+                           error_callback=error_callback)
+        self._chunker = chunker
+        # Count items rather than chunks, whose sizes vary
+        self._number_left = length
+
+    def _set(self, i, obj):
+        start, size, (success, result) = self._chunker.complete(i, obj)
+        self._number_left -= size
+        if success and self._success:
+            self._value[start:start + size] = result
+            if self._number_left == 0:
+                if self._callback:
+                    self._callback(self._value)
+                del self._cache[self._job]
+                self._event.set()
+        else:
+            if not success and self._success:
+                # only store first exception
+                self._success = False
+                self._value = result
+            if self._number_left == 0:
+                # only consider the result ready once all jobs are done
+                if self._error_callback:
+                    self._error_callback(self._value)
+                del self._cache[self._job]
+                self._event.set()
+
 #
 # Class whose instances are returned by `Pool.imap()`
 #
@@ -737,6 +885,26 @@ class IMapUnorderedIterator(IMapIterator):
             if self._index == self._length:
                 del self._cache[self._job]
 
+class AutoIMapIterator(IMapIterator):
+
+    def __init__(self, cache, chunker):
+        IMapIterator.__init__(self, cache)
+        self._chunker = chunker
+
+    def _set(self, i, obj):
+        start, size, obj = self._chunker.complete(i, obj)
+        IMapIterator._set(self, i, obj)
+
+class AutoIMapUnorderedIterator(IMapUnorderedIterator):
+
+    def __init__(self, cache, chunker):
+        IMapUnorderedIterator.__init__(self, cache)
+        self._chunker = chunker
+
+    def _set(self, i, obj):
+        start, size, obj = self._chunker.complete(i, obj)
+        IMapUnorderedIterator._set(self, i, obj)
+
 #
 #
 #
@@ -25,7 +25,7 @@ import os
 import time
 import marshal
 import re
-from functools import cmp_to_key
+from operator import add, itemgetter
 
 __all__ = ["Stats"]
 
@@ -59,7 +59,7 @@ class Stats:
                             print_stats(5).print_callers(5)
     """
 
-    def __init__(self, *args, stream=None):
+    def __init__(self, *args, stream=None, workers=None):
         self.stream = stream or sys.stdout
         if not len(args):
             arg = None
@@ -67,7 +67,7 @@ class Stats:
             arg = args[0]
             args = args[1:]
         self.init(arg)
-        self.add(*args)
+        self.add(*args, workers=workers)
 
     def init(self, arg):
         self.all_callees = None  # calc only if needed
@@ -80,6 +80,7 @@ class Stats:
         self.top_level = set()
         self.stats = {}
         self.sort_arg_dict = {}
+        self._sorted = {}        # cache of sort_stats(), by sort tuple
         self.load_stats(arg)
         try:
             self.get_top_level_stats()
@@ -93,13 +94,7 @@ class Stats:
             self.stats = {}
             return
         elif isinstance(arg, str):
-            with open(arg, 'rb') as f:
-                self.stats = marshal.load(f)
-            try:
-                file_stats = os.stat(arg)
-                arg = time.ctime(file_stats.st_mtime) + "    " + arg
-            except:  # in case this is not unix
-                pass
+            arg, self.stats = load_file(arg)
             self.files = [arg]
         elif hasattr(arg, 'create_stats'):
             arg.create_stats()
@@ -120,30 +115,83 @@ class Stats:
             if len(func_std_string(func)) > self.max_name_len:
                 self.max_name_len = len(func_std_string(func))
 
-    def add(self, *arg_list):
+    def add(self, *arg_list, workers=None):
         if not arg_list:
             return self
-        for item in reversed(arg_list):
-            if type(self) != type(item):
-                item = Stats(item)
-            self.files += item.files
-            self.total_calls += item.total_calls
-            self.prim_calls += item.prim_calls
-            self.total_tt += item.total_tt
-            for func in item.top_level:
-                self.top_level.add(func)
-
-            if self.max_name_len < item.max_name_len:
-                self.max_name_len = item.max_name_len
+        items = list(reversed(arg_list))
+        if workers is not None:
+            filenames = [item for item in items if isinstance(item, str)]
+            items = [item for item in items if not isinstance(item, str)]
+            self.add_files_parallel(filenames, workers)
+        for item in items:
+            if isinstance(item, str):
+                filename, stats = load_file(item)
+                if not stats:
+                    raise TypeError("Cannot create or construct a %r object "
+                                    "from %r" % (self.__class__, item))
+                files = [filename]
+            else:
+                if type(self) != type(item):
+                    item = Stats(item)
+                files, stats = item.files, item.stats
+            self.files += files
+            self.merge_stats(stats)
+        return self
 
-            self.fcn_list = None
+    def add_files_parallel(self, filenames, workers):
+        """Add the stats of dump files, loaded and merged by worker processes.
+
+        The files are split into one group per worker, and each worker
+        returns the sum of the stats of its group.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be greater than 0")
+        size = -(-len(filenames) // workers)
+        groups = [filenames[i:i+size] for i in range(0, len(filenames), size)]
+        if len(groups) <= 1:
+            for group in groups:
+                self.add(*reversed(group))
+            return self
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(len(groups)) as executor:
+            for files, data in executor.map(_merge_files, groups):
+                self.files += files
+                self.merge_stats(marshal.loads(data))
+        return self
 
-            for func, stat in item.stats.items():
-                if func in self.stats:
-                    old_func_stat = self.stats[func]
-                else:
-                    old_func_stat = (0, 0, 0, 0, {},)
-                self.stats[func] = add_func_stats(old_func_stat, stat)
+    def merge_stats(self, stats):
+        """Add a stats dict, as dumped by a profiler, to these stats.
+
+        The entries are updated in place, so that merging many profiles
+        costs time in proportion to their size only.
+        """
+        own_stats = self.stats
+        total_calls = prim_calls = 0
+        total_tt = 0
+        for func, (cc, nc, tt, ct, callers) in stats.items():
+            total_calls += nc
+            prim_calls += cc
+            total_tt += tt
+            if ("jprofile", 0, "profiler") in callers:
+                self.top_level.add(func)
+            old_func_stat = own_stats.get(func)
+            if old_func_stat is None:
+                # Copy the callers, which are updated by the next merges
+                own_stats[func] = cc, nc, tt, ct, dict(callers)
+                name_len = len(func_std_string(func))
+                if name_len > self.max_name_len:
+                    self.max_name_len = name_len
+            else:
+                t_cc, t_nc, t_tt, t_ct, t_callers = old_func_stat
+                add_callers_in_place(t_callers, callers)
+                own_stats[func] = (cc+t_cc, nc+t_nc, tt+t_tt, ct+t_ct,
+                                   t_callers)
+        self.total_calls += total_calls
+        self.prim_calls += prim_calls
+        self.total_tt += total_tt
+        self.fcn_list = None
+        self.all_callees = None
+        self._sorted = {}
         return self
 
     def dump_stats(self, filename):
@@ -209,16 +257,25 @@ class Stats:
             self.sort_type += connector + sort_arg_defs[word][1]
             connector = ", "
 
-        stats_list = []
-        for func, (cc, nc, tt, ct, callers) in self.stats.items():
-            stats_list.append((cc, nc, tt, ct) + func +
-                              (func_std_string(func), func))
-
-        stats_list.sort(key=cmp_to_key(TupleComp(sort_tuple).compare))
-
-        self.fcn_list = fcn_list = []
-        for tuple in stats_list:
-            fcn_list.append(tuple[-1])
+        # The order only depends on the stats, which are only changed by
+        # add() and strip_dirs()
+        fcn_list = self._sorted.get(sort_tuple)
+        if fcn_list is None:
+            stats_list = []
+            for func, (cc, nc, tt, ct, callers) in self.stats.items():
+                stats_list.append((cc, nc, tt, ct) + func +
+                                  (func_std_string(func), func))
+
+            # Sort by each field from the least significant one, relying on
+            # the stability of the sort.  This is equivalent to comparing
+            # with TupleComp(sort_tuple) but much faster.
+            for index, direction in reversed(sort_tuple):
+                stats_list.sort(key=itemgetter(index),
+                                reverse=(direction == -1))
+
+            fcn_list = self._sorted[sort_tuple] = [
+                tuple[-1] for tuple in stats_list]
+        self.fcn_list = fcn_list[:]
         return self
 
     def reverse_order(self):
@@ -253,10 +310,12 @@ class Stats:
 
         self.fcn_list = None
         self.all_callees = None
+        self._sorted = {}
         return self
 
     def calc_callees(self):
-        if self.all_callees:
+        # Computed once, until the stats change
+        if self.all_callees is not None:
             return
         self.all_callees = all_callees = {}
         for func, (cc, nc, tt, ct, callers) in self.stats.items():
@@ -454,6 +513,28 @@ class TupleComp:
         return 0
 
 
+#**************************************************************************
+# The following functions load and merge dump files
+#**************************************************************************
+
+def load_file(filename):
+    """Return the description and the stats dict of a dump file."""
+    with open(filename, 'rb') as f:
+        # marshal.load() reads a file in small chunks, which is much slower
+        stats = marshal.loads(f.read())
+    try:
+        file_stats = os.stat(filename)
+        filename = time.ctime(file_stats.st_mtime) + "    " + filename
+    except:  # in case this is not unix
+        pass
+    return filename, stats
+
+def _merge_files(filenames):
+    # Run by the worker processes of Stats.add_files_parallel()
+    stats = Stats()
+    stats.add(*reversed(filenames))
+    return stats.files, marshal.dumps(stats.stats)
+
 #**************************************************************************
 # func_name is a triple (file:string, line:int, name:string)
 
@@ -506,6 +587,19 @@ def add_callers(target, source):
             new_callers[func] = caller
     return new_callers
 
+def add_callers_in_place(target, source):
+    """Add a caller list to another one, which is updated in place."""
+    for func, caller in source.items():
+        if func in target:
+            if isinstance(caller, tuple):
+                # format used by cProfile
+                target[func] = tuple(map(add, caller, target[func]))
+            else:
+                # format used by profile
+                target[func] += caller
+        else:
+            target[func] = caller
+
 def count_calls(callers):
     """Sum the caller statistics to get total number of calls received."""
     nc = 0
@@ -8,7 +8,7 @@ from collections import deque
 from heapq import heappush, heappop
 from time import monotonic as time
 
-__all__ = ['Empty', 'Full', 'Queue', 'PriorityQueue', 'LifoQueue']
+__all__ = ['Empty', 'Full', 'Queue', 'PriorityQueue', 'LifoQueue', 'SPSCQueue']
 
 class Empty(Exception):
     'Exception raised by Queue.get(block=0)/get_nowait().'
@@ -175,6 +175,89 @@ class Queue:
             self.not_full.notify()
             return item
 
+    def put_many(self, items, block=True, timeout=None):
+        '''Put all the items of an iterable into the queue, in order.
+
+        The items are put in batches, under a single acquisition of the lock
+        for as many items as there are free slots.
+
+        If optional args 'block' is true and 'timeout' is None (the default),
+        block if necessary until free slots are available for all the items.
+        If 'timeout' is a non-negative number, it blocks at most 'timeout'
+        seconds and raises the Full exception if not all items could be put
+        within that time; the items put until then are left in the queue.
+        Otherwise ('block' is false), put the items if enough free slots are
+        immediately available for all of them, else raise the Full exception
+        without putting any ('timeout' is ignored in that case).
+        '''
+        items = list(items)
+        with self.not_full:
+            if self.maxsize <= 0:
+                self._put_items(items)
+                return
+            if not block:
+                if self._qsize() + len(items) > self.maxsize:
+                    raise Full
+                self._put_items(items)
+                return
+            if timeout is not None:
+                if timeout < 0:
+                    raise ValueError("'timeout' must be a non-negative number")
+                endtime = time() + timeout
+            start = 0
+            while True:
+                free = self.maxsize - self._qsize()
+                if free > 0:
+                    self._put_items(items[start:start + free])
+                    start += free
+                if start >= len(items):
+                    return
+                if timeout is None:
+                    self.not_full.wait()
+                else:
+                    remaining = endtime - time()
+                    if remaining <= 0.0:
+                        raise Full
+                    self.not_full.wait(remaining)
+
+    def _put_items(self, items):
+        for item in items:
+            self._put(item)
+        self.unfinished_tasks += len(items)
+        self.not_empty.notify(len(items))
+
+    def get_many(self, max_items=None, block=True, timeout=None):
+        '''Remove and return a list of items from the queue.
+
+        Wait for an item to be available as get() does, then remove and
+        return at most 'max_items' items (all the available items if
+        'max_items' is None), under a single acquisition of the lock.
+        '''
+        if max_items is not None and max_items < 1:
+            raise ValueError("'max_items' must be a positive number")
+        with self.not_empty:
+            if not block:
+                if not self._qsize():
+                    raise Empty
+            elif timeout is None:
+                while not self._qsize():
+                    self.not_empty.wait()
+            elif timeout < 0:
+                raise ValueError("'timeout' must be a non-negative number")
+            else:
+                endtime = time() + timeout
+                while not self._qsize():
+                    remaining = endtime - time()
+                    if remaining <= 0.0:
+                        raise Empty
+                    self.not_empty.wait(remaining)
+            count = self._qsize()
+            if max_items is not None:
+                count = min(count, max_items)
+            items = [self._get() for i in range(count)]
+            self.not_full.notify(count)
+            return items
+
     def put_nowait(self, item):
         '''Put an item into the queue without blocking.
 
@@ -244,3 +327,115 @@ class LifoQueue(Queue):
 
     def _get(self):
         return self.queue.pop()
+
+
+class SPSCQueue:
+    '''Create an unbounded single-producer, single-consumer queue.
+
+    Items are appended to and popped from a deque, whose operations are
+    atomic, so that no lock is taken unless the consumer has to wait for an
+    item.  Only one thread may get items at a time.
+    '''
+
+    def __init__(self):
+        self.queue = deque()
+        self._not_empty = threading.Condition(threading.Lock())
+        # Set by the consumer, under the lock, before it waits for an item
+        self._waiting = False
+
+    def qsize(self):
+        '''Return the approximate size of the queue (not reliable!).'''
+        return len(self.queue)
+
+    def empty(self):
+        '''Return True if the queue is empty, False otherwise (not reliable!).
+        '''
+        return not self.queue
+
+    def put(self, item, block=True, timeout=None):
+        '''Put an item into the queue.
+
+        The queue is unbounded, so this never blocks: the optional args
+        'block' and 'timeout' are ignored and only provided for compatibility
+        with the Queue class.
+        '''
+        self.queue.append(item)
+        if self._waiting:
+            with self._not_empty:
+                self._not_empty.notify()
+
+    def put_many(self, items, block=True, timeout=None):
+        '''Put all the items of an iterable into the queue, in order.
+
+        The optional args 'block' and 'timeout' are ignored, as for put().
+        '''
+        self.queue.extend(list(items))
+        if self._waiting:
+            with self._not_empty:
+                self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        '''Remove and return an item from the queue.
+
+        The optional args 'block' and 'timeout' have the same meaning as for
+        Queue.get().
+        '''
+        try:
+            return self.queue.popleft()
+        except IndexError:
+            if not block:
+                raise Empty from None
+        self._wait(timeout)
+        return self.queue.popleft()
+
+    def get_many(self, max_items=None, block=True, timeout=None):
+        '''Remove and return a list of items from the queue.
+
+        Wait for an item to be available as get() does, then remove and
+        return at most 'max_items' items (all the available items if
+        'max_items' is None).
+        '''
+        if max_items is not None and max_items < 1:
+            raise ValueError("'max_items' must be a positive number")
+        if not self.queue:
+            if not block:
+                raise Empty
+            self._wait(timeout)
+        # The producer may append items meanwhile: only take those we counted
+        count = len(self.queue)
+        if max_items is not None:
+            count = min(count, max_items)
+        popleft = self.queue.popleft
+        return [popleft() for i in range(count)]
+
+    def put_nowait(self, item):
+        '''Put an item into the queue without blocking.'''
+        return self.put(item, block=False)
+
+    def get_nowait(self):
+        '''Remove and return an item from the queue without blocking.
+
+        Only get an item if one is immediately available. Otherwise
+        raise the Empty exception.
+        '''
+        return self.get(block=False)
+
+    def _wait(self, timeout):
+        if timeout is not None:
+            if timeout < 0:
+                raise ValueError("'timeout' must be a non-negative number")
+            endtime = time() + timeout
+        with self._not_empty:
+            self._waiting = True
+            try:
+                # The items put before the flag was set are visible now
+                while not self.queue:
+                    if timeout is None:
+                        self._not_empty.wait()
+                    else:
+                        remaining = endtime - time()
+                        if remaining <= 0.0:
+                            raise Empty
+                        self._not_empty.wait(remaining)
+            finally:
+                self._waiting = False
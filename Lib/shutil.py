@@ -36,6 +36,11 @@ try:
 except ImportError:
     getgrnam = None
 
+_WINDOWS = os.name == 'nt'
+COPY_BUFSIZE = 1024 * 1024 if _WINDOWS else 64 * 1024
+_USE_CP_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+_USE_CP_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
 __all__ = ["copyfileobj", "copyfile", "copymode", "copystat", "copy", "copy2",
            "copytree", "move", "rmtree", "Error", "SpecialFileError",
            "ExecError", "make_archive", "get_archive_formats",
@@ -66,14 +71,151 @@ class RegistryError(Exception):
     """Raised when a registry operation with the archiving
     and unpacking registeries fails"""
 
+class _GiveupOnFastCopy(Exception):
+    """Raised as a signal to fallback on using raw read()/write()
+    file copy when fast-copy functions fail to do so.
+    """
+
+def _fastcopy_blocksize(infd):
+    """Return the chunk size to pass to the zero-copy syscalls.
+
+    Hopefully the whole file will be copied in a single call.  The
+    syscalls are repeated until EOF is reached (0 return), so a size
+    smaller or bigger than the actual file size does not make any
+    difference, also in case the file content changes while being copied.
+    """
+    try:
+        blocksize = max(os.fstat(infd).st_size, 2 ** 23)  # min 8MiB
+    except OSError:
+        blocksize = 2 ** 27  # 128MiB
+    # On 32-bit architectures truncate to 1GiB to avoid OverflowError.
+    if sys.maxsize < 2 ** 32:
+        blocksize = min(blocksize, 2 ** 30)
+    return blocksize
 
-def copyfileobj(fsrc, fdst, length=16*1024):
+def _fastcopy_fds(fsrc, fdst):
+    try:
+        return fsrc.fileno(), fdst.fileno()
+    except Exception as err:
+        raise _GiveupOnFastCopy(err)  # not a regular file
+
+def _fastcopy_copy_file_range(fsrc, fdst):
+    """Copy data from one regular file to another by using the
+    copy_file_range(2) syscall.  The data never leaves the kernel, and
+    the filesystem may use reflinks or server-side copies.
+    This should work on Linux >= 4.5 only.
+    """
+    global _USE_CP_COPY_FILE_RANGE
+    infd, outfd = _fastcopy_fds(fsrc, fdst)
+    blocksize = _fastcopy_blocksize(infd)
+    offset = 0
+    while True:
+        try:
+            copied = os.copy_file_range(infd, outfd, blocksize, offset)
+        except OSError as err:
+            # ...in order to have a more informative exception.
+            err.filename = fsrc.name
+            err.filename2 = fdst.name
+
+            if err.errno in (errno.ENOSYS, errno.EPERM):
+                # The kernel or a seccomp policy does not allow the
+                # syscall at all.
+                _USE_CP_COPY_FILE_RANGE = False
+                raise _GiveupOnFastCopy(err)
+
+            if err.errno == errno.ENOSPC:  # filesystem is full
+                raise err from None
+
+            # Give up on first call and if no data was copied (e.g. EXDEV
+            # when the files are on different filesystems).
+            if offset == 0 and os.lseek(outfd, 0, os.SEEK_CUR) == 0:
+                raise _GiveupOnFastCopy(err)
+
+            raise err
+        else:
+            if copied == 0:
+                # Some filesystems (e.g. procfs) report a size but make
+                # copy_file_range() copy nothing, let read() handle them.
+                if offset == 0:
+                    raise _GiveupOnFastCopy()
+                break  # EOF
+            offset += copied
+
+def _fastcopy_sendfile(fsrc, fdst):
+    """Copy data from one regular mmap-like fd to another by using the
+    sendfile(2) syscall.
+    This should work on Linux >= 2.6.33 only.
+    """
+    # Note: copyfileobj() is left alone in order to not introduce any
+    # unexpected breakage. Possible risks by using zero-copy calls
+    # in copyfileobj() are:
+    # - fdst cannot be open in "a"(ppend) mode
+    # - fsrc and fdst may be open in "t"(ext) mode
+    # - fsrc may be a BufferedReader (which hides unread data in a buffer),
+    #   GzipFile (which decompresses data), HTTPResponse (which decodes
+    #   chunks).
+    # - possibly others (e.g. encrypted fs/partition?)
+    global _USE_CP_SENDFILE
+    infd, outfd = _fastcopy_fds(fsrc, fdst)
+    blocksize = _fastcopy_blocksize(infd)
+    offset = 0
+    while True:
+        try:
+            sent = os.sendfile(outfd, infd, offset, blocksize)
+        except OSError as err:
+            # ...in order to have a more informative exception.
+            err.filename = fsrc.name
+            err.filename2 = fdst.name
+
+            if err.errno == errno.ENOTSOCK:
+                # sendfile() on this platform (probably Linux < 2.6.33)
+                # does not support copies between regular files (only
+                # sockets).
+                _USE_CP_SENDFILE = False
+                raise _GiveupOnFastCopy(err)
+
+            if err.errno == errno.ENOSPC:  # filesystem is full
+                raise err from None
+
+            # Give up on first call and if no data was copied.
+            if offset == 0 and os.lseek(outfd, 0, os.SEEK_CUR) == 0:
+                raise _GiveupOnFastCopy(err)
+
+            raise err
+        else:
+            if sent == 0:
+                break  # EOF
+            offset += sent
+
+def _copyfileobj_readinto(fsrc, fdst, length=COPY_BUFSIZE):
+    """readinto()/memoryview() based variant of copyfileobj().
+    *fsrc* must support readinto() method and both files must be
+    open in binary mode.
+    """
+    # Localize variable access to minimize overhead.
+    fsrc_readinto = fsrc.readinto
+    fdst_write = fdst.write
+    with memoryview(bytearray(length)) as mv:
+        while True:
+            n = fsrc_readinto(mv)
+            if not n:
+                break
+            elif n < length:
+                with mv[:n] as smv:
+                    fdst_write(smv)
+            else:
+                fdst_write(mv)
+
+def copyfileobj(fsrc, fdst, length=COPY_BUFSIZE):
     """copy data from file-like object fsrc to file-like object fdst"""
-    while 1:
-        buf = fsrc.read(length)
+    # Localize variable access to minimize overhead.
+    fsrc_read = fsrc.read
+    fdst_write = fdst.write
+    while True:
+        buf = fsrc_read(length)
         if not buf:
             break
-        fdst.write(buf)
+        fdst_write(buf)
 
 def _samefile(src, dst):
     # Macintosh, Unix.
@@ -111,8 +253,31 @@ def copyfile(src, dst, *, follow_symlinks=True):
     if not follow_symlinks and os.path.islink(src):
         os.symlink(os.readlink(src), dst)
     else:
-        with open(src, 'rb') as fsrc:
-            with open(dst, 'wb') as fdst:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            # Linux: let the kernel copy the data.
+            if _USE_CP_COPY_FILE_RANGE:
+                try:
+                    _fastcopy_copy_file_range(fsrc, fdst)
+                    return dst
+                except _GiveupOnFastCopy:
+                    pass
+            if _USE_CP_SENDFILE:
+                try:
+                    _fastcopy_sendfile(fsrc, fdst)
+                    return dst
+                except _GiveupOnFastCopy:
+                    pass
+
+            # Other platforms, or the fast paths were refused: copy
+            # through a single reused buffer sized after the file.
+            try:
+                file_size = os.fstat(fsrc.fileno()).st_size
+            except OSError:
+                file_size = 0
+            if file_size > 0:
+                _copyfileobj_readinto(fsrc, fdst,
+                                      min(file_size, COPY_BUFSIZE))
+            else:
                 copyfileobj(fsrc, fdst)
     return dst
 
@@ -264,8 +429,82 @@ def ignore_patterns(*patterns):
         return set(ignored_names)
     return _ignore_patterns
 
+def _copytree_walk(src, dst, symlinks, ignore, copy_function,
+                   ignore_dangling_symlinks, executor, steps):
+    # Walk the tree like copytree() does, creating directories and symlinks
+    # right away but handing the file copies over to *executor*.  *steps*
+    # receives, in the order copytree() would perform them, a
+    # (srcname, dstname, future) triple for each file copy, a
+    # (srcname, dstname, exception) triple for each failure met during the
+    # walk and a (src, dst, None) triple for the final copystat() of each
+    # directory, which must wait for the files it contains.
+    names = os.listdir(src)
+    if ignore is not None:
+        ignored_names = ignore(src, names)
+    else:
+        ignored_names = set()
+
+    os.makedirs(dst)
+    for name in names:
+        if name in ignored_names:
+            continue
+        srcname = os.path.join(src, name)
+        dstname = os.path.join(dst, name)
+        try:
+            if os.path.islink(srcname):
+                linkto = os.readlink(srcname)
+                if symlinks:
+                    os.symlink(linkto, dstname)
+                    copystat(srcname, dstname, follow_symlinks=not symlinks)
+                else:
+                    if not os.path.exists(linkto) and ignore_dangling_symlinks:
+                        continue
+                    if os.path.isdir(srcname):
+                        _copytree_walk(srcname, dstname, symlinks, ignore,
+                                       copy_function, False, executor, steps)
+                    else:
+                        steps.append((srcname, dstname,
+                            executor.submit(copy_function, srcname, dstname)))
+            elif os.path.isdir(srcname):
+                _copytree_walk(srcname, dstname, symlinks, ignore,
+                               copy_function, False, executor, steps)
+            else:
+                steps.append((srcname, dstname,
+                    executor.submit(copy_function, srcname, dstname)))
+        except (Error, OSError) as err:
+            steps.append((srcname, dstname, err))
+    steps.append((src, dst, None))
+
+def _copytree_parallel(src, dst, symlinks, ignore, copy_function,
+                       ignore_dangling_symlinks, workers):
+    from concurrent.futures import ThreadPoolExecutor
+
+    steps = []
+    errors = []
+    with ThreadPoolExecutor(workers) as executor:
+        _copytree_walk(src, dst, symlinks, ignore, copy_function,
+                       ignore_dangling_symlinks, executor, steps)
+        for srcname, dstname, outcome in steps:
+            try:
+                if outcome is None:
+                    copystat(srcname, dstname)
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                else:
+                    outcome.result()
+            except Error as err:
+                errors.extend(err.args[0])
+            except OSError as why:
+                # Copying file access times may fail on Windows
+                if (outcome is not None or
+                    getattr(why, 'winerror', None) is None):
+                    errors.append((srcname, dstname, str(why)))
+    if errors:
+        raise Error(errors)
+    return dst
+
 def copytree(src, dst, symlinks=False, ignore=None, copy_function=copy2,
-             ignore_dangling_symlinks=False):
+             ignore_dangling_symlinks=False, *, workers=None):
     """Recursively copy a directory tree.
 
     The destination directory must not already exist.
@@ -299,7 +538,16 @@ def copytree(src, dst, symlinks=False, ignore=None, copy_function=copy2,
     destination path as arguments. By default, copy2() is used, but any
     function that supports the same signature (like copy()) can be used.
 
+    The optional workers argument is the number of threads used to copy
+    the files.  The directory tree is still walked sequentially, but the
+    calls to copy_function are spread over a thread pool, which must then
+    be safe to call concurrently.  Errors are collected and reported in the
+    same order as for a sequential copy.
+
     """
+    if workers is not None:
+        return _copytree_parallel(src, dst, symlinks, ignore, copy_function,
+                                  ignore_dangling_symlinks, workers)
     names = os.listdir(src)
     if ignore is not None:
         ignored_names = ignore(src, names)
@@ -353,8 +601,17 @@ def copytree(src, dst, symlinks=False, ignore=None, copy_function=copy2,
         raise Error(errors)
     return dst
 
+def _rmtree_report(unlinks, onerror):
+    # Report the failures of the unlink() calls handed over to a thread
+    # pool, in the order they were submitted.
+    for fullname, future in unlinks:
+        try:
+            future.result()
+        except OSError:
+            onerror(os.unlink, fullname, sys.exc_info())
+
 # version vulnerable to race conditions
-def _rmtree_unsafe(path, onerror):
+def _rmtree_unsafe(path, onerror, executor=None):
     try:
         if os.path.islink(path):
             # symlinks to directories are forbidden, see bug #1669
@@ -368,6 +625,7 @@ def _rmtree_unsafe(path, onerror):
         names = os.listdir(path)
     except OSError:
         onerror(os.listdir, path, sys.exc_info())
+    unlinks = []
     for name in names:
         fullname = os.path.join(path, name)
         try:
@@ -375,84 +633,83 @@ def _rmtree_unsafe(path, onerror):
         except OSError:
             mode = 0
         if stat.S_ISDIR(mode):
-            _rmtree_unsafe(fullname, onerror)
+            _rmtree_unsafe(fullname, onerror, executor)
+        elif executor is not None:
+            unlinks.append((fullname, executor.submit(os.unlink, fullname)))
         else:
             try:
                 os.unlink(fullname)
             except OSError:
                 onerror(os.unlink, fullname, sys.exc_info())
+    _rmtree_report(unlinks, onerror)
     try:
         os.rmdir(path)
     except OSError:
         onerror(os.rmdir, path, sys.exc_info())
 
 # Version using fd-based APIs to protect against races
-def _rmtree_safe_fd(topfd, path, onerror):
+def _rmtree_safe_fd(topfd, path, onerror, executor=None):
     names = []
     try:
         names = os.listdir(topfd)
     except OSError as err:
         err.filename = path
         onerror(os.listdir, path, sys.exc_info())
-    for name in names:
-        fullname = os.path.join(path, name)
-        try:
-            orig_st = os.stat(name, dir_fd=topfd, follow_symlinks=False)
-            mode = orig_st.st_mode
-        except OSError:
-            mode = 0
-        if stat.S_ISDIR(mode):
+    unlinks = []
+    try:
+        for name in names:
+            fullname = os.path.join(path, name)
             try:
-                dirfd = os.open(name, os.O_RDONLY, dir_fd=topfd)
+                orig_st = os.stat(name, dir_fd=topfd, follow_symlinks=False)
+                mode = orig_st.st_mode
             except OSError:
-                onerror(os.open, fullname, sys.exc_info())
+                mode = 0
+            if stat.S_ISDIR(mode):
+                try:
+                    dirfd = os.open(name, os.O_RDONLY, dir_fd=topfd)
+                except OSError:
+                    onerror(os.open, fullname, sys.exc_info())
+                else:
+                    try:
+                        if os.path.samestat(orig_st, os.fstat(dirfd)):
+                            _rmtree_safe_fd(dirfd, fullname, onerror, executor)
+                            try:
+                                os.rmdir(name, dir_fd=topfd)
+                            except OSError:
+                                onerror(os.rmdir, fullname, sys.exc_info())
+                        else:
+                            try:
+                                # This can only happen if someone replaces
+                                # a directory with a symlink after the call to
+                                # stat.S_ISDIR above.
+                                raise OSError("Cannot call rmtree on a "
+                                              "symbolic link")
+                            except OSError:
+                                onerror(os.path.islink, fullname,
+                                        sys.exc_info())
+                    finally:
+                        os.close(dirfd)
+            elif executor is not None:
+                unlinks.append((fullname, executor.submit(os.unlink, name,
+                                                          dir_fd=topfd)))
             else:
                 try:
-                    if os.path.samestat(orig_st, os.fstat(dirfd)):
-                        _rmtree_safe_fd(dirfd, fullname, onerror)
-                        try:
-                            os.rmdir(name, dir_fd=topfd)
-                        except OSError:
-                            onerror(os.rmdir, fullname, sys.exc_info())
-                    else:
-                        try:
-                            # This can only happen if someone replaces
-                            # a directory with a symlink after the call to
-                            # stat.S_ISDIR above.
-                            raise OSError("Cannot call rmtree on a symbolic "
-                                          "link")
-                        except OSError:
-                            onerror(os.path.islink, fullname, sys.exc_info())
-                finally:
-                    os.close(dirfd)
-        else:
-            try:
-                os.unlink(name, dir_fd=topfd)
-            except OSError:
-                onerror(os.unlink, fullname, sys.exc_info())
+                    os.unlink(name, dir_fd=topfd)
+                except OSError:
+                    onerror(os.unlink, fullname, sys.exc_info())
+    finally:
+        # The pending unlink() calls need topfd, which the caller closes
+        # as soon as we return, even if an onerror hook raised.
+        for fullname, future in unlinks:
+            future.exception()
+    _rmtree_report(unlinks, onerror)
 
 _use_fd_functions = ({os.open, os.stat, os.unlink, os.rmdir} <=
                      os.supports_dir_fd and
                      os.listdir in os.supports_fd and
                      os.stat in os.supports_follow_symlinks)
 
-def rmtree(path, ignore_errors=False, onerror=None):
-    """Recursively delete a directory tree.
-
-    If ignore_errors is set, errors are ignored; otherwise, if onerror
-    is set, it is called to handle the error with arguments (func,
-    path, exc_info) where func is platform and implementation dependent;
-    path is the argument to that function that caused it to fail; and
-    exc_info is a tuple returned by sys.exc_info().  If ignore_errors
-    is false and onerror is None, an exception is raised.
-
-    """
-    if ignore_errors:
-        def onerror(*args):
-            pass
-    elif onerror is None:
-        def onerror(*args):
-            raise
+def _rmtree(path, onerror, executor):
     if _use_fd_functions:
         # While the unsafe rmtree works fine on bytes, the fd based does not.
         if isinstance(path, bytes):
@@ -471,7 +728,7 @@ def rmtree(path, ignore_errors=False, onerror=None):
             return
         try:
             if os.path.samestat(orig_st, os.fstat(fd)):
-                _rmtree_safe_fd(fd, path, onerror)
+                _rmtree_safe_fd(fd, path, onerror, executor)
                 try:
                     os.rmdir(path)
                 except OSError:
@@ -485,7 +742,36 @@ def rmtree(path, ignore_errors=False, onerror=None):
         finally:
             os.close(fd)
     else:
-        return _rmtree_unsafe(path, onerror)
+        return _rmtree_unsafe(path, onerror, executor)
+
+def rmtree(path, ignore_errors=False, onerror=None, *, workers=None):
+    """Recursively delete a directory tree.
+
+    If ignore_errors is set, errors are ignored; otherwise, if onerror
+    is set, it is called to handle the error with arguments (func,
+    path, exc_info) where func is platform and implementation dependent;
+    path is the argument to that function that caused it to fail; and
+    exc_info is a tuple returned by sys.exc_info().  If ignore_errors
+    is false and onerror is None, an exception is raised.
+
+    The optional workers argument is the number of threads used to
+    unlink the files.  Directories are still walked sequentially and
+    onerror is always called from the calling thread: the failures of
+    the files of a directory are reported in listing order, after those
+    of its subdirectories.
+
+    """
+    if ignore_errors:
+        def onerror(*args):
+            pass
+    elif onerror is None:
+        def onerror(*args):
+            raise
+    if workers is None:
+        return _rmtree(path, onerror, None)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(workers) as executor:
+        return _rmtree(path, onerror, executor)
 
 # Allow introspection of whether or not the hardening against symlink
 # attacks is supported on the current platform
@@ -0,0 +1,329 @@
+#! /usr/bin/env python3
+
+"""Sampling profiler.
+
+Unlike the 'profile' and 'cProfile' modules, which record every call and
+return, the profiler takes snapshots of the stacks of all the threads at a
+regular interval, so that its overhead does not depend on the number of
+calls.  The times are estimated from the number of samples in which each
+function is running or on the stack.  The results can be reported with
+the 'pstats' module, or written as collapsed stacks for flame graphs.
+"""
+
+__all__ = ["run", "runctx", "Profile"]
+
+import signal
+import sys
+import threading
+import time
+import profile as _pyprofile
+
+# ____________________________________________________________
+# Simple interface
+
+def run(statement, filename=None, sort=-1):
+    return _pyprofile._Utils(Profile).run(statement, filename, sort)
+
+def runctx(statement, globals, locals, filename=None, sort=-1):
+    return _pyprofile._Utils(Profile).runctx(statement, globals, locals,
+                                             filename, sort)
+
+run.__doc__ = _pyprofile.run.__doc__
+runctx.__doc__ = _pyprofile.runctx.__doc__
+
+# ____________________________________________________________
+
+class Profile:
+    """Profile(interval=0.005, *, mode='thread')
+
+    Builds a profiler object sampling the stacks of all the threads every
+    interval seconds.  If mode is 'thread', the samples are taken by a
+    background thread, counting the wall-clock time.  If mode is 'signal',
+    they are taken by a SIGPROF handler in the main thread, counting the
+    CPU time of the process; this is only available on Unix.
+    """
+
+    def __init__(self, interval=0.005, *, mode='thread'):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if mode not in ('thread', 'signal'):
+            raise ValueError("mode must be 'thread' or 'signal', not %r"
+                             % (mode,))
+        self.interval = interval
+        self.mode = mode
+        self._thread = None
+        self._stop = None
+        self._previous_handler = None
+        self._last = None
+        self.clear()
+
+    def clear(self):
+        """Forget the samples taken so far."""
+        # Maps the stacks, as tuples of the ids of their code objects from
+        # the innermost one, to the number of samples.  The code objects
+        # are kept alive by self._codes, so that their ids are not reused.
+        self._stacks = {}
+        self._codes = {}
+        self._ticks = 0
+        self._elapsed = 0.0
+        self.stats = {}
+
+    def enable(self):
+        """Start taking samples."""
+        if self._thread is not None or self._previous_handler is not None:
+            return
+        if self.mode == 'thread':
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run,
+                                            name='sprofile sampler',
+                                            daemon=True)
+            self._thread.start()
+        else:
+            self._previous_handler = signal.signal(signal.SIGPROF,
+                                                   self._handle_signal)
+            # The timer may fire less often than asked, so the CPU time
+            # between the samples is measured rather than assumed
+            self._last = time.process_time()
+            signal.setitimer(signal.ITIMER_PROF, self.interval,
+                             self.interval)
+
+    def disable(self):
+        """Stop taking samples."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        elif self._previous_handler is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+
+    def _run(self):
+        ident = threading.get_ident()
+        wait = self._stop.wait
+        interval = self.interval
+        last = time.perf_counter()
+        while not wait(interval):
+            now = time.perf_counter()
+            frames = sys._current_frames()
+            del frames[ident]
+            self._sample(frames.values(), now - last)
+            last = now
+
+    def _handle_signal(self, signum, frame):
+        now = time.process_time()
+        frames = sys._current_frames()
+        # Replace the frame of this handler by the interrupted one
+        frames[threading.get_ident()] = frame
+        self._sample(frames.values(), now - self._last)
+        self._last = now
+
+    def _sample(self, frames, elapsed):
+        stacks = self._stacks
+        for frame in frames:
+            codes = []
+            append = codes.append
+            while frame is not None:
+                append(frame.f_code)
+                frame = frame.f_back
+            key = tuple(map(id, codes))
+            if key in stacks:
+                stacks[key] += 1
+            else:
+                # Register the codes first: the stacks may be copied by
+                # another thread at any time, and their codes must be known
+                for code in codes:
+                    self._codes[id(code)] = code
+                stacks[key] = 1
+        self._ticks += 1
+        self._elapsed += elapsed
+
+    def _snapshot(self):
+        # Copy the samples, which the sampler may be adding to while they
+        # are read
+        if self._previous_handler is not None and \
+           hasattr(signal, 'pthread_sigmask'):
+            mask = signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGPROF])
+            try:
+                return self._copy_samples()
+            finally:
+                signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+        return self._copy_samples()
+
+    def _copy_samples(self):
+        # The stacks are copied before the codes, which _sample() registers
+        # before adding the stacks
+        stacks = dict(self._stacks)
+        return stacks, dict(self._codes), self._ticks, self._elapsed
+
+    def create_stats(self):
+        self.disable()
+        self.snapshot_stats()
+
+    def snapshot_stats(self):
+        """Build the stats dict read by pstats.
+
+        The call counts are the numbers of samples in which a function is
+        on the stack.  The internal and cumulative times are estimated from
+        the numbers of samples in which it is running and on the stack.
+        """
+        stacks, codes, ticks, elapsed = self._snapshot()
+        # The mean time between the samples
+        unit = elapsed / ticks if ticks else self.interval
+        labels = {code_id: label(code) for code_id, code in codes.items()}
+        # [samples, running, callers], callers map to [samples, running]
+        entries = {}
+        for key, count in stacks.items():
+            seen = set()
+            callee = None
+            for depth, code_id in enumerate(key):
+                func = labels[code_id]
+                entry = entries.get(func)
+                if entry is None:
+                    entry = entries[func] = [0, 0, {}]
+                if func not in seen:
+                    seen.add(func)
+                    entry[0] += count
+                    if not depth:
+                        entry[1] += count
+                if callee is not None:
+                    edge = callee, func
+                    callers = entries[callee][2]
+                    if edge not in seen:
+                        seen.add(edge)
+                        calls = callers.get(func)
+                        if calls is None:
+                            calls = callers[func] = [0, 0]
+                        calls[0] += count
+                        if depth == 1:
+                            calls[1] += count
+                callee = func
+        self.stats = {}
+        for func, (samples, running, callers) in entries.items():
+            callers = {caller: (n, n, tt * unit, n * unit)
+                       for caller, (n, tt) in callers.items()}
+            self.stats[func] = (samples, samples, running * unit,
+                                samples * unit, callers)
+
+    def collapsed_stacks(self):
+        """Return the samples as a list of collapsed stacks.
+
+        Each line holds the functions of a stack from the outermost one,
+        separated by semicolons, and the number of samples, as expected
+        by the flame graph tools.
+        """
+        stacks, codes, ticks, elapsed = self._snapshot()
+        names = {code_id: '%s (%s:%d)' % (code.co_name, code.co_filename,
+                                          code.co_firstlineno)
+                 for code_id, code in codes.items()}
+        counts = {}
+        for key, count in stacks.items():
+            line = ';'.join([names[code_id] for code_id in reversed(key)])
+            counts[line] = counts.get(line, 0) + count
+        return ['%s %d\n' % item for item in sorted(counts.items())]
+
+    def print_stats(self, sort=-1):
+        import pstats
+        pstats.Stats(self).strip_dirs().sort_stats(sort).print_stats()
+
+    def dump_stats(self, file):
+        import marshal
+        with open(file, 'wb') as f:
+            self.create_stats()
+            marshal.dump(self.stats, f)
+
+    def dump_collapsed(self, file):
+        """Write the collapsed stacks to file, for flame graphs."""
+        self.disable()
+        with open(file, 'w') as f:
+            f.writelines(self.collapsed_stacks())
+
+    # The following two methods can be called by clients to use
+    # a profiler to profile a statement, given as a string.
+
+    def run(self, cmd):
+        import __main__
+        dict = __main__.__dict__
+        return self.runctx(cmd, dict, dict)
+
+    def runctx(self, cmd, globals, locals):
+        self.enable()
+        try:
+            exec(cmd, globals, locals)
+        finally:
+            self.disable()
+        return self
+
+    # This method is more useful to profile a single function call.
+    def runcall(self, func, *args, **kw):
+        self.enable()
+        try:
+            return func(*args, **kw)
+        finally:
+            self.disable()
+
+# ____________________________________________________________
+
+def label(code):
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+# ____________________________________________________________
+
+def main():
+    import os
+    from optparse import OptionParser
+    usage = ("sprofile.py [-o output_file_path] [-c collapsed_file_path] "
+             "[-s sort] [-i interval] [-m mode] scriptfile [arg] ...")
+    parser = OptionParser(usage=usage)
+    parser.allow_interspersed_args = False
+    parser.add_option('-o', '--outfile', dest="outfile",
+        help="Save stats to <outfile>", default=None)
+    parser.add_option('-c', '--collapsed', dest="collapsed",
+        help="Save collapsed stacks for flame graphs to <collapsed>",
+        default=None)
+    parser.add_option('-s', '--sort', dest="sort",
+        help="Sort order when printing to stdout, based on pstats.Stats class",
+        default=-1)
+    parser.add_option('-i', '--interval', dest="interval", type="float",
+        help="Sampling interval in seconds", default=0.005)
+    parser.add_option('-m', '--mode', dest="mode", choices=('thread', 'signal'),
+        help="Sample from a 'thread' (wall-clock time) or from a 'signal' "
+             "handler (CPU time)", default='thread')
+
+    if not sys.argv[1:]:
+        parser.print_usage()
+        sys.exit(2)
+
+    (options, args) = parser.parse_args()
+    sys.argv[:] = args
+
+    if len(args) > 0:
+        progname = args[0]
+        sys.path.insert(0, os.path.dirname(progname))
+        with open(progname, 'rb') as fp:
+            code = compile(fp.read(), progname, 'exec')
+        globs = {
+            '__file__': progname,
+            '__name__': '__main__',
+            '__package__': None,
+            '__cached__': None,
+        }
+        prof = Profile(options.interval, mode=options.mode)
+        try:
+            prof.runctx(code, globs, None)
+        except SystemExit:
+            pass
+        finally:
+            if options.collapsed is not None:
+                prof.dump_collapsed(options.collapsed)
+            if options.outfile is not None:
+                prof.dump_stats(options.outfile)
+            else:
+                prof.print_stats(options.sort)
+    else:
+        parser.print_usage()
+    return parser
+
+# When invoked as main program, invoke the profiler on a script
+if __name__ == '__main__':
+    main()
@@ -1752,6 +1752,31 @@ class _TestPool(BaseTestCase):
         except multiprocessing.TimeoutError:
             self.fail("pool.map_async with chunksize stalled on null list")
 
+    def test_map_auto_chunksize(self):
+        pmap = self.pool.map
+        self.assertEqual(pmap(sqr, list(range(1000)), chunksize='auto'),
+                         list(map(sqr, list(range(1000)))))
+        self.assertEqual(pmap(sqr, [], chunksize='auto'), [])
+        tuples = list(zip(range(100), range(99,-1, -1)))
+        self.assertEqual(self.pool.starmap(mul, tuples, chunksize='auto'),
+                         list(itertools.starmap(mul, tuples)))
+        # Heavy-tailed costs
+        waits = [0.05 if i % 20 == 0 else 0.0 for i in range(100)]
+        self.assertEqual(self.pool.starmap(sqr, zip(range(100), waits),
+                                           chunksize='auto'),
+                         list(map(sqr, list(range(100)))))
+        with self.assertRaises(ZeroDivisionError):
+            self.pool.starmap(operator.truediv,
+                              [(1, i) for i in range(-50, 50)],
+                              chunksize='auto')
+
+    def test_map_async_auto_chunksize(self):
+        call_args = self.manager.list() if self.TYPE == 'manager' else []
+        self.pool.map_async(sqr, list(range(100)), chunksize='auto',
+                            callback=call_args.append,
+                            error_callback=call_args.append).wait()
+        self.assertEqual(list(call_args), [list(map(sqr, list(range(100))))])
+
     def test_async(self):
         res = self.pool.apply_async(sqr, (7, TIMEOUT1,))
         get = TimingWrapper(res.get)
@@ -1778,6 +1803,11 @@ class _TestPool(BaseTestCase):
             self.assertEqual(next(it), i*i)
         self.assertRaises(StopIteration, it.__next__)
 
+        it = self.pool.imap(sqr, iter(range(1000)), chunksize='auto')
+        for i in range(1000):
+            self.assertEqual(next(it), i*i)
+        self.assertRaises(StopIteration, it.__next__)
+
     def test_imap_handle_iterable_exception(self):
         if self.TYPE == 'manager':
             self.skipTest('test not appropriate for {}'.format(self.TYPE))
@@ -1796,6 +1826,11 @@ class _TestPool(BaseTestCase):
         for i in range(4):
             self.assertEqual(next(it), i*i)
         self.assertRaises(SayWhenError, it.__next__)
+        it = self.pool.imap(sqr, exception_throwing_generator(20, 7), 'auto')
+        with self.assertRaises(SayWhenError):
+            for i in range(7):
+                self.assertEqual(next(it), i*i)
+            next(it)
 
     def test_imap_unordered(self):
         it = self.pool.imap_unordered(sqr, list(range(1000)))
@@ -1804,6 +1839,10 @@ class _TestPool(BaseTestCase):
         it = self.pool.imap_unordered(sqr, list(range(1000)), chunksize=53)
         self.assertEqual(sorted(it), list(map(sqr, list(range(1000)))))
 
+        it = self.pool.imap_unordered(sqr, iter(range(1000)),
+                                      chunksize='auto')
+        self.assertEqual(sorted(it), list(map(sqr, list(range(1000)))))
+
     def test_imap_unordered_handle_iterable_exception(self):
         if self.TYPE == 'manager':
             self.skipTest('test not appropriate for {}'.format(self.TYPE))
@@ -22,6 +22,9 @@ from pickle import bytes_types
 requires_32b = unittest.skipUnless(sys.maxsize < 2**32,
                                    "test is only meaningful on 32-bit builds")
 
+requires_picklebuffer = unittest.skipUnless(hasattr(pickle, 'PickleBuffer'),
+                                            "requires pickle.PickleBuffer")
+
 # Tests that try a number of pickle protocols should have a
 #     for proto in protocols:
 # kind of outer loop.
@@ -1416,6 +1419,32 @@ class AbstractPickleTests(unittest.TestCase):
                 p = self.dumps(s, proto)
                 self.assert_is_copy(s, self.loads(p))
 
+    def test_bytearray(self):
+        for proto in protocols:
+            for s in b'', b'xyz', b'xyz'*100:
+                b = bytearray(s)
+                p = self.dumps(b, proto)
+                bb = self.loads(p)
+                self.assertIsNot(bb, b)
+                self.assert_is_copy(b, bb)
+                if proto <= 3:
+                    # bytearray is serialized using a global reference
+                    self.assertIn(b'bytearray', p)
+                    self.assertTrue(opcode_in_pickle(pickle.GLOBAL, p))
+                elif proto == 4:
+                    self.assertIn(b'bytearray', p)
+                    self.assertTrue(opcode_in_pickle(pickle.STACK_GLOBAL, p))
+                elif proto >= 5:
+                    self.assertNotIn(b'bytearray', p)
+                    self.assertTrue(opcode_in_pickle(pickle.BYTEARRAY8, p))
+
+    def test_bytearray_memoization(self):
+        for proto in protocols:
+            b = bytearray(b'xyz')
+            bb = self.loads(self.dumps([b, b], proto))
+            self.assertEqual(bb, [b, b])
+            self.assertIs(bb[0], bb[1])
+
     def test_ints(self):
         for proto in protocols:
             n = sys.maxsize
@@ -2274,6 +2303,127 @@ class AbstractPickleTests(unittest.TestCase):
                 pickletools.dis(self.dumps(f, proto))
 
 
+    def buffer_like_objects(self):
+        # Yield buffer-like objects with the bytestring "abcdefgh" in them
+        bytestring = b"abcdefgh"
+        yield ZeroCopyBytes(bytestring)
+        yield ZeroCopyBytearray(bytestring)
+
+    @requires_picklebuffer
+    def test_in_band_buffers(self):
+        # Test in-band buffers (PEP 574)
+        for obj in self.buffer_like_objects():
+            for proto in range(0, pickle.HIGHEST_PROTOCOL + 1):
+                data = self.dumps(obj, proto)
+                if obj.readonly and proto >= 5:
+                    self.assertIn(b"abcdefgh", data)
+                self.assertEqual(count_opcode(pickle.NEXT_BUFFER, data), 0)
+                if proto >= 5:
+                    self.assertEqual(count_opcode(pickle.SHORT_BINBYTES, data),
+                                     1 if obj.readonly else 0)
+                    self.assertEqual(count_opcode(pickle.BYTEARRAY8, data),
+                                     0 if obj.readonly else 1)
+                    # Return a true value from buffer_callback should have
+                    # the same effect
+                    def buffer_callback(obj):
+                        return True
+                    data2 = self.dumps(obj, proto,
+                                       buffer_callback=buffer_callback)
+                    self.assertEqual(data2, data)
+
+                new = self.loads(data)
+                # It's a copy
+                self.assertIsNot(new, obj)
+                self.assertIs(type(new), type(obj))
+                self.assertEqual(new, obj)
+
+    @requires_picklebuffer
+    def test_oob_buffers(self):
+        # Test out-of-band buffers (PEP 574)
+        for obj in self.buffer_like_objects():
+            for proto in range(0, 5):
+                # Need protocol >= 5 for buffer_callback
+                with self.assertRaises(ValueError):
+                    self.dumps(obj, proto,
+                               buffer_callback=[].append)
+            for proto in range(5, pickle.HIGHEST_PROTOCOL + 1):
+                buffers = []
+                buffer_callback = lambda pb: buffers.append(pb.raw())
+                data = self.dumps(obj, proto,
+                                  buffer_callback=buffer_callback)
+                self.assertNotIn(b"abcdefgh", data)
+                self.assertEqual(count_opcode(pickle.SHORT_BINBYTES, data), 0)
+                self.assertEqual(count_opcode(pickle.BYTEARRAY8, data), 0)
+                self.assertEqual(count_opcode(pickle.NEXT_BUFFER, data), 1)
+                self.assertEqual(count_opcode(pickle.READONLY_BUFFER, data),
+                                 1 if obj.readonly else 0)
+
+                if obj.readonly:
+                    # Unpickling a readonly buffer from a writable object
+                    # must not give a writable object
+                    new = self.loads(data, buffers=[bytearray(b"abcdefgh")])
+                    self.assertIs(type(new), type(obj))
+                    self.assertEqual(new, obj)
+
+                with self.assertRaises(pickle.UnpicklingError):
+                    self.loads(data)
+                with self.assertRaises(pickle.UnpicklingError):
+                    self.loads(data, buffers=[])
+
+                new = self.loads(data, buffers=buffers)
+                # Zero-copy
+                self.assertIs(new, obj)
+
+                # Non-sequence buffers accepted too
+                new = self.loads(data, buffers=iter(buffers))
+                self.assertIs(new, obj)
+
+    @requires_picklebuffer
+    def test_oob_buffers_writable_to_readonly(self):
+        # Test reconstructing readonly object from writable buffer
+        obj = ZeroCopyBytes(b"foobar")
+        for proto in range(5, pickle.HIGHEST_PROTOCOL + 1):
+            buffers = []
+            data = self.dumps(obj, proto, buffer_callback=buffers.append)
+            buffers = map(bytearray, buffers)
+            new = self.loads(data, buffers=buffers)
+            self.assertIs(type(new), type(obj))
+            self.assertEqual(new, obj)
+
+    @requires_picklebuffer
+    def test_picklebuffer_error(self):
+        # PickleBuffer forbidden with protocol < 5
+        pb = pickle.PickleBuffer(b"foobar")
+        for proto in range(0, 5):
+            with self.assertRaises(pickle.PicklingError):
+                self.dumps(pb, proto)
+        # Non-contiguous buffers can't be pickled
+        pb = pickle.PickleBuffer(memoryview(b"foobar")[::2])
+        for proto in range(5, pickle.HIGHEST_PROTOCOL + 1):
+            with self.assertRaises(pickle.PicklingError):
+                self.dumps(pb, proto)
+
+    @requires_picklebuffer
+    def test_buffer_callback_error(self):
+        def buffer_callback(buffers):
+            1/0
+        pb = pickle.PickleBuffer(b"foobar")
+        with self.assertRaises(ZeroDivisionError):
+            self.dumps(pb, 5, buffer_callback=buffer_callback)
+
+    @requires_picklebuffer
+    def test_buffers_error(self):
+        pb = pickle.PickleBuffer(b"foobar")
+        for proto in range(5, pickle.HIGHEST_PROTOCOL + 1):
+            data = self.dumps([pb, pb], proto, buffer_callback=[].append)
+            # Non iterable buffers
+            with self.assertRaises(TypeError):
+                self.loads(data, buffers=object())
+            # Buffer iterable exhausts too early
+            with self.assertRaises(pickle.UnpicklingError):
+                self.loads(data, buffers=[])
+
+
 class BigmemPickleTests(unittest.TestCase):
 
     # Binary protocols can serialize longs of up to 2GB-1
@@ -2401,6 +2551,37 @@ class BigmemPickleTests(unittest.TestCase):
             data = None
 
 
+# Test classes for out-of-band buffers
+
+class ZeroCopyMixin:
+    """Pickled as a PickleBuffer with protocol 5, and unpickled without
+    a copy when given the original object as an out-of-band buffer."""
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return type(self)._reconstruct, (pickle.PickleBuffer(self),), None
+        else:
+            return type(self)._reconstruct, (self.base(self),)
+
+    @classmethod
+    def _reconstruct(cls, obj):
+        with memoryview(obj) as m:
+            obj = m.obj
+            if type(obj) is cls:
+                # Zero-copy
+                return obj
+            else:
+                return cls(obj)
+
+class ZeroCopyBytes(ZeroCopyMixin, bytes):
+    base = bytes
+    readonly = True
+
+class ZeroCopyBytearray(ZeroCopyMixin, bytearray):
+    base = bytearray
+    readonly = False
+
+
 # Test classes for reduce_ex
 
 class REX_one(object):
@@ -2557,7 +2738,7 @@ class AbstractPickleModuleTests(unittest.TestCase):
 
     def test_highest_protocol(self):
         # Of course this needs to be changed when HIGHEST_PROTOCOL changes.
-        self.assertEqual(pickle.HIGHEST_PROTOCOL, 4)
+        self.assertEqual(pickle.HIGHEST_PROTOCOL, 5)
 
     def test_callapi(self):
         f = io.BytesIO()
@@ -2774,6 +2955,111 @@ class AbstractPicklerUnpicklerObjectTests(unittest.TestCase):
                 unpickler = self.unpickler_class(f)
                 self.assertEqual(unpickler.load(), data)
 
+    def test_memo_limit(self):
+        shared = ["shared"]
+        data = [[str(i)] for i in range(100)] + [shared, shared]
+        for proto in protocols:
+            for limit in (0, 1, 10, 1000):
+                with self.subTest(proto=proto, limit=limit):
+                    f = io.BytesIO()
+                    pickler = self.pickler_class(f, proto, memo_limit=limit)
+                    pickler.dump(data)
+                    self.assertLessEqual(pickler.memo_size, limit)
+                    f.seek(0)
+                    unpickled = self.unpickler_class(f).load()
+                    self.assertEqual(unpickled, data)
+                    # Shared objects are only preserved while the memo is
+                    # not full
+                    self.assertIs(unpickled[-1] is unpickled[-2],
+                                  limit == 1000)
+        f = io.BytesIO()
+        pickler = self.pickler_class(f)
+        pickler.dump(data)
+        self.assertGreater(pickler.memo_size, 200)
+
+    def test_memo_limit_recursive(self):
+        l = []
+        l.append(l)
+        for proto in protocols:
+            with self.subTest(proto=proto):
+                pickler = self.pickler_class(io.BytesIO(), proto,
+                                             memo_limit=0)
+                self.assertRaises(RecursionError, pickler.dump, l)
+
+    def test_bad_memo_limit(self):
+        f = io.BytesIO()
+        self.assertRaises(ValueError, self.pickler_class, f, memo_limit=-1)
+        self.assertRaises(TypeError, self.pickler_class, f, memo_limit=1.5)
+        self.assertRaises(TypeError, self.pickler_class, f, memo_limit="1")
+
+    def test_is_unshared(self):
+        class UnsharedPickler(self.pickler_class):
+            def is_unshared(self, obj):
+                seen.append(obj)
+                return type(obj) is tuple
+        shared = ["shared"]
+        data = [shared, ([shared], [1, 2], ("tuple",)), [3, 4]]
+        for proto in protocols:
+            with self.subTest(proto=proto):
+                seen = []
+                f = io.BytesIO()
+                pickler = UnsharedPickler(f, proto)
+                pickler.dump(data)
+                f.seek(0)
+                unpickled = self.unpickler_class(f).load()
+                self.assertEqual(unpickled, data)
+                # Objects already in the memo are still shared
+                self.assertIs(unpickled[1][0][0], unpickled[0])
+                # data, shared, "shared", [3, 4], but nothing from the tuple
+                self.assertEqual(pickler.memo_size, 4)
+                # is_unshared() is not called inside an unshared subtree
+                self.assertIs(seen[3], data[1])
+                self.assertFalse(any(obj is data[1][1] for obj in seen))
+
+    def test_is_unshared_error(self):
+        class BadPickler(self.pickler_class):
+            def is_unshared(self, obj):
+                raise ZeroDivisionError
+        pickler = BadPickler(io.BytesIO())
+        self.assertRaises(ZeroDivisionError, pickler.dump, ["spam"])
+
+    def test_frames_written(self):
+        data = ["x" * 100 + str(i) for i in range(10000)]
+        for proto in protocols:
+            with self.subTest(proto=proto):
+                f = io.BytesIO()
+                pickler = self.pickler_class(f, proto)
+                self.assertEqual(pickler.frames_written, 0)
+                pickler.dump(data)
+                if proto < 4:
+                    self.assertEqual(pickler.frames_written, 0)
+                else:
+                    frame_size = pickle._Framer._FRAME_SIZE_TARGET
+                    self.assertGreaterEqual(pickler.frames_written,
+                                            len(f.getvalue()) // frame_size)
+                    self.assertEqual(pickler.frames_written,
+                                     count_opcode(pickle.FRAME,
+                                                  f.getvalue()))
+
+    def test_dump_streaming(self):
+        # A large pickle is written to the file by chunks rather than
+        # buffered in memory
+        class ChunkRecorder:
+            def __init__(self):
+                self.chunks = []
+            def write(self, data):
+                self.chunks.append(bytes(data))
+        data = ["x" * 100 + str(i) for i in range(10000)]
+        for proto in protocols:
+            with self.subTest(proto=proto):
+                f = ChunkRecorder()
+                pickler = self.pickler_class(f, proto)
+                pickler.dump(data)
+                pickled = b"".join(f.chunks)
+                unpickler = self.unpickler_class(io.BytesIO(pickled))
+                self.assertEqual(unpickler.load(), data)
+                self.assertLess(max(map(len, f.chunks)), len(pickled) // 4)
+
 
 # Tests for dispatch_table attribute
 
@@ -1,6 +1,7 @@
 """Tests for base_events.py"""
 
 import errno
+import io
 import logging
 import math
 import os
@@ -1687,5 +1688,207 @@ class BaseEventLoopWithSelectorTests(test_utils.TestCase):
                          "took .* seconds$")
 
 
+class SendfileProto(asyncio.Protocol):
+
+    def __init__(self, loop):
+        self.data = bytearray()
+        self.transport = None
+        self.paused = False
+        self.done = asyncio.Future(loop=loop)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.data.extend(data)
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+
+    def connection_lost(self, exc):
+        if not self.done.done():
+            self.done.set_result(None)
+
+
+class SendfileTests(test_utils.TestCase):
+
+    DATA = b"SendfileBaseEventLoopTests" * 10 * 1024
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        with open(support.TESTFN, 'wb') as fp:
+            fp.write(self.DATA)
+        self.file = open(support.TESTFN, 'rb')
+        self.addCleanup(self.file.close)
+        self.addCleanup(support.unlink, support.TESTFN)
+
+    def prepare(self):
+        srv_proto = SendfileProto(self.loop)
+        server = self.loop.run_until_complete(self.loop.create_server(
+            lambda: srv_proto, support.HOST, 0))
+        port = server.sockets[0].getsockname()[1]
+        cli_proto = SendfileProto(self.loop)
+        tr, pr = self.loop.run_until_complete(self.loop.create_connection(
+            lambda: cli_proto, support.HOST, port))
+
+        def cleanup():
+            tr.close()
+            self.loop.run_until_complete(cli_proto.done)
+            server.close()
+            self.loop.run_until_complete(server.wait_closed())
+
+        self.addCleanup(cleanup)
+        return srv_proto, cli_proto
+
+    def sendfile(self, cli_proto, srv_proto, *args, **kwargs):
+        ret = self.loop.run_until_complete(
+            self.loop.sendfile(cli_proto.transport, self.file,
+                               *args, **kwargs))
+        cli_proto.transport.close()
+        self.loop.run_until_complete(srv_proto.done)
+        return ret
+
+    @unittest.skipUnless(hasattr(os, 'sendfile'), 'requires os.sendfile()')
+    def test_sendfile_native(self):
+        srv_proto, cli_proto = self.prepare()
+        with mock.patch.object(self.loop, '_sendfile_fallback') as fallback:
+            ret = self.sendfile(cli_proto, srv_proto, fallback=False)
+        self.assertFalse(fallback.called)
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    @unittest.skipUnless(hasattr(os, 'sendfile'), 'requires os.sendfile()')
+    def test_sendfile_native_partial(self):
+        srv_proto, cli_proto = self.prepare()
+        ret = self.sendfile(cli_proto, srv_proto, 1000, 100, fallback=False)
+        self.assertEqual(ret, 100)
+        self.assertEqual(srv_proto.data, self.DATA[1000:1100])
+        self.assertEqual(self.file.tell(), 1100)
+
+    @unittest.skipUnless(hasattr(os, 'sendfile'), 'requires os.sendfile()')
+    def test_sendfile_native_after_write(self):
+        # Data buffered by write() is sent before the file.
+        srv_proto, cli_proto = self.prepare()
+        cli_proto.transport.write(b'header\n')
+        ret = self.sendfile(cli_proto, srv_proto, fallback=False)
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, b'header\n' + self.DATA)
+
+    @unittest.skipUnless(hasattr(os, 'sendfile'), 'requires os.sendfile()')
+    def test_sendfile_write_in_progress(self):
+        srv_proto, cli_proto = self.prepare()
+        transport = cli_proto.transport
+        transport._make_empty_waiter()
+        try:
+            with self.assertRaisesRegex(RuntimeError, 'sendfile'):
+                transport.write(b'data')
+        finally:
+            transport._reset_empty_waiter()
+
+    def test_sendfile_fallback(self):
+        srv_proto, cli_proto = self.prepare()
+        with mock.patch.object(self.loop, '_sendfile_native',
+                               side_effect=asyncio.SendfileNotAvailableError):
+            ret = self.sendfile(cli_proto, srv_proto)
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    def test_sendfile_fallback_partial(self):
+        srv_proto, cli_proto = self.prepare()
+        with mock.patch.object(self.loop, '_sendfile_native',
+                               side_effect=asyncio.SendfileNotAvailableError):
+            ret = self.sendfile(cli_proto, srv_proto, 1000, 100)
+        self.assertEqual(ret, 100)
+        self.assertEqual(srv_proto.data, self.DATA[1000:1100])
+        self.assertEqual(self.file.tell(), 1100)
+
+    def test_sendfile_fallback_flow_control(self):
+        # The fallback never lets the write buffer grow past one chunk
+        # over the high-water mark, and restores the user's protocol.
+        srv_proto, cli_proto = self.prepare()
+        transport = cli_proto.transport
+        transport.set_write_buffer_limits(high=1024, low=512)
+        sizes = []
+        orig_write = transport.write
+
+        def write(data):
+            orig_write(data)
+            sizes.append(transport.get_write_buffer_size())
+
+        with mock.patch.object(self.loop, '_sendfile_native',
+                               side_effect=asyncio.SendfileNotAvailableError), \
+             mock.patch.object(base_events,
+                               '_SENDFILE_FALLBACK_READBUFFER_SIZE', 4096), \
+             mock.patch.object(transport, 'write', write):
+            ret = self.loop.run_until_complete(
+                self.loop.sendfile(transport, self.file))
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertLessEqual(max(sizes), 1024 + 4096)
+        self.assertIs(transport.get_protocol(), cli_proto)
+        self.assertEqual(cli_proto.paused,
+                         transport.get_write_buffer_size() > 1024)
+        transport.close()
+        self.loop.run_until_complete(srv_proto.done)
+        self.assertEqual(srv_proto.data, self.DATA)
+
+    def test_sendfile_not_available(self):
+        srv_proto, cli_proto = self.prepare()
+        with mock.patch.object(self.loop, '_sendfile_native',
+                               side_effect=asyncio.SendfileNotAvailableError):
+            with self.assertRaises(asyncio.SendfileNotAvailableError):
+                self.loop.run_until_complete(
+                    self.loop.sendfile(cli_proto.transport, self.file,
+                                       fallback=False))
+        self.assertEqual(self.file.tell(), 0)
+
+    def test_sendfile_not_a_regular_file(self):
+        # Falls back to reading the file in chunks.
+        srv_proto, cli_proto = self.prepare()
+        file = io.BytesIO(self.DATA)
+        ret = self.loop.run_until_complete(
+            self.loop.sendfile(cli_proto.transport, file))
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(file.tell(), len(self.DATA))
+        cli_proto.transport.close()
+        self.loop.run_until_complete(srv_proto.done)
+        self.assertEqual(srv_proto.data, self.DATA)
+
+    def test_sendfile_invalid_params(self):
+        srv_proto, cli_proto = self.prepare()
+        transport = cli_proto.transport
+        with open(support.TESTFN, 'r') as text_file:
+            with self.assertRaisesRegex(ValueError, 'binary mode'):
+                self.loop.run_until_complete(
+                    self.loop.sendfile(transport, text_file))
+        with self.assertRaisesRegex(TypeError, 'offset'):
+            self.loop.run_until_complete(
+                self.loop.sendfile(transport, self.file, '1'))
+        with self.assertRaisesRegex(ValueError, 'offset'):
+            self.loop.run_until_complete(
+                self.loop.sendfile(transport, self.file, -1))
+        with self.assertRaisesRegex(TypeError, 'count'):
+            self.loop.run_until_complete(
+                self.loop.sendfile(transport, self.file, 0, 1.5))
+        with self.assertRaisesRegex(ValueError, 'count'):
+            self.loop.run_until_complete(
+                self.loop.sendfile(transport, self.file, 0, 0))
+
+    def test_sendfile_closing_transport(self):
+        srv_proto, cli_proto = self.prepare()
+        cli_proto.transport.close()
+        with self.assertRaisesRegex(RuntimeError, 'is closing'):
+            self.loop.run_until_complete(
+                self.loop.sendfile(cli_proto.transport, self.file))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2370,6 +2370,8 @@ class AbstractEventLoopTests(unittest.TestCase):
             NotImplementedError, loop.create_connection, f)
         self.assertRaises(
             NotImplementedError, loop.create_server, f)
+        self.assertRaises(
+            NotImplementedError, loop.sendfile, f, f)
         self.assertRaises(
             NotImplementedError, loop.create_datagram_endpoint, f)
         self.assertRaises(
@@ -66,6 +66,16 @@ class SslProtoHandshakeTests(test_utils.TestCase):
         test_utils.run_briefly(self.loop)
         self.assertIsInstance(waiter.exception(), ConnectionResetError)
 
+    def test_set_protocol(self):
+        ssl_proto = self.ssl_protocol()
+        transport = ssl_proto._app_transport
+        self.assertIs(transport.get_protocol(), ssl_proto._app_protocol)
+
+        new_app_proto = asyncio.Protocol()
+        transport.set_protocol(new_app_proto)
+        self.assertIs(transport.get_protocol(), new_app_proto)
+        self.assertIs(ssl_proto._app_protocol, new_app_proto)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 """Tests for streams.py."""
 
+import array
 import gc
 import os
 import queue
@@ -526,6 +527,118 @@ class StreamReaderTests(test_utils.TestCase):
         self.assertRaises(
             ValueError, self.loop.run_until_complete, stream.readexactly(2))
 
+    def test_readexactly_larger_than_limit(self):
+        # The transport is paused and resumed while waiting for a chunk
+        # larger than the pause limit.
+        stream = asyncio.StreamReader(limit=1, loop=self.loop)
+        transport = mock.Mock()
+        stream.set_transport(transport)
+        read_task = asyncio.Task(stream.readexactly(6), loop=self.loop)
+
+        def cb():
+            stream.feed_data(b'ab')
+            stream.feed_data(b'cd')
+            self.assertTrue(stream._paused)
+            self.loop.call_soon(stream.feed_data, b'efgh')
+        self.loop.call_soon(cb)
+
+        data = self.loop.run_until_complete(read_task)
+        self.assertEqual(b'abcdef', data)
+        self.assertEqual(b'gh', stream._buffer)
+        self.assertTrue(transport.resume_reading.called)
+
+    def test_readinto(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        buf = bytearray(30)
+        read_task = asyncio.Task(stream.readinto(buf), loop=self.loop)
+
+        def cb():
+            stream.feed_data(self.DATA)
+        self.loop.call_soon(cb)
+
+        n = self.loop.run_until_complete(read_task)
+        self.assertEqual(len(self.DATA), n)
+        self.assertEqual(self.DATA, buf[:n])
+        self.assertEqual(b'', stream._buffer)
+
+    def test_readinto_partial(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(b'line1')
+        stream.feed_data(b'line2')
+
+        buf = bytearray(8)
+        view = memoryview(buf)
+        n = self.loop.run_until_complete(stream.readinto(view[:3]))
+        self.assertEqual(3, n)
+        n = self.loop.run_until_complete(stream.readinto(view[3:]))
+        self.assertEqual(5, n)
+        self.assertEqual(b'line1lin', buf)
+        self.assertEqual(b'e2', stream._buffer)
+
+    def test_readinto_typed_buffer(self):
+        # The target is filled bytewise, whatever its format.
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(bytes(range(8)))
+
+        buf = array.array('H', [0, 0])
+        n = self.loop.run_until_complete(stream.readinto(buf))
+        self.assertEqual(4, n)
+        self.assertEqual(bytes(range(4)), buf.tobytes())
+        self.assertEqual(bytes(range(4, 8)), stream._buffer)
+
+    def test_readinto_zero(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(self.DATA)
+
+        n = self.loop.run_until_complete(stream.readinto(bytearray()))
+        self.assertEqual(0, n)
+        self.assertEqual(self.DATA, stream._buffer)
+
+    def test_readinto_eof(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        read_task = asyncio.Task(stream.readinto(bytearray(10)),
+                                 loop=self.loop)
+
+        def cb():
+            stream.feed_eof()
+        self.loop.call_soon(cb)
+
+        n = self.loop.run_until_complete(read_task)
+        self.assertEqual(0, n)
+
+    def test_readinto_readonly(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(self.DATA)
+
+        with self.assertRaises(TypeError):
+            self.loop.run_until_complete(stream.readinto(b'readonly'))
+        self.assertEqual(self.DATA, stream._buffer)
+
+    def test_readinto_exception(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(b'line\n')
+
+        buf = bytearray(2)
+        n = self.loop.run_until_complete(stream.readinto(buf))
+        self.assertEqual(2, n)
+        self.assertEqual(b'li', buf)
+
+        stream.set_exception(ValueError())
+        self.assertRaises(
+            ValueError, self.loop.run_until_complete, stream.readinto(buf))
+
+    def test_readinto_resumes_transport(self):
+        stream = asyncio.StreamReader(limit=1, loop=self.loop)
+        transport = mock.Mock()
+        stream.set_transport(transport)
+        stream.feed_data(b'abc')
+        self.assertTrue(stream._paused)
+
+        n = self.loop.run_until_complete(stream.readinto(bytearray(2)))
+        self.assertEqual(2, n)
+        self.assertFalse(stream._paused)
+        transport.resume_reading.assert_called_with()
+
     def test_exception(self):
         stream = asyncio.StreamReader(loop=self.loop)
         self.assertIsNone(stream.exception())
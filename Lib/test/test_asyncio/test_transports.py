@@ -44,6 +44,8 @@ class TransportTests(unittest.TestCase):
         self.assertRaises(NotImplementedError, transport.resume_reading)
         self.assertRaises(NotImplementedError, transport.close)
         self.assertRaises(NotImplementedError, transport.abort)
+        self.assertRaises(NotImplementedError, transport.set_protocol, None)
+        self.assertRaises(NotImplementedError, transport.get_protocol)
 
     def test_dgram_not_implemented(self):
         transport = asyncio.DatagramTransport()
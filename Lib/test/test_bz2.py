@@ -282,6 +282,67 @@ class BZ2FileTest(BaseTest):
         with open(self.filename, 'rb') as f:
             self.assertEqual(self.decompress(f.read()), self.TEXT)
 
+    def testWriteThreads(self):
+        # BIG_TEXT spans two blocks at compresslevel=1
+        for threads in (0, 2):
+            with BZ2File(self.filename, "w", compresslevel=1,
+                         threads=threads) as bz2f:
+                bz2f.write(self.BIG_TEXT[:1000])
+                bz2f.writelines([self.BIG_TEXT[1000:]] + self.TEXT_LINES)
+                self.assertEqual(bz2f.tell(),
+                                 len(self.BIG_TEXT) + len(self.TEXT))
+            with open(self.filename, 'rb') as f:
+                self.assertEqual(self.decompress(f.read()),
+                                 self.BIG_TEXT + self.TEXT)
+            with BZ2File(self.filename) as bz2f:
+                self.assertEqual(bz2f.read(), self.BIG_TEXT + self.TEXT)
+
+    def testWriteThreadsEmpty(self):
+        with BZ2File(self.filename, "w", threads=2):
+            pass
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), self.EMPTY_DATA)
+
+    def testThreadsBadArgs(self):
+        self.assertRaises(ValueError, BZ2File, self.filename, "w", threads=-1)
+        self.createTempFile()
+        self.assertRaises(ValueError, BZ2File, self.filename, "r", threads=2)
+
+    def testIndex(self):
+        # One bzip2 stream per block of 100 kB
+        text = self.BIG_TEXT * 3
+        with BZ2File(self.filename, "w", compresslevel=1, threads=2) as bz2f:
+            bz2f.write(text)
+        with support.swap_attr(_compression, 'INDEX_SPACING', 1):
+            with BZ2File(self.filename, index=True) as bz2f:
+                self.assertEqual(bz2f.seek(-10, 2), len(text) - 10)
+                self.assertEqual(bz2f.read(), text[-10:])
+                # The start of the file needs no seek point
+                self.assertEqual(len(bz2f._index), 3)
+                for pos in (350000, 50000, 250000, 150000):
+                    self.assertEqual(bz2f.seek(pos), pos)
+                    self.assertEqual(bz2f.read(1000), text[pos:pos + 1000])
+                index = BytesIO()
+                bz2f.save_index(index)
+        index.seek(0)
+        with BZ2File(self.filename, index=index) as bz2f:
+            self.assertEqual(bz2f.seek(-10, 2), len(text) - 10)
+            self.assertEqual(bz2f.read(), text[-10:])
+            bz2f.seek(123456)
+            self.assertEqual(bz2f.read(), text[123456:])
+
+    def testIndexBadArgs(self):
+        self.assertRaises(ValueError, BZ2File, self.filename, "w", index=True)
+        self.createTempFile()
+        with BZ2File(self.filename) as bz2f:
+            self.assertRaises(ValueError, bz2f.save_index, BytesIO())
+        self.assertRaises(ValueError, BZ2File, self.filename,
+                          index=BytesIO(self.DATA))
+        index = BytesIO()
+        _compression.SeekIndex("gzip", 1).save(index)
+        index.seek(0)
+        self.assertRaises(ValueError, BZ2File, self.filename, index=index)
+
     def testWriteMethodsOnReadOnlyFile(self):
         with BZ2File(self.filename, "w") as bz2f:
             bz2f.write(b"abc")
@@ -939,6 +1000,20 @@ class OpenTest(BaseTest):
         with self.open(BytesIO(self.DATA), "rt") as f:
             self.assertEqual(f.read(), text)
 
+    def test_threads(self):
+        text = self.TEXT.decode("ascii")
+        with self.open(self.filename, "wt", threads=2) as f:
+            f.write(text)
+        with self.open(self.filename, "rt") as f:
+            self.assertEqual(f.read(), text)
+
+    def test_index(self):
+        with open(self.filename, "wb") as f:
+            f.write(self.DATA * 5)
+        with self.open(self.filename, "rb", index=True) as f:
+            f.seek(len(self.TEXT) * 3)
+            self.assertEqual(f.read(), self.TEXT * 2)
+
     def test_bad_params(self):
         # Test invalid parameter combinations.
         self.assertRaises(ValueError,
@@ -11,6 +11,8 @@ test.support.import_module('threading')
 
 from test.support.script_helper import assert_python_ok
 
+import array
+import itertools
 import os
 import sys
 import threading
@@ -61,11 +63,13 @@ class MyObject(object):
 
 class ExecutorMixin:
     worker_count = 5
+    executor_kwargs = {}
 
     def setUp(self):
         self.t1 = time.time()
         try:
-            self.executor = self.executor_type(max_workers=self.worker_count)
+            self.executor = self.executor_type(max_workers=self.worker_count,
+                                               **self.executor_kwargs)
         except NotImplementedError as e:
             self.skipTest(str(e))
         self._prime_executor()
@@ -91,6 +95,10 @@ class ThreadPoolMixin(ExecutorMixin):
     executor_type = futures.ThreadPoolExecutor
 
 
+class WorkStealingMixin(ExecutorMixin):
+    executor_type = futures.WorkStealingThreadPoolExecutor
+
+
 class ProcessPoolMixin(ExecutorMixin):
     executor_type = futures.ProcessPoolExecutor
 
@@ -155,20 +163,57 @@ class ThreadPoolShutdownTest(ThreadPoolMixin, ExecutorShutdownTest, unittest.Tes
             t.join()
 
 
+class WorkStealingShutdownTest(WorkStealingMixin, ExecutorShutdownTest,
+                               unittest.TestCase):
+    def _prime_executor(self):
+        pass
+
+    def test_context_manager_shutdown(self):
+        with futures.WorkStealingThreadPoolExecutor(max_workers=5) as e:
+            executor = e
+            self.assertEqual(list(e.map(abs, range(-5, 5))),
+                             [5, 4, 3, 2, 1, 0, 1, 2, 3, 4])
+
+        for t in executor._threads:
+            t.join()
+
+    def test_del_shutdown(self):
+        executor = futures.WorkStealingThreadPoolExecutor(max_workers=5)
+        executor.map(abs, range(-5, 5))
+        threads = executor._threads
+        del executor
+
+        for t in threads:
+            t.join()
+
+    def test_shutdown_waits_for_nested_calls(self):
+        # Calls submitted by the workers during the shutdown still run.
+        results = []
+        def nested(depth):
+            if depth:
+                time.sleep(0.1)
+                self.executor.submit(nested, depth - 1)
+            results.append(depth)
+        self.executor.submit(nested, 3)
+        self.executor.shutdown()
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+
+
 class ProcessPoolShutdownTest(ProcessPoolMixin, ExecutorShutdownTest, unittest.TestCase):
     def _prime_executor(self):
         pass
 
     def test_processes_terminate(self):
-        self.executor.submit(mul, 21, 2)
-        self.executor.submit(mul, 6, 7)
-        self.executor.submit(mul, 3, 14)
-        self.assertEqual(len(self.executor._processes), 5)
+        # Processes are spawned on demand, one for each pending call.
+        futures = [self.executor.submit(time.sleep, 0.5) for _ in range(3)]
+        self.assertEqual(len(self.executor._processes), 3)
         processes = self.executor._processes
         self.executor.shutdown()
 
         for p in processes.values():
             p.join()
+        for f in futures:
+            self.assertIsNone(f.result())
 
     def test_context_manager_shutdown(self):
         with futures.ProcessPoolExecutor(max_workers=5) as e:
@@ -310,6 +355,10 @@ class ThreadPoolWaitTests(ThreadPoolMixin, WaitTests, unittest.TestCase):
             sys.setswitchinterval(oldswitchinterval)
 
 
+class WorkStealingWaitTests(WorkStealingMixin, WaitTests, unittest.TestCase):
+    pass
+
+
 class ProcessPoolWaitTests(ProcessPoolMixin, WaitTests, unittest.TestCase):
     pass
 
@@ -363,6 +412,11 @@ class ThreadPoolAsCompletedTests(ThreadPoolMixin, AsCompletedTests, unittest.Tes
     pass
 
 
+class WorkStealingAsCompletedTests(WorkStealingMixin, AsCompletedTests,
+                                   unittest.TestCase):
+    pass
+
+
 class ProcessPoolAsCompletedTests(ProcessPoolMixin, AsCompletedTests, unittest.TestCase):
     pass
 
@@ -383,6 +437,60 @@ class ExecutorTest:
                 list(self.executor.map(pow, range(10), range(10))),
                 list(map(pow, range(10), range(10))))
 
+    def test_submit_many(self):
+        fs = self.executor.submit_many(pow, [(2, 8), (3, 2), (5, 0)])
+        self.assertEqual([f.result() for f in fs], [256, 9, 1])
+        self.assertEqual(self.executor.submit_many(pow, []), [])
+        # The calls are queued by batches, as the iterable is consumed
+        with test.support.swap_attr(futures._base, '_SUBMIT_BATCH_SIZE', 2):
+            fs = self.executor.submit_many(pow, ((i, 2) for i in range(5)))
+            self.assertEqual([f.result() for f in fs], [0, 1, 4, 9, 16])
+            fs = self.executor.submit_many(pow, [(2, 1), (3, 1)])
+            self.assertEqual([f.result() for f in fs], [2, 3])
+
+    def test_overridden_submit(self):
+        # submit_many() and map() go through an overridden submit()
+        calls = []
+        class Executor(self.executor_type):
+            def submit(self, fn, *args, **kwargs):
+                calls.append(args)
+                return super().submit(fn, *args, **kwargs)
+        executor = Executor(max_workers=2, **self.executor_kwargs)
+        try:
+            self.assertEqual(list(executor.map(abs, [-1, -2])), [1, 2])
+            self.assertEqual(len(calls), 2)
+            fs = executor.submit_many(abs, [(-3,)])
+            self.assertEqual(fs[0].result(), 3)
+            self.assertEqual(len(calls), 3)
+        finally:
+            executor.shutdown(wait=True)
+
+    def test_map_buffersize(self):
+        for buffersize in (1, 2, 5, 100):
+            with self.subTest(buffersize=buffersize):
+                self.assertEqual(
+                        list(self.executor.map(pow, range(10), range(10),
+                                               buffersize=buffersize)),
+                        list(map(pow, range(10), range(10))))
+
+    def test_map_buffersize_lazy(self):
+        # The iterable is consumed as the results are yielded.
+        consumed = []
+        def numbers():
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+        results = self.executor.map(abs, numbers(), buffersize=4)
+        self.assertLessEqual(len(consumed), 4)
+        self.assertEqual(list(itertools.islice(results, 10)), list(range(10)))
+        self.assertLessEqual(len(consumed), 14)
+        del results
+
+    def test_map_buffersize_invalid(self):
+        for buffersize in (0, -1):
+            with self.assertRaises(ValueError):
+                self.executor.map(abs, range(10), buffersize=buffersize)
+
     def test_map_exception(self):
         i = self.executor.map(divmod, [1, 1, 1, 1], [2, 3, 0, 5])
         self.assertEqual(i.__next__(), (0, 1))
@@ -451,6 +559,51 @@ class ThreadPoolExecutorTest(ThreadPoolMixin, ExecutorTest, unittest.TestCase):
                          (os.cpu_count() or 1) * 5)
 
 
+class WorkStealingExecutorTest(WorkStealingMixin, ExecutorTest,
+                               unittest.TestCase):
+    def test_nested_submit(self):
+        # Each call fans out to two more calls, down to 2**8 leaves.
+        leaves = []
+        done = threading.Event()
+        def node(depth):
+            if depth:
+                self.executor.submit(node, depth - 1)
+                self.executor.submit(node, depth - 1)
+            else:
+                leaves.append(depth)
+                if len(leaves) == 2 ** 8:
+                    done.set()
+        self.executor.submit(node, 8)
+        self.assertTrue(done.wait(10))
+        self.assertEqual(len(self.executor._threads), self.worker_count)
+
+    def test_stealing(self):
+        # A call blocked on the call it submitted: another worker steals it.
+        def child():
+            return threading.get_ident()
+        def parent():
+            return (threading.get_ident(),
+                    self.executor.submit(child).result(timeout=10))
+        parent_ident, child_ident = self.executor.submit(parent).result()
+        self.assertNotEqual(parent_ident, child_ident)
+
+    def test_local_calls_lifo(self):
+        # With a single worker, its own calls run most recent first.
+        executor = self.executor_type(max_workers=1)
+        order = []
+        def parent():
+            for i in range(3):
+                executor.submit(order.append, i)
+        executor.submit(parent).result()
+        executor.shutdown()
+        self.assertEqual(order, [2, 1, 0])
+
+    def test_default_workers(self):
+        executor = self.executor_type()
+        self.assertEqual(executor._max_workers,
+                         (os.cpu_count() or 1) * 5)
+
+
 class ProcessPoolExecutorTest(ProcessPoolMixin, ExecutorTest, unittest.TestCase):
     def test_killed_child(self):
         # When a child process is abruptly terminated, the whole pool gets
@@ -480,6 +633,15 @@ class ProcessPoolExecutorTest(ProcessPoolMixin, ExecutorTest, unittest.TestCase)
             ref)
         self.assertRaises(ValueError, bad_map)
 
+    def test_map_chunksize_buffersize(self):
+        ref = list(map(pow, range(40), range(40)))
+        for buffersize in (1, 6, 20):
+            with self.subTest(buffersize=buffersize):
+                self.assertEqual(
+                    list(self.executor.map(pow, range(40), range(40),
+                                           chunksize=6, buffersize=buffersize)),
+                    ref)
+
     @classmethod
     def _test_traceback(cls):
         raise RuntimeError(123) # some comment
@@ -507,6 +669,173 @@ class ProcessPoolExecutorTest(ProcessPoolMixin, ExecutorTest, unittest.TestCase)
                       f1.getvalue())
 
 
+class ProcessPoolScalingTest(unittest.TestCase):
+
+    def create_executor(self, **kwargs):
+        executor = futures.ProcessPoolExecutor(**kwargs)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def wait_for_process_count(self, executor, count):
+        deadline = time.monotonic() + 30
+        while len(executor._processes) != count:
+            if time.monotonic() > deadline:
+                self.fail('%d processes instead of %d'
+                          % (len(executor._processes), count))
+            time.sleep(0.05)
+
+    def test_lazy_spawn(self):
+        executor = self.create_executor(max_workers=4)
+        self.assertEqual(executor._processes, {})
+        for _ in range(5):
+            self.assertEqual(executor.submit(mul, 2, 3).result(), 6)
+        # Each call found an idle process.
+        self.assertEqual(len(executor._processes), 1)
+        futures = [executor.submit(time.sleep, 0.5) for _ in range(10)]
+        self.assertEqual(len(executor._processes), 4)
+        for f in futures:
+            f.result()
+
+    def test_min_workers(self):
+        executor = self.create_executor(max_workers=4, min_workers=2)
+        self.assertEqual(executor.submit(mul, 2, 3).result(), 6)
+        self.assertEqual(len(executor._processes), 2)
+
+    def test_idle_timeout(self):
+        executor = self.create_executor(max_workers=4, min_workers=1,
+                                        idle_timeout=0.2)
+        futures = [executor.submit(time.sleep, 0.3) for _ in range(4)]
+        self.assertEqual(len(executor._processes), 4)
+        for f in futures:
+            f.result()
+        self.wait_for_process_count(executor, 1)
+        # The pool grows again on demand.
+        futures = [executor.submit(time.sleep, 0.3) for _ in range(3)]
+        self.assertEqual(len(executor._processes), 3)
+        self.assertEqual([f.result() for f in futures], [None] * 3)
+        self.wait_for_process_count(executor, 1)
+
+    def test_max_tasks_per_child(self):
+        executor = self.create_executor(max_workers=1, max_tasks_per_child=3)
+        pids = [executor.submit(os.getpid).result() for _ in range(7)]
+        self.assertEqual([len(set(pids[i:i + 3])) for i in range(0, 7, 3)],
+                         [1, 1, 1])
+        self.assertEqual(len(set(pids)), 3)
+        # Calls queued while a process exits are run by its successor.
+        self.assertEqual(list(executor.map(abs, range(-10, 0))),
+                         list(range(10, 0, -1)))
+
+    def test_killed_child_with_idle_timeout(self):
+        executor = self.create_executor(max_workers=2, idle_timeout=0.1)
+        future = executor.submit(time.sleep, 3)
+        next(iter(executor._processes.values())).terminate()
+        self.assertRaises(BrokenProcessPool, future.result)
+        self.assertRaises(BrokenProcessPool, executor.submit, pow, 2, 8)
+
+    def test_invalid_arguments(self):
+        for kwargs in ({'min_workers': -1}, {'min_workers': 5},
+                       {'idle_timeout': 0}, {'max_tasks_per_child': 0}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    futures.ProcessPoolExecutor(max_workers=4, **kwargs)
+
+
+def recursive_buffers(size):
+    result = [b'x' * size]
+    result.append(result)
+    return result
+
+
+def is_same(x, y):
+    return x is y
+
+
+def describe_buffers(*args, **kwargs):
+    return ([(type(arg).__name__, bytes(arg)) for arg in args],
+            {key: (type(arg).__name__, bytes(arg))
+             for key, arg in kwargs.items()})
+
+
+class ProcessPoolSharedMemoryTest(ProcessPoolMixin, ExecutorTest,
+                                  unittest.TestCase):
+    # Recycling the workers also recycles their result arenas.
+    executor_kwargs = {'shared_memory_size': 64 * 1024,
+                       'shared_memory_threshold': 1024,
+                       'max_tasks_per_child': 3}
+
+    def test_argument_buffers(self):
+        data = bytes(range(256)) * 8
+        small = b'small'
+        args = (data, bytearray(data), array.array('B', data), small)
+        future = self.executor.submit(describe_buffers, *args,
+                                      view=memoryview(data))
+        types, kwtypes = future.result()
+        self.assertEqual(types, [('bytes', data), ('bytearray', data),
+                                 ('array', data), ('bytes', small)])
+        # memoryviews can't be pickled: this one went through shared memory
+        # and was handed out as is.
+        self.assertEqual(kwtypes, {'view': ('memoryview', data)})
+        self.assertEqual(self.executor._shared_memory._call_blocks, {})
+
+    def test_result_buffers(self):
+        data = array.array('d', range(1000))
+        for obj in (data, data.tobytes(), bytearray(data.tobytes()),
+                    [data, (data, 'x')]):
+            result = self.executor.submit(mul, obj, 1)
+            self.assertEqual(result.result(), obj)
+            self.assertIs(type(result.result()), type(obj))
+        # The locks of the result arenas were released.
+        for worker in self.executor._shared_memory._workers.values():
+            self.assertTrue(worker.lock.acquire(False))
+            worker.lock.release()
+
+    def test_multidimensional_memoryview(self):
+        data = memoryview(array.array('i', range(600))).cast('B')
+        view = data.cast('i', (20, 30))
+        self.assertEqual(self.executor.submit(memoryview.tolist, view).result(),
+                         view.tolist())
+
+    def test_arena_full(self):
+        # Buffers that don't fit in the arenas are pickled.
+        data = b'x' * (256 * 1024)
+        futures = [self.executor.submit(bytes, data) for _ in range(10)]
+        for future in futures:
+            self.assertEqual(future.result(), data)
+
+    def test_map_buffers(self):
+        data = [bytes([i]) * 2048 for i in range(20)]
+        self.assertEqual(list(self.executor.map(bytes, data, chunksize=3)),
+                         data)
+
+    def test_recursive_arguments(self):
+        # Recursive containers can't be rebuilt, they are pickled
+        data = b'x' * 2048
+        a = [data]
+        a.append(a)
+        future = self.executor.submit(repr, a)
+        self.assertEqual(future.result(timeout=60), repr(a))
+        future = self.executor.submit(len, (data, a))
+        self.assertEqual(future.result(timeout=60), 2)
+        self.assertEqual(self.executor._shared_memory._call_blocks, {})
+        # A container met twice is mapped once
+        b = [data]
+        future = self.executor.submit(is_same, b, b)
+        self.assertIs(future.result(timeout=60), True)
+
+    def test_recursive_result(self):
+        future = self.executor.submit(recursive_buffers, 2048)
+        result = future.result(timeout=60)
+        self.assertEqual(result[0], b'x' * 2048)
+        self.assertIs(result[1], result)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.executor_type(shared_memory_size=-1)
+        with self.assertRaises(ValueError):
+            self.executor_type(shared_memory_size=1024,
+                               shared_memory_threshold=0)
+
+
 class FutureTests(unittest.TestCase):
     def test_done_callback_with_result(self):
         callback_result = None
@@ -4,7 +4,8 @@
 import copy
 import sys
 import unittest
-from io import StringIO
+from io import StringIO, BytesIO
+from array import array
 from tempfile import TemporaryFile
 import csv
 import gc
@@ -309,6 +310,97 @@ class Test_Csv(unittest.TestCase):
         self.assertRaises(StopIteration, next, r)
         self.assertEqual(r.line_num, 3)
 
+    def test_read_columns_arg(self):
+        lines = ['a,b,c,d\r\n', '\r\n', 'e,f\r\n', '"g\r\n', 'h",i,j,k\r\n']
+        self._read_test(lines, [['c', 'a'], [], [None, 'e'], ['j', 'g\r\nh']],
+                        columns=[2, 0])
+        self._read_test(lines, [['a', 'b', 'c', 'd'], [], ['e', 'f'],
+                                ['g\r\nh', 'i', 'j', 'k']],
+                        columns=None)
+        self._read_test(lines, [[], [], [], []], columns=[])
+        self._read_test(['1,2,3'], [['3']], columns=(2,))
+        self.assertRaises(ValueError, csv.reader, lines, columns=[0, 0])
+        self.assertRaises(ValueError, csv.reader, lines, columns=[-1])
+        self.assertRaises(TypeError, csv.reader, lines, columns=['a'])
+        self.assertRaises(TypeError, csv.reader, lines, columns=1)
+
+        # The items are converted once
+        class Index:
+            calls = 0
+            def __index__(self):
+                self.calls += 1
+                return 0 if self.calls == 1 else 10**7
+        self._read_test(['a,b'], [['a']], columns=[Index()])
+        self._read_test(['a,b'], [['b', 'a']], columns=[1, Index()])
+        # The items can't change the list while it is converted
+        class Mutating:
+            def __index__(self):
+                columns.clear()
+                return 1
+        columns = [Mutating(), 0]
+        self._read_test(['a,b'], [['b', 'a']], columns=columns)
+        self.assertRaises(TypeError, csv.reader, lines, column=[1])
+
+    def test_read_converters(self):
+        lines = ['1,2.5,x,3\n', ' -4 ,1e3,y\n']
+        self._read_test(lines, [[1, 2.5, 'X', '3'], [-4, 1000.0, 'Y']],
+                        converters=[int, float, str.upper])
+        self._read_test(lines, [[1, 'x', 2.5], [-4, 'y', 1000.0]],
+                        columns=[0, 2, 1], converters=[int, None, float])
+        self._read_test(['1,"2",3'], [[1, '2', 3.0]],
+                        quoting=csv.QUOTE_NONNUMERIC, converters=[int, str])
+        with self.assertRaises(ValueError):
+            list(csv.reader(['1,x'], converters=[int, int]))
+        with self.assertRaises(ZeroDivisionError):
+            list(csv.reader(['1'], converters=[lambda s: 1 / 0]))
+        self.assertRaises(TypeError, csv.reader, lines, converters=[1])
+        self.assertRaises(TypeError, csv.reader, lines, converters=int)
+
+    def test_binary_reader(self):
+        rows = [['a', 'b\r\nc', '\xe9\u20ac'], [], ['1', '', '"']] * 50
+        sio = StringIO(newline='')
+        csv.writer(sio).writerows(rows)
+        data = sio.getvalue().encode('utf-8')
+        for buffer_size in 1, 2, 7, 100, 65536:
+            with self.subTest(buffer_size=buffer_size):
+                reader = csv.binary_reader(BytesIO(data),
+                                           buffer_size=buffer_size)
+                self.assertEqual(list(reader), rows)
+        # The lines are split as by a text file opened with newline=''
+        for newline in '\r', '\n':
+            text = sio.getvalue().replace('\r\n', newline)
+            expected = list(csv.reader(StringIO(text, newline='')))
+            reader = csv.binary_reader(BytesIO(text.encode('utf-8')),
+                                       buffer_size=5)
+            self.assertEqual(list(reader), expected)
+        reader = csv.binary_reader(BytesIO('a;\xe9\n'.encode('latin-1')),
+                                   encoding='latin-1', delimiter=';',
+                                   columns=[1])
+        self.assertEqual(list(reader), [['\xe9']])
+        reader = csv.binary_reader(BytesIO(b'a\xff\n'),
+                                   errors='replace')
+        self.assertEqual(list(reader), [['a\ufffd']])
+        with self.assertRaises(UnicodeDecodeError):
+            list(csv.binary_reader(BytesIO(b'a\xff\n')))
+
+    def test_read_columns(self):
+        data = b'1,x,2.5\r\n2,y,3\r\n\r\n3,z,-1\r\n'
+        batches = list(csv.read_columns(BytesIO(data), ['q', None, 'd']))
+        self.assertEqual(batches, [[array('q', [1, 2, 3]), ['x', 'y', 'z'],
+                                    array('d', [2.5, 3.0, -1.0])]])
+        batches = list(csv.read_columns(BytesIO(data), ['f', 'b'],
+                                        columns=[2, 0], batch_size=2))
+        self.assertEqual(batches, [[array('f', [2.5, 3.0]), array('b', [1, 2])],
+                                   [array('f', [-1.0]), array('b', [3])]])
+        self.assertEqual(list(csv.read_columns(BytesIO(b''), ['q'])), [])
+        self.assertRaises(ValueError, csv.read_columns, BytesIO(data), ['u'])
+        self.assertRaises(ValueError, csv.read_columns, BytesIO(data), ['q'],
+                          columns=[0, 1])
+        with self.assertRaises(ValueError):
+            list(csv.read_columns(BytesIO(data), ['q', 'q']))
+        with self.assertRaises(TypeError):
+            list(csv.read_columns(BytesIO(b'1\r\n'), ['q', 'q']))
+
     def test_roundtrip_quoteed_newlines(self):
         with TemporaryFile("w+", newline='') as fileobj:
             writer = csv.writer(fileobj)
@@ -732,6 +824,74 @@ class TestDictFields(unittest.TestCase):
         self.assertEqual(next(reader), {"1": '1', "2": '2', "3": 'abc',
                                          "4": '4', "5": '5', "6": '6'})
 
+    def test_read_shared_keys(self):
+        reader = csv.DictReader(["f1,f2,f3\r\n", "1,2,abc\r\n",
+                                 "\r\n", "4,5\r\n", "6,7,8,9,10\r\n"],
+                                restval="DEFAULT", shared_keys=True)
+        rows = list(reader)
+        self.assertEqual(len(rows), 3)
+        self.assertIs(type(rows[0]), type(rows[2]))
+        self.assertEqual(reader.line_num, 5)
+        row = rows[0]
+        self.assertEqual(row, ('1', '2', 'abc'))
+        self.assertEqual(row["f2"], '2')
+        self.assertEqual(row[0], '1')
+        self.assertEqual(row[-1], 'abc')
+        self.assertEqual(row[1:], ('2', 'abc'))
+        self.assertEqual(row.keys(), ["f1", "f2", "f3"])
+        self.assertEqual(row.values(), ['1', '2', 'abc'])
+        self.assertEqual(dict(row), {"f1": '1', "f2": '2', "f3": 'abc'})
+        self.assertEqual(row.get("f3"), 'abc')
+        self.assertIsNone(row.get("f4"))
+        self.assertIsNone(row.get(None))
+        self.assertRaises(KeyError, row.__getitem__, "f4")
+        self.assertRaises(KeyError, row.__getitem__, None)
+        self.assertRaises(IndexError, row.__getitem__, 3)
+        self.assertEqual(dict(rows[1]), {"f1": '4', "f2": '5',
+                                         "f3": 'DEFAULT'})
+        self.assertEqual(dict(rows[2]), {"f1": '6', "f2": '7', "f3": '8',
+                                         None: ['9', '10']})
+        self.assertEqual(rows[2][None], ['9', '10'])
+        self.assertEqual(rows[2].keys(), ["f1", "f2", "f3", None])
+        self.assertEqual(repr(rows[1]),
+                         "Row({'f1': '4', 'f2': '5', 'f3': 'DEFAULT'})")
+
+    def test_read_shared_keys_fieldnames(self):
+        reader = csv.DictReader(["1,2\r\n", "3,4,5\r\n", "6,7\r\n"],
+                                fieldnames=[0, "b"], restkey="_rest",
+                                shared_keys=True)
+        row = next(reader)
+        self.assertEqual(row[0], '1')
+        self.assertEqual(row[1], '2')
+        self.assertEqual(row["b"], '2')
+        self.assertEqual(dict(next(reader)), {0: '3', "b": '4',
+                                              "_rest": ['5']})
+        reader.fieldnames = ["c", "d"]
+        self.assertEqual(dict(next(reader)), {"c": '6', "d": '7'})
+
+    def test_write_dict_subclasses(self):
+        from collections import defaultdict, OrderedDict
+        fileobj = StringIO()
+        writer = csv.DictWriter(fileobj, fieldnames=["f1", "f2"],
+                                restval="-")
+        writer.writerow(defaultdict(int, f1=1))
+        writer.writerow(OrderedDict([("f2", 2)]))
+        writer.writerow({"f1": 3})
+        self.assertEqual(fileobj.getvalue(), "1,-\r\n-,2\r\n3,-\r\n")
+        writer.fieldnames = ["f2"]
+        self.assertRaises(ValueError, writer.writerow, {"f1": 1, "f2": 2})
+        writer.writerow({"f2": 4})
+        self.assertEqual(fileobj.getvalue(),
+                         "1,-\r\n-,2\r\n3,-\r\n4\r\n")
+
+    def test_write_shared_keys_rows(self):
+        reader = csv.DictReader(["f1,f2\r\n", "1,2\r\n", "3\r\n"],
+                                shared_keys=True)
+        fileobj = StringIO()
+        writer = csv.DictWriter(fileobj, fieldnames=["f2", "f1"])
+        writer.writerows(reader)
+        self.assertEqual(fileobj.getvalue(), "2,1\r\n,3\r\n")
+
 class TestArrayWrites(unittest.TestCase):
     def test_int_write(self):
         import array
@@ -8,6 +8,9 @@ import os
 import io
 import struct
 import array
+import random
+import zlib
+import _compression
 gzip = support.import_module('gzip')
 
 data1 = b"""  int length=DEFAULTALLOC, err = Z_OK;
@@ -493,6 +496,119 @@ class TestGzip(BaseTest):
         with gzip.open(self.filename, "rb") as f:
             f._buffer.raw._fp.prepend()
 
+    def test_write_threads(self):
+        data = data1 * 500 + data2 * 500
+        for threads in (0, 2, 4):
+            with support.swap_attr(gzip, '_PARALLEL_BLOCK_SIZE', 1000):
+                with gzip.GzipFile(self.filename, 'wb', threads=threads) as f:
+                    f.write(data[:100])
+                    f.flush()
+                    f.write(memoryview(data)[100:15000])
+                    f.flush(zlib.Z_FULL_FLUSH)
+                    f.write(data[15000:])
+                    self.assertEqual(f.tell(), len(data))
+            with open(self.filename, 'rb') as f:
+                compressed = f.read()
+            # A single gzip member
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self.assertEqual(decompressor.decompress(compressed), data)
+            self.assertTrue(decompressor.eof)
+            self.assertEqual(decompressor.unused_data, b'')
+            with gzip.GzipFile(self.filename) as f:
+                self.assertEqual(f.read(), data)
+
+    def test_write_threads_bounded(self):
+        # A large write doesn't put all its blocks in flight at once
+        in_flight = []
+        class Deflater(gzip._ParallelDeflater):
+            def _submit(self, *args):
+                super()._submit(*args)
+                in_flight.append(len(self._pending))
+        data = bytearray(data1 * 2000)
+        with support.swap_attr(gzip, '_PARALLEL_BLOCK_SIZE', 1000), \
+             support.swap_attr(gzip, '_ParallelDeflater', Deflater):
+            with gzip.GzipFile(self.filename, 'wb', threads=2) as f:
+                f.write(data[:500])
+                f.write(data[500:])
+                # The data was copied
+                data[:] = b''
+        self.assertGreater(len(in_flight), 100)
+        self.assertLessEqual(max(in_flight), 4)
+        with gzip.GzipFile(self.filename) as f:
+            self.assertEqual(f.read(), data1 * 2000)
+
+    def test_write_threads_empty(self):
+        with gzip.GzipFile(self.filename, 'wb', threads=2):
+            pass
+        with gzip.GzipFile(self.filename) as f:
+            self.assertEqual(f.read(), b'')
+
+    def test_threads_bad_args(self):
+        self.assertRaises(ValueError, gzip.GzipFile, self.filename, 'wb',
+                          threads=-1)
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            f.write(data1)
+        self.assertRaises(ValueError, gzip.GzipFile, self.filename, 'rb',
+                          threads=2)
+
+    def test_index(self):
+        rng = random.Random(42)
+        data = bytes(rng.choice(b'abcdefgh\n') for i in range(300000))
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            f.write(data[:200000])
+        with gzip.GzipFile(self.filename, 'ab') as f:
+            f.write(data[200000:])
+        with support.swap_attr(_compression, 'INDEX_SPACING', 10000):
+            with gzip.GzipFile(self.filename, index=True) as f:
+                self.assertEqual(f.read(150000), data[:150000])
+                self.assertEqual(f.seek(-10, 2), len(data) - 10)
+                self.assertEqual(f.read(), data[-10:])
+                points = len(f._index)
+                # Seek points in both members
+                self.assertGreater(points, 4)
+                for i in range(100):
+                    pos = rng.randrange(len(data))
+                    self.assertEqual(f.seek(pos), pos)
+                    self.assertEqual(f.read(1000), data[pos:pos + 1000])
+                self.assertEqual(len(f._index), points)
+                f.save_index(self.filename + '.idx')
+        self.addCleanup(support.unlink, self.filename + '.idx')
+        with gzip.GzipFile(self.filename, index=self.filename + '.idx') as f:
+            self.assertEqual(len(f._index), points)
+            self.assertEqual(f.seek(-10, 2), len(data) - 10)
+            self.assertEqual(f.read(), data[-10:])
+            f.seek(123456)
+            self.assertEqual(f.read(1000), data[123456:124456])
+            f.seek(0)
+            self.assertEqual(f.read(), data)
+        with open(self.filename + '.idx', 'rb') as idx, \
+             gzip.open(self.filename, index=idx) as f:
+            f.seek(234567)
+            self.assertEqual(f.read(), data[234567:])
+
+    def test_index_bad_args(self):
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            f.write(data1)
+        self.assertRaises(ValueError, gzip.GzipFile, self.filename, 'ab',
+                          index=True)
+        with gzip.GzipFile(self.filename) as f:
+            self.assertRaises(ValueError, f.save_index, io.BytesIO())
+        with open(self.filename, 'rb') as f:
+            self.assertRaises(io.UnsupportedOperation, gzip.GzipFile,
+                              fileobj=UnseekableIO(f.read()), index=True)
+        self.assertRaises(ValueError, gzip.GzipFile, self.filename,
+                          index=io.BytesIO(data1))
+        index = io.BytesIO()
+        _compression.SeekIndex('bz2', 1000).save(index)
+        self.assertRaises(ValueError, gzip.GzipFile, self.filename,
+                          index=io.BytesIO(index.getvalue()))
+        index = io.BytesIO()
+        with gzip.GzipFile(self.filename, index=True) as f:
+            f.read()
+            f.save_index(index)
+        self.assertRaises(ValueError, gzip.GzipFile, self.filename,
+                          index=io.BytesIO(index.getvalue()[:-1]))
+
 class TestOpen(BaseTest):
     def test_binary_modes(self):
         uncompressed = data1 * 50
@@ -576,6 +692,25 @@ class TestOpen(BaseTest):
         with gzip.open(io.BytesIO(compressed), "rt") as f:
             self.assertEqual(f.read(), uncompressed_str)
 
+    def test_threads(self):
+        uncompressed = data1.decode("ascii") * 500
+        with gzip.open(self.filename, "wt", threads=2) as f:
+            f.write(uncompressed)
+        with gzip.open(self.filename, "rt") as f:
+            self.assertEqual(f.read(), uncompressed)
+        with gzip.open(io.BytesIO(), "wb", threads=2) as f:
+            f.write(data1)
+
+    def test_index(self):
+        uncompressed = data1.decode("ascii") * 500
+        with gzip.open(self.filename, "wt") as f:
+            f.write(uncompressed)
+        with gzip.open(self.filename, "rt", index=True) as f:
+            f.seek(5000)
+            self.assertEqual(f.read(), uncompressed[5000:])
+            f.seek(0)
+            self.assertEqual(f.read(), uncompressed)
+
     def test_bad_params(self):
         # Test invalid parameter combinations.
         with self.assertRaises(TypeError):
@@ -9,9 +9,97 @@ class TestDump:
         self.json.dump({}, sio)
         self.assertEqual(sio.getvalue(), '{}')
 
+    def test_dump_coalesced_writes(self):
+        class File:
+            def __init__(self):
+                self.writes = []
+            def write(self, s):
+                self.writes.append(s)
+        obj = [{'a': [i, str(i)], 'b': None} for i in range(5000)]
+        for indent in None, 2:
+            f = File()
+            self.json.dump(obj, f, indent=indent)
+            self.assertEqual(''.join(f.writes),
+                             self.dumps(obj, indent=indent))
+            self.assertLess(len(f.writes), len(f.writes[0]))
+        f = File()
+        self.json.dump([], f)
+        self.assertEqual(f.writes, ['[]'])
+
     def test_dumps(self):
         self.assertEqual(self.dumps({}), '{}')
 
+    def test_dumpb(self):
+        self.assertEqual(self.json.dumpb({}), b'{}')
+        obj = {'caf\xe9': ['\u20ac', 1.5, None]}
+        self.assertEqual(self.json.dumpb(obj),
+                         self.dumps(obj).encode('ascii'))
+        self.assertEqual(self.json.dumpb(obj, ensure_ascii=False),
+                         '{"caf\xe9": ["\u20ac", 1.5, null]}'.encode('utf-8'))
+        self.assertEqual(self.json.dumpb(obj, indent=1, separators=(',', ':')),
+                         self.dumps(obj, indent=1,
+                                    separators=(',', ':')).encode('ascii'))
+        self.assertEqual(self.json.dumpb('\ud800'), b'"\\ud800"')
+        with self.assertRaises(UnicodeEncodeError):
+            self.json.dumpb('\ud800', ensure_ascii=False)
+
+    def test_encode_into(self):
+        encoder = self.json.JSONEncoder(ensure_ascii=False)
+        buffer = bytearray(b'>')
+        self.assertEqual(encoder.encode_into([1, 'caf\xe9'], buffer), 12)
+        self.assertEqual(encoder.encode_into(None, buffer), 4)
+        self.assertEqual(buffer, '>[1, "caf\xe9"]null'.encode('utf-8'))
+        with self.assertRaises(TypeError):
+            encoder.encode_into(object(), buffer)
+        self.assertEqual(buffer, '>[1, "caf\xe9"]null'.encode('utf-8'))
+
+    def test_encode_into_large(self):
+        obj = [{'caf\xe9': i, 'list': [None] * (i % 7)} for i in range(5000)]
+        for kw in ({}, {'ensure_ascii': False}, {'indent': 1}):
+            with self.subTest(**kw):
+                encoder = self.json.JSONEncoder(**kw)
+                buffer = bytearray(b'>')
+                size = encoder.encode_into(obj, buffer)
+                expected = encoder.encode(obj).encode('utf-8')
+                self.assertEqual(encoder.encodeb(obj), expected)
+                self.assertEqual(size, len(expected))
+                self.assertEqual(buffer, b'>' + expected)
+                with self.assertRaises(TypeError):
+                    encoder.encode_into(obj + [object()], buffer)
+                self.assertEqual(buffer, b'>' + expected)
+
+    def test_encodeb_overridden_iterencode(self):
+        class Encoder(self.json.JSONEncoder):
+            def iterencode(self, o, _one_shot=False):
+                yield '<'
+                yield from super().iterencode(o, _one_shot)
+                yield '>'
+        encoder = Encoder()
+        self.assertEqual(encoder.encodeb([1, '\u20ac']), b'<[1, "\\u20ac"]>')
+        buffer = bytearray()
+        self.assertEqual(encoder.encode_into(None, buffer), 6)
+        self.assertEqual(buffer, b'<null>')
+
+    def test_key_cache(self):
+        rows = [{'id': i, 'name\n': 'x', 1: None, 2.5: True, None: False,
+                 True: [{'id': i}], 'caf\xe9': '\u20ac'} for i in range(10)]
+        for kw in ({}, {'ensure_ascii': False}, {'indent': 2},
+                   {'separators': (',', ':')}, {'sort_keys': True}):
+            if kw.get('sort_keys'):
+                rows = [{str(k): v for k, v in row.items()} for row in rows]
+            expected = self.dumps(rows, **kw)
+            for size in 1, 3, 100:
+                with self.subTest(kw=kw, key_cache_size=size):
+                    self.assertEqual(self.dumps(rows, key_cache_size=size,
+                                                **kw),
+                                     expected)
+        encoder = self.json.JSONEncoder(key_cache_size=2)
+        self.assertEqual(encoder.key_cache_size, 2)
+        self.assertEqual(encoder.encode({'a': {'a': 1}}), '{"a": {"a": 1}}')
+        self.assertEqual(self.json.JSONEncoder().key_cache_size, 0)
+        with self.assertRaises(ValueError):
+            self.json.JSONEncoder(key_cache_size=-1)
+
     def test_encode_truefalse(self):
         self.assertEqual(self.dumps(
                  {True: False, False: True}, sort_keys=True),
@@ -0,0 +1,218 @@
+import itertools
+from io import StringIO, BytesIO
+from collections import OrderedDict
+from test.test_json import PyTest, CTest
+
+
+DOC = '''
+{"name": "spam", "tags": ["a", "b\\u00e9"], "rows": [
+    {"id": 1, "x": -1.5e3, "ok": true},
+    {"id": 22, "x": NaN, "ok": false, "nested": [[], {}]},
+    null
+], "empty": {}}
+'''
+
+EVENTS = [
+    ((), 'start_map', None),
+    ((), 'map_key', 'name'),
+    (('name',), 'value', 'spam'),
+    ((), 'map_key', 'tags'),
+    (('tags',), 'start_array', None),
+    (('tags', 0), 'value', 'a'),
+    (('tags', 1), 'value', 'b\xe9'),
+    (('tags',), 'end_array', None),
+    ((), 'map_key', 'rows'),
+    (('rows',), 'start_array', None),
+    (('rows', 0), 'start_map', None),
+    (('rows', 0), 'map_key', 'id'),
+    (('rows', 0, 'id'), 'value', 1),
+    (('rows', 0), 'map_key', 'x'),
+    (('rows', 0, 'x'), 'value', -1500.0),
+    (('rows', 0), 'map_key', 'ok'),
+    (('rows', 0, 'ok'), 'value', True),
+    (('rows', 0), 'end_map', None),
+    (('rows', 1), 'start_map', None),
+    (('rows', 1), 'map_key', 'id'),
+    (('rows', 1, 'id'), 'value', 22),
+    (('rows', 1), 'map_key', 'x'),
+    (('rows', 1, 'x'), 'value', 'NaN'),
+    (('rows', 1), 'map_key', 'ok'),
+    (('rows', 1, 'ok'), 'value', False),
+    (('rows', 1), 'map_key', 'nested'),
+    (('rows', 1, 'nested'), 'start_array', None),
+    (('rows', 1, 'nested', 0), 'start_array', None),
+    (('rows', 1, 'nested', 0), 'end_array', None),
+    (('rows', 1, 'nested', 1), 'start_map', None),
+    (('rows', 1, 'nested', 1), 'end_map', None),
+    (('rows', 1, 'nested'), 'end_array', None),
+    (('rows', 1), 'end_map', None),
+    (('rows', 2), 'value', None),
+    (('rows',), 'end_array', None),
+    ((), 'map_key', 'empty'),
+    (('empty',), 'start_map', None),
+    (('empty',), 'end_map', None),
+    ((), 'end_map', None),
+]
+
+
+def split(s, size):
+    return [s[i:i + size] for i in range(0, len(s), size)]
+
+
+class TestIterload:
+    def iterdecode(self, s, size, items=None, **kw):
+        decoder = self.json.JSONDecoder(**kw)
+        return list(decoder.iterdecode(split(s, size), items))
+
+    def test_events(self):
+        for size in range(1, len(DOC) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(self.iterdecode(DOC, size,
+                                                 parse_constant=str),
+                                 EVENTS)
+
+    def test_scalar_documents(self):
+        for doc, value in [('0', 0), (' 123 ', 123), ('-1.25e2', -125.0),
+                           ('"abc"', 'abc'), ('true', True), ('null', None),
+                           ('-Infinity', float('-inf'))]:
+            for size in range(1, len(doc) + 1):
+                with self.subTest(doc=doc, size=size):
+                    self.assertEqual(self.iterdecode(doc, size),
+                                     [((), 'value', value)])
+
+    def test_items(self):
+        expected = self.loads(DOC, parse_constant=str)
+        for size in range(1, len(DOC) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    self.iterdecode(DOC, size, ('rows',),
+                                    parse_constant=str),
+                    expected['rows'])
+                self.assertEqual(self.iterdecode(DOC, size, ['tags']),
+                                 expected['tags'])
+                self.assertEqual(
+                    self.iterdecode(DOC, size, ('rows', 1, 'nested')),
+                    [[], {}])
+        self.assertEqual(self.iterdecode(DOC, 7, ('name',)), [])
+        self.assertEqual(self.iterdecode(DOC, 7, ('missing',)), [])
+        self.assertEqual(self.iterdecode('[1, [2, 3], "4"]', 1, ()),
+                         [1, [2, 3], '4'])
+        self.assertEqual(self.iterdecode('[]', 1, ()), [])
+
+    def test_items_hooks(self):
+        s = '[{"b": 1, "a": 2}, {"c": 3.5}]'
+        self.assertEqual(self.iterdecode(s, 3, (),
+                                         object_pairs_hook=OrderedDict),
+                         [OrderedDict([('b', 1), ('a', 2)]),
+                          OrderedDict([('c', 3.5)])])
+        self.assertEqual(self.iterdecode(s, 3, (), object_hook=len),
+                         [2, 1])
+
+    def test_lazy(self):
+        read = []
+        def chunks():
+            for chunk in split('[1, 2, 3, 4, 5, 6, 7, 8, 9]', 3):
+                read.append(chunk)
+                yield chunk
+        it = self.json.JSONDecoder().iterdecode(chunks(), ())
+        self.assertEqual(next(it), 1)
+        self.assertLess(len(read), 3)
+        self.assertEqual(list(it), [2, 3, 4, 5, 6, 7, 8, 9])
+
+    def test_errors(self):
+        for doc, msg, pos in [
+                ('', 'Expecting value', 0),
+                ('[1, 2', "Expecting ',' delimiter", 5),
+                ('[1 2]', "Expecting ',' delimiter", 3),
+                ('[1,]', 'Expecting value', 3),
+                ('{"a" 1}', "Expecting ':' delimiter", 5),
+                ('{"a": 1,}', 'Expecting property name enclosed in double '
+                              'quotes', 8),
+                ('{1: 2}', 'Expecting property name enclosed in double '
+                           'quotes', 1),
+                ('{"a": 1', "Expecting ',' delimiter", 7),
+                ('[x]', 'Expecting value', 1),
+                ('[1] [2]', 'Extra data', 4),
+                ('["abc', 'Unterminated string starting at', 1),
+            ]:
+            for size in range(1, len(doc) + 1):
+                with self.subTest(doc=doc, size=size):
+                    with self.assertRaises(self.JSONDecodeError) as cm:
+                        self.iterdecode(doc, size)
+                    err = cm.exception
+                    self.assertEqual(err.msg, msg)
+                    # The position is relative to the buffered part of the
+                    # document
+                    self.assertTrue(doc[pos:].startswith(err.doc[err.pos:]))
+                    self.assertEqual(err.doc[err.pos:err.pos + 1],
+                                     doc[pos:pos + 1])
+        with self.assertRaises(self.JSONDecodeError):
+            self.iterdecode('[[1, 2}]', 2, ())
+
+    def test_early_errors(self):
+        # Invalid data is reported without reading the rest of the document
+        for start in ['[1, x', '[1, tru ', '{"a": 1 "b"', '[1, "a\\q',
+                      '[1, 12a', '{"a": [1, 2}', 'garbage', '[1, -a']:
+            read = []
+            def chunks():
+                yield start
+                for i in itertools.count():
+                    read.append(i)
+                    yield ', 1' * 100
+            with self.subTest(start=start):
+                with self.assertRaises(self.JSONDecodeError):
+                    list(self.json.JSONDecoder().iterdecode(chunks()))
+                self.assertLess(len(read), 3)
+                read.clear()
+                with self.assertRaises(self.JSONDecodeError):
+                    list(self.json.JSONDecoder().iterdecode(chunks(), ()))
+                self.assertLess(len(read), 3)
+
+    def test_bytes_chunks(self):
+        expected = self.iterdecode(DOC, len(DOC), parse_constant=str)
+        data = DOC.replace('b\\u00e9', 'b\xe9\u20ac').encode('utf-8')
+        expected[6] = (('tags', 1), 'value', 'b\xe9\u20ac')
+        for size in range(1, len(data) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(self.iterdecode(data, size,
+                                                 parse_constant=str),
+                                 expected)
+        self.assertEqual(self.iterdecode(b'[1]', 1), self.iterdecode('[1]', 1))
+        self.assertEqual(self.iterdecode(bytearray(b'"\xc3\xa9"'), 1),
+                         [((), 'value', '\xe9')])
+        self.assertEqual(self.iterdecode(b'1', 1), [((), 'value', 1)])
+        with self.assertRaises(UnicodeDecodeError):
+            self.iterdecode(b'"\xc3', 1)
+
+    def test_non_str_chunks(self):
+        decoder = self.json.JSONDecoder()
+        with self.assertRaises(TypeError):
+            list(decoder.iterdecode([[1]]))
+        with self.assertRaises(TypeError):
+            list(decoder.iterdecode(['[1, ', b'2]']))
+        with self.assertRaises(TypeError):
+            list(decoder.iterdecode([b'[1, ', '2]']))
+
+    def test_iterload(self):
+        self.assertEqual(list(self.json.iterload(StringIO(DOC), chunk_size=5,
+                                                 parse_constant=str)),
+                         EVENTS)
+        self.assertEqual(list(self.json.iterload(StringIO(DOC),
+                                                 items=('rows', 0))),
+                         [])
+        self.assertEqual(list(self.json.iterload(StringIO(DOC),
+                                                 items=('tags',),
+                                                 chunk_size=1)),
+                         ['a', 'b\xe9'])
+        self.assertEqual(list(self.json.iterload(StringIO('[{"a": 1}]'),
+                                                 items=(),
+                                                 object_hook=list)),
+                         [['a']])
+        data = DOC.replace('b\\u00e9', 'b\xe9').encode('utf-8')
+        self.assertEqual(list(self.json.iterload(BytesIO(data), chunk_size=5,
+                                                 parse_constant=str)),
+                         EVENTS)
+
+
+class TestPyIterload(TestIterload, PyTest): pass
+class TestCIterload(TestIterload, CTest): pass
@@ -0,0 +1,173 @@
+import json
+import unittest
+from io import StringIO, BytesIO
+from collections import OrderedDict
+from test import support
+from test.test_json import PyTest, CTest
+
+
+RECORDS = [
+    {'id': 1, 'name': 'spam', 'tags': ['a', 'b']},
+    {'id': 2, 'name': 'eggs\n€', 'tags': []},
+    [1, 2.5, None, True],
+    'text',
+    42,
+]
+
+
+class TestLines:
+    def test_dump_lines(self):
+        sio = StringIO()
+        self.json.dump_lines(RECORDS, sio)
+        lines = sio.getvalue().split('\n')
+        self.assertEqual(lines[-1], '')
+        self.assertEqual(lines[:-1], [self.dumps(r) for r in RECORDS])
+
+        sio = StringIO()
+        self.json.dump_lines(iter(range(3000)), sio)
+        self.assertEqual(sio.getvalue(),
+                         ''.join('%d\n' % i for i in range(3000)))
+
+        sio = StringIO()
+        self.json.dump_lines([], sio)
+        self.assertEqual(sio.getvalue(), '')
+
+    def test_dump_lines_options(self):
+        sio = StringIO()
+        self.json.dump_lines([{'b': 1, 'a': '\xe9'}, {1, 2}], sio,
+                             sort_keys=True, ensure_ascii=False,
+                             separators=(',', ':'), default=sorted)
+        self.assertEqual(sio.getvalue(), '{"a":"\xe9","b":1}\n[1,2]\n')
+
+        class Encoder(self.json.JSONEncoder):
+            def encode(self, o):
+                return '<%s>' % super().encode(o)
+        sio = StringIO()
+        self.json.dump_lines([1, 'a'], sio, cls=Encoder)
+        self.assertEqual(sio.getvalue(), '<1>\n<"a">\n')
+
+        with self.assertRaises(TypeError):
+            self.json.dump_lines([object()], StringIO())
+
+    def test_dump_lines_indent(self):
+        # Each object must fit on a single line
+        sio = StringIO()
+        with self.assertRaises(ValueError):
+            self.json.dump_lines([{'a': [1, 2]}, 3], sio, indent=2)
+        class Encoder(self.json.JSONEncoder):
+            def __init__(self, **kw):
+                super().__init__(indent=2, **kw)
+        with self.assertRaises(ValueError):
+            self.json.dump_lines([{'a': [1, 2]}, 3], sio, cls=Encoder)
+        self.assertEqual(sio.getvalue(), '')
+        self.json.dump_lines([{'a': [1, 2]}], sio, indent=None)
+        self.assertEqual(sio.getvalue(), '{"a": [1, 2]}\n')
+
+    def test_load_lines(self):
+        sio = StringIO()
+        self.json.dump_lines(RECORDS, sio)
+        s = sio.getvalue()
+        for block_size in (1, 7, 100, 1 << 20):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(list(self.json.load_lines(
+                                     StringIO(s), block_size=block_size)),
+                                 RECORDS)
+                self.assertEqual(list(self.json.load_lines(
+                                     BytesIO(s.encode('utf-8')),
+                                     block_size=block_size)),
+                                 RECORDS)
+
+    def test_load_lines_whitespace(self):
+        s = '\n  1 \r\n\n[2, 3]\t\n \t\n{"a": 4}'
+        self.assertEqual(list(self.json.load_lines(StringIO(s))),
+                         [1, [2, 3], {'a': 4}])
+        self.assertEqual(list(self.json.load_lines(StringIO(''))), [])
+        self.assertEqual(list(self.json.load_lines(BytesIO(b'\n\n'))), [])
+
+    def test_load_lines_hooks(self):
+        s = '{"b": 1, "a": 2.5}\n{"c": 3}\n'
+        self.assertEqual(list(self.json.load_lines(
+                             StringIO(s), object_pairs_hook=OrderedDict)),
+                         [OrderedDict([('b', 1), ('a', 2.5)]),
+                          OrderedDict([('c', 3)])])
+        self.assertEqual(list(self.json.load_lines(
+                             StringIO(s), parse_float=str, parse_int=str)),
+                         [{'b': '1', 'a': '2.5'}, {'c': '3'}])
+
+    def test_load_lines_errors(self):
+        for s, msg in [('1\n2 3\n', 'Extra data'),
+                       ('1\n{"a": 1,}\n', 'Expecting property name '
+                                           'enclosed in double quotes'),
+                       ('[1, 2]\nx\n', 'Expecting value'),
+                       ('[1, 2]\n{"a"\n', "Expecting ':' delimiter")]:
+            with self.subTest(s=s):
+                with self.assertRaises(self.JSONDecodeError) as cm:
+                    list(self.json.load_lines(StringIO(s)))
+                self.assertEqual(cm.exception.msg, msg)
+        with self.assertRaises(UnicodeDecodeError):
+            list(self.json.load_lines(BytesIO(b'"\xff"\n')))
+
+    def test_load_lines_multiline(self):
+        # A document must fit on its line, whatever the block layout
+        for s, msg, pos in [('1\n[2,\n 3]\n', 'Expecting value', 5),
+                            ('1\n{"a":\n 3}\n', 'Expecting value', 7),
+                            ('1\n[2\n]\n', "Expecting ',' delimiter", 4),
+                            ('1\n[2, "a\nb"]\n', 'Unterminated string '
+                                                 'starting at', 6)]:
+            for block_size in (1, 3, 7, 100):
+                with self.subTest(s=s, block_size=block_size):
+                    with self.assertRaises(self.JSONDecodeError) as cm:
+                        list(self.json.load_lines(StringIO(s),
+                                                  block_size=block_size,
+                                                  strict=False))
+                    self.assertEqual(cm.exception.msg, msg)
+                    self.assertEqual(cm.exception.pos, pos)
+                    self.assertEqual(cm.exception.lineno, 2)
+
+    def test_load_lines_error_position(self):
+        s = '[1]\n"\xe9\xe9"\n\n  {"a": 1,}\n'
+        for block_size in (1, 5, 12, 100):
+            for fp in StringIO(s), BytesIO(s.encode('utf-8')):
+                with self.subTest(block_size=block_size, fp=fp):
+                    with self.assertRaises(self.JSONDecodeError) as cm:
+                        list(self.json.load_lines(fp, block_size=block_size))
+                    err = cm.exception
+                    self.assertEqual(err.msg, 'Expecting property name '
+                                              'enclosed in double quotes')
+                    self.assertEqual((err.pos, err.lineno, err.colno),
+                                     (20, 4, 11))
+                    self.assertEqual(str(err), '%s: line 4 column 11 '
+                                               '(char 20)' % err.msg)
+
+
+class TestPyLines(TestLines, PyTest): pass
+class TestCLines(TestLines, CTest): pass
+
+
+class TestLoadLinesWorkers(unittest.TestCase):
+    # The worker processes look up the functions and classes by name, so this
+    # uses the json module itself instead of the fresh copies of the others
+
+    def setUp(self):
+        support.import_module('multiprocessing.synchronize')
+
+    def test_load_lines_workers(self):
+        records = [{'id': i, 'value': [i / 2] * (i % 5)} for i in range(2000)]
+        sio = StringIO()
+        json.dump_lines(records, sio)
+        data = sio.getvalue()
+        for fp in StringIO(data), BytesIO(data.encode('ascii')):
+            self.assertEqual(list(json.load_lines(fp, block_size=1000,
+                                                  workers=2,
+                                                  parse_int=float)),
+                             [{'id': float(r['id']), 'value': r['value']}
+                              for r in records])
+
+    def test_load_lines_workers_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(json.load_lines(StringIO('1\n2\n[\n'), workers=2))
+        data = '1\n2\n' * 500 + '[3,\n4]\n'
+        with self.assertRaises(json.JSONDecodeError) as cm:
+            list(json.load_lines(StringIO(data), block_size=100, workers=2))
+        self.assertEqual((cm.exception.pos, cm.exception.lineno,
+                          cm.exception.colno), (2003, 1001, 4))
@@ -22,3 +22,18 @@ class TestDecode(CTest):
             (True, False),
             b"\xCD\x7D\x3D\x4E\x12\x4C\xF9\x79\xD7\x52\xBA\x82\xF2\x27\x4A\x7D\xA0\xCA\x75",
             None)
+
+    def test_make_encoder_key_cache(self):
+        make_encoder = self.json.encoder.c_make_encoder
+        encode = self.json.encoder.c_encode_basestring_ascii
+        self.assertRaises(TypeError, make_encoder, None, None, encode, None,
+                          ': ', ', ', False, False, False, [], 2)
+        cache = {}
+        encoder = make_encoder(None, None, encode, None, ': ', ', ',
+                               False, False, False, cache, 2)
+        self.assertIs(encoder.key_cache, cache)
+        self.assertEqual(''.join(encoder([{'a': 1}, {'b': 2}, {'a': 3}], 0)),
+                         '[{"a": 1}, {"b": 2}, {"a": 3}]')
+        self.assertEqual(cache, {'a': '"a": ', 'b': '"b": '})
+        self.assertEqual(''.join(encoder({'\xe9': 1}, 0)), '{"\\u00e9": 1}')
+        self.assertEqual(cache, {'\xe9': '"\\u00e9": '})
@@ -3793,6 +3793,35 @@ class LoggerTest(BaseTest):
         self.assertEqual(len(called), 1)
         self.assertEqual('Stack (most recent call last):\n', called[0])
 
+    def test_find_caller(self):
+        self.logger.error('located')
+        record = self.recording.records[-1]
+        self.assertEqual(record.pathname, __file__)
+        self.assertEqual(record.funcName, 'test_find_caller')
+
+    def test_record_policy(self):
+        self.logger.logCaller = False
+        self.logger.logThreads = False
+        self.logger.logProcesses = False
+        self.logger.error('bare')
+        record = self.recording.records[-1]
+        self.assertEqual(record.getMessage(), 'bare')
+        self.assertEqual(record.pathname, '(unknown file)')
+        self.assertEqual(record.lineno, 0)
+        self.assertEqual(record.funcName, '(unknown function)')
+        self.assertIsNone(record.thread)
+        self.assertIsNone(record.threadName)
+        self.assertIsNone(record.process)
+        self.assertIsNone(record.processName)
+        # Asking for the stack still finds the caller
+        self.logger.error('stacked', stack_info=True)
+        record = self.recording.records[-1]
+        self.assertEqual(record.funcName, 'test_record_policy')
+        self.assertIsNotNone(record.stack_info)
+        # Other loggers are unaffected
+        self.assertTrue(logging.Logger.logCaller)
+        self.assertTrue(logging.getLogger('blah.other').logThreads)
+
     def test_make_record_with_extra_overwrite(self):
         name = 'my record'
         level = 13
@@ -3833,6 +3862,41 @@ class LoggerTest(BaseTest):
         self.addCleanup(setattr, self.logger.manager, 'disable', old_disable)
         self.assertFalse(self.logger.isEnabledFor(22))
 
+    def test_is_enabled_for_cache(self):
+        parent = logging.getLogger('blah.cached')
+        child = logging.getLogger('blah.cached.child')
+        self.addCleanup(parent.setLevel, logging.NOTSET)
+        parent.setLevel(logging.WARNING)
+        self.assertFalse(child.isEnabledFor(logging.INFO))
+        self.assertEqual(child._cache, {logging.INFO: False})
+
+        # setLevel() invalidates the cache of the whole hierarchy
+        parent.setLevel(logging.INFO)
+        self.assertEqual(child._cache, {})
+        self.assertTrue(child.isEnabledFor(logging.INFO))
+
+        # and so does disable()
+        self.addCleanup(logging.disable, 0)
+        logging.disable(logging.INFO)
+        self.assertFalse(child.isEnabledFor(logging.INFO))
+        logging.disable(0)
+        self.assertTrue(child.isEnabledFor(logging.INFO))
+
+    def test_is_enabled_for_cache_config(self):
+        parent = logging.getLogger('blah.configured')
+        child = logging.getLogger('blah.configured.child')
+        child.setLevel(logging.ERROR)
+        self.assertFalse(child.isEnabledFor(logging.WARNING))
+        logging.config.dictConfig({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'loggers': {'blah.configured': {'level': 'WARNING'}},
+        })
+        # The level of the existing child was reset
+        self.assertEqual(child.level, logging.NOTSET)
+        self.assertTrue(child.isEnabledFor(logging.WARNING))
+        self.assertFalse(child.isEnabledFor(logging.INFO))
+
     def test_root_logger_aliases(self):
         root = logging.getLogger()
         self.assertIs(root, logging.root)
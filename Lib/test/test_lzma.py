@@ -1024,6 +1024,36 @@ class FileTestCase(unittest.TestCase):
         finally:
             unlink(TESTFN)
 
+    def test_write_threads(self):
+        # Three blocks of 1 MiB
+        data = INPUT * (2500000 // len(INPUT))
+        for threads in (0, 2):
+            with BytesIO() as dst:
+                with LZMAFile(dst, "w", preset=0, threads=threads) as f:
+                    f.write(data[:1000])
+                    f.write(data[1000:])
+                    self.assertEqual(f.tell(), len(data))
+                self.assertEqual(lzma.decompress(dst.getvalue()), data)
+                dst.seek(0)
+                with LZMAFile(dst) as f:
+                    self.assertEqual(f.read(), data)
+        with BytesIO() as dst:
+            with LZMAFile(dst, "w", threads=2):
+                pass
+            self.assertEqual(dst.getvalue(), lzma.compress(b""))
+
+    def test_threads_bad_args(self):
+        self.assertRaises(ValueError, LZMAFile, BytesIO(), "w", threads=-1)
+        self.assertRaises(ValueError, LZMAFile, BytesIO(COMPRESSED_XZ), "r",
+                          threads=2)
+        self.assertRaises(ValueError, LZMAFile, BytesIO(), "w",
+                          format=lzma.FORMAT_ALONE, threads=2)
+        self.assertRaises(ValueError, LZMAFile, BytesIO(), "w",
+                          format=lzma.FORMAT_RAW, filters=FILTERS_RAW_1,
+                          threads=2)
+        self.assertRaises(LZMAError, LZMAFile, BytesIO(), "w", preset=10,
+                          threads=2)
+
     def test_write_bad_args(self):
         f = LZMAFile(BytesIO(), "w")
         f.close()
@@ -1159,6 +1189,14 @@ class OpenTestCase(unittest.TestCase):
             file_data = lzma.decompress(bio.getvalue()).decode("ascii")
             self.assertEqual(file_data, uncompressed_raw * 2)
 
+    def test_threads(self):
+        with BytesIO() as bio:
+            with lzma.open(bio, "wb", preset=0, threads=2) as f:
+                f.write(INPUT)
+            self.assertEqual(lzma.decompress(bio.getvalue()), INPUT)
+        self.assertRaises(ValueError, lzma.open, BytesIO(), "wb",
+                          format=lzma.FORMAT_ALONE, threads=2)
+
     def test_filename(self):
         with TempFile(TESTFN):
             with lzma.open(TESTFN, "wb") as f:
@@ -2420,6 +2420,66 @@ class TestSendfile(unittest.TestCase):
                 raise
 
 
+@unittest.skipUnless(hasattr(os, 'copy_file_range'),
+                     'test needs os.copy_file_range()')
+class TestCopyFileRange(unittest.TestCase):
+
+    DATA = b"12345abcde" * 16 * 1024  # 160 KB
+    DST = support.TESTFN + '-dst'
+
+    def setUp(self):
+        create_file(support.TESTFN, self.DATA)
+        self.addCleanup(support.unlink, support.TESTFN)
+        self.addCleanup(support.unlink, self.DST)
+        self.src = os.open(support.TESTFN, os.O_RDONLY)
+        self.addCleanup(os.close, self.src)
+        self.dst = os.open(self.DST, os.O_WRONLY | os.O_CREAT, 0o600)
+        self.addCleanup(os.close, self.dst)
+
+    def copy(self, *args, **kwargs):
+        try:
+            return os.copy_file_range(*args, **kwargs)
+        except OSError as err:
+            if err.errno in (errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                             errno.EOPNOTSUPP, errno.EPERM):
+                self.skipTest('copy_file_range() not supported: %s' % err)
+            raise
+
+    def read_dst(self):
+        with open(self.DST, 'rb') as f:
+            return f.read()
+
+    def test_invalid_count(self):
+        with self.assertRaises(ValueError):
+            os.copy_file_range(self.src, self.dst, -1)
+
+    def test_copy(self):
+        total = 0
+        while True:
+            copied = self.copy(self.src, self.dst, len(self.DATA))
+            if copied == 0:
+                break
+            total += copied
+        self.assertEqual(total, len(self.DATA))
+        self.assertEqual(self.read_dst(), self.DATA)
+        # The file positions are updated when no offset is given.
+        self.assertEqual(os.lseek(self.src, 0, os.SEEK_CUR), len(self.DATA))
+        self.assertEqual(os.lseek(self.dst, 0, os.SEEK_CUR), len(self.DATA))
+
+    def test_offsets(self):
+        copied = self.copy(self.src, self.dst, 5, offset_src=5, offset_dst=3)
+        self.assertEqual(copied, 5)
+        self.assertEqual(self.read_dst(), b"\0\0\0abcde")
+        # Explicit offsets leave the file positions untouched.
+        self.assertEqual(os.lseek(self.src, 0, os.SEEK_CUR), 0)
+        self.assertEqual(os.lseek(self.dst, 0, os.SEEK_CUR), 0)
+
+    def test_eof(self):
+        copied = self.copy(self.src, self.dst, 10, offset_src=len(self.DATA))
+        self.assertEqual(copied, 0)
+        self.assertEqual(self.read_dst(), b"")
+
+
 def supports_extended_attributes():
     if not hasattr(os, "setxattr"):
         return False
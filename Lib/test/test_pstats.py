@@ -1,6 +1,7 @@
 import unittest
 from test import support
 from io import StringIO
+from functools import cmp_to_key
 import pstats
 
 
@@ -22,6 +23,16 @@ class AddCallersTestCase(unittest.TestCase):
         new_callers = pstats.add_callers(target, source)
         self.assertEqual(new_callers, {'a': 2, 'b': 5})
 
+    def test_combine_results_in_place(self):
+        target = {"a": (1, 2, 3, 4)}
+        source = {"a": (1, 2, 3, 4), "b": (5, 6, 7, 8)}
+        pstats.add_callers_in_place(target, source)
+        self.assertEqual(target, {'a': (2, 4, 6, 8), 'b': (5, 6, 7, 8)})
+        self.assertEqual(source, {'a': (1, 2, 3, 4), 'b': (5, 6, 7, 8)})
+        target = {"a": 1}
+        pstats.add_callers_in_place(target, {"a": 1, "b": 5})
+        self.assertEqual(target, {'a': 2, 'b': 5})
+
 
 class StatsTestCase(unittest.TestCase):
     def setUp(self):
@@ -33,6 +44,98 @@ class StatsTestCase(unittest.TestCase):
         stats = pstats.Stats(stream=stream)
         stats.add(self.stats, self.stats)
 
+    def check_sum(self, stats, single, count):
+        self.assertEqual(stats.total_calls, count * single.total_calls)
+        self.assertEqual(stats.prim_calls, count * single.prim_calls)
+        self.assertAlmostEqual(stats.total_tt, count * single.total_tt)
+        self.assertEqual(stats.max_name_len, single.max_name_len)
+        self.assertEqual(stats.top_level, single.top_level)
+        self.assertEqual(stats.stats.keys(), single.stats.keys())
+        for func, (cc, nc, tt, ct, callers) in single.stats.items():
+            t_cc, t_nc, t_tt, t_ct, t_callers = stats.stats[func]
+            self.assertEqual((t_cc, t_nc), (count * cc, count * nc))
+            self.assertAlmostEqual(t_tt, count * tt)
+            self.assertAlmostEqual(t_ct, count * ct)
+            self.assertEqual(t_callers.keys(), callers.keys())
+            for caller, value in callers.items():
+                self.assertEqual(t_callers[caller][:2],
+                                 tuple(count * x for x in value[:2]))
+
+    def test_add_sums(self):
+        stats_file = support.findfile('pstats.pck')
+        single = pstats.Stats(stats_file)
+        before = {func: (cc, nc, tt, ct, dict(callers))
+                  for func, (cc, nc, tt, ct, callers)
+                  in self.stats.stats.items()}
+        stats = pstats.Stats(stats_file, self.stats, stats_file)
+        self.check_sum(stats, single, 3)
+        self.assertEqual(len(stats.files), 3)
+        # The stats added are left unchanged
+        self.assertEqual(self.stats.stats, before)
+        stats.add(self.stats)
+        self.check_sum(stats, single, 4)
+
+    def test_add_empty_file(self):
+        self.addCleanup(support.unlink, support.TESTFN)
+        pstats.Stats(stream=StringIO()).dump_stats(support.TESTFN)
+        with self.assertRaises(TypeError):
+            self.stats.add(support.TESTFN)
+
+    def test_add_workers(self):
+        support.import_module('multiprocessing.synchronize')
+        stats_file = support.findfile('pstats.pck')
+        stats = pstats.Stats(stats_file, stats_file, stats_file, stats_file,
+                             stats_file, workers=2)
+        self.check_sum(stats, self.stats, 5)
+        self.assertEqual(len(stats.files), 5)
+        stats = pstats.Stats(stream=StringIO())
+        stats.add(stats_file, workers=3)
+        self.check_sum(stats, self.stats, 1)
+        with self.assertRaises(ValueError):
+            stats.add(stats_file, workers=0)
+
+    def test_sort_stats(self):
+        # The order is the same as with the comparison function
+        stats_list = []
+        for func, (cc, nc, tt, ct, callers) in self.stats.stats.items():
+            stats_list.append((cc, nc, tt, ct) + func +
+                              (pstats.func_std_string(func), func))
+        for field in [('cumulative', 'name'), ('time',),
+                      ('calls', 'filename', 'line'), ('nfl',), ('stdname',),
+                      (-1,), (2,)]:
+            with self.subTest(field=field):
+                self.stats.sort_stats(*field)
+                sort_tuple = ()
+                for word in field:
+                    if isinstance(word, int):
+                        word = {-1: "stdname", 0: "calls", 1: "time",
+                                2: "cumulative"}[word]
+                    sort_tuple += self.stats.get_sort_arg_defs()[word][0]
+                compare = pstats.TupleComp(sort_tuple).compare
+                expected = [t[-1] for t in sorted(stats_list,
+                                                  key=cmp_to_key(compare))]
+                self.assertEqual(self.stats.fcn_list, expected)
+                # The cached order is not changed by reverse_order()
+                self.stats.reverse_order()
+                self.assertEqual(self.stats.fcn_list, expected[::-1])
+                self.stats.sort_stats(*field)
+                self.assertEqual(self.stats.fcn_list, expected)
+
+    def test_callees_updated(self):
+        stream = StringIO()
+        stats = pstats.Stats(stream=stream).add(self.stats)
+        stats.calc_callees()
+        callees = stats.all_callees
+        stats.calc_callees()
+        self.assertIs(stats.all_callees, callees)
+        stats.add(self.stats)
+        stats.calc_callees()
+        self.assertIsNot(stats.all_callees, callees)
+        for func, called in callees.items():
+            for callee, value in called.items():
+                self.assertEqual(stats.all_callees[func][callee][:2],
+                                 tuple(2 * x for x in value[:2]))
+
 
 if __name__ == "__main__":
     unittest.main()
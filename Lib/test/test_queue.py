@@ -232,6 +232,56 @@ class BaseQueueTestMixin(BlockingTestMixin):
         with self.assertRaises(queue.Full):
             q.put_nowait(4)
 
+    def test_put_many_get_many(self):
+        q = self.type2test()
+        q.put_many(iter([111, 333, 222]))
+        self.assertEqual(q.qsize(), 3)
+        target_order = dict(Queue = [111, 333, 222],
+                            LifoQueue = [222, 333, 111],
+                            PriorityQueue = [111, 222, 333])
+        self.assertEqual(q.get_many(), target_order[q.__class__.__name__])
+        q.put_many(range(10))
+        self.assertEqual(len(q.get_many(4)), 4)
+        self.assertEqual(len(q.get_many(10)), 6)
+        with self.assertRaises(queue.Empty):
+            q.get_many(block=False)
+        with self.assertRaises(queue.Empty):
+            q.get_many(timeout=0.01)
+        with self.assertRaises(ValueError):
+            q.get_many(0)
+        with self.assertRaises(ValueError):
+            q.get_many(timeout=-1)
+        # Each item put counts as a task
+        for i in range(13):
+            q.task_done()
+        with self.assertRaises(ValueError):
+            q.task_done()
+
+    def test_put_many_full(self):
+        q = self.type2test(QUEUE_SIZE)
+        q.put(0)
+        with self.assertRaises(queue.Full):
+            q.put_many(range(QUEUE_SIZE), block=False)
+        self.assertEqual(q.qsize(), 1)
+        q.put_many(range(QUEUE_SIZE - 1), block=False)
+        self.assertTrue(q.full())
+        with self.assertRaises(queue.Full):
+            q.put_many([1], timeout=0.01)
+        with self.assertRaises(ValueError):
+            q.put_many([1], timeout=-1)
+
+    def test_put_many_get_many_blocking(self):
+        q = self.type2test(QUEUE_SIZE)
+        # More items than slots: put_many() waits for the queue to drain.
+        self.do_blocking_test(q.put_many, (range(QUEUE_SIZE + 2),),
+                              q.get_many, ())
+        self.assertEqual(q.qsize(), 2)
+        q.get_many()
+        result = self.do_blocking_test(q.get_many, (None, True, 10),
+                                       q.put_many, ([1, 2],))
+        # Both items were put under the same acquisition of the lock
+        self.assertEqual(sorted(result), [1, 2])
+
 class QueueTest(BaseQueueTestMixin, unittest.TestCase):
     type2test = queue.Queue
 
@@ -243,6 +293,62 @@ class PriorityQueueTest(BaseQueueTestMixin, unittest.TestCase):
 
 
 
+class SPSCQueueTest(BlockingTestMixin, unittest.TestCase):
+
+    def test_simple(self):
+        q = queue.SPSCQueue()
+        self.assertTrue(q.empty())
+        q.put(111)
+        q.put_nowait(333)
+        q.put(222)
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual([q.get(), q.get_nowait(), q.get()], [111, 333, 222])
+        self.assertTrue(q.empty())
+        with self.assertRaises(queue.Empty):
+            q.get(block=False)
+        with self.assertRaises(queue.Empty):
+            q.get_nowait()
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+        with self.assertRaises(ValueError):
+            q.get(timeout=-1)
+        self.assertEqual(self.do_blocking_test(q.get, (), q.put, ('empty',)),
+                         'empty')
+        self.assertEqual(self.do_blocking_test(q.get, (True, 10),
+                                               q.put, ('empty',)),
+                         'empty')
+
+    def test_put_many_get_many(self):
+        q = queue.SPSCQueue()
+        q.put_many(iter(range(10)))
+        self.assertEqual(q.get_many(4), [0, 1, 2, 3])
+        self.assertEqual(q.get_many(), [4, 5, 6, 7, 8, 9])
+        with self.assertRaises(queue.Empty):
+            q.get_many(block=False)
+        with self.assertRaises(queue.Empty):
+            q.get_many(timeout=0.01)
+        with self.assertRaises(ValueError):
+            q.get_many(0)
+        result = self.do_blocking_test(q.get_many, (None, True, 10),
+                                       q.put_many, ([1, 2],))
+        self.assertEqual(result, [1, 2])
+
+    def test_producer_consumer(self):
+        q = queue.SPSCQueue()
+        count = 10000
+        def produce():
+            for i in range(0, count, 10):
+                q.put(i)
+                q.put_many(range(i + 1, i + 10))
+        producer = threading.Thread(target=produce)
+        producer.start()
+        received = []
+        while len(received) < count:
+            received.extend(q.get_many(timeout=10))
+        producer.join()
+        self.assertEqual(received, list(range(count)))
+
+
 # A Queue subclass that can provoke failure at a moment's notice :)
 class FailingQueueException(Exception):
     pass
@@ -10,6 +10,8 @@ import os
 import os.path
 import errno
 import functools
+import contextlib
+import io
 import subprocess
 from contextlib import ExitStack
 from shutil import (make_archive,
@@ -773,6 +775,110 @@ class TestShutil(unittest.TestCase):
         self.assertEqual(os.stat(restrictive_subdir).st_mode,
                           os.stat(restrictive_subdir_dst).st_mode)
 
+    def _make_tree(self, files=4, depth=2):
+        root = tempfile.mkdtemp()
+        self.addCleanup(support.rmtree, root)
+        def populate(path, depth):
+            for i in range(files):
+                write_file((path, 'file%d.txt' % i), path + str(i))
+            write_file((path, 'skip.tmp'), 'skipped')
+            if depth:
+                for i in range(2):
+                    subdir = os.path.join(path, 'dir%d' % i)
+                    os.mkdir(subdir)
+                    populate(subdir, depth - 1)
+        populate(root, depth)
+        return root
+
+    def test_copytree_workers(self):
+        src_dir = self._make_tree()
+        dst_dir = os.path.join(self.mkdtemp(), 'destination')
+        os.utime(os.path.join(src_dir, 'dir1'), (0, 0))
+
+        shutil.copytree(src_dir, dst_dir,
+                        ignore=shutil.ignore_patterns('*.tmp'), workers=3)
+        expected = [name for name in rlistdir(src_dir)
+                    if not name.endswith('.tmp')]
+        self.assertEqual(rlistdir(dst_dir), expected)
+        for name in expected:
+            if not name.endswith('/'):
+                self.assertEqual(read_file((dst_dir, name)),
+                                 read_file((src_dir, name)))
+        # The directories are stamped once all their files have been copied.
+        self.assertEqual(os.stat(os.path.join(dst_dir, 'dir1')).st_mtime, 0)
+
+    def test_copytree_workers_errors(self):
+        src_dir = self._make_tree()
+        dst_root = self.mkdtemp()
+        def copy_function(src, dst):
+            if src.endswith(('1.txt', '.tmp')):
+                raise OSError(errno.EIO, 'failed')
+            shutil.copy2(src, dst)
+
+        dst_dir = os.path.join(dst_root, 'sequential')
+        with self.assertRaises(Error) as cm:
+            shutil.copytree(src_dir, dst_dir, copy_function=copy_function)
+        expected = [(src, os.path.relpath(dst, dst_dir), why)
+                    for src, dst, why in cm.exception.args[0]]
+        self.assertEqual(len(expected), 14)
+
+        for workers in (1, 4):
+            dst_dir = os.path.join(dst_root, 'parallel%d' % workers)
+            with self.assertRaises(Error) as cm:
+                shutil.copytree(src_dir, dst_dir,
+                                copy_function=copy_function, workers=workers)
+            errors = [(src, os.path.relpath(dst, dst_dir), why)
+                      for src, dst, why in cm.exception.args[0]]
+            self.assertEqual(errors, expected)
+
+    def test_copytree_workers_unexpected_exception(self):
+        src_dir = self._make_tree(depth=0)
+        dst_dir = os.path.join(self.mkdtemp(), 'destination')
+        def copy_function(src, dst):
+            raise ZeroDivisionError
+        with self.assertRaises(ZeroDivisionError):
+            shutil.copytree(src_dir, dst_dir, copy_function=copy_function,
+                            workers=2)
+
+    def test_rmtree_workers(self):
+        for use_fd_functions in {shutil._use_fd_functions, False}:
+            with self.subTest(use_fd_functions=use_fd_functions), \
+                 unittest.mock.patch('shutil._use_fd_functions',
+                                     use_fd_functions):
+                root = self._make_tree()
+                shutil.rmtree(root, workers=3)
+                self.assertFalse(os.path.exists(root))
+
+    def test_rmtree_workers_onerror(self):
+        # Failures are reported from the calling thread, in listing order.
+        import threading
+        root = self._make_tree(depth=0)
+        real_unlink = os.unlink
+        def unlink(path, *args, **kwargs):
+            if path.endswith(('1.txt', '3.txt')):
+                raise PermissionError(errno.EACCES, 'denied', path)
+            real_unlink(path, *args, **kwargs)
+        errors = []
+        def onerror(func, path, exc_info):
+            self.assertIs(threading.current_thread(), threading.main_thread())
+            errors.append((func, path, exc_info[1]))
+
+        with unittest.mock.patch('os.unlink', unlink):
+            shutil.rmtree(root, onerror=onerror, workers=3)
+        expected = [os.path.join(root, name) for name in os.listdir(root)
+                    if name.endswith(('1.txt', '3.txt'))]
+        self.assertEqual([path for func, path, exc in errors[:-1]], expected)
+        for func, path, exc in errors[:-1]:
+            self.assertIsInstance(exc, PermissionError)
+        self.assertIs(errors[-1][0], os.rmdir)
+        self.assertEqual(errors[-1][1], root)
+
+        with unittest.mock.patch('os.unlink', unlink):
+            with self.assertRaises(PermissionError) as cm:
+                shutil.rmtree(root, workers=3)
+        self.assertEqual(os.path.basename(cm.exception.filename),
+                         os.path.basename(expected[0]))
+
     @unittest.mock.patch('os.chmod')
     def test_copytree_winerror(self, mock_patch):
         # When copying to VFAT, copystat() raises OSError. On Windows, the
@@ -1812,6 +1918,323 @@ class TestCopyFile(unittest.TestCase):
         finally:
             os.rmdir(dst_dir)
 
+class _ZeroCopyFileTest(object):
+    """Tests common to all zero-copy APIs."""
+    FILESIZE = (10 * 1024 * 1024)  # 10 MiB
+    FILEDATA = b""
+    PATCHPOINT = ""
+
+    @classmethod
+    def setUpClass(cls):
+        chunk = b"0123456789abcdef" * 64  # 1 KiB
+        cls.FILEDATA = chunk * (cls.FILESIZE // len(chunk))
+        with open(TESTFN, 'wb') as f:
+            f.write(cls.FILEDATA)
+
+    @classmethod
+    def tearDownClass(cls):
+        support.unlink(TESTFN)
+        support.unlink(TESTFN2)
+
+    def tearDown(self):
+        support.unlink(TESTFN2)
+
+    def zerocopy_fun(self, src, dst):
+        raise NotImplementedError("must be implemented in subclass")
+
+    @contextlib.contextmanager
+    def get_files(self):
+        with open(TESTFN, "rb") as src:
+            with open(TESTFN2, "wb") as dst:
+                yield (src, dst)
+
+    def test_regular_copy(self):
+        with self.get_files() as (src, dst):
+            self.assertIsNone(self.zerocopy_fun(src, dst))
+        with open(TESTFN2, "rb") as f:
+            self.assertEqual(f.read(), self.FILEDATA)
+        # Make sure the fallback function is not called.
+        with unittest.mock.patch('shutil._copyfileobj_readinto') as m:
+            shutil.copyfile(TESTFN, TESTFN2)
+            assert not m.called
+
+    def test_same_file(self):
+        self.addCleanup(self.reset)
+        with self.assertRaises(shutil.SameFileError):
+            shutil.copyfile(TESTFN, TESTFN)
+        with open(TESTFN, "rb") as f:
+            self.assertEqual(f.read(), self.FILEDATA)
+
+    def test_non_existent_src(self):
+        name = tempfile.mktemp()
+        with self.assertRaises(FileNotFoundError) as cm:
+            shutil.copyfile(name, "new")
+        self.assertEqual(cm.exception.filename, name)
+
+    def test_empty_file(self):
+        srcname = TESTFN + 'src'
+        dstname = TESTFN + 'dst'
+        self.addCleanup(lambda: support.unlink(srcname))
+        self.addCleanup(lambda: support.unlink(dstname))
+        with open(srcname, "wb"):
+            pass
+
+        with open(srcname, "rb") as src, open(dstname, "wb") as dst:
+            self.zerocopy_fun(src, dst)
+
+        with open(dstname, "rb") as f:
+            self.assertEqual(f.read(), b"")
+
+    def test_unhandled_exception(self):
+        with unittest.mock.patch(self.PATCHPOINT,
+                                 side_effect=ZeroDivisionError):
+            self.assertRaises(ZeroDivisionError,
+                              shutil.copyfile, TESTFN, TESTFN2)
+
+    def test_exception_on_first_call(self):
+        # Emulate a case where the first call to the zero-copy
+        # function raises an exception in which case the function is
+        # supposed to give up immediately.
+        with unittest.mock.patch(self.PATCHPOINT,
+                                 side_effect=OSError(errno.EINVAL, "yo")):
+            with self.get_files() as (src, dst):
+                with self.assertRaises(shutil._GiveupOnFastCopy):
+                    self.zerocopy_fun(src, dst)
+
+    def test_filesystem_full(self):
+        # Emulate a case where filesystem is full and the zero-copy
+        # function fails.
+        with unittest.mock.patch(self.PATCHPOINT,
+                                 side_effect=OSError(errno.ENOSPC, "yo")):
+            with self.get_files() as (src, dst):
+                self.assertRaises(OSError, self.zerocopy_fun, src, dst)
+
+    def test_not_a_file(self):
+        # Objects without a fileno() make the function give up.
+        src = io.BytesIO(self.FILEDATA)
+        dst = io.BytesIO()
+        with self.assertRaises(shutil._GiveupOnFastCopy):
+            self.zerocopy_fun(src, dst)
+
+    def reset(self):
+        with open(TESTFN, 'wb') as f:
+            f.write(self.FILEDATA)
+
+
+@unittest.skipIf(not hasattr(os, 'copy_file_range'),
+                 'requires os.copy_file_range()')
+class TestZeroCopyCopyFileRange(_ZeroCopyFileTest, unittest.TestCase):
+    PATCHPOINT = "os.copy_file_range"
+
+    def zerocopy_fun(self, fsrc, fdst):
+        return shutil._fastcopy_copy_file_range(fsrc, fdst)
+
+    def setUp(self):
+        super().setUp()
+        # The syscall may be refused by the filesystem or a seccomp
+        # policy, in which case copyfile() silently falls back.
+        try:
+            with self.get_files() as (src, dst):
+                os.copy_file_range(src.fileno(), dst.fileno(), 1)
+        except OSError as err:
+            self.skipTest(err)
+        finally:
+            support.unlink(TESTFN2)
+
+    def test_empty_file(self):
+        # Nothing copied on the first call: let copyfile() fall back on
+        # read()/write(), which also handles files misreporting their size.
+        srcname = TESTFN + 'src'
+        dstname = TESTFN + 'dst'
+        self.addCleanup(lambda: support.unlink(srcname))
+        self.addCleanup(lambda: support.unlink(dstname))
+        with open(srcname, "wb"):
+            pass
+
+        with open(srcname, "rb") as src, open(dstname, "wb") as dst:
+            with self.assertRaises(shutil._GiveupOnFastCopy):
+                self.zerocopy_fun(src, dst)
+
+        shutil.copyfile(srcname, dstname)
+        with open(dstname, "rb") as f:
+            self.assertEqual(f.read(), b"")
+
+    def test_syscall_not_supported(self):
+        # ENOSYS disables the fast path for the rest of the process.
+        self.addCleanup(setattr, shutil, '_USE_CP_COPY_FILE_RANGE',
+                        shutil._USE_CP_COPY_FILE_RANGE)
+        with unittest.mock.patch(self.PATCHPOINT,
+                                 side_effect=OSError(errno.ENOSYS, "yo")):
+            with self.get_files() as (src, dst):
+                with self.assertRaises(shutil._GiveupOnFastCopy):
+                    self.zerocopy_fun(src, dst)
+        self.assertFalse(shutil._USE_CP_COPY_FILE_RANGE)
+
+    def test_nothing_copied(self):
+        # A first call copying nothing from a non-empty file means the
+        # filesystem does not support the syscall for this file.
+        with unittest.mock.patch(self.PATCHPOINT, return_value=0):
+            with self.get_files() as (src, dst):
+                with self.assertRaises(shutil._GiveupOnFastCopy):
+                    self.zerocopy_fun(src, dst)
+        shutil.copyfile(TESTFN, TESTFN2)
+        with open(TESTFN2, "rb") as f:
+            self.assertEqual(f.read(), self.FILEDATA)
+
+
+@unittest.skipIf(not shutil._USE_CP_SENDFILE, 'os.sendfile() not supported')
+class TestZeroCopySendfile(_ZeroCopyFileTest, unittest.TestCase):
+    PATCHPOINT = "os.sendfile"
+
+    def zerocopy_fun(self, fsrc, fdst):
+        return shutil._fastcopy_sendfile(fsrc, fdst)
+
+    def setUp(self):
+        super().setUp()
+        patcher = unittest.mock.patch('shutil._USE_CP_COPY_FILE_RANGE',
+                                      False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exception_on_second_call(self):
+        def sendfile(*args, **kwargs):
+            if not flag:
+                flag.append(None)
+                return orig_sendfile(*args, **kwargs)
+            else:
+                raise OSError(errno.EBADF, "yo")
+
+        flag = []
+        orig_sendfile = os.sendfile
+        with unittest.mock.patch('os.sendfile', create=True,
+                                 side_effect=sendfile):
+            with self.get_files() as (src, dst):
+                with self.assertRaises(OSError) as cm:
+                    shutil._fastcopy_sendfile(src, dst)
+        assert flag
+        self.assertEqual(cm.exception.errno, errno.EBADF)
+
+    def test_cant_get_size(self):
+        # Emulate a case where src file size cannot be determined.
+        # Internally bufsize will be set to a small value and
+        # sendfile() will be called repeatedly.
+        with unittest.mock.patch('os.fstat', side_effect=OSError) as m:
+            with self.get_files() as (src, dst):
+                shutil._fastcopy_sendfile(src, dst)
+                assert m.called
+        with open(TESTFN2, "rb") as f:
+            self.assertEqual(f.read(), self.FILEDATA)
+
+    def test_small_chunks(self):
+        # Force internal file size detection to be smaller than the
+        # actual file size. We want to force sendfile() to be called
+        # multiple times, also in order to emulate a src fd which gets
+        # bigger while it is being copied.
+        mock = unittest.mock.Mock()
+        mock.st_size = 65536 + 1
+        with unittest.mock.patch('os.fstat', return_value=mock) as m:
+            with self.get_files() as (src, dst):
+                shutil._fastcopy_sendfile(src, dst)
+                assert m.called
+        with open(TESTFN2, "rb") as f:
+            self.assertEqual(f.read(), self.FILEDATA)
+
+    def test_big_chunk(self):
+        # Force internal file size detection to be +100MB bigger than
+        # the actual file size. Make sure sendfile() does not rely on
+        # file size value except for (maybe) a better throughput /
+        # performance.
+        mock = unittest.mock.Mock()
+        mock.st_size = self.FILESIZE + (100 * 1024 * 1024)
+        with unittest.mock.patch('os.fstat', return_value=mock) as m:
+            with self.get_files() as (src, dst):
+                shutil._fastcopy_sendfile(src, dst)
+                assert m.called
+        with open(TESTFN2, "rb") as f:
+            self.assertEqual(f.read(), self.FILEDATA)
+
+    def test_blocksize_arg(self):
+        with unittest.mock.patch('os.sendfile',
+                                 side_effect=ZeroDivisionError) as m:
+            self.assertRaises(ZeroDivisionError,
+                              shutil.copyfile, TESTFN, TESTFN2)
+            blocksize = m.call_args[0][3]
+            # Make sure file size and the block size arg passed to
+            # sendfile() are the same.
+            self.assertEqual(blocksize, os.path.getsize(TESTFN))
+            # ...unless we're dealing with a small file.
+            support.unlink(TESTFN2)
+            write_file(TESTFN2, b"hello", binary=True)
+            self.addCleanup(support.unlink, TESTFN2 + '3')
+            self.assertRaises(ZeroDivisionError,
+                              shutil.copyfile, TESTFN2, TESTFN2 + '3')
+            blocksize = m.call_args[0][3]
+            self.assertEqual(blocksize, 2 ** 23)
+
+    def test_file2file_not_supported(self):
+        # Emulate a case where sendfile() only support file->socket
+        # fds. In such a case copyfile() is supposed to skip the
+        # fast-copy attempt from then on.
+        assert shutil._USE_CP_SENDFILE
+        try:
+            with unittest.mock.patch(
+                    self.PATCHPOINT,
+                    side_effect=OSError(errno.ENOTSOCK, "yo")) as m:
+                with self.get_files() as (src, dst):
+                    with self.assertRaises(shutil._GiveupOnFastCopy):
+                        shutil._fastcopy_sendfile(src, dst)
+                assert m.called
+            assert not shutil._USE_CP_SENDFILE
+
+            with unittest.mock.patch(self.PATCHPOINT) as m:
+                shutil.copyfile(TESTFN, TESTFN2)
+                assert not m.called
+        finally:
+            shutil._USE_CP_SENDFILE = True
+
+
+class TestCopyFileObjReadinto(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(support.unlink, TESTFN)
+        self.addCleanup(support.unlink, TESTFN2)
+
+    def test_readinto(self):
+        data = os.urandom(100 * 1024 + 7)
+        src = io.BytesIO(data)
+        dst = io.BytesIO()
+        shutil._copyfileobj_readinto(src, dst, length=4096)
+        self.assertEqual(dst.getvalue(), data)
+
+    def test_short_reads(self):
+        # A read shorter than the buffer does not mean EOF.
+        class ShortReader(io.RawIOBase):
+            def __init__(self, data):
+                self.data = data
+            def readable(self):
+                return True
+            def readinto(self, b):
+                n = min(len(b), len(self.data), 3)
+                b[:n] = self.data[:n]
+                self.data = self.data[n:]
+                return n
+        dst = io.BytesIO()
+        shutil._copyfileobj_readinto(ShortReader(b'0123456789'), dst, 8)
+        self.assertEqual(dst.getvalue(), b'0123456789')
+
+    def test_copyfile_fallback(self):
+        # Without the fast paths, copyfile() uses a buffer sized after
+        # the file.
+        write_file(TESTFN, b'x' * 1000, binary=True)
+        with unittest.mock.patch('shutil._USE_CP_COPY_FILE_RANGE', False), \
+             unittest.mock.patch('shutil._USE_CP_SENDFILE', False), \
+             unittest.mock.patch('shutil._copyfileobj_readinto',
+                                 wraps=shutil._copyfileobj_readinto) as m:
+            shutil.copyfile(TESTFN, TESTFN2)
+        self.assertEqual(m.call_args[0][2], 1000)
+        self.assertEqual(read_file(TESTFN2, binary=True), b'x' * 1000)
+
+
 class TermsizeTests(unittest.TestCase):
     def test_does_not_crash(self):
         """Check if get_terminal_size() returns a meaningful value.
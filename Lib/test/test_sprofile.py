@@ -0,0 +1,198 @@
+"""Test suite for the sprofile module."""
+
+import pstats
+import sys
+import threading
+import time
+import unittest
+from io import StringIO
+from test import support
+
+import sprofile
+
+
+def spin(duration):
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        pass
+
+def caller(duration):
+    spin(duration)
+    return 42
+
+def recursive(depth, duration):
+    if depth:
+        return recursive(depth - 1, duration)
+    spin(duration)
+
+
+def func_label(func):
+    return sprofile.label(func.__code__)
+
+
+class SProfileTest(unittest.TestCase):
+    mode = 'thread'
+
+    def profile(self, func, *args):
+        prof = sprofile.Profile(0.001, mode=self.mode)
+        result = prof.runcall(func, *args)
+        return prof, result
+
+    def test_runcall(self):
+        prof, result = self.profile(caller, 0.3)
+        self.assertEqual(result, 42)
+        prof.create_stats()
+        stats = prof.stats
+        cc, nc, tt, ct, callers = stats[func_label(spin)]
+        self.assertGreater(nc, 0)
+        self.assertEqual(cc, nc)
+        self.assertGreater(tt, 0.0)
+        self.assertGreaterEqual(ct, tt)
+        self.assertIn(func_label(caller), callers)
+        self.assertEqual(callers[func_label(caller)][0], nc)
+        spin_samples = nc
+        cc, nc, tt, ct, callers = stats[func_label(caller)]
+        # The times depend on the load of the machine, but nearly all the
+        # samples of caller() are in spin()
+        self.assertGreaterEqual(nc, spin_samples)
+        self.assertGreaterEqual(spin_samples, 0.8 * nc)
+        self.assertGreater(ct, 0.0)
+        self.assertLess(tt, ct)
+
+    def test_recursion(self):
+        prof, result = self.profile(recursive, 10, 0.2)
+        prof.create_stats()
+        func = func_label(recursive)
+        cc, nc, tt, ct, callers = prof.stats[func]
+        # A recursive function is counted once per sample
+        self.assertEqual(nc, prof.stats[func_label(spin)][1])
+        self.assertEqual(callers[func][0], nc)
+
+    def test_pstats(self):
+        prof, result = self.profile(caller, 0.1)
+        stream = StringIO()
+        stats = pstats.Stats(prof, stream=stream)
+        stats.sort_stats('cumulative').print_stats()
+        self.assertIn('(spin)', stream.getvalue())
+        stats.print_callers('spin')
+        self.assertIn('(caller)', stream.getvalue())
+
+    def test_dump_stats(self):
+        prof, result = self.profile(caller, 0.1)
+        self.addCleanup(support.unlink, support.TESTFN)
+        prof.dump_stats(support.TESTFN)
+        stats = pstats.Stats(support.TESTFN)
+        self.assertIn(func_label(spin), stats.stats)
+
+    def test_collapsed_stacks(self):
+        prof, result = self.profile(caller, 0.1)
+        lines = prof.collapsed_stacks()
+        self.assertTrue(lines)
+        total = 0
+        for line in lines:
+            self.assertTrue(line.endswith('\n'))
+            stack, count = line.rsplit(' ', 1)
+            total += int(count)
+        self.assertEqual(total, sum(prof._stacks.values()))
+        name = 'spin (%s:%d)' % (__file__, spin.__code__.co_firstlineno)
+        caller_name = 'caller (%s:%d)' % (__file__,
+                                          caller.__code__.co_firstlineno)
+        self.assertTrue(any((caller_name + ';' + name + ' ') in line
+                            for line in lines))
+
+        self.addCleanup(support.unlink, support.TESTFN)
+        prof.dump_collapsed(support.TESTFN)
+        with open(support.TESTFN) as f:
+            self.assertEqual(f.readlines(), lines)
+
+    def test_threads(self):
+        prof = sprofile.Profile(0.001, mode=self.mode)
+        thread = threading.Thread(target=caller, args=(0.3,))
+        prof.enable()
+        try:
+            thread.start()
+            # The signal handler only runs in the main thread, while it
+            # runs Python code
+            spin(0.3)
+            thread.join()
+        finally:
+            prof.disable()
+        prof.create_stats()
+        self.assertIn(func_label(caller), prof.stats)
+
+    def test_enable_disable(self):
+        prof = sprofile.Profile(0.001, mode=self.mode)
+        prof.disable()
+        prof.enable()
+        prof.enable()
+        spin(0.1)
+        prof.disable()
+        prof.disable()
+        prof.create_stats()
+        samples = prof.stats[func_label(spin)][1]
+        self.assertGreater(samples, 0)
+        spin(0.1)
+        prof.create_stats()
+        self.assertEqual(prof.stats[func_label(spin)][1], samples)
+        prof.clear()
+        prof.create_stats()
+        self.assertEqual(prof.stats, {})
+
+    def test_snapshot_while_enabled(self):
+        prof = sprofile.Profile(0.0001, mode=self.mode)
+        prof.enable()
+        try:
+            deadline = time.perf_counter() + 0.5
+            while time.perf_counter() < deadline:
+                prof.snapshot_stats()
+                prof.collapsed_stacks()
+        finally:
+            prof.disable()
+        prof.snapshot_stats()
+        self.assertIn(func_label(self.test_snapshot_while_enabled.__func__),
+                      prof.stats)
+
+    def test_bad_arguments(self):
+        self.assertRaises(ValueError, sprofile.Profile, 0)
+        self.assertRaises(ValueError, sprofile.Profile, -1.0)
+        self.assertRaises(ValueError, sprofile.Profile, mode='timer')
+
+
+@unittest.skipUnless(hasattr(__import__('signal'), 'setitimer'),
+                     'requires signal.setitimer()')
+class SProfileSignalTest(SProfileTest):
+    mode = 'signal'
+
+    def test_handler_restored(self):
+        import signal
+        prof = sprofile.Profile(0.001, mode=self.mode)
+        before = signal.getsignal(signal.SIGPROF)
+        prof.runcall(spin, 0.05)
+        self.assertEqual(signal.getsignal(signal.SIGPROF), before)
+
+
+class SProfileMainTest(unittest.TestCase):
+
+    def test_main(self):
+        self.addCleanup(support.unlink, support.TESTFN)
+        self.addCleanup(support.unlink, support.TESTFN + '.txt')
+        script = support.TESTFN + '.py'
+        self.addCleanup(support.unlink, script)
+        with open(script, 'w') as f:
+            f.write('import time\n'
+                    'deadline = time.perf_counter() + 0.1\n'
+                    'while time.perf_counter() < deadline:\n'
+                    '    pass\n')
+        argv = ['sprofile.py', '-o', support.TESTFN,
+                '-c', support.TESTFN + '.txt', '-i', '0.002', script]
+        with support.swap_attr(sys, 'argv', argv), \
+             support.swap_attr(sys, 'path', sys.path[:]):
+            sprofile.main()
+        stats = pstats.Stats(support.TESTFN)
+        self.assertTrue(any(func[0] == script for func in stats.stats))
+        with open(support.TESTFN + '.txt') as f:
+            self.assertIn('<module> (%s:1)' % script, f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -906,6 +906,82 @@ class ExtractTests(unittest.TestCase):
         # remove the test file subdirectories
         rmtree(os.path.join(os.getcwd(), 'ziptest2dir'))
 
+    def test_extract_all_workers(self):
+        with zipfile.ZipFile(TESTFN2, "w", zipfile.ZIP_STORED) as zipfp:
+            for fpath, fdata in SMALL_TEST_DATA:
+                zipfp.writestr(fpath, fdata)
+            zipfp.writestr('ziptest2dir/emptydir/', b'')
+
+        with open(TESTFN2, 'rb') as f:
+            data = f.read()
+        for workers in (0, 2, 4):
+            for file in (TESTFN2, io.BytesIO(data)):
+                with zipfile.ZipFile(file) as zipfp:
+                    zipfp.extractall(TESTFNDIR, workers=workers)
+                for fpath, fdata in SMALL_TEST_DATA:
+                    self.check_file(os.path.join(TESTFNDIR, fpath),
+                                    fdata.encode())
+                self.assertTrue(os.path.isdir(
+                    os.path.join(TESTFNDIR, 'ziptest2dir', 'emptydir')))
+                rmtree(TESTFNDIR)
+
+    def test_extract_all_workers_members(self):
+        with zipfile.ZipFile(TESTFN2, "w", zipfile.ZIP_STORED) as zipfp:
+            for fpath, fdata in SMALL_TEST_DATA:
+                zipfp.writestr(fpath, fdata)
+            with self.assertWarns(UserWarning):
+                zipfp.writestr(SMALL_TEST_DATA[0][0], b'last')
+
+        with zipfile.ZipFile(TESTFN2) as zipfp:
+            # The last of the members with the same name wins, as when
+            # extracting them in order
+            infos = zipfp.infolist()
+            members = [infos[0], infos[1], SMALL_TEST_DATA[2][0],
+                       SMALL_TEST_DATA[0][0]]
+            zipfp.extractall(TESTFNDIR, members, workers=2)
+        self.addCleanup(rmtree, TESTFNDIR)
+        self.check_file(os.path.join(TESTFNDIR, SMALL_TEST_DATA[0][0]),
+                        b'last')
+        for fpath, fdata in SMALL_TEST_DATA[1:3]:
+            self.check_file(os.path.join(TESTFNDIR, fpath), fdata.encode())
+        self.assertFalse(os.path.exists(os.path.join(TESTFNDIR,
+                                                     SMALL_TEST_DATA[3][0])))
+
+    def test_extract_all_workers_same_path(self):
+        # Different names extracted to the same path are extracted once,
+        # the last one winning
+        with zipfile.ZipFile(TESTFN2, "w", zipfile.ZIP_STORED) as zipfp:
+            zipfp.writestr('b', b'1' * 100000)
+            zipfp.writestr('./b', b'2' * 100000)
+            zipfp.writestr('a/b', b'3' * 100000)
+            zipfp.writestr('a/../b', b'4' * 100000)
+            zipfp.writestr('a/./b', b'5' * 100000)
+
+        self.addCleanup(rmtree, TESTFNDIR)
+        with zipfile.ZipFile(TESTFN2) as zipfp:
+            zipfp.extractall(TESTFNDIR, workers=4)
+        self.check_file(os.path.join(TESTFNDIR, 'b'), b'2' * 100000)
+        self.check_file(os.path.join(TESTFNDIR, 'a', 'b'), b'5' * 100000)
+
+    def test_extract_all_workers_errors(self):
+        with zipfile.ZipFile(TESTFN2, "w", zipfile.ZIP_STORED) as zipfp:
+            for fpath, fdata in SMALL_TEST_DATA:
+                zipfp.writestr(fpath, fdata)
+        self.addCleanup(rmtree, TESTFNDIR)
+        with zipfile.ZipFile(TESTFN2) as zipfp:
+            self.assertRaises(ValueError, zipfp.extractall, TESTFNDIR,
+                              workers=-1)
+            self.assertRaises(KeyError, zipfp.extractall, TESTFNDIR,
+                              ['missing'], workers=2)
+            self.assertRaises(TypeError, zipfp.extractall, TESTFNDIR,
+                              pwd='python', workers=2)
+            # Errors in the threads are raised
+            zipfp.infolist()[1].flag_bits |= 0x40
+            self.assertRaises(NotImplementedError, zipfp.extractall,
+                              TESTFNDIR, workers=2)
+        self.assertRaises(RuntimeError, zipfp.extractall, TESTFNDIR,
+                          workers=2)
+
     def check_file(self, filename, content):
         self.assertTrue(os.path.isfile(filename))
         with open(filename, 'rb') as f:
@@ -1031,6 +1107,40 @@ class OtherTests(unittest.TestCase):
                 data += zipfp.read(info)
             self.assertIn(data, {b"foobar", b"barfoo"})
 
+    def test_lazy_infos(self):
+        # The ZipInfo objects are created as needed when reading
+        with zipfile.ZipFile(TESTFN2, "w", zipfile.ZIP_STORED) as zipfp:
+            for fpath, fdata in SMALL_TEST_DATA:
+                zipfp.writestr(fpath, fdata)
+            with self.assertWarns(UserWarning):
+                zipfp.writestr(SMALL_TEST_DATA[0][0], "last")
+        names = [fpath for fpath, fdata in SMALL_TEST_DATA]
+        names.append(names[0])
+
+        with zipfile.ZipFile(TESTFN2, "r") as zipfp:
+            self.assertEqual(zipfp.namelist(), names)
+            info = zipfp.getinfo(names[1])
+            self.assertIs(zipfp.getinfo(names[1]), info)
+            self.assertEqual(zipfp.read(names[0]), b"last")
+            self.assertEqual(zipfp.read(info), b"qawsedrftg")
+            self.assertRaises(KeyError, zipfp.getinfo, "missing")
+            infos = zipfp.infolist()
+            self.assertEqual([i.filename for i in infos], names)
+            self.assertIs(infos[1], info)
+            self.assertIs(zipfp.getinfo(names[0]), infos[-1])
+            self.assertIs(zipfp.filelist, infos)
+            self.assertIs(zipfp.NameToInfo[names[1]], info)
+            self.assertEqual(zipfp.namelist(), names)
+
+        with zipfile.ZipFile(TESTFN2, "a") as zipfp:
+            info = zipfp.getinfo(names[1])
+            info.comment = b"comment"
+            zipfp.writestr("new", "data")
+        with zipfile.ZipFile(TESTFN2, "r") as zipfp:
+            self.assertEqual(zipfp.namelist(), names + ["new"])
+            self.assertEqual(zipfp.getinfo(names[1]).comment, b"comment")
+            self.assertIsNone(zipfp.testzip())
+
     def test_writestr_extended_local_header_issue1202(self):
         with zipfile.ZipFile(TESTFN2, 'w') as orig_zip:
             for data in 'abcdefghijklmnop':
@@ -566,6 +566,61 @@ class CompressObjectTestCase(BaseCompressTestCase, unittest.TestCase):
         uncomp = dco.decompress(comp) + dco.flush()
         self.assertEqual(zdict, uncomp)
 
+    def test_decompress_block(self):
+        # Resume the decompression at each block boundary from the window
+        # of 32 KiB preceding it, as done by the gzip index
+        rng = random.Random(42)
+        data = bytes(rng.choice(b'abcdefgh') for i in range(500000))
+        co = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        comp = co.compress(data) + co.flush()
+        dco = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+        self.assertIsNone(dco.block_bits)
+        out = b''
+        offset = 0
+        points = []
+        while not dco.eof:
+            chunk = comp[offset:offset + 1000]
+            out += dco.decompress_block(chunk)
+            offset += len(chunk) - len(dco.unconsumed_tail)
+            if dco.block_bits is not None:
+                points.append((len(out), offset, dco.block_bits))
+        self.assertEqual(out, data)
+        self.assertIsNone(dco.block_bits)
+        self.assertGreater(len(points), 2)
+        for pos, offset, bits in points:
+            dco = zlib.decompressobj(wbits=-zlib.MAX_WBITS,
+                                     zdict=data[max(pos - 32768, 0):pos])
+            if bits:
+                dco.prime(bits, comp[offset - 1] >> (8 - bits))
+            self.assertEqual(dco.decompress(comp[offset:]), data[pos:])
+            self.assertTrue(dco.eof)
+
+    def test_decompress_block_max_length(self):
+        data = HAMLET_SCENE * 8
+        co = zlib.compressobj()
+        comp = co.compress(data) + co.flush(zlib.Z_FULL_FLUSH)
+        comp += co.compress(data) + co.flush()
+        dco = zlib.decompressobj()
+        out = b''
+        boundaries = 0
+        while not dco.eof:
+            chunk = dco.decompress_block(dco.unconsumed_tail or comp, 100)
+            self.assertLessEqual(len(chunk), 100)
+            out += chunk
+            if dco.block_bits is not None:
+                boundaries += 1
+        self.assertEqual(out, data * 2)
+        # After the header, and between the two blocks
+        self.assertGreaterEqual(boundaries, 2)
+
+    def test_prime_bad_args(self):
+        dco = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+        self.assertRaises(TypeError, dco.prime, 1)
+        self.assertRaises(ValueError, dco.prime, -1, 0)
+        self.assertRaises(ValueError, dco.prime, 17, 0)
+        dco.prime(0, 0)
+        dco.prime(3, 0xff)
+
     def test_flush_with_freed_input(self):
         # Issue #16411: decompressor accesses input to last decompress() call
         # in flush(), even if this object has been freed in the meanwhile.
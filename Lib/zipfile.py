@@ -13,6 +13,7 @@ import stat
 import shutil
 import struct
 import binascii
+import array
 
 try:
     import threading
@@ -102,6 +103,12 @@ structCentralDir = "<4s4B4HL2L5H2L"
 stringCentralDir = b"PK\001\002"
 sizeCentralDir = struct.calcsize(structCentralDir)
 
+# The fields of the central directory read when opening an archive:
+# signature, extract version, flag bits and the three lengths
+_CD_SCAN = struct.Struct("<4s2xBxH18x3H")
+# The flag bits and the file name length, at offset 8
+_CD_NAME = struct.Struct("<H18xH")
+
 # indexes of entries in the central directory structure
 _CD_SIGNATURE = 0
 _CD_CREATE_VERSION = 1
@@ -292,6 +299,20 @@ def _EndRecData(fpin):
     return None
 
 
+def _sanitize_filename(filename):
+    # Terminate the file name at the first null byte.  Null bytes in file
+    # names are used as tricks by viruses in archives.
+    null_byte = filename.find(chr(0))
+    if null_byte >= 0:
+        filename = filename[0:null_byte]
+    # This is used to ensure paths in generated ZIP files always use
+    # forward slashes as the directory separator, as required by the
+    # ZIP format specification.
+    if os.sep != "/" and os.sep in filename:
+        filename = filename.replace(os.sep, "/")
+    return filename
+
+
 class ZipInfo (object):
     """Class with attributes describing each file in the ZIP archive."""
 
@@ -319,19 +340,7 @@ class ZipInfo (object):
 
     def __init__(self, filename="NoName", date_time=(1980,1,1,0,0,0)):
         self.orig_filename = filename   # Original file name in archive
-
-        # Terminate the file name at the first null byte.  Null bytes in file
-        # names are used as tricks by viruses in archives.
-        null_byte = filename.find(chr(0))
-        if null_byte >= 0:
-            filename = filename[0:null_byte]
-        # This is used to ensure paths in generated ZIP files always use
-        # forward slashes as the directory separator, as required by the
-        # ZIP format specification.
-        if os.sep != "/" and os.sep in filename:
-            filename = filename.replace(os.sep, "/")
-
-        self.filename = filename        # Normalized file name
+        self.filename = _sanitize_filename(filename)  # Normalized file name
         self.date_time = date_time      # year, month, day, hour, min, sec
 
         if date_time[0] < 1980:
@@ -1031,6 +1040,133 @@ class _ZipWriteFile(io.BufferedIOBase):
         self._zipfile.filelist.append(self._zinfo)
         self._zipfile.NameToInfo[self._zinfo.filename] = self._zinfo
 
+class _CentralDirectory:
+    """Compact central directory of an archive opened for reading.
+
+    Holds the raw central directory and the offsets of its records in an
+    array, and only creates the ZipInfo objects of the members which are
+    asked for, so that opening an archive with many members is fast.
+    """
+
+    def __init__(self, data, concat, debug=0):
+        self._data = data
+        self._concat = concat  # Offset of the archive in the file
+        self._debug = debug
+        self._offsets = offsets = array.array('Q')
+        self._names = None     # The names of the members, once decoded
+        self._index = None     # Maps the names to record numbers
+        self._infos = {}       # ZipInfo objects created by getinfo()
+        total = 0
+        size_cd = len(data)
+        while total < size_cd:
+            if total + sizeCentralDir > size_cd:
+                raise BadZipFile("Truncated central directory")
+            (signature, extract_version, flags, filename_length,
+             extra_length, comment_length) = _CD_SCAN.unpack_from(data, total)
+            if signature != stringCentralDir:
+                raise BadZipFile("Bad magic number for central directory")
+            if extract_version > MAX_EXTRACT_VERSION:
+                raise NotImplementedError("zip file version %.1f" %
+                                          (extract_version / 10))
+            offsets.append(total)
+            # update total bytes read from central directory
+            total = (total + sizeCentralDir + filename_length
+                     + extra_length + comment_length)
+
+            if debug > 2:
+                print("total", total)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _orig_name(self, offset):
+        flags, length = _CD_NAME.unpack_from(self._data, offset + 8)
+        start = offset + sizeCentralDir
+        filename = self._data[start:start + length]
+        try:
+            # Both encodings below are supersets of ASCII, which is much
+            # faster to decode
+            return filename.decode('ascii')
+        except UnicodeDecodeError:
+            pass
+        if flags & 0x800:
+            # UTF-8 file names extension
+            return filename.decode('utf-8')
+        else:
+            # Historical ZIP filename encoding
+            return filename.decode('cp437')
+
+    def names(self):
+        """Return the names of the members, as ZipInfo.filename."""
+        if self._names is None:
+            orig_name = self._orig_name
+            self._names = names = [orig_name(offset)
+                                   for offset in self._offsets]
+            for i, name in enumerate(names):
+                if '\0' in name or (os.sep != '/' and os.sep in name):
+                    names[i] = _sanitize_filename(name)
+        return list(self._names)
+
+    def _make_info(self, i):
+        data = self._data
+        offset = self._offsets[i]
+        centdir = struct.unpack_from(structCentralDir, data, offset)
+        if self._debug > 2:
+            print(centdir)
+        # Create ZipInfo instance to store file information
+        x = ZipInfo(self._orig_name(offset))
+        start = offset + sizeCentralDir + centdir[_CD_FILENAME_LENGTH]
+        end = start + centdir[_CD_EXTRA_FIELD_LENGTH]
+        x.extra = data[start:end]
+        x.comment = data[end:end + centdir[_CD_COMMENT_LENGTH]]
+        x.header_offset = centdir[_CD_LOCAL_HEADER_OFFSET]
+        (x.create_version, x.create_system, x.extract_version, x.reserved,
+         x.flag_bits, x.compress_type, t, d,
+         x.CRC, x.compress_size, x.file_size) = centdir[1:12]
+        x.volume, x.internal_attr, x.external_attr = centdir[15:18]
+        # Convert date/time code to (year, month, day, hour, min, sec)
+        x._raw_time = t
+        x.date_time = ( (d>>9)+1980, (d>>5)&0xF, d&0x1F,
+                        t>>11, (t>>5)&0x3F, (t&0x1F) * 2 )
+
+        x._decodeExtra()
+        x.header_offset = x.header_offset + self._concat
+        return x
+
+    def getinfo(self, name):
+        """Return the ZipInfo of the last member named name, or None.
+
+        The same object is returned for the same member.
+        """
+        if self._index is None:
+            self.names()
+            self._index = {name: i for i, name in enumerate(self._names)}
+        i = self._index.get(name)
+        if i is None:
+            return None
+        info = self._infos.get(i)
+        if info is None:
+            info = self._infos[i] = self._make_info(i)
+        return info
+
+    def __iter__(self):
+        """Iterate over the ZipInfo objects of the members, without keeping
+        the ones which were not returned by getinfo()."""
+        for i in range(len(self._offsets)):
+            info = self._infos.get(i)
+            if info is None:
+                info = self._make_info(i)
+            yield info
+
+    def infos(self):
+        """Return the list of the ZipInfo objects of all the members."""
+        infos = self._infos
+        for i in range(len(self._offsets)):
+            if i not in infos:
+                infos[i] = self._make_info(i)
+        return [infos[i] for i in range(len(self._offsets))]
+
+
 class ZipFile:
     """ Class with methods to open, read, write, close, list zip files.
 
@@ -1062,8 +1198,9 @@ class ZipFile:
         self._allowZip64 = allowZip64
         self._didModify = False
         self.debug = 0  # Level of printing: 0 through 3
-        self.NameToInfo = {}    # Find file info given name
-        self.filelist = []      # List of ZipInfo instances for archive
+        self._NameToInfo = {}   # Find file info given name
+        self._filelist = []     # List of ZipInfo instances for archive
+        self._cdir = None       # Central directory read but not yet parsed
         self.compression = compression  # Method of compression
         self.mode = mode
         self.pwd = None
@@ -1184,59 +1321,53 @@ class ZipFile:
         self.start_dir = offset_cd + concat
         fp.seek(self.start_dir, 0)
         data = fp.read(size_cd)
-        fp = io.BytesIO(data)
-        total = 0
-        while total < size_cd:
-            centdir = fp.read(sizeCentralDir)
-            if len(centdir) != sizeCentralDir:
-                raise BadZipFile("Truncated central directory")
-            centdir = struct.unpack(structCentralDir, centdir)
-            if centdir[_CD_SIGNATURE] != stringCentralDir:
-                raise BadZipFile("Bad magic number for central directory")
-            if self.debug > 2:
-                print(centdir)
-            filename = fp.read(centdir[_CD_FILENAME_LENGTH])
-            flags = centdir[5]
-            if flags & 0x800:
-                # UTF-8 file names extension
-                filename = filename.decode('utf-8')
-            else:
-                # Historical ZIP filename encoding
-                filename = filename.decode('cp437')
-            # Create ZipInfo instance to store file information
-            x = ZipInfo(filename)
-            x.extra = fp.read(centdir[_CD_EXTRA_FIELD_LENGTH])
-            x.comment = fp.read(centdir[_CD_COMMENT_LENGTH])
-            x.header_offset = centdir[_CD_LOCAL_HEADER_OFFSET]
-            (x.create_version, x.create_system, x.extract_version, x.reserved,
-             x.flag_bits, x.compress_type, t, d,
-             x.CRC, x.compress_size, x.file_size) = centdir[1:12]
-            if x.extract_version > MAX_EXTRACT_VERSION:
-                raise NotImplementedError("zip file version %.1f" %
-                                          (x.extract_version / 10))
-            x.volume, x.internal_attr, x.external_attr = centdir[15:18]
-            # Convert date/time code to (year, month, day, hour, min, sec)
-            x._raw_time = t
-            x.date_time = ( (d>>9)+1980, (d>>5)&0xF, d&0x1F,
-                            t>>11, (t>>5)&0x3F, (t&0x1F) * 2 )
-
-            x._decodeExtra()
-            x.header_offset = x.header_offset + concat
-            self.filelist.append(x)
-            self.NameToInfo[x.filename] = x
+        if len(data) != size_cd:
+            raise BadZipFile("Truncated central directory")
+        # The ZipInfo objects are only created when needed
+        self._cdir = _CentralDirectory(data, concat, self.debug)
+
+    def _load_infos(self):
+        # Create the ZipInfo objects of all the members
+        if self._cdir is not None:
+            infos = self._cdir.infos()
+            self._cdir = None
+            for x in infos:
+                self._filelist.append(x)
+                self._NameToInfo[x.filename] = x
 
-            # update total bytes read from central directory
-            total = (total + sizeCentralDir + centdir[_CD_FILENAME_LENGTH]
-                     + centdir[_CD_EXTRA_FIELD_LENGTH]
-                     + centdir[_CD_COMMENT_LENGTH])
+    @property
+    def filelist(self):
+        """List of ZipInfo instances for archive."""
+        self._load_infos()
+        return self._filelist
 
-            if self.debug > 2:
-                print("total", total)
+    @filelist.setter
+    def filelist(self, filelist):
+        self._load_infos()
+        self._filelist = filelist
 
+    @property
+    def NameToInfo(self):
+        """Dictionary mapping the file names to the ZipInfo instances."""
+        self._load_infos()
+        return self._NameToInfo
+
+    @NameToInfo.setter
+    def NameToInfo(self, name_to_info):
+        self._load_infos()
+        self._NameToInfo = name_to_info
+
+    def _iterinfos(self):
+        # Iterate over the members without keeping all their ZipInfo
+        if self._cdir is not None:
+            return iter(self._cdir)
+        return iter(self._filelist)
 
     def namelist(self):
         """Return a list of file names in the archive."""
-        return [data.filename for data in self.filelist]
+        if self._cdir is not None:
+            return self._cdir.names()
+        return [data.filename for data in self._filelist]
 
     def infolist(self):
         """Return a list of class ZipInfo instances for files in the
@@ -1247,7 +1378,7 @@ class ZipFile:
         """Print a table of contents for the zip file."""
         print("%-46s %19s %12s" % ("File Name", "Modified    ", "Size"),
               file=file)
-        for zinfo in self.filelist:
+        for zinfo in self._iterinfos():
             date = "%d-%02d-%02d %02d:%02d:%02d" % zinfo.date_time[:6]
             print("%-46s %s %12d" % (zinfo.filename, date, zinfo.file_size),
                   file=file)
@@ -1255,7 +1386,7 @@ class ZipFile:
     def testzip(self):
         """Read all the files and check the CRC."""
         chunk_size = 2 ** 20
-        for zinfo in self.filelist:
+        for zinfo in self._iterinfos():
             try:
                 # Read by chunks, to avoid an OverflowError or a
                 # MemoryError with very large embedded files.
@@ -1267,7 +1398,10 @@ class ZipFile:
 
     def getinfo(self, name):
         """Return the instance of ZipInfo given 'name'."""
-        info = self.NameToInfo.get(name)
+        if self._cdir is not None:
+            info = self._cdir.getinfo(name)
+        else:
+            info = self._NameToInfo.get(name)
         if info is None:
             raise KeyError(
                 'There is no item named %r in the archive' % name)
@@ -1356,69 +1490,74 @@ class ZipFile:
         zef_file = _SharedFile(self.fp, zinfo.header_offset,
                                self._fpclose, self._lock, lambda: self._writing)
         try:
-            # Skip the file header:
-            fheader = zef_file.read(sizeFileHeader)
-            if len(fheader) != sizeFileHeader:
-                raise BadZipFile("Truncated file header")
-            fheader = struct.unpack(structFileHeader, fheader)
-            if fheader[_FH_SIGNATURE] != stringFileHeader:
-                raise BadZipFile("Bad magic number for file header")
-
-            fname = zef_file.read(fheader[_FH_FILENAME_LENGTH])
-            if fheader[_FH_EXTRA_FIELD_LENGTH]:
-                zef_file.read(fheader[_FH_EXTRA_FIELD_LENGTH])
-
-            if zinfo.flag_bits & 0x20:
-                # Zip 2.7: compressed patched data
-                raise NotImplementedError("compressed patched data (flag bit 5)")
-
-            if zinfo.flag_bits & 0x40:
-                # strong encryption
-                raise NotImplementedError("strong encryption (flag bit 6)")
-
-            if zinfo.flag_bits & 0x800:
-                # UTF-8 filename
-                fname_str = fname.decode("utf-8")
-            else:
-                fname_str = fname.decode("cp437")
-
-            if fname_str != zinfo.orig_filename:
-                raise BadZipFile(
-                    'File name in directory %r and header %r differ.'
-                    % (zinfo.orig_filename, fname))
-
-            # check for encrypted flag & handle password
-            is_encrypted = zinfo.flag_bits & 0x1
-            zd = None
-            if is_encrypted:
-                if not pwd:
-                    pwd = self.pwd
-                if not pwd:
-                    raise RuntimeError("File %s is encrypted, password "
-                                       "required for extraction" % name)
-
-                zd = _ZipDecrypter(pwd)
-                # The first 12 bytes in the cypher stream is an encryption header
-                #  used to strengthen the algorithm. The first 11 bytes are
-                #  completely random, while the 12th contains the MSB of the CRC,
-                #  or the MSB of the file time depending on the header type
-                #  and is used to check the correctness of the password.
-                header = zef_file.read(12)
-                h = list(map(zd, header[0:12]))
-                if zinfo.flag_bits & 0x8:
-                    # compare against the file type from extended local headers
-                    check_byte = (zinfo._raw_time >> 8) & 0xff
-                else:
-                    # compare against the CRC otherwise
-                    check_byte = (zinfo.CRC >> 24) & 0xff
-                if h[11] != check_byte:
-                    raise RuntimeError("Bad password for file", name)
-
-            return ZipExtFile(zef_file, mode, zinfo, zd, True)
+            return self._open_member(zef_file, zinfo, pwd)
         except:
             zef_file.close()
             raise
 
+    def _open_member(self, zef_file, zinfo, pwd):
+        """Return a ZipExtFile reading the member zinfo from zef_file,
+        positioned at its local file header."""
+        # Skip the file header:
+        fheader = zef_file.read(sizeFileHeader)
+        if len(fheader) != sizeFileHeader:
+            raise BadZipFile("Truncated file header")
+        fheader = struct.unpack(structFileHeader, fheader)
+        if fheader[_FH_SIGNATURE] != stringFileHeader:
+            raise BadZipFile("Bad magic number for file header")
+
+        fname = zef_file.read(fheader[_FH_FILENAME_LENGTH])
+        if fheader[_FH_EXTRA_FIELD_LENGTH]:
+            zef_file.read(fheader[_FH_EXTRA_FIELD_LENGTH])
+
+        if zinfo.flag_bits & 0x20:
+            # Zip 2.7: compressed patched data
+            raise NotImplementedError("compressed patched data (flag bit 5)")
+
+        if zinfo.flag_bits & 0x40:
+            # strong encryption
+            raise NotImplementedError("strong encryption (flag bit 6)")
+
+        if zinfo.flag_bits & 0x800:
+            # UTF-8 filename
+            fname_str = fname.decode("utf-8")
+        else:
+            fname_str = fname.decode("cp437")
+
+        if fname_str != zinfo.orig_filename:
+            raise BadZipFile(
+                'File name in directory %r and header %r differ.'
+                % (zinfo.orig_filename, fname))
+
+        # check for encrypted flag & handle password
+        is_encrypted = zinfo.flag_bits & 0x1
+        zd = None
+        if is_encrypted:
+            if not pwd:
+                pwd = self.pwd
+            if not pwd:
+                raise RuntimeError("File %s is encrypted, password "
+                                   "required for extraction" % zinfo.filename)
+
+            zd = _ZipDecrypter(pwd)
+            # The first 12 bytes in the cypher stream is an encryption header
+            #  used to strengthen the algorithm. The first 11 bytes are
+            #  completely random, while the 12th contains the MSB of the CRC,
+            #  or the MSB of the file time depending on the header type
+            #  and is used to check the correctness of the password.
+            header = zef_file.read(12)
+            h = list(map(zd, header[0:12]))
+            if zinfo.flag_bits & 0x8:
+                # compare against the file type from extended local headers
+                check_byte = (zinfo._raw_time >> 8) & 0xff
+            else:
+                # compare against the CRC otherwise
+                check_byte = (zinfo.CRC >> 24) & 0xff
+            if h[11] != check_byte:
+                raise RuntimeError("Bad password for file", zinfo.filename)
+
+        return ZipExtFile(zef_file, 'r', zinfo, zd, True)
+
     def _open_to_write(self, zinfo, force_zip64=False):
         if force_zip64 and not self._allowZip64:
             raise ValueError(
@@ -1476,17 +1615,88 @@ class ZipFile:
 
         return self._extract_member(member, path, pwd)
 
-    def extractall(self, path=None, members=None, pwd=None):
+    def extractall(self, path=None, members=None, pwd=None, *, workers=1):
         """Extract all members from the archive to the current working
            directory. `path' specifies a different directory to extract to.
            `members' is optional and must be a subset of the list returned
-           by namelist().
+           by namelist().  `workers' is the number of threads extracting
+           the members concurrently; 0 means the number of CPUs.
         """
+        if workers < 0:
+            raise ValueError("workers must be non-negative")
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if workers == 1:
+            if members is None:
+                members = self.namelist()
+
+            for zipinfo in members:
+                self.extract(zipinfo, path, pwd)
+            return
+
+        if pwd and not isinstance(pwd, bytes):
+            raise TypeError("pwd: expected bytes, got %s" % type(pwd))
+        if not self.fp:
+            raise RuntimeError(
+                "Attempt to use ZIP archive that was already closed")
+        if self._writing:
+            raise RuntimeError("Can't read from the ZIP file while there "
+                    "is an open writing handle on it. "
+                    "Close the writing handle before trying to read.")
+        if path is None:
+            path = os.getcwd()
         if members is None:
-            members = self.namelist()
+            members = self._iterinfos()
+        # Only extract the last of the members with the same target path
+        # (different names such as "a/../b" and "a/b" may map to the same
+        # one), as they would be overwritten in order by a sequential
+        # extraction, while concurrent threads would mix their contents
+        infos = {}
+        for member in members:
+            if not isinstance(member, ZipInfo):
+                member = self.getinfo(member)
+            key = os.path.normcase(self._member_path(member, path))
+            infos.pop(key, None)
+            infos[key] = member
+        self._extract_parallel(list(infos.values()), path, pwd, workers)
+
+    def _extract_parallel(self, members, path, pwd, workers):
+        from concurrent.futures import ThreadPoolExecutor
+        # Each thread reads the archive through its own file object if it
+        # can be opened again, so that the threads do not wait for each
+        # other to seek and read in the shared one
+        reopen = self.mode == 'r' and not self._filePassed
+        local = threading.local()
+        handles = []
+
+        def extract(member):
+            if reopen:
+                fp = getattr(local, 'fp', None)
+                if fp is None:
+                    fp = local.fp = io.open(self.filename, 'rb')
+                    local.lock = threading.Lock()
+                    handles.append(fp)
+                lock = local.lock
+            else:
+                fp, lock = self.fp, self._lock
+            zef_file = _SharedFile(fp, member.header_offset, lambda fp: None,
+                                   lock, lambda: self._writing)
+            return self._extract_member(member, path, pwd, zef_file)
 
-        for zipinfo in members:
-            self.extract(zipinfo, path, pwd)
+        try:
+            with ThreadPoolExecutor(workers) as executor:
+                futures = [executor.submit(extract, member)
+                           for member in members]
+                try:
+                    for future in futures:
+                        future.result()
+                except:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            for fp in handles:
+                fp.close()
 
     @classmethod
     def _sanitize_windows_name(cls, arcname, pathsep):
@@ -1503,9 +1713,9 @@ class ZipFile:
         arcname = pathsep.join(x for x in arcname if x)
         return arcname
 
-    def _extract_member(self, member, targetpath, pwd):
-        """Extract the ZipInfo object 'member' to a physical
-           file on the path targetpath.
+    def _member_path(self, member, targetpath):
+        """Return the path to which the ZipInfo object 'member' is
+           extracted in the directory targetpath.
         """
         # build the destination pathname, replacing
         # forward slashes to platform specific separators.
@@ -1524,20 +1734,31 @@ class ZipFile:
             arcname = self._sanitize_windows_name(arcname, os.path.sep)
 
         targetpath = os.path.join(targetpath, arcname)
-        targetpath = os.path.normpath(targetpath)
+        return os.path.normpath(targetpath)
+
+    def _extract_member(self, member, targetpath, pwd, zef_file=None):
+        """Extract the ZipInfo object 'member' to a physical
+           file on the path targetpath.  If zef_file is given, the member
+           is read from it rather than from the shared file object.
+        """
+        targetpath = self._member_path(member, targetpath)
 
         # Create all upper directories if necessary.
         upperdirs = os.path.dirname(targetpath)
         if upperdirs and not os.path.exists(upperdirs):
-            os.makedirs(upperdirs)
+            # Other threads may create the directories concurrently
+            os.makedirs(upperdirs, exist_ok=True)
 
         if member.is_dir():
             if not os.path.isdir(targetpath):
-                os.mkdir(targetpath)
+                os.makedirs(targetpath, exist_ok=True)
             return targetpath
 
-        with self.open(member, pwd=pwd) as source, \
-             open(targetpath, "wb") as target:
+        if zef_file is None:
+            source = self.open(member, pwd=pwd)
+        else:
+            source = self._open_member(zef_file, member, pwd)
+        with source, open(targetpath, "wb") as target:
             shutil.copyfileobj(source, target)
 
         return targetpath
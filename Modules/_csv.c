@@ -101,6 +101,11 @@ typedef struct {
     Py_ssize_t field_len;       /* length of current field */
     int numeric_field;          /* treat field as numeric */
     unsigned long line_num;     /* Source-file line number */
+    Py_ssize_t field_index;     /* index of the current field in the line */
+    PyObject *converters;       /* tuple of the converters of the columns */
+    Py_ssize_t *column_map;     /* column of each field, or -1 to skip it */
+    Py_ssize_t column_map_len;  /* length of column_map */
+    Py_ssize_t num_columns;     /* number of selected columns */
 } ReaderObj;
 
 static PyTypeObject Reader_Type;
@@ -535,14 +540,52 @@ _call_dialect(PyObject *dialect_inst, PyObject *kwargs)
 static int
 parse_save_field(ReaderObj *self)
 {
-    PyObject *field;
+    PyObject *field, *converter = Py_None;
+    Py_ssize_t column = self->field_index++;
+
+    if (self->column_map != NULL) {
+        if (column == 0) {
+            /* The selected columns missing from the line are None */
+            Py_ssize_t i;
+            for (i = 0; i < self->num_columns; i++) {
+                if (PyList_Append(self->fields, Py_None) < 0)
+                    return -1;
+            }
+        }
+        if (column >= self->column_map_len ||
+            self->column_map[column] < 0) {
+            /* Skip the field without building it */
+            self->field_len = 0;
+            self->numeric_field = 0;
+            return 0;
+        }
+        column = self->column_map[column];
+    }
+    if (self->converters != NULL &&
+        column < PyTuple_GET_SIZE(self->converters))
+        converter = PyTuple_GET_ITEM(self->converters, column);
 
     field = PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND,
                                       (void *) self->field, self->field_len);
     if (field == NULL)
         return -1;
     self->field_len = 0;
-    if (self->numeric_field) {
+    if (converter != Py_None) {
+        PyObject *tmp;
+
+        self->numeric_field = 0;
+        if (converter == (PyObject *)&PyLong_Type)
+            tmp = PyLong_FromUnicodeObject(field, 10);
+        else if (converter == (PyObject *)&PyFloat_Type)
+            tmp = PyFloat_FromString(field);
+        else
+            tmp = PyObject_CallFunctionObjArgs(converter, field, NULL);
+        Py_DECREF(field);
+        if (tmp == NULL)
+            return -1;
+        field = tmp;
+    }
+    else if (self->numeric_field) {
         PyObject *tmp;
 
         self->numeric_field = 0;
@@ -552,6 +595,10 @@ parse_save_field(ReaderObj *self)
             return -1;
         field = tmp;
     }
+    if (self->column_map != NULL) {
+        /* PyList_SetItem() steals the reference */
+        return PyList_SetItem(self->fields, column, field);
+    }
     if (PyList_Append(self->fields, field) < 0) {
         Py_DECREF(field);
         return -1;
@@ -780,6 +827,46 @@ parse_process_char(ReaderObj *self, Py_UCS4 c)
     return 0;
 }
 
+static Py_ssize_t
+parse_add_run(ReaderObj *self, unsigned int kind, void *data,
+              Py_ssize_t pos, Py_ssize_t end)
+{
+    /* Add the ordinary characters of the current field from data[pos:end]
+       at once, and return the position of the first special one.  The
+       field limit and the special characters are left to
+       parse_process_char(). */
+    DialectObj *dialect = self->dialect;
+    Py_ssize_t room = _csvstate_global->field_limit - self->field_len;
+    Py_UCS4 c;
+
+    if (end - pos > room)
+        end = pos + room;
+    while (self->field_size - self->field_len < end - pos) {
+        if (!parse_grow_buff(self))
+            return -1;
+    }
+    if (self->state == IN_FIELD) {
+        for (; pos < end; pos++) {
+            c = PyUnicode_READ(kind, data, pos);
+            if (c == dialect->delimiter || c == dialect->escapechar ||
+                c == '\n' || c == '\r' || c == '\0')
+                break;
+            self->field[self->field_len++] = c;
+        }
+    }
+    else {
+        assert(self->state == IN_QUOTED_FIELD);
+        for (; pos < end; pos++) {
+            c = PyUnicode_READ(kind, data, pos);
+            if (c == dialect->quotechar || c == dialect->escapechar ||
+                c == '\0')
+                break;
+            self->field[self->field_len++] = c;
+        }
+    }
+    return pos;
+}
+
 static int
 parse_reset(ReaderObj *self)
 {
@@ -789,6 +876,7 @@ parse_reset(ReaderObj *self)
     self->field_len = 0;
     self->state = START_RECORD;
     self->numeric_field = 0;
+    self->field_index = 0;
     return 0;
 }
 
@@ -797,7 +885,7 @@ Reader_iternext(ReaderObj *self)
 {
     PyObject *fields = NULL;
     Py_UCS4 c;
-    Py_ssize_t pos, linelen;
+    Py_ssize_t pos, next, linelen;
     unsigned int kind;
     void *data;
     PyObject *lineobj;
@@ -850,6 +938,15 @@ Reader_iternext(ReaderObj *self)
                 goto err;
             }
             pos++;
+            if (self->state == IN_FIELD || self->state == IN_QUOTED_FIELD) {
+                next = parse_add_run(self, kind, data, pos, pos + linelen);
+                if (next < 0) {
+                    Py_DECREF(lineobj);
+                    goto err;
+                }
+                linelen -= next - pos;
+                pos = next;
+            }
         }
         Py_DECREF(lineobj);
         if (parse_process_char(self, 0) < 0)
@@ -869,8 +966,11 @@ Reader_dealloc(ReaderObj *self)
     Py_XDECREF(self->dialect);
     Py_XDECREF(self->input_iter);
     Py_XDECREF(self->fields);
+    Py_XDECREF(self->converters);
     if (self->field != NULL)
         PyMem_Free(self->field);
+    if (self->column_map != NULL)
+        PyMem_Free(self->column_map);
     PyObject_GC_Del(self);
 }
 
@@ -880,6 +980,7 @@ Reader_traverse(ReaderObj *self, visitproc visit, void *arg)
     Py_VISIT(self->dialect);
     Py_VISIT(self->input_iter);
     Py_VISIT(self->fields);
+    Py_VISIT(self->converters);
     return 0;
 }
 
@@ -889,6 +990,7 @@ Reader_clear(ReaderObj *self)
     Py_CLEAR(self->dialect);
     Py_CLEAR(self->input_iter);
     Py_CLEAR(self->fields);
+    Py_CLEAR(self->converters);
     return 0;
 }
 
@@ -947,10 +1049,100 @@ static PyTypeObject Reader_Type = {
 
 };
 
+static int
+reader_set_columns(ReaderObj *self, PyObject *columns)
+{
+    /* Build the map of the fields to the selected columns */
+    PyObject *seq, *tuple;
+    Py_ssize_t i, index, n, max_index = -1;
+    Py_ssize_t *indexes = NULL;
+
+    seq = PySequence_Fast(columns, "columns must be a sequence of integers");
+    if (seq == NULL)
+        return -1;
+    /* A copy, as the __index__() methods of the items could change a list */
+    tuple = PySequence_Tuple(seq);
+    Py_DECREF(seq);
+    if (tuple == NULL)
+        return -1;
+    n = PyTuple_GET_SIZE(tuple);
+    /* The items are only converted once, as they could return different
+       indexes when converted again */
+    indexes = PyMem_New(Py_ssize_t, n ? n : 1);
+    if (indexes == NULL) {
+        PyErr_NoMemory();
+        goto bail;
+    }
+    for (i = 0; i < n; i++) {
+        index = PyNumber_AsSsize_t(PyTuple_GET_ITEM(tuple, i),
+                                   PyExc_OverflowError);
+        if (index == -1 && PyErr_Occurred())
+            goto bail;
+        if (index < 0) {
+            PyErr_SetString(PyExc_ValueError,
+                            "columns must not be negative");
+            goto bail;
+        }
+        if (index > max_index)
+            max_index = index;
+        indexes[i] = index;
+    }
+    if (max_index >= PY_SSIZE_T_MAX / (Py_ssize_t)sizeof(Py_ssize_t)) {
+        PyErr_NoMemory();
+        goto bail;
+    }
+    self->column_map = PyMem_New(Py_ssize_t, max_index + 1);
+    if (self->column_map == NULL) {
+        PyErr_NoMemory();
+        goto bail;
+    }
+    self->column_map_len = max_index + 1;
+    self->num_columns = n;
+    for (i = 0; i <= max_index; i++)
+        self->column_map[i] = -1;
+    for (i = 0; i < n; i++) {
+        index = indexes[i];
+        if (self->column_map[index] >= 0) {
+            PyErr_Format(PyExc_ValueError, "duplicate column %zd", index);
+            goto bail;
+        }
+        self->column_map[index] = i;
+    }
+    PyMem_Free(indexes);
+    Py_DECREF(tuple);
+    return 0;
+
+bail:
+    PyMem_Free(indexes);
+    Py_DECREF(tuple);
+    return -1;
+}
+
+static int
+reader_set_converters(ReaderObj *self, PyObject *converters)
+{
+    Py_ssize_t i;
+
+    self->converters = PySequence_Tuple(converters);
+    if (self->converters == NULL)
+        return -1;
+    for (i = 0; i < PyTuple_GET_SIZE(self->converters); i++) {
+        PyObject *converter = PyTuple_GET_ITEM(self->converters, i);
+        if (converter != Py_None && !PyCallable_Check(converter)) {
+            PyErr_Format(PyExc_TypeError,
+                         "converters must be callable or None, not %.200s",
+                         Py_TYPE(converter)->tp_name);
+            return -1;
+        }
+    }
+    return 0;
+}
+
 static PyObject *
 csv_reader(PyObject *module, PyObject *args, PyObject *keyword_args)
 {
     PyObject * iterator, * dialect = NULL;
+    PyObject * converters = NULL, * columns = NULL;
     ReaderObj * self = PyObject_GC_New(ReaderObj, &Reader_Type);
 
     if (!self)
@@ -962,6 +1154,10 @@ csv_reader(PyObject *module, PyObject *args, PyObject *keyword_args)
     self->field = NULL;
     self->field_size = 0;
     self->line_num = 0;
+    self->converters = NULL;
+    self->column_map = NULL;
+    self->column_map_len = 0;
+    self->num_columns = 0;
 
     if (parse_reset(self) < 0) {
         Py_DECREF(self);
@@ -979,11 +1175,41 @@ csv_reader(PyObject *module, PyObject *args, PyObject *keyword_args)
         Py_DECREF(self);
         return NULL;
     }
+    if (keyword_args != NULL) {
+        /* Separate the reader arguments from the formatting parameters */
+        converters = PyDict_GetItemString(keyword_args, "converters");
+        columns = PyDict_GetItemString(keyword_args, "columns");
+        if (converters != NULL || columns != NULL) {
+            keyword_args = PyDict_Copy(keyword_args);
+            if (keyword_args == NULL) {
+                Py_DECREF(self);
+                return NULL;
+            }
+            if ((converters != NULL &&
+                 PyDict_DelItemString(keyword_args, "converters") < 0) ||
+                (columns != NULL &&
+                 PyDict_DelItemString(keyword_args, "columns") < 0)) {
+                Py_DECREF(keyword_args);
+                Py_DECREF(self);
+                return NULL;
+            }
+        }
+        else
+            Py_INCREF(keyword_args);
+    }
     self->dialect = (DialectObj *)_call_dialect(dialect, keyword_args);
+    Py_XDECREF(keyword_args);
     if (self->dialect == NULL) {
         Py_DECREF(self);
         return NULL;
     }
+    if ((columns != NULL && columns != Py_None &&
+         reader_set_columns(self, columns) < 0) ||
+        (converters != NULL && converters != Py_None &&
+         reader_set_converters(self, converters) < 0)) {
+        Py_DECREF(self);
+        return NULL;
+    }
 
     PyObject_GC_Track(self);
     return (PyObject *)self;
@@ -1560,7 +1786,13 @@ PyDoc_STRVAR(csv_reader_doc,
 "provided by the dialect.\n"
 "\n"
 "The returned object is an iterator.  Each iteration returns a row\n"
-"of the CSV file (which can span multiple input lines).\n");
+"of the CSV file (which can span multiple input lines).\n"
+"\n"
+"The optional \"columns\" keyword argument is a sequence of indexes of\n"
+"the fields to return, in that order, the others being skipped; missing\n"
+"fields are returned as None.  The optional \"converters\" keyword\n"
+"argument is a sequence of callables, such as int or float, converting\n"
+"the fields of the corresponding columns, or None to keep them as str.\n");
 
 PyDoc_STRVAR(csv_writer_doc,
 "    csv_writer = csv.writer(fileobj [, dialect='excel']\n"
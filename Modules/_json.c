@@ -47,6 +47,8 @@ typedef struct _PyEncoderObject {
     PyObject *item_separator;
     PyObject *sort_keys;
     PyObject *skipkeys;
+    PyObject *key_cache;
+    Py_ssize_t key_cache_size;
     PyCFunction fast_encode;
     int allow_nan;
 } PyEncoderObject;
@@ -60,6 +62,7 @@ static PyMemberDef encoder_members[] = {
     {"item_separator", T_OBJECT, offsetof(PyEncoderObject, item_separator), READONLY, "item_separator"},
     {"sort_keys", T_OBJECT, offsetof(PyEncoderObject, sort_keys), READONLY, "sort_keys"},
     {"skipkeys", T_OBJECT, offsetof(PyEncoderObject, skipkeys), READONLY, "skipkeys"},
+    {"key_cache", T_OBJECT, offsetof(PyEncoderObject, key_cache), READONLY, "key_cache"},
     {NULL}
 };
 
@@ -103,12 +106,97 @@ static void
 encoder_dealloc(PyObject *self);
 static int
 encoder_clear(PyObject *self);
+/* The output of the encoder: a list of str, or UTF-8 encoded bytes written
+   directly into a single bytes object */
+typedef struct {
+    _PyAccu accu;
+    PyObject *bytes;    /* the bytes object in bytes mode, else NULL */
+    Py_ssize_t size;    /* number of bytes written in bytes */
+} EncoderOutput;
+
+static int
+output_init(EncoderOutput *out, int as_bytes)
+{
+    if (as_bytes) {
+        out->bytes = PyBytes_FromStringAndSize(NULL, 256);
+        out->size = 0;
+        return out->bytes == NULL ? -1 : 0;
+    }
+    out->bytes = NULL;
+    return _PyAccu_Init(&out->accu);
+}
+
+static int
+output_write(EncoderOutput *out, PyObject *unicode)
+{
+    PyObject *encoded = NULL;
+    const char *data;
+    Py_ssize_t len, allocated;
+
+    if (out->bytes == NULL)
+        return _PyAccu_Accumulate(&out->accu, unicode);
+    if (PyUnicode_READY(unicode) == -1)
+        return -1;
+    if (PyUnicode_IS_ASCII(unicode)) {
+        /* The characters of ASCII strings are their UTF-8 encoding */
+        data = (const char *)PyUnicode_DATA(unicode);
+        len = PyUnicode_GET_LENGTH(unicode);
+    }
+    else {
+        encoded = PyUnicode_AsUTF8String(unicode);
+        if (encoded == NULL)
+            return -1;
+        data = PyBytes_AS_STRING(encoded);
+        len = PyBytes_GET_SIZE(encoded);
+    }
+    allocated = PyBytes_GET_SIZE(out->bytes);
+    if (len > allocated - out->size) {
+        if (len > PY_SSIZE_T_MAX - out->size) {
+            Py_XDECREF(encoded);
+            PyErr_NoMemory();
+            return -1;
+        }
+        /* Overallocate by half to get a linear time */
+        if (allocated <= (PY_SSIZE_T_MAX - allocated) / 2)
+            allocated += allocated / 2;
+        if (allocated < out->size + len)
+            allocated = out->size + len;
+        if (_PyBytes_Resize(&out->bytes, allocated) < 0) {
+            Py_XDECREF(encoded);
+            return -1;
+        }
+    }
+    memcpy(PyBytes_AS_STRING(out->bytes) + out->size, data, len);
+    out->size += len;
+    Py_XDECREF(encoded);
+    return 0;
+}
+
+static PyObject *
+output_finish(EncoderOutput *out)
+{
+    if (out->bytes == NULL)
+        return _PyAccu_FinishAsList(&out->accu);
+    if (_PyBytes_Resize(&out->bytes, out->size) < 0)
+        return NULL;
+    return out->bytes;
+}
+
+static void
+output_destroy(EncoderOutput *out)
+{
+    if (out->bytes == NULL)
+        _PyAccu_Destroy(&out->accu);
+    else
+        Py_CLEAR(out->bytes);
+}
+
 static int
-encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc, PyObject *seq, Py_ssize_t indent_level);
+encoder_listencode_list(PyEncoderObject *s, EncoderOutput *acc, PyObject *seq, Py_ssize_t indent_level);
 static int
-encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc, PyObject *obj, Py_ssize_t indent_level);
+encoder_listencode_obj(PyEncoderObject *s, EncoderOutput *acc, PyObject *obj, Py_ssize_t indent_level);
 static int
-encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc, PyObject *dct, Py_ssize_t indent_level);
+encoder_listencode_dict(PyEncoderObject *s, EncoderOutput *acc, PyObject *dct, Py_ssize_t indent_level);
 static PyObject *
 _encoded_const(PyObject *obj);
 static void
@@ -1324,6 +1412,7 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         s->item_separator = NULL;
         s->sort_keys = NULL;
         s->skipkeys = NULL;
+        s->key_cache = NULL;
     }
     return (PyObject *)s;
 }
@@ -1332,20 +1421,23 @@ static int
 encoder_init(PyObject *self, PyObject *args, PyObject *kwds)
 {
     /* initialize Encoder object */
-    static char *kwlist[] = {"markers", "default", "encoder", "indent", "key_separator", "item_separator", "sort_keys", "skipkeys", "allow_nan", NULL};
+    static char *kwlist[] = {"markers", "default", "encoder", "indent", "key_separator", "item_separator", "sort_keys", "skipkeys", "allow_nan", "key_cache", "key_cache_size", NULL};
 
     PyEncoderObject *s;
     PyObject *markers, *defaultfn, *encoder, *indent, *key_separator;
     PyObject *item_separator, *sort_keys, *skipkeys;
+    PyObject *key_cache = Py_None;
+    Py_ssize_t key_cache_size = 0;
     int allow_nan;
 
     assert(PyEncoder_Check(self));
     s = (PyEncoderObject *)self;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOOUUOOp:make_encoder", kwlist,
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOOUUOOp|On:make_encoder", kwlist,
         &markers, &defaultfn, &encoder, &indent,
         &key_separator, &item_separator,
-        &sort_keys, &skipkeys, &allow_nan))
+        &sort_keys, &skipkeys, &allow_nan,
+        &key_cache, &key_cache_size))
         return -1;
 
     if (markers != Py_None && !PyDict_Check(markers)) {
@@ -1354,6 +1446,12 @@ encoder_init(PyObject *self, PyObject *args, PyObject *kwds)
                      "not %.200s", Py_TYPE(markers)->tp_name);
         return -1;
     }
+    if (key_cache != Py_None && !PyDict_CheckExact(key_cache)) {
+        PyErr_Format(PyExc_TypeError,
+                     "make_encoder() argument 10 must be dict or None, "
+                     "not %.200s", Py_TYPE(key_cache)->tp_name);
+        return -1;
+    }
 
     s->markers = markers;
     s->defaultfn = defaultfn;
@@ -1363,6 +1461,8 @@ encoder_init(PyObject *self, PyObject *args, PyObject *kwds)
     s->item_separator = item_separator;
     s->sort_keys = sort_keys;
     s->skipkeys = skipkeys;
+    s->key_cache = key_cache;
+    s->key_cache_size = key_cache_size;
     s->fast_encode = NULL;
     if (PyCFunction_Check(s->encoder)) {
         PyCFunction f = PyCFunction_GetFunction(s->encoder);
@@ -1381,6 +1481,7 @@ encoder_init(PyObject *self, PyObject *args, PyObject *kwds)
     Py_INCREF(s->item_separator);
     Py_INCREF(s->sort_keys);
     Py_INCREF(s->skipkeys);
+    Py_INCREF(s->key_cache);
     return 0;
 }
 
@@ -1388,24 +1489,25 @@ static PyObject *
 encoder_call(PyObject *self, PyObject *args, PyObject *kwds)
 {
     /* Python callable interface to encode_listencode_obj */
-    static char *kwlist[] = {"obj", "_current_indent_level", NULL};
+    static char *kwlist[] = {"obj", "_current_indent_level", "_bytes", NULL};
     PyObject *obj;
     Py_ssize_t indent_level;
+    int as_bytes = 0;
     PyEncoderObject *s;
-    _PyAccu acc;
+    EncoderOutput acc;
 
     assert(PyEncoder_Check(self));
     s = (PyEncoderObject *)self;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "On:_iterencode", kwlist,
-        &obj, &indent_level))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "On|p:_iterencode", kwlist,
+        &obj, &indent_level, &as_bytes))
         return NULL;
-    if (_PyAccu_Init(&acc))
+    if (output_init(&acc, as_bytes))
         return NULL;
     if (encoder_listencode_obj(s, &acc, obj, indent_level)) {
-        _PyAccu_Destroy(&acc);
+        output_destroy(&acc);
         return NULL;
     }
-    return _PyAccu_FinishAsList(&acc);
+    return output_finish(&acc);
 }
 
 static PyObject *
@@ -1479,16 +1581,16 @@ encoder_encode_string(PyEncoderObject *s, PyObject *obj)
 }
 
 static int
-_steal_accumulate(_PyAccu *acc, PyObject *stolen)
+_steal_accumulate(EncoderOutput *acc, PyObject *stolen)
 {
     /* Append stolen and then decrement its reference count */
-    int rval = _PyAccu_Accumulate(acc, stolen);
+    int rval = output_write(acc, stolen);
     Py_DECREF(stolen);
     return rval;
 }
 
 static int
-encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_obj(PyEncoderObject *s, EncoderOutput *acc,
                        PyObject *obj, Py_ssize_t indent_level)
 {
     /* Encode Python object obj to a JSON term */
@@ -1580,8 +1682,35 @@ encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
     }
 }
 
+static PyObject *
+encoder_encode_key(PyEncoderObject *s, PyObject *kstr)
+{
+    /* Return a borrowed reference to the escaped kstr followed by the key
+       separator, from the key cache.  The cache is cleared when full. */
+    PyObject *encoded, *fragment;
+    int rv;
+
+    fragment = PyDict_GetItemWithError(s->key_cache, kstr);
+    if (fragment != NULL || PyErr_Occurred())
+        return fragment;
+    encoded = encoder_encode_string(s, kstr);
+    if (encoded == NULL)
+        return NULL;
+    fragment = PyUnicode_Concat(encoded, s->key_separator);
+    Py_DECREF(encoded);
+    if (fragment == NULL)
+        return NULL;
+    if (PyDict_Size(s->key_cache) >= s->key_cache_size)
+        PyDict_Clear(s->key_cache);
+    rv = PyDict_SetItem(s->key_cache, kstr, fragment);
+    Py_DECREF(fragment);
+    if (rv < 0)
+        return NULL;
+    return fragment;
+}
+
 static int
-encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_dict(PyEncoderObject *s, EncoderOutput *acc,
                         PyObject *dct, Py_ssize_t indent_level)
 {
     /* Encode Python dict dct a JSON term */
@@ -1605,7 +1734,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
             return -1;
     }
     if (Py_SIZE(dct) == 0)
-        return _PyAccu_Accumulate(acc, empty_dict);
+        return output_write(acc, empty_dict);
 
     if (s->markers != Py_None) {
         int has_key;
@@ -1623,7 +1752,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         }
     }
 
-    if (_PyAccu_Accumulate(acc, open_dict))
+    if (output_write(acc, open_dict))
         goto bail;
 
     if (s->indent != Py_None) {
@@ -1690,21 +1819,32 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         }
 
         if (idx) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (output_write(acc, s->item_separator))
                 goto bail;
         }
 
-        encoded = encoder_encode_string(s, kstr);
-        Py_CLEAR(kstr);
-        if (encoded == NULL)
-            goto bail;
-        if (_PyAccu_Accumulate(acc, encoded)) {
+        if (s->key_cache != Py_None && PyUnicode_CheckExact(kstr)) {
+            /* Reuse the escaped key followed by the key separator */
+            encoded = encoder_encode_key(s, kstr);
+            Py_CLEAR(kstr);
+            if (encoded == NULL)
+                goto bail;
+            if (output_write(acc, encoded))
+                goto bail;
+        }
+        else {
+            encoded = encoder_encode_string(s, kstr);
+            Py_CLEAR(kstr);
+            if (encoded == NULL)
+                goto bail;
+            if (output_write(acc, encoded)) {
+                Py_DECREF(encoded);
+                goto bail;
+            }
             Py_DECREF(encoded);
-            goto bail;
+            if (output_write(acc, s->key_separator))
+                goto bail;
         }
-        Py_DECREF(encoded);
-        if (_PyAccu_Accumulate(acc, s->key_separator))
-            goto bail;
 
         value = PyTuple_GET_ITEM(item, 1);
         if (encoder_listencode_obj(s, acc, value, indent_level))
@@ -1727,7 +1867,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
 
         yield '\n' + (' ' * (_indent * _current_indent_level))
     }*/
-    if (_PyAccu_Accumulate(acc, close_dict))
+    if (output_write(acc, close_dict))
         goto bail;
     return 0;
 
@@ -1741,7 +1881,7 @@ bail:
 
 
 static int
-encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_list(PyEncoderObject *s, EncoderOutput *acc,
                         PyObject *seq, Py_ssize_t indent_level)
 {
     /* Encode Python list seq to a JSON term */
@@ -1765,7 +1905,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
         return -1;
     if (PySequence_Fast_GET_SIZE(s_fast) == 0) {
         Py_DECREF(s_fast);
-        return _PyAccu_Accumulate(acc, empty_array);
+        return output_write(acc, empty_array);
     }
 
     if (s->markers != Py_None) {
@@ -1784,7 +1924,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
         }
     }
 
-    if (_PyAccu_Accumulate(acc, open_array))
+    if (output_write(acc, open_array))
         goto bail;
     if (s->indent != Py_None) {
         /* TODO: DOES NOT RUN */
@@ -1798,7 +1938,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
     for (i = 0; i < PySequence_Fast_GET_SIZE(s_fast); i++) {
         PyObject *obj = PySequence_Fast_GET_ITEM(s_fast, i);
         if (i) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (output_write(acc, s->item_separator))
                 goto bail;
         }
         if (encoder_listencode_obj(s, acc, obj, indent_level))
@@ -1816,7 +1956,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
 
         yield '\n' + (' ' * (_indent * _current_indent_level))
     }*/
-    if (_PyAccu_Accumulate(acc, close_array))
+    if (output_write(acc, close_array))
         goto bail;
     Py_DECREF(s_fast);
     return 0;
@@ -1849,6 +1989,7 @@ encoder_traverse(PyObject *self, visitproc visit, void *arg)
     Py_VISIT(s->item_separator);
     Py_VISIT(s->sort_keys);
     Py_VISIT(s->skipkeys);
+    Py_VISIT(s->key_cache);
     return 0;
 }
 
@@ -1867,6 +2008,7 @@ encoder_clear(PyObject *self)
     Py_CLEAR(s->item_separator);
     Py_CLEAR(s->sort_keys);
     Py_CLEAR(s->skipkeys);
+    Py_CLEAR(s->key_cache);
     return 0;
 }
 
@@ -10,12 +10,13 @@ class _pickle.Pickler "PicklerObject *" "&Pickler_Type"
 class _pickle.PicklerMemoProxy "PicklerMemoProxyObject *" "&PicklerMemoProxyType"
 class _pickle.Unpickler "UnpicklerObject *" "&Unpickler_Type"
 class _pickle.UnpicklerMemoProxy "UnpicklerMemoProxyObject *" "&UnpicklerMemoProxyType"
+class _pickle.PickleBuffer "PickleBufferObject *" "&PickleBuffer_Type"
 [clinic start generated code]*/
-/*[clinic end generated code: output=da39a3ee5e6b4b0d input=4b3e113468a58e6c]*/
+/*[clinic end generated code: output=da39a3ee5e6b4b0d input=af7eea402f102bcb]*/
 
 /* Bump this when new opcodes are added to the pickle protocol. */
 enum {
-    HIGHEST_PROTOCOL = 4,
+    HIGHEST_PROTOCOL = 5,
     DEFAULT_PROTOCOL = 3
 };
 
@@ -92,7 +93,12 @@ enum opcode {
     NEWOBJ_EX        = '\x92',
     STACK_GLOBAL     = '\x93',
     MEMOIZE          = '\x94',
-    FRAME            = '\x95'
+    FRAME            = '\x95',
+
+    /* Protocol 5 */
+    BYTEARRAY8       = '\x96',
+    NEXT_BUFFER      = '\x97',
+    READONLY_BUFFER  = '\x98'
 };
 
 enum {
@@ -587,6 +593,13 @@ typedef struct PicklerObject {
     int fix_imports;            /* Indicate whether Pickler should fix
                                    the name of globals for Python 2.x. */
     PyObject *fast_memo;
+    PyObject *buffer_callback;  /* Callback for out-of-band buffers, or NULL */
+    Py_ssize_t memo_limit;      /* Maximum number of objects in the memo,
+                                   or -1 if unbounded. */
+    PyObject *unshared_func;    /* is_unshared() method, can be NULL */
+    int unshared;               /* True while saving an unshared subtree,
+                                   whose objects are not memoized. */
+    Py_ssize_t frames_written;  /* Number of frames committed so far */
 } PicklerObject;
 
 typedef struct UnpicklerObject {
@@ -625,6 +638,7 @@ typedef struct UnpicklerObject {
     int proto;                  /* Protocol of the pickle loaded. */
     int fix_imports;            /* Indicate whether Unpickler should fix
                                    the name of globals pickled by Python 2.x. */
+    PyObject *buffers;          /* iterable of out-of-band buffers, or NULL */
 } UnpicklerObject;
 
 typedef struct {
@@ -637,14 +651,211 @@ typedef struct {
     UnpicklerObject *unpickler;
 } UnpicklerMemoProxyObject;
 
+typedef struct {
+    PyObject_HEAD
+    Py_buffer view;             /* The wrapped buffer, view.obj is NULL once
+                                   released. */
+    PyObject *weakreflist;
+} PickleBufferObject;
+
 /* Forward declarations */
 static int save(PicklerObject *, PyObject *, int);
 static int save_reduce(PicklerObject *, PyObject *, PyObject *);
 static PyTypeObject Pickler_Type;
 static PyTypeObject Unpickler_Type;
+static PyTypeObject PickleBuffer_Type;
 
 #include "clinic/_pickle.c.h"
 
+/*************************************************************************
+ PickleBuffer, a wrapper for buffer-like objects which the pickler can
+ serialize out-of-band, without copying them, with protocol 5. */
+
+static PyObject *
+PickleBuffer_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    PickleBufferObject *self;
+    PyObject *base;
+
+    if (!_PyArg_NoKeywords("PickleBuffer", kwds))
+        return NULL;
+    if (!PyArg_UnpackTuple(args, "PickleBuffer", 1, 1, &base))
+        return NULL;
+
+    self = PyObject_GC_New(PickleBufferObject, type);
+    if (self == NULL)
+        return NULL;
+    self->view.obj = NULL;
+    self->weakreflist = NULL;
+    if (PyObject_GetBuffer(base, &self->view, PyBUF_FULL_RO) < 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    PyObject_GC_Track(self);
+    return (PyObject *)self;
+}
+
+static void
+PickleBuffer_dealloc(PickleBufferObject *self)
+{
+    PyObject_GC_UnTrack(self);
+    if (self->weakreflist != NULL)
+        PyObject_ClearWeakRefs((PyObject *)self);
+    PyBuffer_Release(&self->view);
+    PyObject_GC_Del(self);
+}
+
+static int
+PickleBuffer_traverse(PickleBufferObject *self, visitproc visit, void *arg)
+{
+    Py_VISIT(self->view.obj);
+    return 0;
+}
+
+static int
+PickleBuffer_clear(PickleBufferObject *self)
+{
+    PyBuffer_Release(&self->view);
+    return 0;
+}
+
+static int
+PickleBuffer_getbuffer(PickleBufferObject *self, Py_buffer *view, int flags)
+{
+    if (self->view.obj == NULL) {
+        PyErr_SetString(PyExc_ValueError,
+                        "operation forbidden on released PickleBuffer object");
+        return -1;
+    }
+    return PyObject_GetBuffer(self->view.obj, view, flags);
+}
+
+static PyBufferProcs PickleBuffer_as_buffer = {
+    (getbufferproc)PickleBuffer_getbuffer,  /* bf_getbuffer */
+    0,                                      /* bf_releasebuffer */
+};
+
+/*[clinic input]
+_pickle.PickleBuffer.raw
+
+Return a memoryview of the raw memory underlying this buffer.
+
+The memoryview has format 'B' and one dimension.  This raises
+BufferError if the buffer is not contiguous.
+[clinic start generated code]*/
+
+static PyObject *
+_pickle_PickleBuffer_raw_impl(PickleBufferObject *self)
+/*[clinic end generated code: output=c78b3fd04355aba5 input=33553e9f9826ff87]*/
+
+{
+    PyObject *m;
+    PyMemoryViewObject *mv;
+    Py_buffer *view;
+
+    if (self->view.obj == NULL) {
+        PyErr_SetString(PyExc_ValueError,
+                        "operation forbidden on released PickleBuffer object");
+        return NULL;
+    }
+    if (self->view.suboffsets != NULL
+        || !PyBuffer_IsContiguous(&self->view, 'A')) {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot extract raw buffer from non-contiguous buffer");
+        return NULL;
+    }
+    m = PyMemoryView_FromObject((PyObject *)self);
+    if (m == NULL)
+        return NULL;
+    /* Mutate the fresh memoryview to make it a 1-dimensional view of
+       unsigned bytes over the whole buffer */
+    mv = (PyMemoryViewObject *)m;
+    view = &mv->view;
+    view->format = "B";
+    view->itemsize = 1;
+    view->ndim = 1;
+    view->shape = &view->len;
+    view->strides = &view->itemsize;
+    view->suboffsets = NULL;
+    mv->flags = _Py_MEMORYVIEW_C | _Py_MEMORYVIEW_FORTRAN;
+    return m;
+}
+
+/*[clinic input]
+_pickle.PickleBuffer.release
+
+Release the underlying buffer exposed by the PickleBuffer object.
+[clinic start generated code]*/
+
+static PyObject *
+_pickle_PickleBuffer_release_impl(PickleBufferObject *self)
+/*[clinic end generated code: output=cc7900aaba67e761 input=b9a5e91e3bdd0dc7]*/
+
+{
+    PyBuffer_Release(&self->view);
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef PickleBuffer_methods[] = {
+    _PICKLE_PICKLEBUFFER_RAW_METHODDEF
+    _PICKLE_PICKLEBUFFER_RELEASE_METHODDEF
+    {NULL, NULL}
+};
+
+PyDoc_STRVAR(PickleBuffer_doc,
+"PickleBuffer(buffer)\n"
+"--\n"
+"\n"
+"Wrapper for potentially out-of-band buffers.\n"
+"\n"
+"With protocol 5, a PickleBuffer is pickled out-of-band when the\n"
+"buffer_callback of the pickler returns a false value, and in-band\n"
+"otherwise, as a bytes object if the buffer is readonly or as a\n"
+"bytearray object if it is writable.");
+
+static PyTypeObject PickleBuffer_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_pickle.PickleBuffer",             /*tp_name*/
+    sizeof(PickleBufferObject),         /*tp_basicsize*/
+    0,                                  /*tp_itemsize*/
+    (destructor)PickleBuffer_dealloc,   /*tp_dealloc*/
+    0,                                  /*tp_print*/
+    0,                                  /*tp_getattr*/
+    0,                                  /*tp_setattr*/
+    0,                                  /*tp_reserved*/
+    0,                                  /*tp_repr*/
+    0,                                  /*tp_as_number*/
+    0,                                  /*tp_as_sequence*/
+    0,                                  /*tp_as_mapping*/
+    0,                                  /*tp_hash*/
+    0,                                  /*tp_call*/
+    0,                                  /*tp_str*/
+    0,                                  /*tp_getattro*/
+    0,                                  /*tp_setattro*/
+    &PickleBuffer_as_buffer,            /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,  /*tp_flags*/
+    PickleBuffer_doc,                   /*tp_doc*/
+    (traverseproc)PickleBuffer_traverse,  /*tp_traverse*/
+    (inquiry)PickleBuffer_clear,        /*tp_clear*/
+    0,                                  /*tp_richcompare*/
+    offsetof(PickleBufferObject, weakreflist),  /*tp_weaklistoffset*/
+    0,                                  /*tp_iter*/
+    0,                                  /*tp_iternext*/
+    PickleBuffer_methods,               /*tp_methods*/
+    0,                                  /*tp_members*/
+    0,                                  /*tp_getset*/
+    0,                                  /*tp_base*/
+    0,                                  /*tp_dict*/
+    0,                                  /*tp_descr_get*/
+    0,                                  /*tp_descr_set*/
+    0,                                  /*tp_dictoffset*/
+    0,                                  /*tp_init*/
+    0,                                  /*tp_alloc*/
+    PickleBuffer_new,                   /*tp_new*/
+    0,                                  /*tp_free*/
+    0,                                  /*tp_is_gc*/
+};
+
 /*************************************************************************
  A custom hashtable mapping void* to Python ints. This is used by the pickler
  for memoization. Using a custom hashtable rather than PyDict allows us to skip
@@ -912,21 +1123,42 @@ _Pickler_CommitFrame(PicklerObject *self)
     qdata = PyBytes_AS_STRING(self->output_buffer) + self->frame_start;
     _Pickler_WriteFrameHeader(self, qdata, frame_len);
     self->frame_start = -1;
+    self->frames_written++;
     return 0;
 }
 
+static int _Pickler_FlushToFile(PicklerObject *self);
+
 static int
 _Pickler_OpcodeBoundary(PicklerObject *self)
 {
     Py_ssize_t frame_len;
 
-    if (!self->framing || self->frame_start == -1)
-        return 0;
-    frame_len = self->output_len - self->frame_start - FRAME_HEADER_SIZE;
-    if (frame_len >= FRAME_SIZE_TARGET)
-        return _Pickler_CommitFrame(self);
-    else
-        return 0;
+    if (!self->framing) {
+        /* Without framing, only the output buffer needs to be bounded. */
+        if (self->write == NULL || self->output_len < FRAME_SIZE_TARGET)
+            return 0;
+    }
+    else {
+        if (self->frame_start == -1)
+            return 0;
+        frame_len = self->output_len - self->frame_start - FRAME_HEADER_SIZE;
+        if (frame_len < FRAME_SIZE_TARGET)
+            return 0;
+        if (_Pickler_CommitFrame(self) < 0)
+            return -1;
+        if (self->write == NULL)
+            return 0;
+    }
+    /* Flush the committed data to the file and reuse the buffer, so that
+       dumping a large object graph to a file does not hold the whole
+       pickle in memory.  self->write is NULL when called via dumps(). */
+    if (_Pickler_FlushToFile(self) < 0)
+        return -1;
+    /* Don't keep a buffer enlarged by a large object. */
+    if (self->max_output_len > 2 * FRAME_SIZE_TARGET)
+        self->max_output_len = 2 * FRAME_SIZE_TARGET;
+    return _Pickler_ClearBuffer(self);
 }
 
 static PyObject *
@@ -1033,6 +1265,11 @@ _Pickler_New(void)
     self->fast_nesting = 0;
     self->fix_imports = 0;
     self->fast_memo = NULL;
+    self->buffer_callback = NULL;
+    self->memo_limit = -1;
+    self->unshared_func = NULL;
+    self->unshared = 0;
+    self->frames_written = 0;
     self->max_output_len = WRITE_BUF_SIZE;
     self->output_len = 0;
 
@@ -1074,6 +1311,42 @@ _Pickler_SetProtocol(PicklerObject *self, PyObject *protocol, int fix_imports)
     return 0;
 }
 
+static int
+_Pickler_SetBufferCallback(PicklerObject *self, PyObject *buffer_callback)
+{
+    if (buffer_callback == Py_None) {
+        buffer_callback = NULL;
+    }
+    if (buffer_callback != NULL && self->proto < 5) {
+        PyErr_SetString(PyExc_ValueError,
+                        "buffer_callback needs protocol >= 5");
+        return -1;
+    }
+
+    Py_XINCREF(buffer_callback);
+    Py_XSETREF(self->buffer_callback, buffer_callback);
+    return 0;
+}
+
+static int
+_Pickler_SetMemoLimit(PicklerObject *self, PyObject *memo_limit)
+{
+    Py_ssize_t limit = -1;
+
+    if (memo_limit != Py_None) {
+        limit = PyNumber_AsSsize_t(memo_limit, PyExc_OverflowError);
+        if (limit == -1 && PyErr_Occurred())
+            return -1;
+        if (limit < 0) {
+            PyErr_SetString(PyExc_ValueError,
+                            "memo_limit must be non-negative or None");
+            return -1;
+        }
+    }
+    self->memo_limit = limit;
+    return 0;
+}
+
 /* Returns -1 (with an exception set) on failure, 0 on success. This may
    be called once on a freshly created Pickler. */
 static int
@@ -1408,6 +1681,7 @@ _Unpickler_New(void)
     self->marks_size = 0;
     self->proto = 0;
     self->fix_imports = 0;
+    self->buffers = NULL;
     memset(&self->buffer, 0, sizeof(Py_buffer));
     self->memo_size = 32;
     self->memo_len = 0;
@@ -1473,6 +1747,23 @@ _Unpickler_SetInputEncoding(UnpicklerObject *self,
     return 0;
 }
 
+/* Returns -1 (with an exception set) on failure, 0 on success. This may
+   be called once on a freshly created Unpickler. */
+static int
+_Unpickler_SetBuffers(UnpicklerObject *self, PyObject *buffers)
+{
+    if (buffers == NULL || buffers == Py_None) {
+        self->buffers = NULL;
+    }
+    else {
+        self->buffers = PyObject_GetIter(buffers);
+        if (self->buffers == NULL) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
 /* Generate a GET opcode for an object stored in the memo. */
 static int
 memo_get(PicklerObject *self, PyObject *key)
@@ -1532,10 +1823,12 @@ memo_put(PicklerObject *self, PyObject *obj)
 
     const char memoize_op = MEMOIZE;
 
-    if (self->fast)
+    if (self->fast || self->unshared)
         return 0;
 
     idx = PyMemoTable_Size(self->memo);
+    if (self->memo_limit >= 0 && idx >= self->memo_limit)
+        return 0;
     if (PyMemoTable_Set(self->memo, obj, idx) < 0)
         return -1;
 
@@ -2030,6 +2323,53 @@ done:
     return 0;
 }
 
+static int
+_save_bytes_data(PicklerObject *self, PyObject *obj, const char *data,
+                 Py_ssize_t size)
+{
+    char header[9];
+    Py_ssize_t len;
+
+    assert(self->proto >= 3);
+    if (size < 0)
+        return -1;
+
+    if (size <= 0xff) {
+        header[0] = SHORT_BINBYTES;
+        header[1] = (unsigned char)size;
+        len = 2;
+    }
+    else if ((size_t)size <= 0xffffffffUL) {
+        header[0] = BINBYTES;
+        header[1] = (unsigned char)(size & 0xff);
+        header[2] = (unsigned char)((size >> 8) & 0xff);
+        header[3] = (unsigned char)((size >> 16) & 0xff);
+        header[4] = (unsigned char)((size >> 24) & 0xff);
+        len = 5;
+    }
+    else if (self->proto >= 4) {
+        header[0] = BINBYTES8;
+        _write_size64(header + 1, size);
+        len = 9;
+    }
+    else {
+        PyErr_SetString(PyExc_OverflowError,
+                        "cannot serialize a bytes object larger than 4 GiB");
+        return -1;          /* string too large */
+    }
+
+    if (_Pickler_Write(self, header, len) < 0)
+        return -1;
+
+    if (_Pickler_Write(self, data, size) < 0)
+        return -1;
+
+    if (memo_put(self, obj) < 0)
+        return -1;
+
+    return 0;
+}
+
 static int
 save_bytes(PicklerObject *self, PyObject *obj)
 {
@@ -2076,49 +2416,100 @@ save_bytes(PicklerObject *self, PyObject *obj)
         return status;
     }
     else {
-        Py_ssize_t size;
-        char header[9];
-        Py_ssize_t len;
+        return _save_bytes_data(self, obj, PyBytes_AS_STRING(obj),
+                                PyBytes_GET_SIZE(obj));
+    }
+}
 
-        size = PyBytes_GET_SIZE(obj);
-        if (size < 0)
-            return -1;
+static int
+_save_bytearray_data(PicklerObject *self, PyObject *obj, const char *data,
+                     Py_ssize_t size)
+{
+    char header[9];
 
-        if (size <= 0xff) {
-            header[0] = SHORT_BINBYTES;
-            header[1] = (unsigned char)size;
-            len = 2;
-        }
-        else if ((size_t)size <= 0xffffffffUL) {
-            header[0] = BINBYTES;
-            header[1] = (unsigned char)(size & 0xff);
-            header[2] = (unsigned char)((size >> 8) & 0xff);
-            header[3] = (unsigned char)((size >> 16) & 0xff);
-            header[4] = (unsigned char)((size >> 24) & 0xff);
-            len = 5;
-        }
-        else if (self->proto >= 4) {
-            header[0] = BINBYTES8;
-            _write_size64(header + 1, size);
-            len = 9;
-        }
-        else {
-            PyErr_SetString(PyExc_OverflowError,
-                            "cannot serialize a bytes object larger than 4 GiB");
-            return -1;          /* string too large */
-        }
+    assert(self->proto >= 5);
+    if (size < 0)
+        return -1;
 
-        if (_Pickler_Write(self, header, len) < 0)
-            return -1;
+    header[0] = BYTEARRAY8;
+    _write_size64(header + 1, size);
 
-        if (_Pickler_Write(self, PyBytes_AS_STRING(obj), size) < 0)
-            return -1;
+    if (_Pickler_Write(self, header, 9) < 0)
+        return -1;
 
-        if (memo_put(self, obj) < 0)
+    if (_Pickler_Write(self, data, size) < 0)
+        return -1;
+
+    if (memo_put(self, obj) < 0)
+        return -1;
+
+    return 0;
+}
+
+static int
+save_bytearray(PicklerObject *self, PyObject *obj)
+{
+    /* Older protocols go through bytearray.__reduce_ex__() */
+    assert(self->proto >= 5);
+    return _save_bytearray_data(self, obj, PyByteArray_AS_STRING(obj),
+                                PyByteArray_GET_SIZE(obj));
+}
+
+static int
+save_picklebuffer(PicklerObject *self, PyObject *obj)
+{
+    PickleState *st = _Pickle_GetGlobalState();
+    Py_buffer *view = &((PickleBufferObject *)obj)->view;
+    int in_band = 1;
+
+    if (self->proto < 5) {
+        PyErr_SetString(st->PicklingError,
+                        "PickleBuffer can only be pickled with protocol >= 5");
+        return -1;
+    }
+    if (view->obj == NULL) {
+        PyErr_SetString(PyExc_ValueError,
+                        "operation forbidden on released PickleBuffer object");
+        return -1;
+    }
+    if (view->suboffsets != NULL || !PyBuffer_IsContiguous(view, 'A')) {
+        PyErr_SetString(st->PicklingError,
+                        "PickleBuffer can not be pickled when "
+                        "pointing to a non-contiguous buffer");
+        return -1;
+    }
+    if (self->buffer_callback != NULL) {
+        PyObject *ret = PyObject_CallFunctionObjArgs(self->buffer_callback,
+                                                     obj, NULL);
+        if (ret == NULL)
             return -1;
+        in_band = PyObject_IsTrue(ret);
+        Py_DECREF(ret);
+        if (in_band == -1)
+            return -1;
+    }
+    if (in_band) {
+        /* Write the data in-band, without an intermediate copy */
+        if (view->readonly)
+            return _save_bytes_data(self, obj, (const char *)view->buf,
+                                    view->len);
+        else
+            return _save_bytearray_data(self, obj, (const char *)view->buf,
+                                        view->len);
+    }
+    else {
+        /* Write the data out-of-band: only the opcodes go in the stream */
+        const char next_buffer_op = NEXT_BUFFER;
+        const char readonly_buffer_op = READONLY_BUFFER;
 
-        return 0;
+        if (_Pickler_Write(self, &next_buffer_op, 1) < 0)
+            return -1;
+        if (view->readonly) {
+            if (_Pickler_Write(self, &readonly_buffer_op, 1) < 0)
+                return -1;
+        }
     }
+    return 0;
 }
 
 /* A copy of PyUnicode_EncodeRawUnicodeEscape() that also translates
@@ -3782,6 +4173,30 @@ save_reduce(PicklerObject *self, PyObject *args, PyObject *obj)
     return 0;
 }
 
+/* Save obj without memoizing it nor any object reachable from it, if the
+   is_unshared() method returns a true value.  Returns -1 on error, 0 if
+   the method returned a false value and 1 if obj was saved. */
+static int
+save_unshared(PicklerObject *self, PyObject *obj)
+{
+    PyObject *result;
+    int unshared, status;
+
+    Py_INCREF(obj);
+    result = _Pickle_FastCall(self->unshared_func, obj);
+    if (result == NULL)
+        return -1;
+    unshared = PyObject_IsTrue(result);
+    Py_DECREF(result);
+    if (unshared <= 0)
+        return unshared;
+
+    self->unshared = 1;
+    status = save(self, obj, 1);
+    self->unshared = 0;
+    return (status < 0) ? -1 : 1;
+}
+
 static int
 save(PicklerObject *self, PyObject *obj, int pers_save)
 {
@@ -3843,10 +4258,24 @@ save(PicklerObject *self, PyObject *obj, int pers_save)
         goto done;
     }
 
+    /* Check whether obj is the root of an unshared subtree. */
+    if (self->unshared_func != NULL && !self->unshared) {
+        if ((status = save_unshared(self, obj)) != 0)
+            goto done;
+    }
+
     if (type == &PyBytes_Type) {
         status = save_bytes(self, obj);
         goto done;
     }
+    else if (type == &PyByteArray_Type && self->proto >= 5) {
+        status = save_bytearray(self, obj);
+        goto done;
+    }
+    else if (type == &PickleBuffer_Type) {
+        status = save_picklebuffer(self, obj);
+        goto done;
+    }
     else if (type == &PyUnicode_Type) {
         status = save_unicode(self, obj);
         goto done;
@@ -4123,6 +4552,8 @@ Pickler_dealloc(PicklerObject *self)
     Py_XDECREF(self->pers_func);
     Py_XDECREF(self->dispatch_table);
     Py_XDECREF(self->fast_memo);
+    Py_XDECREF(self->buffer_callback);
+    Py_XDECREF(self->unshared_func);
 
     PyMemoTable_Del(self->memo);
 
@@ -4136,6 +4567,8 @@ Pickler_traverse(PicklerObject *self, visitproc visit, void *arg)
     Py_VISIT(self->pers_func);
     Py_VISIT(self->dispatch_table);
     Py_VISIT(self->fast_memo);
+    Py_VISIT(self->buffer_callback);
+    Py_VISIT(self->unshared_func);
     return 0;
 }
 
@@ -4147,6 +4580,8 @@ Pickler_clear(PicklerObject *self)
     Py_CLEAR(self->pers_func);
     Py_CLEAR(self->dispatch_table);
     Py_CLEAR(self->fast_memo);
+    Py_CLEAR(self->buffer_callback);
+    Py_CLEAR(self->unshared_func);
 
     if (self->memo != NULL) {
         PyMemoTable *memo = self->memo;
@@ -4164,11 +4599,14 @@ _pickle.Pickler.__init__
   file: object
   protocol: object = NULL
   fix_imports: bool = True
+  buffer_callback: object = None
+  *
+  memo_limit: object = None
 
 This takes a binary file for writing a pickle data stream.
 
 The optional *protocol* argument tells the pickler to use the given
-protocol; supported protocols are 0, 1, 2, 3 and 4.  The default
+protocol; supported protocols are 0, 1, 2, 3, 4 and 5.  The default
 protocol is 3; a backward-incompatible protocol designed for Python 3.
 
 Specifying a negative protocol version selects the highest protocol
@@ -4183,15 +4621,31 @@ this interface.
 If *fix_imports* is True and protocol is less than 3, pickle will try
 to map the new Python 3 names to the old module names used in Python
 2, so that the pickle data stream is readable with Python 2.
+
+If *buffer_callback* is None (the default), buffer views are
+serialized into *file* as part of the pickle stream.  Otherwise, it
+is called with each PickleBuffer, and the buffer is serialized
+out-of-band if the callback returns a false value, in-band otherwise.
+It is an error if *buffer_callback* is not None and *protocol* is
+None or smaller than 5.
+
+If *memo_limit* is not None, at most *memo_limit* objects are kept in
+the memo; the objects pickled once it is full are not memoized, which
+bounds the memory used to pickle large acyclic object graphs.  The
+objects shared by several parents are then pickled several times, and
+pickling a recursive data structure fails.
 [clinic start generated code]*/
 
 static int
 _pickle_Pickler___init___impl(PicklerObject *self, PyObject *file,
-                              PyObject *protocol, int fix_imports)
-/*[clinic end generated code: output=b5f31078dab17fb0 input=4faabdbc763c2389]*/
+                              PyObject *protocol, int fix_imports,
+                              PyObject *buffer_callback,
+                              PyObject *memo_limit)
+/*[clinic end generated code: output=5d8e8cd58b398f35 input=a1633d99a20ca63b]*/
 {
     _Py_IDENTIFIER(persistent_id);
     _Py_IDENTIFIER(dispatch_table);
+    _Py_IDENTIFIER(is_unshared);
 
     /* In case of multiple __init__() calls, clear previous content. */
     if (self->write != NULL)
@@ -4203,6 +4657,12 @@ _pickle_Pickler___init___impl(PicklerObject *self, PyObject *file,
     if (_Pickler_SetOutputStream(self, file) < 0)
         return -1;
 
+    if (_Pickler_SetBufferCallback(self, buffer_callback) < 0)
+        return -1;
+
+    if (_Pickler_SetMemoLimit(self, memo_limit) < 0)
+        return -1;
+
     /* memo and output_buffer may have already been created in _Pickler_New */
     if (self->memo == NULL) {
         self->memo = PyMemoTable_New();
@@ -4235,6 +4695,14 @@ _pickle_Pickler___init___impl(PicklerObject *self, PyObject *file,
         if (self->dispatch_table == NULL)
             return -1;
     }
+    self->unshared = 0;
+    self->unshared_func = NULL;
+    if (_PyObject_HasAttrId((PyObject *)self, &PyId_is_unshared)) {
+        self->unshared_func = _PyObject_GetAttrId((PyObject *)self,
+                                                  &PyId_is_unshared);
+        if (self->unshared_func == NULL)
+            return -1;
+    }
 
     return 0;
 }
@@ -4518,10 +4986,18 @@ Pickler_set_persid(PicklerObject *self, PyObject *value)
     return 0;
 }
 
+static PyObject *
+Pickler_get_memo_size(PicklerObject *self)
+{
+    return PyLong_FromSsize_t(PyMemoTable_Size(self->memo));
+}
+
 static PyMemberDef Pickler_members[] = {
     {"bin", T_INT, offsetof(PicklerObject, bin)},
     {"fast", T_INT, offsetof(PicklerObject, fast)},
     {"dispatch_table", T_OBJECT_EX, offsetof(PicklerObject, dispatch_table)},
+    {"frames_written", T_PYSSIZET, offsetof(PicklerObject, frames_written),
+     READONLY},
     {NULL}
 };
 
@@ -4530,6 +5006,7 @@ static PyGetSetDef Pickler_getsets[] = {
                       (setter)Pickler_set_memo},
     {"persistent_id", (getter)Pickler_get_persid,
                       (setter)Pickler_set_persid},
+    {"memo_size",     (getter)Pickler_get_memo_size},
     {NULL}
 };
 
@@ -5013,6 +5490,88 @@ load_counted_binbytes(UnpicklerObject *self, int nbytes)
     return 0;
 }
 
+static int
+load_counted_bytearray(UnpicklerObject *self)
+{
+    PyObject *bytearray;
+    Py_ssize_t size;
+    char *s;
+
+    if (_Unpickler_Read(self, &s, 8) < 0)
+        return -1;
+
+    size = calc_binsize(s, 8);
+    if (size < 0) {
+        PyErr_Format(PyExc_OverflowError,
+                     "BYTEARRAY8 exceeds system's maximum size of %zd bytes",
+                     PY_SSIZE_T_MAX);
+        return -1;
+    }
+
+    if (_Unpickler_Read(self, &s, size) < 0)
+        return -1;
+
+    bytearray = PyByteArray_FromStringAndSize(s, size);
+    if (bytearray == NULL)
+        return -1;
+
+    PDATA_PUSH(self->stack, bytearray, -1);
+    return 0;
+}
+
+static int
+load_next_buffer(UnpicklerObject *self)
+{
+    PyObject *buf;
+
+    if (self->buffers == NULL) {
+        PickleState *st = _Pickle_GetGlobalState();
+        PyErr_SetString(st->UnpicklingError,
+                        "pickle stream refers to out-of-band data "
+                        "but no *buffers* argument was given");
+        return -1;
+    }
+    buf = PyIter_Next(self->buffers);
+    if (buf == NULL) {
+        if (!PyErr_Occurred()) {
+            PickleState *st = _Pickle_GetGlobalState();
+            PyErr_SetString(st->UnpicklingError,
+                            "not enough out-of-band buffers");
+        }
+        return -1;
+    }
+
+    PDATA_PUSH(self->stack, buf, -1);
+    return 0;
+}
+
+static int
+load_readonly_buffer(UnpicklerObject *self)
+{
+    Py_ssize_t len = Py_SIZE(self->stack);
+    PyObject *obj, *view;
+
+    if (len <= self->stack->fence)
+        return Pdata_stack_underflow(self->stack);
+
+    obj = self->stack->data[len - 1];
+    view = PyMemoryView_FromObject(obj);
+    if (view == NULL)
+        return -1;
+    if (!PyMemoryView_GET_BUFFER(view)->readonly) {
+        /* The original object is writable, replace it with a readonly
+           view of it */
+        PyMemoryView_GET_BUFFER(view)->readonly = 1;
+        self->stack->data[len - 1] = view;
+        Py_DECREF(obj);
+    }
+    else {
+        /* The original object is readonly already */
+        Py_DECREF(view);
+    }
+    return 0;
+}
+
 static int
 load_unicode(UnpicklerObject *self)
 {
@@ -6274,6 +6833,9 @@ load(UnpicklerObject *self)
         OP_ARG(SHORT_BINBYTES, load_counted_binbytes, 1)
         OP_ARG(BINBYTES, load_counted_binbytes, 4)
         OP_ARG(BINBYTES8, load_counted_binbytes, 8)
+        OP(BYTEARRAY8, load_counted_bytearray)
+        OP(NEXT_BUFFER, load_next_buffer)
+        OP(READONLY_BUFFER, load_readonly_buffer)
         OP_ARG(SHORT_BINSTRING, load_counted_binstring, 1)
         OP_ARG(BINSTRING, load_counted_binstring, 4)
         OP(STRING, load_string)
@@ -6540,6 +7102,7 @@ Unpickler_dealloc(UnpicklerObject *self)
     Py_XDECREF(self->peek);
     Py_XDECREF(self->stack);
     Py_XDECREF(self->pers_func);
+    Py_XDECREF(self->buffers);
     if (self->buffer.buf != NULL) {
         PyBuffer_Release(&self->buffer);
         self->buffer.buf = NULL;
@@ -6562,6 +7125,7 @@ Unpickler_traverse(UnpicklerObject *self, visitproc visit, void *arg)
     Py_VISIT(self->peek);
     Py_VISIT(self->stack);
     Py_VISIT(self->pers_func);
+    Py_VISIT(self->buffers);
     return 0;
 }
 
@@ -6573,6 +7137,7 @@ Unpickler_clear(UnpicklerObject *self)
     Py_CLEAR(self->peek);
     Py_CLEAR(self->stack);
     Py_CLEAR(self->pers_func);
+    Py_CLEAR(self->buffers);
     if (self->buffer.buf != NULL) {
         PyBuffer_Release(&self->buffer);
         self->buffer.buf = NULL;
@@ -6600,6 +7165,7 @@ _pickle.Unpickler.__init__
   fix_imports: bool = True
   encoding: str = 'ASCII'
   errors: str = 'strict'
+  buffers: object = None
 
 This takes a binary file for reading a pickle data stream.
 
@@ -6621,13 +7187,18 @@ map the old Python 2 names to the new names used in Python 3.  The
 instances pickled by Python 2; these default to 'ASCII' and 'strict',
 respectively.  The *encoding* can be 'bytes' to read these 8-bit
 string instances as bytes objects.
+
+If *buffers* is not None, it should be an iterable of buffer-enabled
+objects, consumed each time the pickle stream references an
+out-of-band buffer, in the order in which they were given to the
+*buffer_callback* of the pickler.
 [clinic start generated code]*/
 
 static int
 _pickle_Unpickler___init___impl(UnpicklerObject *self, PyObject *file,
                                 int fix_imports, const char *encoding,
-                                const char *errors)
-/*[clinic end generated code: output=e2c8ce748edc57b0 input=f9b7da04f5f4f335]*/
+                                const char *errors, PyObject *buffers)
+/*[clinic end generated code: output=09f0192649ea3f85 input=d640c15cb2748bc3]*/
 {
     _Py_IDENTIFIER(persistent_load);
 
@@ -6641,6 +7212,9 @@ _pickle_Unpickler___init___impl(UnpicklerObject *self, PyObject *file,
     if (_Unpickler_SetInputEncoding(self, encoding, errors) < 0)
         return -1;
 
+    if (_Unpickler_SetBuffers(self, buffers) < 0)
+        return -1;
+
     self->fix_imports = fix_imports;
     if (self->fix_imports == -1)
         return -1;
@@ -7026,6 +7600,7 @@ _pickle.dump
   protocol: object = NULL
   *
   fix_imports: bool = True
+  buffer_callback: object = None
 
 Write a pickled representation of obj to the open file object file.
 
@@ -7033,7 +7608,7 @@ This is equivalent to ``Pickler(file, protocol).dump(obj)``, but may
 be more efficient.
 
 The optional *protocol* argument tells the pickler to use the given
-protocol supported protocols are 0, 1, 2, 3 and 4.  The default
+protocol supported protocols are 0, 1, 2, 3, 4 and 5.  The default
 protocol is 3; a backward-incompatible protocol designed for Python 3.
 
 Specifying a negative protocol version selects the highest protocol
@@ -7048,12 +7623,17 @@ this interface.
 If *fix_imports* is True and protocol is less than 3, pickle will try
 to map the new Python 3 names to the old module names used in Python
 2, so that the pickle data stream is readable with Python 2.
+
+If *buffer_callback* is not None, it is called with each PickleBuffer
+and the buffers for which it returns a false value are serialized
+out-of-band.  This requires *protocol* 5 or higher.
 [clinic start generated code]*/
 
 static PyObject *
 _pickle_dump_impl(PyModuleDef *module, PyObject *obj, PyObject *file,
-                  PyObject *protocol, int fix_imports)
-/*[clinic end generated code: output=0de7dff89c406816 input=830f8a64cef6f042]*/
+                  PyObject *protocol, int fix_imports,
+                  PyObject *buffer_callback)
+/*[clinic end generated code: output=656982757518cedd input=ca964c69c64b8069]*/
 {
     PicklerObject *pickler = _Pickler_New();
 
@@ -7066,6 +7646,9 @@ _pickle_dump_impl(PyModuleDef *module, PyObject *obj, PyObject *file,
     if (_Pickler_SetOutputStream(pickler, file) < 0)
         goto error;
 
+    if (_Pickler_SetBufferCallback(pickler, buffer_callback) < 0)
+        goto error;
+
     if (dump(pickler, obj) < 0)
         goto error;
 
@@ -7088,11 +7671,12 @@ _pickle.dumps
   protocol: object = NULL
   *
   fix_imports: bool = True
+  buffer_callback: object = None
 
 Return the pickled representation of the object as a bytes object.
 
 The optional *protocol* argument tells the pickler to use the given
-protocol; supported protocols are 0, 1, 2, 3 and 4.  The default
+protocol; supported protocols are 0, 1, 2, 3, 4 and 5.  The default
 protocol is 3; a backward-incompatible protocol designed for Python 3.
 
 Specifying a negative protocol version selects the highest protocol
@@ -7102,12 +7686,16 @@ version of Python needed to read the pickle produced.
 If *fix_imports* is True and *protocol* is less than 3, pickle will
 try to map the new Python 3 names to the old module names used in
 Python 2, so that the pickle data stream is readable with Python 2.
+
+If *buffer_callback* is not None, it is called with each PickleBuffer
+and the buffers for which it returns a false value are serialized
+out-of-band.  This requires *protocol* 5 or higher.
 [clinic start generated code]*/
 
 static PyObject *
 _pickle_dumps_impl(PyModuleDef *module, PyObject *obj, PyObject *protocol,
-                   int fix_imports)
-/*[clinic end generated code: output=daa380db56fe07b9 input=293dbeda181580b7]*/
+                   int fix_imports, PyObject *buffer_callback)
+/*[clinic end generated code: output=0addcbb129aa1757 input=3a96c0c036f7ef1f]*/
 {
     PyObject *result;
     PicklerObject *pickler = _Pickler_New();
@@ -7118,6 +7706,9 @@ _pickle_dumps_impl(PyModuleDef *module, PyObject *obj, PyObject *protocol,
     if (_Pickler_SetProtocol(pickler, protocol, fix_imports) < 0)
         goto error;
 
+    if (_Pickler_SetBufferCallback(pickler, buffer_callback) < 0)
+        goto error;
+
     if (dump(pickler, obj) < 0)
         goto error;
 
@@ -7139,6 +7730,7 @@ _pickle.load
   fix_imports: bool = True
   encoding: str = 'ASCII'
   errors: str = 'strict'
+  buffers: object = None
 
 Read and return an object from the pickle data stored in a file.
 
@@ -7163,12 +7755,16 @@ map the old Python 2 names to the new names used in Python 3.  The
 instances pickled by Python 2; these default to 'ASCII' and 'strict',
 respectively.  The *encoding* can be 'bytes' to read these 8-bit
 string instances as bytes objects.
+
+If *buffers* is not None, it should be an iterable of the out-of-band
+buffers referenced by the pickle stream.
 [clinic start generated code]*/
 
 static PyObject *
 _pickle_load_impl(PyModuleDef *module, PyObject *file, int fix_imports,
-                  const char *encoding, const char *errors)
-/*[clinic end generated code: output=798f1c57cb2b4eb1 input=01b44dd3fc07afa7]*/
+                  const char *encoding, const char *errors,
+                  PyObject *buffers)
+/*[clinic end generated code: output=f9bb8e33cd94b07f input=cfb517a55b114c75]*/
 {
     PyObject *result;
     UnpicklerObject *unpickler = _Unpickler_New();
@@ -7182,6 +7778,9 @@ _pickle_load_impl(PyModuleDef *module, PyObject *file, int fix_imports,
     if (_Unpickler_SetInputEncoding(unpickler, encoding, errors) < 0)
         goto error;
 
+    if (_Unpickler_SetBuffers(unpickler, buffers) < 0)
+        goto error;
+
     unpickler->fix_imports = fix_imports;
 
     result = load(unpickler);
@@ -7202,6 +7801,7 @@ _pickle.loads
   fix_imports: bool = True
   encoding: str = 'ASCII'
   errors: str = 'strict'
+  buffers: object = None
 
 Read and return an object from the given pickle data.
 
@@ -7217,12 +7817,16 @@ map the old Python 2 names to the new names used in Python 3.  The
 instances pickled by Python 2; these default to 'ASCII' and 'strict',
 respectively.  The *encoding* can be 'bytes' to read these 8-bit
 string instances as bytes objects.
+
+If *buffers* is not None, it should be an iterable of the out-of-band
+buffers referenced by the pickle stream.
 [clinic start generated code]*/
 
 static PyObject *
 _pickle_loads_impl(PyModuleDef *module, PyObject *data, int fix_imports,
-                   const char *encoding, const char *errors)
-/*[clinic end generated code: output=61e9cdb01e36a736 input=70605948a719feb9]*/
+                   const char *encoding, const char *errors,
+                   PyObject *buffers)
+/*[clinic end generated code: output=26822276b4a79405 input=1548d30fe96a9d55]*/
 {
     PyObject *result;
     UnpicklerObject *unpickler = _Unpickler_New();
@@ -7236,6 +7840,9 @@ _pickle_loads_impl(PyModuleDef *module, PyObject *data, int fix_imports,
     if (_Unpickler_SetInputEncoding(unpickler, encoding, errors) < 0)
         goto error;
 
+    if (_Unpickler_SetBuffers(unpickler, buffers) < 0)
+        goto error;
+
     unpickler->fix_imports = fix_imports;
 
     result = load(unpickler);
@@ -7322,6 +7929,8 @@ PyInit__pickle(void)
         return NULL;
     if (PyType_Ready(&UnpicklerMemoProxyType) < 0)
         return NULL;
+    if (PyType_Ready(&PickleBuffer_Type) < 0)
+        return NULL;
 
     /* Create the module and add the functions. */
     m = PyModule_Create(&_picklemodule);
@@ -7334,6 +7943,10 @@ PyInit__pickle(void)
     Py_INCREF(&Unpickler_Type);
     if (PyModule_AddObject(m, "Unpickler", (PyObject *)&Unpickler_Type) < 0)
         return NULL;
+    Py_INCREF(&PickleBuffer_Type);
+    if (PyModule_AddObject(m, "PickleBuffer",
+                           (PyObject *)&PickleBuffer_Type) < 0)
+        return NULL;
 
     st = _Pickle_GetState(m);
 
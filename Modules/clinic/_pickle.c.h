@@ -2,6 +2,45 @@
 preserve
 [clinic start generated code]*/
 
+PyDoc_STRVAR(_pickle_PickleBuffer_raw__doc__,
+"raw($self, /)\n"
+"--\n"
+"\n"
+"Return a memoryview of the raw memory underlying this buffer.\n"
+"\n"
+"The memoryview has format \'B\' and one dimension.  This raises\n"
+"BufferError if the buffer is not contiguous.");
+
+#define _PICKLE_PICKLEBUFFER_RAW_METHODDEF    \
+    {"raw", (PyCFunction)_pickle_PickleBuffer_raw, METH_NOARGS, _pickle_PickleBuffer_raw__doc__},
+
+static PyObject *
+_pickle_PickleBuffer_raw_impl(PickleBufferObject *self);
+
+static PyObject *
+_pickle_PickleBuffer_raw(PickleBufferObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return _pickle_PickleBuffer_raw_impl(self);
+}
+
+PyDoc_STRVAR(_pickle_PickleBuffer_release__doc__,
+"release($self, /)\n"
+"--\n"
+"\n"
+"Release the underlying buffer exposed by the PickleBuffer object.");
+
+#define _PICKLE_PICKLEBUFFER_RELEASE_METHODDEF    \
+    {"release", (PyCFunction)_pickle_PickleBuffer_release, METH_NOARGS, _pickle_PickleBuffer_release__doc__},
+
+static PyObject *
+_pickle_PickleBuffer_release_impl(PickleBufferObject *self);
+
+static PyObject *
+_pickle_PickleBuffer_release(PickleBufferObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return _pickle_PickleBuffer_release_impl(self);
+}
+
 PyDoc_STRVAR(_pickle_Pickler_clear_memo__doc__,
 "clear_memo($self, /)\n"
 "--\n"
@@ -63,13 +102,14 @@ exit:
 }
 
 PyDoc_STRVAR(_pickle_Pickler___init____doc__,
-"Pickler(file, protocol=None, fix_imports=True)\n"
+"Pickler(file, protocol=None, fix_imports=True, buffer_callback=None, *,\n"
+"        memo_limit=None)\n"
 "--\n"
 "\n"
 "This takes a binary file for writing a pickle data stream.\n"
 "\n"
 "The optional *protocol* argument tells the pickler to use the given\n"
-"protocol; supported protocols are 0, 1, 2, 3 and 4.  The default\n"
+"protocol; supported protocols are 0, 1, 2, 3, 4 and 5.  The default\n"
 "protocol is 3; a backward-incompatible protocol designed for Python 3.\n"
 "\n"
 "Specifying a negative protocol version selects the highest protocol\n"
@@ -83,26 +123,43 @@ PyDoc_STRVAR(_pickle_Pickler___init____doc__,
 "\n"
 "If *fix_imports* is True and protocol is less than 3, pickle will try\n"
 "to map the new Python 3 names to the old module names used in Python\n"
-"2, so that the pickle data stream is readable with Python 2.");
+"2, so that the pickle data stream is readable with Python 2.\n"
+"\n"
+"If *buffer_callback* is None (the default), buffer views are\n"
+"serialized into *file* as part of the pickle stream.  Otherwise, it\n"
+"is called with each PickleBuffer, and the buffer is serialized\n"
+"out-of-band if the callback returns a false value, in-band otherwise.\n"
+"It is an error if *buffer_callback* is not None and *protocol* is\n"
+"None or smaller than 5.\n"
+"\n"
+"If *memo_limit* is not None, at most *memo_limit* objects are kept in\n"
+"the memo; the objects pickled once it is full are not memoized, which\n"
+"bounds the memory used to pickle large acyclic object graphs.  The\n"
+"objects shared by several parents are then pickled several times, and\n"
+"pickling a recursive data structure fails.");
 
 static int
 _pickle_Pickler___init___impl(PicklerObject *self, PyObject *file,
-                              PyObject *protocol, int fix_imports);
+                              PyObject *protocol, int fix_imports,
+                              PyObject *buffer_callback,
+                              PyObject *memo_limit);
 
 static int
 _pickle_Pickler___init__(PyObject *self, PyObject *args, PyObject *kwargs)
 {
     int return_value = -1;
-    static char *_keywords[] = {"file", "protocol", "fix_imports", NULL};
+    static char *_keywords[] = {"file", "protocol", "fix_imports", "buffer_callback", "memo_limit", NULL};
     PyObject *file;
     PyObject *protocol = NULL;
     int fix_imports = 1;
+    PyObject *buffer_callback = Py_None;
+    PyObject *memo_limit = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|Op:Pickler", _keywords,
-        &file, &protocol, &fix_imports)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OpO$O:Pickler", _keywords,
+        &file, &protocol, &fix_imports, &buffer_callback, &memo_limit)) {
         goto exit;
     }
-    return_value = _pickle_Pickler___init___impl((PicklerObject *)self, file, protocol, fix_imports);
+    return_value = _pickle_Pickler___init___impl((PicklerObject *)self, file, protocol, fix_imports, buffer_callback, memo_limit);
 
 exit:
     return return_value;
@@ -252,7 +309,8 @@ exit:
 }
 
 PyDoc_STRVAR(_pickle_Unpickler___init____doc__,
-"Unpickler(file, *, fix_imports=True, encoding=\'ASCII\', errors=\'strict\')\n"
+"Unpickler(file, *, fix_imports=True, encoding=\'ASCII\', errors=\'strict\',\n"
+"          buffers=None)\n"
 "--\n"
 "\n"
 "This takes a binary file for reading a pickle data stream.\n"
@@ -274,28 +332,34 @@ PyDoc_STRVAR(_pickle_Unpickler___init____doc__,
 "*encoding* and *errors* tell pickle how to decode 8-bit string\n"
 "instances pickled by Python 2; these default to \'ASCII\' and \'strict\',\n"
 "respectively.  The *encoding* can be \'bytes\' to read these 8-bit\n"
-"string instances as bytes objects.");
+"string instances as bytes objects.\n"
+"\n"
+"If *buffers* is not None, it should be an iterable of buffer-enabled\n"
+"objects, consumed each time the pickle stream references an\n"
+"out-of-band buffer, in the order in which they were given to the\n"
+"*buffer_callback* of the pickler.");
 
 static int
 _pickle_Unpickler___init___impl(UnpicklerObject *self, PyObject *file,
                                 int fix_imports, const char *encoding,
-                                const char *errors);
+                                const char *errors, PyObject *buffers);
 
 static int
 _pickle_Unpickler___init__(PyObject *self, PyObject *args, PyObject *kwargs)
 {
     int return_value = -1;
-    static char *_keywords[] = {"file", "fix_imports", "encoding", "errors", NULL};
+    static char *_keywords[] = {"file", "fix_imports", "encoding", "errors", "buffers", NULL};
     PyObject *file;
     int fix_imports = 1;
     const char *encoding = "ASCII";
     const char *errors = "strict";
+    PyObject *buffers = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|$pss:Unpickler", _keywords,
-        &file, &fix_imports, &encoding, &errors)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|$pssO:Unpickler", _keywords,
+        &file, &fix_imports, &encoding, &errors, &buffers)) {
         goto exit;
     }
-    return_value = _pickle_Unpickler___init___impl((UnpicklerObject *)self, file, fix_imports, encoding, errors);
+    return_value = _pickle_Unpickler___init___impl((UnpicklerObject *)self, file, fix_imports, encoding, errors, buffers);
 
 exit:
     return return_value;
@@ -356,7 +420,8 @@ _pickle_UnpicklerMemoProxy___reduce__(UnpicklerMemoProxyObject *self, PyObject *
 }
 
 PyDoc_STRVAR(_pickle_dump__doc__,
-"dump($module, /, obj, file, protocol=None, *, fix_imports=True)\n"
+"dump($module, /, obj, file, protocol=None, *, fix_imports=True,\n"
+"     buffer_callback=None)\n"
 "--\n"
 "\n"
 "Write a pickled representation of obj to the open file object file.\n"
@@ -365,7 +430,7 @@ PyDoc_STRVAR(_pickle_dump__doc__,
 "be more efficient.\n"
 "\n"
 "The optional *protocol* argument tells the pickler to use the given\n"
-"protocol supported protocols are 0, 1, 2, 3 and 4.  The default\n"
+"protocol supported protocols are 0, 1, 2, 3, 4 and 5.  The default\n"
 "protocol is 3; a backward-incompatible protocol designed for Python 3.\n"
 "\n"
 "Specifying a negative protocol version selects the highest protocol\n"
@@ -379,43 +444,50 @@ PyDoc_STRVAR(_pickle_dump__doc__,
 "\n"
 "If *fix_imports* is True and protocol is less than 3, pickle will try\n"
 "to map the new Python 3 names to the old module names used in Python\n"
-"2, so that the pickle data stream is readable with Python 2.");
+"2, so that the pickle data stream is readable with Python 2.\n"
+"\n"
+"If *buffer_callback* is not None, it is called with each PickleBuffer\n"
+"and the buffers for which it returns a false value are serialized\n"
+"out-of-band.  This requires *protocol* 5 or higher.");
 
 #define _PICKLE_DUMP_METHODDEF    \
     {"dump", (PyCFunction)_pickle_dump, METH_VARARGS|METH_KEYWORDS, _pickle_dump__doc__},
 
 static PyObject *
 _pickle_dump_impl(PyModuleDef *module, PyObject *obj, PyObject *file,
-                  PyObject *protocol, int fix_imports);
+                  PyObject *protocol, int fix_imports,
+                  PyObject *buffer_callback);
 
 static PyObject *
 _pickle_dump(PyModuleDef *module, PyObject *args, PyObject *kwargs)
 {
     PyObject *return_value = NULL;
-    static char *_keywords[] = {"obj", "file", "protocol", "fix_imports", NULL};
+    static char *_keywords[] = {"obj", "file", "protocol", "fix_imports", "buffer_callback", NULL};
     PyObject *obj;
     PyObject *file;
     PyObject *protocol = NULL;
     int fix_imports = 1;
+    PyObject *buffer_callback = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O$p:dump", _keywords,
-        &obj, &file, &protocol, &fix_imports)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O$pO:dump", _keywords,
+        &obj, &file, &protocol, &fix_imports, &buffer_callback)) {
         goto exit;
     }
-    return_value = _pickle_dump_impl(module, obj, file, protocol, fix_imports);
+    return_value = _pickle_dump_impl(module, obj, file, protocol, fix_imports, buffer_callback);
 
 exit:
     return return_value;
 }
 
 PyDoc_STRVAR(_pickle_dumps__doc__,
-"dumps($module, /, obj, protocol=None, *, fix_imports=True)\n"
+"dumps($module, /, obj, protocol=None, *, fix_imports=True,\n"
+"      buffer_callback=None)\n"
 "--\n"
 "\n"
 "Return the pickled representation of the object as a bytes object.\n"
 "\n"
 "The optional *protocol* argument tells the pickler to use the given\n"
-"protocol; supported protocols are 0, 1, 2, 3 and 4.  The default\n"
+"protocol; supported protocols are 0, 1, 2, 3, 4 and 5.  The default\n"
 "protocol is 3; a backward-incompatible protocol designed for Python 3.\n"
 "\n"
 "Specifying a negative protocol version selects the highest protocol\n"
@@ -424,29 +496,34 @@ PyDoc_STRVAR(_pickle_dumps__doc__,
 "\n"
 "If *fix_imports* is True and *protocol* is less than 3, pickle will\n"
 "try to map the new Python 3 names to the old module names used in\n"
-"Python 2, so that the pickle data stream is readable with Python 2.");
+"Python 2, so that the pickle data stream is readable with Python 2.\n"
+"\n"
+"If *buffer_callback* is not None, it is called with each PickleBuffer\n"
+"and the buffers for which it returns a false value are serialized\n"
+"out-of-band.  This requires *protocol* 5 or higher.");
 
 #define _PICKLE_DUMPS_METHODDEF    \
     {"dumps", (PyCFunction)_pickle_dumps, METH_VARARGS|METH_KEYWORDS, _pickle_dumps__doc__},
 
 static PyObject *
 _pickle_dumps_impl(PyModuleDef *module, PyObject *obj, PyObject *protocol,
-                   int fix_imports);
+                   int fix_imports, PyObject *buffer_callback);
 
 static PyObject *
 _pickle_dumps(PyModuleDef *module, PyObject *args, PyObject *kwargs)
 {
     PyObject *return_value = NULL;
-    static char *_keywords[] = {"obj", "protocol", "fix_imports", NULL};
+    static char *_keywords[] = {"obj", "protocol", "fix_imports", "buffer_callback", NULL};
     PyObject *obj;
     PyObject *protocol = NULL;
     int fix_imports = 1;
+    PyObject *buffer_callback = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|O$p:dumps", _keywords,
-        &obj, &protocol, &fix_imports)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|O$pO:dumps", _keywords,
+        &obj, &protocol, &fix_imports, &buffer_callback)) {
         goto exit;
     }
-    return_value = _pickle_dumps_impl(module, obj, protocol, fix_imports);
+    return_value = _pickle_dumps_impl(module, obj, protocol, fix_imports, buffer_callback);
 
 exit:
     return return_value;
@@ -454,7 +531,7 @@ exit:
 
 PyDoc_STRVAR(_pickle_load__doc__,
 "load($module, /, file, *, fix_imports=True, encoding=\'ASCII\',\n"
-"     errors=\'strict\')\n"
+"     errors=\'strict\', buffers=None)\n"
 "--\n"
 "\n"
 "Read and return an object from the pickle data stored in a file.\n"
@@ -479,30 +556,35 @@ PyDoc_STRVAR(_pickle_load__doc__,
 "*encoding* and *errors* tell pickle how to decode 8-bit string\n"
 "instances pickled by Python 2; these default to \'ASCII\' and \'strict\',\n"
 "respectively.  The *encoding* can be \'bytes\' to read these 8-bit\n"
-"string instances as bytes objects.");
+"string instances as bytes objects.\n"
+"\n"
+"If *buffers* is not None, it should be an iterable of the out-of-band\n"
+"buffers referenced by the pickle stream.");
 
 #define _PICKLE_LOAD_METHODDEF    \
     {"load", (PyCFunction)_pickle_load, METH_VARARGS|METH_KEYWORDS, _pickle_load__doc__},
 
 static PyObject *
 _pickle_load_impl(PyModuleDef *module, PyObject *file, int fix_imports,
-                  const char *encoding, const char *errors);
+                  const char *encoding, const char *errors,
+                  PyObject *buffers);
 
 static PyObject *
 _pickle_load(PyModuleDef *module, PyObject *args, PyObject *kwargs)
 {
     PyObject *return_value = NULL;
-    static char *_keywords[] = {"file", "fix_imports", "encoding", "errors", NULL};
+    static char *_keywords[] = {"file", "fix_imports", "encoding", "errors", "buffers", NULL};
     PyObject *file;
     int fix_imports = 1;
     const char *encoding = "ASCII";
     const char *errors = "strict";
+    PyObject *buffers = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|$pss:load", _keywords,
-        &file, &fix_imports, &encoding, &errors)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|$pssO:load", _keywords,
+        &file, &fix_imports, &encoding, &errors, &buffers)) {
         goto exit;
     }
-    return_value = _pickle_load_impl(module, file, fix_imports, encoding, errors);
+    return_value = _pickle_load_impl(module, file, fix_imports, encoding, errors, buffers);
 
 exit:
     return return_value;
@@ -510,7 +592,7 @@ exit:
 
 PyDoc_STRVAR(_pickle_loads__doc__,
 "loads($module, /, data, *, fix_imports=True, encoding=\'ASCII\',\n"
-"      errors=\'strict\')\n"
+"      errors=\'strict\', buffers=None)\n"
 "--\n"
 "\n"
 "Read and return an object from the given pickle data.\n"
@@ -526,32 +608,37 @@ PyDoc_STRVAR(_pickle_loads__doc__,
 "*encoding* and *errors* tell pickle how to decode 8-bit string\n"
 "instances pickled by Python 2; these default to \'ASCII\' and \'strict\',\n"
 "respectively.  The *encoding* can be \'bytes\' to read these 8-bit\n"
-"string instances as bytes objects.");
+"string instances as bytes objects.\n"
+"\n"
+"If *buffers* is not None, it should be an iterable of the out-of-band\n"
+"buffers referenced by the pickle stream.");
 
 #define _PICKLE_LOADS_METHODDEF    \
     {"loads", (PyCFunction)_pickle_loads, METH_VARARGS|METH_KEYWORDS, _pickle_loads__doc__},
 
 static PyObject *
 _pickle_loads_impl(PyModuleDef *module, PyObject *data, int fix_imports,
-                   const char *encoding, const char *errors);
+                   const char *encoding, const char *errors,
+                   PyObject *buffers);
 
 static PyObject *
 _pickle_loads(PyModuleDef *module, PyObject *args, PyObject *kwargs)
 {
     PyObject *return_value = NULL;
-    static char *_keywords[] = {"data", "fix_imports", "encoding", "errors", NULL};
+    static char *_keywords[] = {"data", "fix_imports", "encoding", "errors", "buffers", NULL};
     PyObject *data;
     int fix_imports = 1;
     const char *encoding = "ASCII";
     const char *errors = "strict";
+    PyObject *buffers = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|$pss:loads", _keywords,
-        &data, &fix_imports, &encoding, &errors)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|$pssO:loads", _keywords,
+        &data, &fix_imports, &encoding, &errors, &buffers)) {
         goto exit;
     }
-    return_value = _pickle_loads_impl(module, data, fix_imports, encoding, errors);
+    return_value = _pickle_loads_impl(module, data, fix_imports, encoding, errors, buffers);
 
 exit:
     return return_value;
 }
-/*[clinic end generated code: output=5e972f339d197760 input=a9049054013a1b77]*/
+/*[clinic end generated code: output=17215b0d67ead3a0 input=a9049054013a1b77]*/
@@ -270,6 +270,89 @@ exit:
     return return_value;
 }
 
+PyDoc_STRVAR(zlib_Decompress_decompress_block__doc__,
+"decompress_block($self, data, max_length=0, /)\n"
+"--\n"
+"\n"
+"Like decompress(), but stop at the end of a deflate block.\n"
+"\n"
+"  data\n"
+"    The binary data to decompress.\n"
+"  max_length\n"
+"    The maximum allowable length of the decompressed data.\n"
+"\n"
+"The input data following the end of the block is stored in the\n"
+"unconsumed_tail attribute.  The block_bits attribute tells whether\n"
+"the decompression stopped between two blocks.");
+
+#define ZLIB_DECOMPRESS_DECOMPRESS_BLOCK_METHODDEF    \
+    {"decompress_block", (PyCFunction)zlib_Decompress_decompress_block, METH_VARARGS, zlib_Decompress_decompress_block__doc__},
+
+static PyObject *
+zlib_Decompress_decompress_block_impl(compobject *self, Py_buffer *data,
+                                      unsigned int max_length);
+
+static PyObject *
+zlib_Decompress_decompress_block(compobject *self, PyObject *args)
+{
+    PyObject *return_value = NULL;
+    Py_buffer data = {NULL, NULL};
+    unsigned int max_length = 0;
+
+    if (!PyArg_ParseTuple(args, "y*|O&:decompress_block",
+        &data, capped_uint_converter, &max_length)) {
+        goto exit;
+    }
+    return_value = zlib_Decompress_decompress_block_impl(self, &data, max_length);
+
+exit:
+    /* Cleanup for data */
+    if (data.obj) {
+       PyBuffer_Release(&data);
+    }
+
+    return return_value;
+}
+
+PyDoc_STRVAR(zlib_Decompress_prime__doc__,
+"prime($self, bits, value, /)\n"
+"--\n"
+"\n"
+"Insert bits in the input stream of the decompressor.\n"
+"\n"
+"  bits\n"
+"    The number of bits to insert, from 0 to 16.\n"
+"  value\n"
+"    The bits to insert, in the low-order bits of the integer.\n"
+"\n"
+"This is used to resume the decompression of a raw deflate stream at a\n"
+"block boundary which is not on a byte boundary: the decompressor is\n"
+"created with the 32 KiB of data preceding the boundary as zdict, and is\n"
+"primed with the bits of the block in the byte containing the boundary.");
+
+#define ZLIB_DECOMPRESS_PRIME_METHODDEF    \
+    {"prime", (PyCFunction)zlib_Decompress_prime, METH_VARARGS, zlib_Decompress_prime__doc__},
+
+static PyObject *
+zlib_Decompress_prime_impl(compobject *self, int bits, int value);
+
+static PyObject *
+zlib_Decompress_prime(compobject *self, PyObject *args)
+{
+    PyObject *return_value = NULL;
+    int bits;
+    int value;
+
+    if (!PyArg_ParseTuple(args, "ii:prime",
+        &bits, &value)) {
+        goto exit;
+    }
+    return_value = zlib_Decompress_prime_impl(self, bits, value);
+
+exit:
+    return return_value;
+}
+
 PyDoc_STRVAR(zlib_Compress_flush__doc__,
 "flush($self, mode=zlib.Z_FINISH, /)\n"
 "--\n"
@@ -460,4 +543,4 @@ exit:
 #ifndef ZLIB_COMPRESS_COPY_METHODDEF
     #define ZLIB_COMPRESS_COPY_METHODDEF
 #endif /* !defined(ZLIB_COMPRESS_COPY_METHODDEF) */
-/*[clinic end generated code: output=9bd8a093baa653b2 input=a9049054013a1b77]*/
+/*[clinic end generated code: output=bfd2f587bf9aba1d input=a9049054013a1b77]*/
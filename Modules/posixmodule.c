@@ -8405,6 +8405,75 @@ done:
 #endif /* HAVE_SENDFILE */
 
 
+#ifdef HAVE_COPY_FILE_RANGE
+/*[clinic input]
+os.copy_file_range
+
+    src: int
+        Source file descriptor.
+    dst: int
+        Destination file descriptor.
+    count: Py_ssize_t
+        Number of bytes to copy.
+    offset_src: object = None
+        Starting offset in src.
+    offset_dst: object = None
+        Starting offset in dst.
+
+Copy count bytes from one file descriptor to another.
+
+If offset_src is None, then src is read from the current position;
+respectively for offset_dst.  The copy is done in the kernel, without
+going through user space.
+[clinic start generated code]*/
+
+static PyObject *
+os_copy_file_range_impl(PyModuleDef *module, int src, int dst,
+                        Py_ssize_t count, PyObject *offset_src,
+                        PyObject *offset_dst)
+/*[clinic end generated code: output=683455717f220eee input=8e132581dcaa8183]*/
+{
+    Py_off_t offset_src_val, offset_dst_val;
+    Py_off_t *p_offset_src = NULL;
+    Py_off_t *p_offset_dst = NULL;
+    Py_ssize_t ret;
+    int async_err = 0;
+    /* The flags argument is provided to allow
+     * for future extensions and currently must be 0. */
+    unsigned int flags = 0;
+
+    if (count < 0) {
+        PyErr_SetString(PyExc_ValueError, "negative value not allowed");
+        return NULL;
+    }
+
+    if (offset_src != Py_None) {
+        if (!Py_off_t_converter(offset_src, &offset_src_val))
+            return NULL;
+        p_offset_src = &offset_src_val;
+    }
+
+    if (offset_dst != Py_None) {
+        if (!Py_off_t_converter(offset_dst, &offset_dst_val))
+            return NULL;
+        p_offset_dst = &offset_dst_val;
+    }
+
+    do {
+        Py_BEGIN_ALLOW_THREADS
+        ret = copy_file_range(src, p_offset_src, dst, p_offset_dst,
+                              (size_t)count, flags);
+        Py_END_ALLOW_THREADS
+    } while (ret < 0 && errno == EINTR && !(async_err = PyErr_CheckSignals()));
+
+    if (ret < 0)
+        return (!async_err) ? posix_error() : NULL;
+
+    return PyLong_FromSsize_t(ret);
+}
+#endif /* HAVE_COPY_FILE_RANGE */
+
+
 /*[clinic input]
 os.fstat
 
@@ -12477,6 +12546,7 @@ static PyMethodDef posix_methods[] = {
     {"sendfile",        (PyCFunction)posix_sendfile, METH_VARARGS | METH_KEYWORDS,
                             posix_sendfile__doc__},
 #endif
+    OS_COPY_FILE_RANGE_METHODDEF
     OS_FSTAT_METHODDEF
     OS_ISATTY_METHODDEF
     OS_PIPE_METHODDEF
@@ -535,6 +535,7 @@ zlib_decompressobj_impl(PyModuleDef *module, int wbits, PyObject *zdict)
     self->zst.zfree = PyZlib_Free;
     self->zst.next_in = NULL;
     self->zst.avail_in = 0;
+    self->zst.data_type = 0;
     if (zdict != NULL) {
         Py_INCREF(zdict);
         self->zdict = zdict;
@@ -730,28 +731,12 @@ save_unconsumed_input(compobject *self, int err)
     return 0;
 }
 
-/*[clinic input]
-zlib.Decompress.decompress
-
-    data: Py_buffer
-        The binary data to decompress.
-    max_length: capped_uint = 0
-        The maximum allowable length of the decompressed data.
-        Unconsumed input data will be stored in
-        the unconsumed_tail attribute.
-    /
-
-Return a bytes object containing the decompressed version of the data.
-
-After calling this function, some of the input data may still be stored in
-internal buffers for later processing.
-Call the flush() method to clear these buffers.
-[clinic start generated code]*/
-
+/* Helper for Decompress.decompress() and Decompress.decompress_block().
+   flush is passed to inflate(): Z_SYNC_FLUSH, or Z_BLOCK to stop at the end
+   of a deflate block. */
 static PyObject *
-zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
-                                unsigned int max_length)
-/*[clinic end generated code: output=b82e2a2c19f5fe7b input=68b6508ab07c2cf0]*/
+decompress_data(compobject *self, Py_buffer *data, unsigned int max_length,
+                int flush)
 {
     int err;
     unsigned int old_length, length = DEF_BUF_SIZE;
@@ -779,7 +764,7 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
     self->zst.next_out = (unsigned char *)PyBytes_AS_STRING(RetVal);
 
     Py_BEGIN_ALLOW_THREADS
-    err = inflate(&(self->zst), Z_SYNC_FLUSH);
+    err = inflate(&(self->zst), flush);
     Py_END_ALLOW_THREADS
 
     if (err == Z_NEED_DICT && self->zdict != NULL) {
@@ -791,7 +776,7 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
 
         /* Repeat the call to inflate. */
         Py_BEGIN_ALLOW_THREADS
-        err = inflate(&(self->zst), Z_SYNC_FLUSH);
+        err = inflate(&(self->zst), flush);
         Py_END_ALLOW_THREADS
     }
 
@@ -804,6 +789,9 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
         */
         if (max_length && length >= max_length)
             break;
+        /* With Z_BLOCK, stop at the end of a block. */
+        if (flush == Z_BLOCK && (self->zst.data_type & 128))
+            break;
 
         /* otherwise, ... */
         old_length = length;
@@ -820,7 +808,7 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
         self->zst.avail_out = length - old_length;
 
         Py_BEGIN_ALLOW_THREADS
-        err = inflate(&(self->zst), Z_SYNC_FLUSH);
+        err = inflate(&(self->zst), flush);
         Py_END_ALLOW_THREADS
     }
 
@@ -854,6 +842,94 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
     return RetVal;
 }
 
+/*[clinic input]
+zlib.Decompress.decompress
+
+    data: Py_buffer
+        The binary data to decompress.
+    max_length: capped_uint = 0
+        The maximum allowable length of the decompressed data.
+        Unconsumed input data will be stored in
+        the unconsumed_tail attribute.
+    /
+
+Return a bytes object containing the decompressed version of the data.
+
+After calling this function, some of the input data may still be stored in
+internal buffers for later processing.
+Call the flush() method to clear these buffers.
+[clinic start generated code]*/
+
+static PyObject *
+zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
+                                unsigned int max_length)
+/*[clinic end generated code: output=b82e2a2c19f5fe7b input=68b6508ab07c2cf0]*/
+{
+    return decompress_data(self, data, max_length, Z_SYNC_FLUSH);
+}
+
+/*[clinic input]
+zlib.Decompress.decompress_block
+
+    data: Py_buffer
+        The binary data to decompress.
+    max_length: capped_uint = 0
+        The maximum allowable length of the decompressed data.
+    /
+
+Like decompress(), but stop at the end of a deflate block.
+
+The input data following the end of the block is stored in the
+unconsumed_tail attribute.  The block_bits attribute tells whether
+the decompression stopped between two blocks.
+[clinic start generated code]*/
+
+static PyObject *
+zlib_Decompress_decompress_block_impl(compobject *self, Py_buffer *data,
+                                      unsigned int max_length)
+/*[clinic end generated code: output=990b948d367c2b76 input=605c48c50003506f]*/
+{
+    return decompress_data(self, data, max_length, Z_BLOCK);
+}
+
+/*[clinic input]
+zlib.Decompress.prime
+
+    bits: int
+        The number of bits to insert, from 0 to 16.
+    value: int
+        The bits to insert, in the low-order bits of the integer.
+    /
+
+Insert bits in the input stream of the decompressor.
+
+This is used to resume the decompression of a raw deflate stream at a
+block boundary which is not on a byte boundary: the decompressor is
+created with the 32 KiB of data preceding the boundary as zdict, and is
+primed with the bits of the block in the byte containing the boundary.
+[clinic start generated code]*/
+
+static PyObject *
+zlib_Decompress_prime_impl(compobject *self, int bits, int value)
+/*[clinic end generated code: output=667944a4574c40d3 input=eb6c6aee152f0211]*/
+{
+    int err;
+
+    if (bits < 0 || bits > 16) {
+        PyErr_SetString(PyExc_ValueError,
+                        "bits must be between 0 and 16");
+        return NULL;
+    }
+    ENTER_ZLIB(self);
+    err = inflatePrime(&(self->zst), bits, value & ((1 << bits) - 1));
+    LEAVE_ZLIB(self);
+    if (err != Z_OK) {
+        zlib_error(self->zst, err, "while priming the decompressor");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
 /*[clinic input]
 zlib.Compress.flush
 
@@ -1176,6 +1252,8 @@ static PyMethodDef comp_methods[] =
 static PyMethodDef Decomp_methods[] =
 {
     ZLIB_DECOMPRESS_DECOMPRESS_METHODDEF
+    ZLIB_DECOMPRESS_DECOMPRESS_BLOCK_METHODDEF
+    ZLIB_DECOMPRESS_PRIME_METHODDEF
     ZLIB_DECOMPRESS_FLUSH_METHODDEF
 #ifdef HAVE_ZLIB_COPY
     ZLIB_DECOMPRESS_COPY_METHODDEF
@@ -1191,6 +1269,26 @@ static PyMemberDef Decomp_members[] = {
     {NULL},
 };
 
+static PyObject *
+Decomp_get_block_bits(compobject *self, void *closure)
+{
+    int data_type = self->zst.data_type;
+
+    /* Bit 7 of data_type is set when inflate() stopped at the end of a
+       block or of the header, bit 6 when the last block was reached, and
+       bits 0-2 hold the number of unused bits of the last input byte. */
+    if (!(data_type & 128) || (data_type & 64))
+        Py_RETURN_NONE;
+    return PyLong_FromLong(data_type & 7);
+}
+
+static PyGetSetDef Decomp_getsets[] = {
+    {"block_bits", (getter)Decomp_get_block_bits, NULL,
+     "Number of unused bits in the last input byte consumed, if the "
+     "decompression\nstopped between two deflate blocks, else None."},
+    {NULL},
+};
+
 /*[clinic input]
 zlib.adler32
 
@@ -1344,6 +1442,7 @@ static PyTypeObject Decomptype = {
     0,                              /*tp_iternext*/
     Decomp_methods,                 /*tp_methods*/
     Decomp_members,                 /*tp_members*/
+    Decomp_getsets,                 /*tp_getset*/
 };
 
 PyDoc_STRVAR(zlib_module_documentation,
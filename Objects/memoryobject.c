@@ -2175,6 +2175,21 @@ memory_hex(PyMemoryViewObject *self, PyObject *dummy)
     return ret;
 }
 
+static PyObject *
+memory_toreadonly(PyMemoryViewObject *self, PyObject *noargs)
+{
+    PyMemoryViewObject *mv;
+
+    CHECK_RELEASED(self);
+
+    mv = (PyMemoryViewObject *)mbuf_add_view(self->mbuf, &self->view);
+    if (mv == NULL)
+        return NULL;
+
+    mv->view.readonly = 1;
+    return (PyObject *)mv;
+}
+
 static PyObject *
 memory_repr(PyMemoryViewObject *self)
 {
@@ -3083,6 +3098,10 @@ PyDoc_STRVAR(memory_hex_doc,
 "hex($self, /)\n--\n\
 \n\
 Return the data in the buffer as a string of hexadecimal numbers.");
+PyDoc_STRVAR(memory_toreadonly_doc,
+"toreadonly($self, /)\n--\n\
+\n\
+Return a readonly version of the memoryview.");
 PyDoc_STRVAR(memory_tolist_doc,
 "tolist($self, /)\n--\n\
 \n\
@@ -3097,6 +3116,7 @@ static PyMethodDef memory_methods[] = {
     {"tobytes",     (PyCFunction)memory_tobytes, METH_NOARGS, memory_tobytes_doc},
     {"hex",         (PyCFunction)memory_hex, METH_NOARGS, memory_hex_doc},
     {"tolist",      (PyCFunction)memory_tolist, METH_NOARGS, memory_tolist_doc},
+    {"toreadonly",  (PyCFunction)memory_toreadonly, METH_NOARGS, memory_toreadonly_doc},
     {"cast",        (PyCFunction)memory_cast, METH_VARARGS|METH_KEYWORDS, memory_cast_doc},
     {"__enter__",   memory_enter, METH_NOARGS, NULL},
     {"__exit__",    memory_exit, METH_VARARGS, NULL},
@@ -0,0 +1,70 @@
+"""Buffer transport benchmark for concurrent.futures.ProcessPoolExecutor.
+
+Sends bytes objects of increasing sizes to the workers, which send them
+back, once with the arguments and results pickled through pipes and once
+with shared memory, and prints the round trips per second of each to
+locate the size from which shared memory pays off.
+
+Usage: bufferbench.py [-w WORKERS] [-n CALLS] [-m MAX_SIZE]
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def echo(data):
+    return data
+
+
+def bench(executor, size, calls):
+    data = b'x' * size
+    start = time.perf_counter()
+    futures = [executor.submit(echo, data) for _ in range(calls)]
+    for future in futures:
+        future.result()
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-w', '--workers', type=int, default=2,
+                        help='number of worker processes (default: 2)')
+    parser.add_argument('-n', '--calls', type=int, default=200,
+                        help='number of calls per size (default: 200)')
+    parser.add_argument('-m', '--max-size', type=int, default=16,
+                        help='largest buffer size in MiB (default: 16)')
+    args = parser.parse_args()
+
+    max_size = args.max_size * 1024 ** 2
+    arena_size = 2 * (args.workers + 1) * max_size
+    pickled = ProcessPoolExecutor(args.workers)
+    shared = ProcessPoolExecutor(args.workers, shared_memory_size=arena_size,
+                                 shared_memory_threshold=1)
+    try:
+        # Start the workers
+        bench(pickled, 1, args.workers)
+        bench(shared, 1, args.workers)
+
+        print('%10s %12s %12s' % ('size', 'pickled/s', 'shared/s'))
+        crossover = None
+        size = 1024
+        while size <= max_size:
+            calls = max(10, min(args.calls, args.calls * 1024 ** 2 // size))
+            pickled_rate = bench(pickled, size, calls)
+            shared_rate = bench(shared, size, calls)
+            if crossover is None and shared_rate > pickled_rate:
+                crossover = size
+            print('%10d %12.1f %12.1f' % (size, pickled_rate, shared_rate))
+            size *= 4
+    finally:
+        pickled.shutdown()
+        shared.shutdown()
+    if crossover is None:
+        print('shared memory never won')
+    else:
+        print('shared memory wins from %d bytes' % crossover)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Scheduling benchmark for multiprocessing.Pool.map().
+
+Maps a function spinning for a given time over tasks whose costs are
+either uniform or heavy-tailed (Pareto-distributed, with the same mean),
+with a chunksize of 1, the default chunksize and chunksize='auto', and
+prints the wall-clock time of each against the ideal time (the total cost
+divided by the number of workers).
+
+Usage: poolbench.py [-w WORKERS] [-n TASKS] [-c MEAN_COST] [-a ALPHA]
+"""
+
+import argparse
+import multiprocessing
+import random
+import time
+
+
+def spin(cost):
+    deadline = time.perf_counter() + cost
+    while time.perf_counter() < deadline:
+        pass
+    return cost
+
+
+def uniform_costs(tasks, mean, alpha):
+    return [mean] * tasks
+
+
+def pareto_costs(tasks, mean, alpha):
+    rng = random.Random(0)
+    costs = [rng.paretovariate(alpha) for _ in range(tasks)]
+    scale = mean * tasks / sum(costs)
+    return [cost * scale for cost in costs]
+
+
+DISTRIBUTIONS = [
+    ('uniform', uniform_costs),
+    ('heavy-tailed', pareto_costs),
+]
+
+CHUNKSIZES = [1, None, 'auto']
+
+
+def bench(pool, costs, chunksize):
+    start = time.perf_counter()
+    pool.map(spin, costs, chunksize=chunksize)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-w', '--workers', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='number of worker processes '
+                             '(default: the number of CPUs)')
+    parser.add_argument('-n', '--tasks', type=int, default=20000,
+                        help='number of tasks (default: 20000)')
+    parser.add_argument('-c', '--mean-cost', type=float, default=100,
+                        help='mean cost of a task in microseconds '
+                             '(default: 100)')
+    parser.add_argument('-a', '--alpha', type=float, default=1.2,
+                        help='shape of the Pareto distribution, the lower '
+                             'the heavier its tail (default: 1.2)')
+    args = parser.parse_args()
+
+    mean = args.mean_cost / 1e6
+    with multiprocessing.Pool(args.workers) as pool:
+        # Start the workers
+        pool.map(spin, [0] * args.workers, chunksize=1)
+
+        print('%-14s %12s %12s %12s %12s' % (
+            ('costs', 'ideal') + tuple('chunks=%s' % c for c in CHUNKSIZES)))
+        for name, distribution in DISTRIBUTIONS:
+            costs = distribution(args.tasks, mean, args.alpha)
+            ideal = max(sum(costs) / args.workers, max(costs))
+            timings = [bench(pool, costs, chunksize)
+                       for chunksize in CHUNKSIZES]
+            print('%-14s %11.3fs' % (name, ideal) +
+                  ''.join(' %11.3fs' % t for t in timings))
+
+
+if __name__ == '__main__':
+    main()
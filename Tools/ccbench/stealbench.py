@@ -0,0 +1,79 @@
+"""Submission benchmark for the thread pool executors.
+
+Runs the same workloads on ThreadPoolExecutor and on
+WorkStealingThreadPoolExecutor and prints the calls per second of each:
+
+- flat: the main thread submits all the calls;
+- nested: each call submits two more calls, down to a given depth, so
+  that most calls are submitted by the workers themselves.
+
+Usage: stealbench.py [-w WORKERS] [-n CALLS] [-d DEPTH]
+"""
+
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import (ThreadPoolExecutor,
+                                WorkStealingThreadPoolExecutor)
+
+
+EXECUTORS = [ThreadPoolExecutor, WorkStealingThreadPoolExecutor]
+
+
+def noop():
+    pass
+
+
+def flat(executor, calls, depth):
+    start = time.perf_counter()
+    futures = [executor.submit(noop) for _ in range(calls)]
+    for future in futures:
+        future.result()
+    return calls / (time.perf_counter() - start)
+
+
+def nested(executor, calls, depth):
+    leaves = 2 ** depth
+    counter = itertools.count(1)
+    done = threading.Event()
+
+    def node(depth):
+        if depth:
+            executor.submit(node, depth - 1)
+            executor.submit(node, depth - 1)
+        elif next(counter) == leaves:
+            done.set()
+
+    start = time.perf_counter()
+    executor.submit(node, depth)
+    done.wait()
+    return (2 * leaves - 1) / (time.perf_counter() - start)
+
+
+WORKLOADS = [flat, nested]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                        help='number of worker threads (default: 4)')
+    parser.add_argument('-n', '--calls', type=int, default=100000,
+                        help='number of flat calls (default: 100000)')
+    parser.add_argument('-d', '--depth', type=int, default=16,
+                        help='depth of the nested calls (default: 16)')
+    args = parser.parse_args()
+
+    print('%-8s' % 'workload' +
+          ''.join(' %32s' % cls.__name__ for cls in EXECUTORS))
+    for workload in WORKLOADS:
+        rates = []
+        for cls in EXECUTORS:
+            with cls(args.workers) as executor:
+                rates.append(workload(executor, args.calls, args.depth))
+        print('%-8s' % workload.__name__ +
+              ''.join(' %25.0f calls/s' % rate for rate in rates))
+
+
+if __name__ == '__main__':
+    main()
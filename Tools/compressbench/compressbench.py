@@ -0,0 +1,126 @@
+"""Throughput benchmark of the gzip, bz2 and lzma writers with threads.
+
+Compresses log-like data (or the contents of a file) into memory with
+gzip.GzipFile, bz2.BZ2File and lzma.LZMAFile, at several compression
+levels and numbers of threads, and prints the throughput in MB/s of
+uncompressed data and the compression ratio.  With more than one thread,
+the data is compressed by blocks in a pool of threads; the speedup is
+bounded by the number of CPUs.
+
+Usage: compressbench.py [-s SIZE] [-f FILE] [-t THREADS ...] [-m MODULE ...]
+"""
+
+import argparse
+import bz2
+import gzip
+import io
+import lzma
+import os
+import random
+import time
+
+
+LEVELS = {
+    'gzip': [1, 6, 9],
+    'bz2': [1, 9],
+    'lzma': [0, 6],
+}
+
+
+def gzip_writer(f, level, threads):
+    return gzip.GzipFile(fileobj=f, mode='wb', compresslevel=level,
+                         threads=threads)
+
+
+def bz2_writer(f, level, threads):
+    return bz2.BZ2File(f, 'wb', compresslevel=level, threads=threads)
+
+
+def lzma_writer(f, level, threads):
+    return lzma.LZMAFile(f, 'wb', preset=level, threads=threads)
+
+
+WRITERS = {
+    'gzip': gzip_writer,
+    'bz2': bz2_writer,
+    'lzma': lzma_writer,
+}
+
+
+def make_data(size):
+    rng = random.Random(42)
+    levels = ['DEBUG', 'INFO', 'INFO', 'INFO', 'WARNING', 'ERROR']
+    paths = ['/api/users', '/api/orders', '/static/app.js', '/health',
+             '/api/orders/%d/items', '/login']
+    lines = []
+    total = 0
+    t = 1467000000.0
+    while total < size:
+        t += rng.expovariate(50.0)
+        line = ('%s %s [%s] GET %s %d %d bytes in %.3f ms from 10.%d.%d.%d\n'
+                % (time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(t)),
+                   rng.choice(levels), rng.randrange(1, 64),
+                   rng.choice(paths).replace('%d', str(rng.randrange(10**6))),
+                   rng.choice([200, 200, 200, 304, 404, 500]),
+                   rng.randrange(100, 100000), rng.expovariate(0.1),
+                   rng.randrange(256), rng.randrange(256),
+                   rng.randrange(256))).encode('ascii')
+        lines.append(line)
+        total += len(line)
+    return b''.join(lines)[:size]
+
+
+def bench(writer, data, level, threads, chunk_size=64 * 1024):
+    f = io.BytesIO()
+    start = time.perf_counter()
+    with writer(f, level, threads) as w:
+        for pos in range(0, len(data), chunk_size):
+            w.write(data[pos:pos + chunk_size])
+    elapsed = time.perf_counter() - start
+    return elapsed, len(f.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-s', '--size', type=float, default=32,
+                        help='size of the generated data in MB (default: 32)')
+    parser.add_argument('-f', '--file',
+                        help='compress the contents of FILE instead')
+    parser.add_argument('-t', '--threads', type=int, nargs='+',
+                        help='numbers of threads (default: 1 2 4 ... up to '
+                             'the number of CPUs)')
+    parser.add_argument('-m', '--modules', nargs='+', choices=sorted(WRITERS),
+                        default=['gzip', 'bz2', 'lzma'],
+                        help='modules to benchmark (default: all)')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'rb') as f:
+            data = f.read()
+    else:
+        data = make_data(int(args.size * 1e6))
+    threads = args.threads
+    if threads is None:
+        ncpu = os.cpu_count() or 1
+        threads = [1]
+        while threads[-1] * 2 < ncpu:
+            threads.append(threads[-1] * 2)
+        if ncpu > 1:
+            threads.append(ncpu)
+
+    print('%.1f MB of data, %s CPUs' % (len(data) / 1e6, os.cpu_count()))
+    for name in args.modules:
+        for level in LEVELS[name]:
+            base = None
+            for n in threads:
+                elapsed, size = bench(WRITERS[name], data, level, n)
+                if base is None:
+                    base = elapsed
+                print('%-4s level %d, %2d threads: %8.1f MB/s  '
+                      'ratio %5.2f  speedup %.2fx'
+                      % (name, level, n, len(data) / elapsed / 1e6,
+                         len(data) / size, base / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Load benchmark for csv.binary_reader() and csv.read_columns().
+
+Writes a CSV file of integer, float and string columns, then loads a
+projection of its numeric columns into arrays:
+
+- loop: csv.reader() over a text file, converting and appending the
+  fields in Python, row by row;
+- converters: csv.binary_reader() with the columns and converters
+  arguments, appending the converted fields in Python;
+- columns: csv.read_columns(), which builds the arrays batch by batch.
+
+and prints the rows per second of each.
+
+Usage: columnbench.py [-n ROWS] [-c COLUMNS] [-d DIRECTORY]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+from array import array
+
+
+def write_file(path, rows, columns):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        for i in range(rows):
+            row = []
+            for j in range(columns):
+                if j % 3 == 0:
+                    row.append(i * j)
+                elif j % 3 == 1:
+                    row.append(i / (j + 1))
+                else:
+                    row.append('name%d' % i)
+            writer.writerow(row)
+
+
+def selected(columns):
+    # The integer and float columns, but not the strings
+    return [j for j in range(columns) if j % 3 != 2]
+
+
+def typecode(j):
+    return 'q' if j % 3 == 0 else 'd'
+
+
+def loop(path, columns):
+    selection = selected(columns)
+    converters = [int if typecode(j) == 'q' else float for j in selection]
+    arrays = [array(typecode(j)) for j in selection]
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            for j, convert, a in zip(selection, converters, arrays):
+                a.append(convert(row[j]))
+    return arrays
+
+
+def converters(path, columns):
+    selection = selected(columns)
+    arrays = [array(typecode(j)) for j in selection]
+    appends = [a.append for a in arrays]
+    with open(path, 'rb') as f:
+        reader = csv.binary_reader(
+            f, columns=selection,
+            converters=[int if typecode(j) == 'q' else float
+                        for j in selection])
+        for row in reader:
+            for append, value in zip(appends, row):
+                append(value)
+    return arrays
+
+
+def columns(path, columns):
+    selection = selected(columns)
+    arrays = [array(typecode(j)) for j in selection]
+    with open(path, 'rb') as f:
+        for batch in csv.read_columns(f, [typecode(j) for j in selection],
+                                      columns=selection):
+            for a, column in zip(arrays, batch):
+                a.extend(column)
+    return arrays
+
+
+LOADERS = [loop, converters, columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=200000,
+                        help='number of rows (default: 200000)')
+    parser.add_argument('-c', '--columns', type=int, default=12,
+                        help='number of columns (default: 12)')
+    parser.add_argument('-d', '--directory', default=None,
+                        help='directory holding the file '
+                             '(default: the system temporary directory)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmpdir:
+        path = os.path.join(tmpdir, 'data.csv')
+        write_file(path, args.rows, args.columns)
+        expected = None
+        for loader in LOADERS:
+            start = time.perf_counter()
+            arrays = loader(path, args.columns)
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = arrays
+            elif arrays != expected:
+                raise RuntimeError('%s loaded different data'
+                                   % loader.__name__)
+            print('%-12s %10.0f rows/s' % (loader.__name__,
+                                           args.rows / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark of csv.DictReader and csv.DictWriter on narrow and wide files.
+
+Reads and writes in-memory CSV data of a given number of rows, with few
+and with many columns, and prints the rows per second of:
+
+- reader, writer: the plain csv.reader() and csv.writer(), as a baseline;
+- DictReader: rows returned as dicts;
+- DictReader(shared_keys=True): rows returned as tuples sharing the
+  mapping of their keys;
+- DictWriter: rows given as dicts.
+
+Usage: dictbench.py [-n ROWS] [-c COLUMNS ...]
+"""
+
+import argparse
+import csv
+import io
+import time
+
+
+def make_data(rows, columns):
+    fieldnames = ['field%d' % j for j in range(columns)]
+    f = io.StringIO(newline='')
+    writer = csv.writer(f)
+    writer.writerow(fieldnames)
+    for i in range(rows):
+        writer.writerow([i * j for j in range(columns)])
+    return fieldnames, f.getvalue()
+
+
+def read_lists(data, fieldnames):
+    for row in csv.reader(io.StringIO(data, newline='')):
+        pass
+
+
+def read_dicts(data, fieldnames):
+    for row in csv.DictReader(io.StringIO(data, newline='')):
+        pass
+
+
+def read_rows(data, fieldnames):
+    for row in csv.DictReader(io.StringIO(data, newline=''),
+                              shared_keys=True):
+        pass
+
+
+def write_lists(data, fieldnames):
+    rows = list(csv.reader(io.StringIO(data, newline='')))
+    start = time.perf_counter()
+    csv.writer(io.StringIO(newline='')).writerows(rows)
+    return time.perf_counter() - start
+
+
+def write_dicts(data, fieldnames):
+    rows = list(csv.DictReader(io.StringIO(data, newline='')))
+    start = time.perf_counter()
+    writer = csv.DictWriter(io.StringIO(newline=''), fieldnames)
+    writer.writerows(rows)
+    return time.perf_counter() - start
+
+
+TESTS = [
+    ('reader', read_lists),
+    ('DictReader', read_dicts),
+    ('DictReader(shared_keys=True)', read_rows),
+    ('writer', write_lists),
+    ('DictWriter', write_dicts),
+]
+
+
+def bench(func, data, fieldnames):
+    start = time.perf_counter()
+    elapsed = func(data, fieldnames)
+    if elapsed is None:
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=20000,
+                        help='number of rows (default: 20000)')
+    parser.add_argument('-c', '--columns', type=int, nargs='+',
+                        default=[5, 200],
+                        help='numbers of columns (default: 5 200)')
+    args = parser.parse_args()
+
+    for columns in args.columns:
+        fieldnames, data = make_data(args.rows, columns)
+        print('%d columns:' % columns)
+        for name, func in TESTS:
+            elapsed = bench(func, data, fieldnames)
+            print('  %-30s %10.0f rows/s' % (name, args.rows / elapsed))
+
+
+if __name__ == '__main__':
+    main()
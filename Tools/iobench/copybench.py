@@ -0,0 +1,70 @@
+"""Throughput benchmark for shutil.copyfile().
+
+A file of the given size is copied repeatedly, once with each of the
+fast-copy paths available on this platform (os.copy_file_range(),
+os.sendfile()) and once with the plain read()/write() fallback, and the
+best time of each is reported.
+
+Usage: copybench.py [-s SIZE] [-n REPEAT] [-d DIRECTORY]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+
+# (name, _USE_CP_COPY_FILE_RANGE, _USE_CP_SENDFILE)
+STRATEGIES = [
+    ('copy_file_range', True, False),
+    ('sendfile', False, True),
+    ('copyfileobj', False, False),
+]
+
+
+def bench(src, dst, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        shutil.copyfile(src, dst)
+        best = min(best, time.perf_counter() - start)
+        os.unlink(dst)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-s', '--size', type=int, default=256,
+                        help='size of the copied file in MiB (default: 256)')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='number of copies per strategy (default: 5)')
+    parser.add_argument('-d', '--directory', default=None,
+                        help='directory holding the files '
+                             '(default: the system temporary directory)')
+    args = parser.parse_args()
+
+    size = args.size * 1024 ** 2
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmpdir:
+        src = os.path.join(tmpdir, 'src')
+        dst = os.path.join(tmpdir, 'dst')
+        block = os.urandom(1024 ** 2)
+        with open(src, 'wb') as f:
+            for _ in range(args.size):
+                f.write(block)
+
+        saved = shutil._USE_CP_COPY_FILE_RANGE, shutil._USE_CP_SENDFILE
+        try:
+            for name, use_cfr, use_sendfile in STRATEGIES:
+                if (use_cfr and not saved[0]) or (use_sendfile and not saved[1]):
+                    continue
+                shutil._USE_CP_COPY_FILE_RANGE = use_cfr
+                shutil._USE_CP_SENDFILE = use_sendfile
+                elapsed = bench(src, dst, args.repeat)
+                print('%-16s %8.1f MB/s' % (name, size / elapsed / 1024 ** 2))
+        finally:
+            shutil._USE_CP_COPY_FILE_RANGE, shutil._USE_CP_SENDFILE = saved
+
+
+if __name__ == '__main__':
+    main()
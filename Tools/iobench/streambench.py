@@ -0,0 +1,93 @@
+"""Throughput benchmark for asyncio.StreamReader with large frames.
+
+A length-prefixed framing protocol is simulated: frames of a given size
+are fed to a StreamReader in transport-sized chunks while a consumer
+reads them back, either with readexactly() or with readinto() into a
+preallocated buffer.
+
+Usage: streambench.py [-s FRAME_SIZE] [-n FRAMES] [-c CHUNK_SIZE]
+"""
+
+import argparse
+import asyncio
+import struct
+import time
+
+HEADER = struct.Struct('!I')
+
+
+def make_stream(frame_size, frames, chunk_size):
+    frame = HEADER.pack(frame_size) + b'x' * frame_size
+    data = frame * frames
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+async def produce(reader, chunks):
+    for chunk in chunks:
+        reader.feed_data(chunk)
+        await asyncio.sleep(0)
+    reader.feed_eof()
+
+
+async def consume_readexactly(reader):
+    total = 0
+    while True:
+        try:
+            header = await reader.readexactly(HEADER.size)
+        except asyncio.IncompleteReadError:
+            return total
+        size, = HEADER.unpack(header)
+        frame = await reader.readexactly(size)
+        total += len(frame)
+
+
+async def consume_readinto(reader):
+    total = 0
+    header = bytearray(HEADER.size)
+    frame = bytearray()
+    while True:
+        if await reader.readinto(header) < HEADER.size:
+            return total
+        size, = HEADER.unpack(header)
+        if len(frame) < size:
+            frame = bytearray(size)
+        view = memoryview(frame)[:size]
+        while view:
+            n = await reader.readinto(view)
+            if not n:
+                return total
+            view = view[n:]
+            total += n
+
+
+def run(loop, consumer, chunks):
+    reader = asyncio.StreamReader(limit=2 ** 20, loop=loop)
+    start = time.perf_counter()
+    total, _ = loop.run_until_complete(
+        asyncio.gather(consumer(reader), produce(reader, chunks), loop=loop))
+    return total, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-s', '--frame-size', type=int, default=1024 ** 2,
+                        help='size of each frame in bytes (default: 1 MiB)')
+    parser.add_argument('-n', '--frames', type=int, default=256,
+                        help='number of frames (default: 256)')
+    parser.add_argument('-c', '--chunk-size', type=int, default=256 * 1024,
+                        help='size of the fed chunks (default: 256 KiB)')
+    args = parser.parse_args()
+
+    chunks = make_stream(args.frame_size, args.frames, args.chunk_size)
+    loop = asyncio.new_event_loop()
+    try:
+        for consumer in (consume_readexactly, consume_readinto):
+            total, elapsed = run(loop, consumer, chunks)
+            print('%-20s %8.1f MB/s' % (consumer.__name__[8:],
+                                        total / elapsed / 1024 ** 2))
+    finally:
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
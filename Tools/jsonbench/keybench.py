@@ -0,0 +1,57 @@
+"""Encoding benchmark for lists of dictionaries sharing the same keys.
+
+Encodes a list of rows, dictionaries with the same keys, with and without
+the key cache of JSONEncoder (key_cache_size), with the C accelerator and
+with the pure Python encoder (--indent forces the latter), and prints the
+rows per second of each.
+
+Usage: keybench.py [-n ROWS] [-k KEYS] [-r REPEAT] [--indent N]
+"""
+
+import argparse
+import json
+import time
+
+
+def make_rows(count, keys):
+    names = ['field_%d_name' % i for i in range(keys)]
+    return [{name: i for name in names} for i in range(count)]
+
+
+def bench(encoder, rows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoder.encode(rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=100000,
+                        help='number of rows (default: 100000)')
+    parser.add_argument('-k', '--keys', type=int, default=10,
+                        help='number of keys per row (default: 10)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='number of encodings per case (default: 5)')
+    parser.add_argument('--indent', type=int, default=None,
+                        help='indent of the output, which disables the '
+                             'C accelerator')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.keys)
+    for ensure_ascii in True, False:
+        rates = []
+        for key_cache_size in 0, 256:
+            encoder = json.JSONEncoder(ensure_ascii=ensure_ascii,
+                                       indent=args.indent,
+                                       key_cache_size=key_cache_size)
+            rates.append(bench(encoder, rows, args.repeat))
+        print('ensure_ascii=%-5s %10.0f rows/s uncached %10.0f rows/s cached'
+              ' (%+.0f%%)' % (ensure_ascii, rates[0], rates[1],
+                              (rates[1] / rates[0] - 1) * 100))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Throughput benchmark for json.load_lines() and json.dump_lines().
+
+Writes and reads back a JSON Lines file of small records, once with a
+naive loop calling json.dumps() or json.loads() for each line and once
+with json.dump_lines() and json.load_lines() (also with a process pool
+if --workers is given), and prints the records per second of each.
+
+Usage: linesbench.py [-n RECORDS] [-w WORKERS] [-d DIRECTORY]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def make_records(count):
+    return [{'id': i, 'name': 'user%d' % i, 'score': i / 7,
+             'active': i % 3 == 0, 'tags': ['a', 'b', 'c'][:i % 4]}
+            for i in range(count)]
+
+
+def naive_dump(records, path):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def dump_lines(records, path):
+    with open(path, 'w') as f:
+        json.dump_lines(records, f)
+
+
+def naive_load(path, workers):
+    with open(path, 'rb') as f:
+        for line in f:
+            json.loads(line.decode('utf-8'))
+
+
+def load_lines(path, workers):
+    with open(path, 'rb') as f:
+        for record in json.load_lines(f, workers=workers):
+            pass
+
+
+def bench(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--records', type=int, default=500000,
+                        help='number of records (default: 500000)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='also decode with this many worker processes')
+    parser.add_argument('-d', '--directory', default=None,
+                        help='directory holding the file '
+                             '(default: the system temporary directory)')
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmpdir:
+        path = os.path.join(tmpdir, 'records.jsonl')
+        results = [
+            ('dumps() loop', bench(naive_dump, records, path)),
+            ('dump_lines()', bench(dump_lines, records, path)),
+            ('loads() loop', bench(naive_load, path, None)),
+            ('load_lines()', bench(load_lines, path, None)),
+        ]
+        if args.workers:
+            results.append(('load_lines(workers=%d)' % args.workers,
+                            bench(load_lines, path, args.workers)))
+    for name, elapsed in results:
+        print('%-24s %12.0f records/s' % (name, args.records / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Micro-benchmark of disabled logging calls.
+
+Calls logger.debug() on loggers nested at several depths below a logger
+whose level is WARNING, so that the calls are suppressed, and prints the
+time per call.  The level checks are cached, so the cost should not
+depend on the depth; --no-cache clears the caches before every call to
+show the cost of walking the hierarchy.
+
+Usage: levelbench.py [-n CALLS] [-d DEPTH ...] [--no-cache]
+"""
+
+import argparse
+import logging
+import time
+
+
+def bench(logger, calls, clear):
+    debug = logger.debug
+    manager = logger.manager
+    start = time.perf_counter()
+    if clear:
+        for _ in range(calls):
+            manager._clear_cache()
+            debug('suppressed %s', 'message')
+    else:
+        for _ in range(calls):
+            debug('suppressed %s', 'message')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--calls', type=int, default=1000000,
+                        help='number of calls per depth (default: 1000000)')
+    parser.add_argument('-d', '--depth', type=int, nargs='+',
+                        default=[1, 4, 16],
+                        help='depths of the loggers below the configured '
+                             'one (default: 1 4 16)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='clear the caches before each call')
+    args = parser.parse_args()
+
+    logging.getLogger('bench').setLevel(logging.WARNING)
+    for depth in args.depth:
+        name = '.'.join(['bench'] + ['sub%d' % i for i in range(depth)])
+        logger = logging.getLogger(name)
+        elapsed = bench(logger, args.calls, args.no_cache)
+        print('depth %3d: %6.1f ns per call'
+              % (depth, elapsed / args.calls * 1e9))
+
+
+if __name__ == '__main__':
+    main()
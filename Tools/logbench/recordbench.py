@@ -0,0 +1,62 @@
+"""Micro-benchmark of the creation of log records.
+
+Logs messages through a handler which only keeps the records, so that
+the cost measured is that of the logging call and of the record, with the
+default record policy and with the capture of the caller, thread and
+process information turned off on the logger.
+
+Usage: recordbench.py [-n CALLS]
+"""
+
+import argparse
+import collections
+import logging
+import time
+
+
+# (name, logCaller, logThreads, logProcesses)
+POLICIES = [
+    ('default', True, True, True),
+    ('no caller', False, True, True),
+    ('no caller/thread/process', False, False, False),
+]
+
+
+class KeepingHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = collections.deque(maxlen=1000)
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def bench(logger, calls):
+    info = logger.info
+    start = time.perf_counter()
+    for i in range(calls):
+        info('message %d', i)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--calls', type=int, default=200000,
+                        help='number of calls per policy (default: 200000)')
+    args = parser.parse_args()
+
+    logger = logging.getLogger('bench')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(KeepingHandler())
+    for name, caller, threads, processes in POLICIES:
+        logger.logCaller = caller
+        logger.logThreads = threads
+        logger.logProcesses = processes
+        elapsed = bench(logger, args.calls)
+        print('%-26s %8.2f us per call' % (name, elapsed / args.calls * 1e6))
+
+
+if __name__ == '__main__':
+    main()